@@ -13,6 +13,7 @@
 # limitations under the License.
 
 """op_build"""
+import hashlib
 import os
 import fcntl
 import types
@@ -24,6 +25,39 @@ import _akg
 from _akg import save_gpu_param as gpu_utils
 from _akg.utils import validation_check as vc_util
 
+try:
+    from mindspore._extends.parallel_compile.compiler_process import build_version, restore_kernel, store_kernel
+except ImportError:
+    build_version = restore_kernel = store_kernel = None
+
+
+def _cuda_arch():
+    """Gets the compute capability of the GPU the kernels are built for, "" if it is unknown."""
+    try:
+        return _akg.tvm.gpu(0).compute_version
+    except Exception:  # pylint: disable=broad-except
+        return ""
+
+
+def _kernel_cache_key(device, kernel_name, args):
+    """
+    Gets the key of a kernel in the "akg" compile cache, None if the cache can not be used.
+
+    The name of the kernel is not enough, as the kernels of the same op with other shapes or types have the same
+    name, so the shapes and the types of the arguments are in the key, with the versions of MindSpore and tvm and
+    the architecture of the GPU, the PTX code depending on them.
+    """
+    if restore_kernel is None:
+        return None
+    arg_descs = []
+    for arg in args:
+        shape = [str(dim) for dim in getattr(arg, "shape", [])]
+        arg_descs.append("{}:{}:{}".format(getattr(arg, "name", ""), shape, getattr(arg, "dtype", "")))
+    tvm_version = getattr(_akg.tvm, "__version__", "")
+    description = "\n".join([build_version(), "tvm=" + tvm_version, "arch=" + _cuda_arch(), device,
+                              kernel_name] + arg_descs)
+    return hashlib.sha256(description.encode()).hexdigest()
+
 
 @vc_util.check_input_type(list, (list, tuple), (list, tuple), str, str)
 def op_build(opnames, computes, args, device, kernel_name):
@@ -44,6 +78,11 @@ def op_build(opnames, computes, args, device, kernel_name):
             return None
 
         ptx_file = os.path.realpath(kernel_meta_path + kernel_name + ".ptx")
+        json_file = os.path.realpath(kernel_meta_path + kernel_name + ".json")
+        key = _kernel_cache_key(device, kernel_name, args)
+        if key is not None and not os.path.exists(ptx_file) and \
+                restore_kernel("akg", key, [ptx_file, json_file]):
+            return True
         if os.path.exists(ptx_file):
             os.chmod(ptx_file, 0o600)
         try:
@@ -55,14 +94,17 @@ def op_build(opnames, computes, args, device, kernel_name):
                     foo = _akg.tvm.build(s, args, device, name=kernel_name)
                     ptx_code = foo.imported_modules[0].get_source("ptx")
                     file.write(ptx_code)
-                    json_file = os.path.realpath(
-                        kernel_meta_path + kernel_name + ".json")
                     kernel_info = (ptx_code, json_file, kernel_name)
                     gpu_utils.save_gpu_params(s, args, kernel_info)
             os.chmod(ptx_file, 0o400)
         except IOError:
             logging.error(traceback.format_exc())
             return None
+        if key is not None:
+            try:
+                store_kernel("akg", key, [ptx_file, json_file])
+            except OSError:
+                logging.warning(traceback.format_exc())
         return True
 
     logging.error("Not support device %s.", device)
@@ -13,7 +13,12 @@
 # limitations under the License.
 # ============================================================================
 """Providing akg compile with json"""
+import json
+import os
 import sys
+import traceback
+
+
 def run_compiler(op_json):
     """
     Run AKG compiler to compile op with subprocess, if this process of
@@ -31,5 +36,33 @@ def run_compiler(op_json):
     if not res:
         raise ValueError("Compile error")
 
+
+def serve():
+    """
+    Compiles the ops read from stdin, one json string per line, until stdin is closed.
+
+    For each op one json line is written to stdout, with the `status` Success or Exception and the `out` of the
+    compile, empty or the traceback. The text printed by the compiler goes to stderr so it does not mix with
+    the results.
+    """
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    for line in iter(sys.stdin.readline, ""):
+        try:
+            run_compiler(line)
+            response = {"status": "Success", "out": ""}
+        except Exception:  # pylint: disable=broad-except
+            response = {"status": "Exception", "out": traceback.format_exc()}
+        try:
+            channel.write(json.dumps(response) + "\n")
+            channel.flush()
+        except BrokenPipeError:
+            # the worker which started the compiler is gone
+            return
+
+
 if __name__ == "__main__":
-    run_compiler(sys.argv[1])
+    if sys.argv[1] == "--serve":
+        serve()
+    else:
+        run_compiler(sys.argv[1])
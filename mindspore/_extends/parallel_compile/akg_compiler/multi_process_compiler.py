@@ -13,32 +13,51 @@
 # limitations under the License.
 # ============================================================================
 """Providing multi process compile with json"""
+import json
 import os
-import subprocess
-import sys
-from multiprocessing import Pool, cpu_count
+import time
+from functools import partial
+from multiprocessing import Pool, TimeoutError, cpu_count  # pylint: disable=redefined-builtin
 
+from mindspore import log as logger
+from mindspore.common._compile_cache import KERNEL_META_DIR
+from ..compiler_process import CompilerProcess, build_version, kernel_cache_key, restore_kernel, store_kernel
 
-def _compile_akg_task(*json_strs):
+# the compiler process of a worker of the pool, it imports akg once and compiles the kernels one by one
+_compiler_process = CompilerProcess(os.path.join(os.path.split(os.path.realpath(__file__))[0], "compiler.py"))
+
+
+def _compile_akg_task(json_str, timeout):
     """
-    compile func called in single process
+    compile func called in the workers of the pool
 
     Parameters:
-        json_strs: list. List contains multiple kernel infos, suitable for json compile api.
+        json_str: str. The kernel info, suitable for json compile api.
+        timeout: int. Max time of the compile.
+
+    Returns:
+        The json str, the status and the output of the compiler, the compile time.
     """
-    akg_compiler = os.path.join(os.path.split(
-        os.path.realpath(__file__))[0], "compiler.py")
-    for json_str in json_strs:
-        res = subprocess.run(
-            [sys.executable, akg_compiler, json_str], text=True)
-        if res.returncode != 0:
-            raise ValueError("Failed, args: {}!".format(json_str))
+    start_time = time.time()
+    status, out = _compiler_process.compile(json_str, timeout)
+    return json_str, status, out, time.time() - start_time
+
+
+def _kernel_of(json_str):
+    """Gets the name of the kernel of a json str and the paths of its files."""
+    kernel_name = json.loads(json_str)["op"]
+    return kernel_name, [os.path.join(KERNEL_META_DIR, kernel_name + suffix) for suffix in (".json", ".o")]
 
 
 def compile_akg_kernel_parallel(json_infos, process, waitime):
     """
     compile kernel use multi processes
 
+    The kernels are taken one by one from a shared queue by the workers, so a slow kernel does not hold back the
+    ones behind it, and each worker compiles with a compiler process started once. The kernels built are also
+    stored in the "akg" compile cache when it is enabled, by the hash of their json, and the kernels found there
+    are not compiled. The versions of akg and MindSpore are in the keys of the kernels.
+
     Parameters:
         json_infos: list. list contain kernel info(task id and json str)
         process: int. processes num
@@ -54,18 +73,44 @@ def compile_akg_kernel_parallel(json_infos, process, waitime):
     if not isinstance(waitime, int):
         raise ValueError("waittime must be a num")
 
-    if process == 0 and json_infos:
-        process = 1
+    deadline = time.time() + waitime
+    keys = {}
+    for json_str in json_infos:
+        kernel_name, kernel_files = _kernel_of(json_str)
+        key = kernel_cache_key(json_str, build_version("akg"))
+        if restore_kernel("akg", key, kernel_files):
+            logger.info("Got AKG kernel %s from the compile cache.", kernel_name)
+        else:
+            keys[json_str] = key
+    if not keys:
+        return True
 
     cpu_proc_num = cpu_count()
     max_proc_num = 16
-    process = min([cpu_proc_num, max_proc_num, process])
-
-    args = [[] for _ in range(process)]
-    for p, info in enumerate(json_infos):
-        args[p % process].append(info)
+    process = min([cpu_proc_num, max_proc_num, max(process, 1), len(keys)])
 
+    failed = []
     with Pool(processes=process) as pool:
-        res = pool.starmap_async(_compile_akg_task, args)
-        res.get(timeout=waitime)
+        results = pool.imap_unordered(partial(_compile_akg_task, timeout=waitime), keys, chunksize=1)
+        for finished in range(len(keys)):
+            try:
+                json_str, status, out, compile_time = results.next(timeout=max(deadline - time.time(), 0))
+            except TimeoutError:
+                logger.error("Failed to compile AKG kernels in %ds, %d of %d kernels not finished.", waitime,
+                             len(keys) - finished, len(keys))
+                return False
+            kernel_name, kernel_files = _kernel_of(json_str)
+            if status != "Success":
+                logger.error("Failed to compile AKG kernel %s, %s: %s\nargs: %s", kernel_name, status, out,
+                             json_str)
+                failed.append(kernel_name)
+                continue
+            logger.info("Compiled AKG kernel %s in %.2fs.", kernel_name, compile_time)
+            try:
+                store_kernel("akg", keys[json_str], kernel_files)
+            except OSError as e:
+                logger.warning("Failed to store AKG kernel %s in the compile cache: %s.", kernel_name, e)
+    if failed:
+        logger.error("Failed to compile %d of %d AKG kernels: %s.", len(failed), len(json_infos), failed)
+        return False
     return True
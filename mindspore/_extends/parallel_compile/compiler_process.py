@@ -0,0 +1,194 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Long-lived compiler processes and the kernel cache shared by the parallel compilers."""
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import select
+import subprocess
+import sys
+import traceback
+
+from mindspore.common._compile_cache import get_compile_cache
+
+COMPILE_TIMEOUT = 300
+
+# the result status of CompilerProcess.compile besides the ones of the compiler
+STATUS_TIMEOUT = "Timeout"
+STATUS_EXITED = "Exited"
+
+
+class CompilerProcess:
+    """
+    A compiler script run in serve mode, which compiles the ops written on its stdin one json string per line
+    and writes one json line with the `status` and the `out` of each compile on its stdout.
+
+    The compiler modules are imported once by the process, which is started on the first compile and started
+    again after a timeout or an exit.
+
+    Args:
+        script (str): The path of the compiler script.
+    """
+    def __init__(self, script):
+        self.script = script
+        self._process = None
+
+    def stop(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+
+    def compile(self, op_json, timeout=COMPILE_TIMEOUT):
+        """
+        Compiles an op.
+
+        Args:
+            op_json (str): The json string of the op.
+            timeout (int): The max time of the compile in seconds. Default: COMPILE_TIMEOUT.
+
+        Returns:
+            str, the status, "Success", "Exception", STATUS_TIMEOUT or STATUS_EXITED.
+            str, the output of the compiler, the error message if it failed.
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen([sys.executable, self.script, "--serve"], stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE, text=True)
+        process = self._process
+        try:
+            process.stdin.write(op_json.rstrip("\n") + "\n")
+            process.stdin.flush()
+            ready, _, _ = select.select([process.stdout], [], [], timeout)
+            if not ready:
+                self.stop()
+                return STATUS_TIMEOUT, "no result after {}s".format(timeout)
+            line = process.stdout.readline()
+        except OSError:
+            self.stop()
+            return STATUS_EXITED, traceback.format_exc()
+        if not line:
+            return_code = process.wait()
+            self.stop()
+            return STATUS_EXITED, "the compiler exited with code {}".format(return_code)
+        response = json.loads(line)
+        return response["status"], response["out"]
+
+
+def kernel_cache_key(op_json, extra=""):
+    """
+    Gets the key of the kernel of an op in the cache, the hash of its normalized json.
+
+    Args:
+        op_json (Union[str, dict]): The json of the op.
+        extra (str): Other description of the build, e.g. the version of the compiler. Default: "".
+
+    Returns:
+        str, the hex digest of the key.
+    """
+    if isinstance(op_json, str):
+        op_json = json.loads(op_json)
+    normalized = json.dumps(op_json, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256((extra + normalized).encode()).hexdigest()
+
+
+def _distribution_version(package):
+    """Gets the version in the metadata of an installed package, None if it has no metadata."""
+    try:
+        from importlib import metadata
+    except ImportError:
+        metadata = None
+    if metadata is not None:
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return None
+    # python 3.7
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution(package).version
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _package_version(package):
+    """Gets the version of an installed package without importing it, the time of its files if it has no metadata."""
+    version = _distribution_version(package)
+    if version is not None:
+        return version
+    # e.g. a package found in PYTHONPATH
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.origin is None or not os.path.isfile(spec.origin):
+        return ""
+    return "mtime:{}".format(os.path.getmtime(spec.origin))
+
+
+@functools.lru_cache(maxsize=None)
+def build_version(*packages):
+    """
+    Gets the version of MindSpore and of the compiler packages, to put in the keys of the kernels in the cache,
+    so the kernels built by other versions of the code generators are not restored.
+
+    Args:
+        packages (str): The names of the compiler packages, which are not imported.
+
+    Returns:
+        str, the versions.
+    """
+    try:
+        from mindspore.version import __version__ as version
+    except ImportError:
+        version = ""
+    return ";".join(["mindspore=" + version] + ["{}={}".format(package, _package_version(package))
+                                                for package in packages])
+
+
+def restore_kernel(name, key, kernel_files):
+    """
+    Copies the files of a kernel from the compile cache named `name`, if it is enabled.
+
+    Args:
+        name (str): The name of the compile cache.
+        key (str): The key of the kernel.
+        kernel_files (list): The paths of the files of the kernel, in the same directory.
+
+    Returns:
+        bool, whether all the files of the kernel are there.
+    """
+    cache = get_compile_cache(name)
+    entry = cache.lookup(key) if cache is not None else None
+    if entry is None:
+        return False
+    cache.restore_kernels(entry, os.path.dirname(kernel_files[0]))
+    return all(os.path.isfile(kernel_file) for kernel_file in kernel_files)
+
+
+def store_kernel(name, key, kernel_files):
+    """
+    Stores the files of a kernel in the compile cache named `name`, if it is enabled.
+
+    Args:
+        name (str): The name of the compile cache.
+        key (str): The key of the kernel.
+        kernel_files (list): The paths of the files of the kernel, it is not stored if one is missing.
+    """
+    cache = get_compile_cache(name)
+    if cache is None or not all(os.path.isfile(kernel_file) for kernel_file in kernel_files):
+        return
+    cache.store(key, kernel_files)
@@ -13,9 +13,12 @@
 # limitations under the License.
 # ============================================================================
 """tbe compiler"""
+import contextlib
+import io
 import json
 import os
 import sys
+import traceback
 from te.platform.cce_conf import te_set_version
 from te.platform.fusion_manager import op_build_cfg_dis, op_build_cfg_en, set_current_op_name, \
     init_op_pattern, set_op_params, set_op_build_type, get_op_pattern, set_current_op_func_name
@@ -41,6 +44,8 @@ def _initialize(impl_path):
     if not op_module_name:
         raise ValueError("Can not find the env TBE_IMPL_PATH")
 
+    if op_module_name in sys.path:
+        sys.path.remove(op_module_name)
     sys.path.insert(0, op_module_name)
 
 def build_op(build_type, json_str):
@@ -79,6 +84,8 @@ def build_op(build_type, json_str):
         kernel_name = kernel_info['op_info']['kernel_name']
 
         if custom_flag:
+            # a compiler serving several ops may have imported another custom op file with the same name
+            sys.modules.pop(op_name, None)
             op_module = __import__(op_name)
         else:
             op_module = __import__("impl."+op_name, globals(), locals(), [op_name], 0)
@@ -165,8 +172,40 @@ def compile_with_json(json_str):
         ret = build_op(op_build, json_str)
     return ret
 
+
+def serve():
+    """
+    Compiles the ops read from stdin, one json string per line, until stdin is closed.
+
+    For each op one json line is written to stdout, with the `status` Success or Exception and the `out` of the
+    compile, the printed text followed by the result or the traceback. The text printed out of Python goes to
+    stderr so it does not mix with the results.
+    """
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    for line in iter(sys.stdin.readline, ""):
+        printed = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(printed):
+                compile_result = compile_with_json(line)
+            response = {"status": "Success",
+                        "out": printed.getvalue() + fusion_pattern_start_flag + str(compile_result) +
+                        fusion_pattern_end_flag}
+        except Exception:  # pylint: disable=broad-except
+            response = {"status": "Exception", "out": printed.getvalue() + traceback.format_exc()}
+        try:
+            channel.write(json.dumps(response) + "\n")
+            channel.flush()
+        except BrokenPipeError:
+            # the worker which started the compiler is gone
+            return
+
+
 if __name__ == "__main__":
-    in_args = sys.stdin.readline()
-    result = compile_with_json(in_args)
-    sys.stdout.write(fusion_pattern_start_flag + str(result) + fusion_pattern_end_flag)
-    sys.stdout.flush()
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve()
+    else:
+        in_args = sys.stdin.readline()
+        result = compile_with_json(in_args)
+        sys.stdout.write(fusion_pattern_start_flag + str(result) + fusion_pattern_end_flag)
+        sys.stdout.flush()
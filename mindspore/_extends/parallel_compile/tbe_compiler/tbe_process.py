@@ -13,13 +13,16 @@
 # limitations under the License.
 # ============================================================================
 """tbe process"""
-import traceback
 import multiprocessing
-import subprocess
-import sys
+import queue
 import os
 import json
-from .common import check_kernel_info, TBEException
+import time
+from mindspore import log as logger
+from mindspore.common._compile_cache import KERNEL_META_DIR
+from ..compiler_process import CompilerProcess, COMPILE_TIMEOUT, STATUS_TIMEOUT, kernel_cache_key, restore_kernel, \
+    store_kernel
+from .common import check_kernel_info, get_ddk_version, TBEException
 from .helper import _op_select_format, _check_supported
 
 def create_tbe_parallel_compiler():
@@ -75,31 +78,60 @@ def check_supported(op_json: str):
 
     return ret
 
+# the compiler process of a worker of the pool, it imports the compiler once and compiles the ops one by one
+_compiler_process = CompilerProcess(os.path.join(os.path.split(os.path.realpath(__file__))[0], "compiler.py"))
+
+
 def run_compiler(op_json):
     """
-    run compiler to compile op with subprocess
+    run compiler to compile op with the compiler process of this worker
 
     Args:
         op_json (str): json string of the op
 
     Returns:
-        result type, result.
+        result type, result, compile time in seconds.
+    """
+    start_time = time.time()
+    status, out = _compiler_process.compile(op_json)
+    if status == STATUS_TIMEOUT:
+        return "TBEException", "PreCompileTimeOut: " + out + "\ninput_args: " + op_json, time.time() - start_time
+    if status != "Success":
+        return "TBEException", "PreCompileProcessFailed:\n" + out + "\ninput_args: " + op_json, \
+            time.time() - start_time
+    return "Success", out, time.time() - start_time
+
+
+def _kernel_of(op_json):
+    """
+    Gets the kernel name of an op and the key of its kernel in the cache, which is the hash of the normalized json.
+
+    The pre build ops have no kernel, their key is None.
     """
     try:
-        tbe_compiler = os.path.join(os.path.split(os.path.realpath(__file__))[0], "compiler.py")
-        completed_object = subprocess.run([sys.executable, tbe_compiler], input=op_json, timeout=300,
-                                          text=True, capture_output=True, check=True)
-        if completed_object:
-            out = completed_object.stdout
-        return "Success", out
-    except subprocess.TimeoutExpired:
-        tb = traceback.format_exc()
-        return "TBEException", "PreCompileTimeOut: " + tb + "\ninput_args: " + op_json
-    except subprocess.CalledProcessError as e:
-        return "TBEException", "PreCompileProcessFailed:\n" + e.stdout + "\n" + e.stderr + "\ninput_args: " + op_json
+        kernel_info = json.loads(op_json)
+    except ValueError:
+        return "", None
+    if "fusion_op" in kernel_info:
+        kernel_name = kernel_info["fusion_op"].get("fusion_op_name", "")
+    else:
+        kernel_name = kernel_info.get("op_info", {}).get("kernel_name", "")
+    if "compile_type" in kernel_info or not kernel_name:
+        return kernel_name, None
+    return kernel_name, kernel_cache_key(kernel_info, get_ddk_version())
+
+
+def _kernel_files(kernel_name):
+    return [os.path.join(KERNEL_META_DIR, kernel_name + suffix) for suffix in (".json", ".o")]
+
 
 class CompilerPool:
-    """compiler pool"""
+    """
+    compiler pool
+
+    The tasks are reported by `wait_one` in the order they finish. The kernels built are also stored in the "tbe"
+    compile cache when it is enabled, by the hash of their json, and a task of a kernel found there finishes at once.
+    """
 
     def __init__(self):
         self.__processe_num = multiprocessing.cpu_count()
@@ -109,7 +141,9 @@ class CompilerPool:
             self.__processe_num = max_processes_num
         self.__pool = None
         self.__next_task_id = 1
-        self.__running_tasks = []
+        # task id: (kernel name, cache key)
+        self.__running_tasks = {}
+        self.__finished_tasks = queue.Queue()
 
     def __del__(self):
         if self.__pool is not None:
@@ -121,7 +155,7 @@ class CompilerPool:
         if self.__pool is not None:
             self.__pool.terminate()
             self.__pool.join()
-            del self.__pool
+            self.__pool = None
 
     def start_compile_op(self, op_json):
         """
@@ -135,10 +169,23 @@ class CompilerPool:
         """
         task_id = self.__next_task_id
         self.__next_task_id = self.__next_task_id + 1
+        kernel_name, key = _kernel_of(op_json)
+        self.__running_tasks[task_id] = (kernel_name, key)
+
+        if key is not None and restore_kernel("tbe", key, _kernel_files(kernel_name)):
+            self.__finished_tasks.put((task_id, ("Success", "", 0.0)))
+            return task_id
+
         if self.__pool is None:
             self.__pool = multiprocessing.Pool(processes=self.__processe_num)
-        task_future = self.__pool.apply_async(func=run_compiler, args=(op_json,))
-        self.__running_tasks.append((task_id, task_future))
+
+        def finish(result):
+            self.__finished_tasks.put((task_id, result))
+
+        def fail(error):
+            self.__finished_tasks.put((task_id, ("Exception", str(error), 0.0)))
+
+        self.__pool.apply_async(func=run_compiler, args=(op_json,), callback=finish, error_callback=fail)
         return task_id
 
     def wait_one(self):
@@ -150,17 +197,35 @@ class CompilerPool:
             str, result of compile task
         """
         ret = 0, "Success"
-        if self.__running_tasks:
-            task_id, task_future = self.__running_tasks.pop(0)
-            ret_type, result = task_future.get(330)
+        while self.__running_tasks:
+            task_id, (ret_type, result, compile_time) = self.__finished_tasks.get(timeout=COMPILE_TIMEOUT + 30)
+            if task_id not in self.__running_tasks:
+                # a task dropped by reset_task_info
+                continue
+            kernel_name, key = self.__running_tasks.pop(task_id)
             if ret_type == "Success":
+                if compile_time > 0:
+                    logger.info("Compiled TBE kernel %s in %.2fs.", kernel_name, compile_time)
+                    self.__store_kernel(kernel_name, key)
+                else:
+                    logger.info("Got TBE kernel %s from the compile cache.", kernel_name)
                 ret = task_id, "Success", result
             elif ret_type in ("Exception", "TBEException"):
                 ret = task_id, ret_type + ":" + result, "_"
             else:
                 ret = task_id, "Exception: Not support return type:" + str(ret_type), "_"
+            break
         return ret
 
+    @staticmethod
+    def __store_kernel(kernel_name, key):
+        if key is None:
+            return
+        try:
+            store_kernel("tbe", key, _kernel_files(kernel_name))
+        except OSError as e:
+            logger.warning("Failed to store TBE kernel %s in the compile cache: %s.", kernel_name, e)
+
     def reset_task_info(self):
         """
         reset task info when task compile error
@@ -0,0 +1,204 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Cache of the ast trees of the parsed functions."""
+import ast
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from textwrap import dedent
+
+import asttokens
+
+# only the start and the end of the tokens are used to locate the nodes
+_Token = namedtuple("_Token", ["start", "end"])
+
+_CACHE_VERSION = 1
+_POSITIONS_FILE = "positions.json"
+
+
+class _AstEntry:
+    """The ast tree of a function with the offsets of its source in the file."""
+    def __init__(self, tree, line_offset, col_offset):
+        self.tree = tree
+        self.line_offset = line_offset
+        self.col_offset = col_offset
+
+
+class AstCache:
+    """
+    Two levels cache of the ast trees of the functions, marked with the positions of their tokens.
+
+    In the process the trees are kept by file and code object, which saves reading the source, and by hash of the
+    source. Both are bounded to `max_size` trees. If a `CompileCache` is given, the token positions of the trees
+    are also stored there by hash of the source, so the new processes only run `ast.parse` instead of the slower
+    tokenizing of asttokens.
+
+    Args:
+        max_size (int): The max number of trees kept in the process. Default: 4096.
+    """
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._by_code = OrderedDict()
+        self._by_source = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"parses": 0, "code_hits": 0, "source_hits": 0, "disk_hits": 0, "misses": 0,
+                       "parse_time": 0.0}
+
+    @property
+    def stats(self):
+        """
+        Counters of the cache.
+
+        `parses` is the number of parsed functions, each one is a hit of a level of the cache or a miss, and
+        `parse_time` is the total time spent getting the trees, in seconds.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self):
+        """Clears the trees kept in the process."""
+        with self._lock:
+            self._by_code.clear()
+            self._by_source.clear()
+
+    def _get(self, cache, key):
+        with self._lock:
+            entry = cache.get(key)
+            if entry is not None:
+                cache.move_to_end(key)
+            return entry
+
+    def _put(self, cache, key, entry):
+        with self._lock:
+            cache[key] = entry
+            while len(cache) > self.max_size:
+                cache.popitem(last=False)
+
+    def _count(self, name, start_time):
+        with self._lock:
+            self._stats["parses"] += 1
+            self._stats[name] += 1
+            self._stats["parse_time"] += time.perf_counter() - start_time
+
+    def get(self, fn, compile_cache=None):
+        """
+        Gets the ast tree of a function.
+
+        Args:
+            fn (Union[FunctionType, MethodType]): The function.
+            compile_cache (CompileCache): The cache of the token positions of the trees, None to not use it.
+                Default: None.
+
+        Returns:
+            _AstEntry, the tree and the line and column offsets of the source of the function.
+        """
+        start_time = time.perf_counter()
+        code = getattr(inspect.unwrap(fn), "__code__", None)
+        code_key = None
+        if code is not None:
+            # code objects compare equal across files, the same function in two files must not share its entry
+            code_key = (code.co_filename, code.co_firstlineno, code)
+            entry = self._get(self._by_code, code_key)
+            if entry is not None:
+                self._count("code_hits", start_time)
+                return entry
+
+        lines, line_offset = inspect.getsourcelines(fn)
+        original_src = ''.join(lines)
+        hexstr = hashlib.sha256(original_src.encode()).hexdigest()
+        entry = self._get(self._by_source, hexstr)
+        if entry is not None:
+            counter = "source_hits"
+            entry = _AstEntry(entry.tree, line_offset, entry.col_offset)
+        else:
+            src = dedent(original_src)
+            col_offset = len(original_src.split('\n')[0]) - len(src.split('\n')[0])
+            tree = None
+            if compile_cache is not None:
+                tree = _load_positions(compile_cache, hexstr, src)
+            if tree is not None:
+                counter = "disk_hits"
+            else:
+                counter = "misses"
+                tree = asttokens.ASTTokens(src, parse=True).tree
+                if compile_cache is not None:
+                    _save_positions(compile_cache, hexstr, tree)
+            entry = _AstEntry(tree, line_offset, col_offset)
+            self._put(self._by_source, hexstr, entry)
+        if code_key is not None:
+            self._put(self._by_code, code_key, entry)
+        self._count(counter, start_time)
+        return entry
+
+
+def _positions_key(hexstr):
+    return "{}_py{}{}".format(hexstr, sys.version_info[0], sys.version_info[1])
+
+
+def _save_positions(compile_cache, hexstr, tree):
+    """Stores the token positions of the nodes of a tree, in the order of `ast.walk`."""
+    positions = []
+    for node in ast.walk(tree):
+        if hasattr(node, "first_token"):
+            positions.append(list(node.first_token.start + node.first_token.end +
+                                  node.last_token.start + node.last_token.end))
+        else:
+            positions.append(None)
+    data = json.dumps({"version": _CACHE_VERSION, "positions": positions}).encode()
+    try:
+        compile_cache.store_contents(_positions_key(hexstr), {_POSITIONS_FILE: data})
+    except OSError:
+        pass
+
+
+def _load_positions(compile_cache, hexstr, src):
+    """Parses the source and marks the nodes with the stored token positions, None if they are not stored."""
+    entry = compile_cache.lookup(_positions_key(hexstr))
+    if entry is None:
+        return None
+    try:
+        with open(os.path.join(entry, _POSITIONS_FILE)) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    tree = ast.parse(src)
+    nodes = list(ast.walk(tree))
+    positions = cached.get("positions")
+    if cached.get("version") != _CACHE_VERSION or not isinstance(positions, list) or len(positions) != len(nodes):
+        return None
+    for node, position in zip(nodes, positions):
+        if position is not None:
+            node.first_token = _Token(tuple(position[0:2]), tuple(position[2:4]))
+            node.last_token = _Token(tuple(position[4:6]), tuple(position[6:8]))
+    return tree
+
+
+ast_cache = AstCache()
+
+
+def get_parse_stats():
+    """
+    Gets the counters of the parsing of the functions.
+
+    Returns:
+        dict, the number of `parses`, how many were hits of the caches `code_hits`, `source_hits` and `disk_hits`,
+        how many were `misses`, and the total `parse_time` in seconds.
+    """
+    return ast_cache.stats
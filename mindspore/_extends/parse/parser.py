@@ -19,17 +19,16 @@
 import ast
 import types
 import inspect
-import hashlib
-from textwrap import dedent
 from dataclasses import is_dataclass
-import asttokens
 import mindspore.nn as nn
 from mindspore import log as logger
 from mindspore import ops
 from mindspore.common.dtype import pytype_to_dtype
 from mindspore.common.api import _MindSporeFunction
+from mindspore.common._compile_cache import get_compile_cache
 from .namespace import CellNamespace, ClosureNamespace, ClassMemberNamespace
 from .resources import parse_object_map, convert_object_map, trope_ns, SYMBOL_UNDEFINE, NO_IMPLEMENT
+from .ast_cache import ast_cache
 
 # define return value
 RET_SUCCESS = 0
@@ -327,9 +326,10 @@ class Parser:
     Args:
         fn(FunctionType/MethodType): Need parse object instance.
         parse_method(ExtendInfoOfParseObj): Extend information for parse the function.
-        ast_cache: Dictionary for caching ast tree.
+        ast_cache(AstCache): Cache of the ast trees, the token positions are also stored in the "ast" directory
+            of the compile cache when it is enabled.
     """
-    ast_cache = {}
+    ast_cache = ast_cache
 
     def __init__(self, fn: (types.FunctionType, types.MethodType), parse_method=None) -> None:
         self.fn = fn
@@ -350,17 +350,8 @@ class Parser:
         logger.debug("fn = %r", self.fn)
         tree = None
         if isinstance(self.fn, (types.FunctionType, types.MethodType)):
-            lines, self.line_offset = inspect.getsourcelines(self.fn)
-            original_src = ''.join(lines)
-            hexstr = hashlib.sha256(original_src.encode()).hexdigest()
-            tree = Parser.ast_cache.get(hexstr)
-            if not tree:
-                src = dedent(original_src)
-                self.col_offset = \
-                    len(original_src.split('\n')[0]) - len(src.split('\n')[0])
-                logger.debug("get source = %s", src)
-                tree = asttokens.ASTTokens(src, parse=True).tree
-                Parser.ast_cache[hexstr] = tree
+            entry = Parser.ast_cache.get(self.fn, get_compile_cache("ast"))
+            tree, self.line_offset, self.col_offset = entry.tree, entry.line_offset, entry.col_offset
         else:
             logger.error("Fn type is invalid")
         return tree
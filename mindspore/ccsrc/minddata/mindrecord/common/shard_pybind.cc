@@ -78,6 +78,25 @@ void BindShardWriter(py::module *m) {
     .def("write_raw_data", (MSRStatus(ShardWriter::*)(std::map<uint64_t, std::vector<py::handle>> &,
                                                       vector<vector<uint8_t>> &, bool, bool)) &
                              ShardWriter::WriteRawData)
+    .def("write_packed_raw_data",
+         [](ShardWriter &writer, std::map<uint64_t, std::vector<py::handle>> &raw_data, const py::buffer &blob_buffer,
+            const std::vector<uint64_t> &blob_offsets, bool sign, bool parallel_writer) {
+           // the blobs of the rows are packed in one buffer, the blob of row i is [offsets[i], offsets[i + 1])
+           py::buffer_info info = blob_buffer.request();
+           auto buffer_size = static_cast<uint64_t>(info.size * info.itemsize);
+           auto buffer_data = static_cast<const uint8_t *>(info.ptr);
+           vector<vector<uint8_t>> blob_data;
+           blob_data.reserve(blob_offsets.empty() ? 0 : blob_offsets.size() - 1);
+           for (size_t i = 1; i < blob_offsets.size(); ++i) {
+             if (blob_offsets[i - 1] > blob_offsets[i] || blob_offsets[i] > buffer_size) {
+               MS_LOG(ERROR) << "Invalid blob offset " << blob_offsets[i] << ", the size of blob buffer is "
+                             << buffer_size << ".";
+               return FAILED;
+             }
+             blob_data.emplace_back(buffer_data + blob_offsets[i - 1], buffer_data + blob_offsets[i]);
+           }
+           return writer.WriteRawData(raw_data, blob_data, sign, parallel_writer);
+         })
     .def("commit", &ShardWriter::Commit);
 }
 
@@ -135,6 +154,9 @@ void BindGlobalParams(py::module *m) {
   (*m).attr("MAX_SHARD_COUNT") = kMaxShardCount;
   (*m).attr("MIN_CONSUMER_COUNT") = kMinConsumerCount;
   (void)(*m).def("get_max_thread_num", &GetMaxThreadNum);
+  (void)(*m).def("from_msgpack", [](const py::bytes &raw_data) {
+    return nlohmann::detail::FromJsonImpl(json::from_msgpack(std::string(raw_data)));
+  });
 }
 
 PYBIND11_MODULE(_c_mindrecord, m) {
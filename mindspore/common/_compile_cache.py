@@ -0,0 +1,412 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Persistent cache of the compile artifacts of the graphs."""
+import hashlib
+import inspect
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from mindspore import context
+from mindspore import log as logger
+
+# the directory where the TBE kernels are compiled and looked up, relative to the working directory
+KERNEL_META_DIR = "./kernel_meta"
+_STRATEGY_FILE = "strategy.ckpt"
+_KERNEL_DIR = "kernel_meta"
+
+# the attributes of a cell which change between processes or runs without changing the graph
+_VOLATILE_CELL_ATTRS = ("_create_time", "_params", "_cells", "_phase", "phase_prefix", "_is_run",
+                        "_construct_inputs_num", "_construct_inputs_names")
+_source_cache = {}
+
+
+def _source_of(item):
+    """Gets the source of a class or function, the qualified name if there is no source."""
+    if item not in _source_cache:
+        try:
+            _source_cache[item] = inspect.getsource(item)
+        except (OSError, TypeError):
+            _source_cache[item] = item.__module__ + "." + item.__qualname__
+    return _source_cache[item]
+
+
+def _describe_value(value):
+    """Describes a value which can change the compiled graph, returns None for the ones not described."""
+    from mindspore.ops.primitive import Primitive
+    from mindspore.common.tensor import Tensor
+    if isinstance(value, Primitive):
+        return "{}{}".format(value.name, sorted((k, repr(v)) for k, v in value.attrs.items()))
+    if isinstance(value, Tensor):
+        return "Tensor{}{}".format(value.shape, value.dtype)
+    if isinstance(value, (bool, int, float, str, type(None))):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        items = [_describe_value(item) for item in value]
+        if None not in items:
+            return "({})".format(",".join(items))
+    return None
+
+
+def _describe_cell(cell):
+    """Describes the source and the attributes of a cell."""
+    from mindspore.nn import Cell
+    sources = [_source_of(cls) for cls in type(cell).__mro__ if issubclass(cls, Cell) and cls is not Cell]
+    attrs = []
+    for name, value in sorted(cell.__dict__.items()):
+        if name in _VOLATILE_CELL_ATTRS:
+            continue
+        description = _describe_value(value)
+        if description is not None:
+            attrs.append("{}={}".format(name, description))
+    return sources + attrs
+
+
+def compile_key(obj, args_list, phase):
+    """
+    Gets the key of the compile artifacts of a graph.
+
+    The key is a hash of the source and the attributes of the cells, the parameters, the input signatures, the phase,
+    the context and the version, so it does not depend on the process like the phase of `_Executor`.
+
+    Args:
+        obj (Union[Cell, Function]): The cell or the function compiled.
+        args_list (tuple): The inputs of the graph.
+        phase (str): The compile phase, without the create time of the cell.
+
+    Returns:
+        str, the hex digest of the key.
+    """
+    from mindspore.nn import Cell
+    from mindspore.parallel._auto_parallel_context import auto_parallel_context
+    try:
+        from mindspore.version import __version__ as version
+    except ImportError:
+        version = ""
+
+    parts = [version, phase]
+    if isinstance(obj, Cell):
+        for name, cell in obj.cells_and_names():
+            parts.append(name)
+            parts.extend(_describe_cell(cell))
+        for name, param in obj.parameters_dict().items():
+            parts.append("{}:{}:{}".format(name, param.data.shape, param.data.dtype))
+    else:
+        parts.append(_source_of(obj))
+    for arg in args_list:
+        description = _describe_value(arg)
+        parts.append(description if description is not None else type(arg).__name__)
+    for key in ("mode", "device_target", "enable_graph_kernel", "enable_auto_mixed_precision", "enable_sparse"):
+        parts.append("{}={}".format(key, context.get_context(key)))
+    parallel_context = auto_parallel_context()
+    parts.append("{}:{}:{}:{}".format(parallel_context.get_parallel_mode(), parallel_context.get_device_num(),
+                                      parallel_context.get_global_rank(), parallel_context.get_full_batch()))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _dir_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            size += os.path.getsize(os.path.join(root, file_name))
+    return size
+
+
+def _list_files(path):
+    if not os.path.isdir(path):
+        return set()
+    return set(os.listdir(path))
+
+
+class _SizeBudget:
+    """
+    The size of the entries of the caches in a directory, shared by the caches of the process stored there.
+
+    The size is counted as the entries are stored and only measured again on the directory, with the entries
+    stored by the other processes, when it goes over `max_size`, so storing many entries does not scan the
+    directory each time.
+
+    Args:
+        path (str): The directory of the entries.
+        max_size (int): The max size of the entries in bytes.
+        nested (bool): Whether the entries are in sub directories of `path`, one for each cache.
+    """
+    def __init__(self, path, max_size, nested):
+        self.path = path
+        self.max_size = max_size
+        self.nested = nested
+        self._lock = threading.Lock()
+        # the size of the entries, None until the directory is scanned
+        self._size = None
+
+    def add(self, size):
+        """Counts the size of a stored entry, returns whether the directory must be scanned."""
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            return self._size is None or self._size > self.max_size
+
+    def _entry_dirs(self):
+        if not self.nested:
+            return [self.path]
+        return [os.path.join(self.path, name) for name in _list_files(self.path)
+                if not name.startswith(".tmp_") and os.path.isdir(os.path.join(self.path, name))]
+
+    def evict(self):
+        """Measures the entries and removes the least recently used ones until they fit, returns their number."""
+        entries = []
+        for entry_dir in self._entry_dirs():
+            for name in _list_files(entry_dir):
+                entry = os.path.join(entry_dir, name)
+                if name.startswith(".tmp_") or not os.path.isdir(entry):
+                    continue
+                try:
+                    entries.append((os.path.getmtime(entry), _dir_size(entry), entry))
+                except OSError:
+                    continue
+        total_size = sum(size for _, size, _ in entries)
+        num = 0
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+            num += 1
+        with self._lock:
+            self._size = total_size
+        return num
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+def _get_budget(path, max_size, nested):
+    """Gets the size budget of a directory, shared by the caches stored there."""
+    with _budgets_lock:
+        budget = _budgets.get(path)
+        if budget is None or budget.nested != nested:
+            budget = _SizeBudget(path, max_size, nested)
+            _budgets[path] = budget
+        return budget
+
+
+class CompileCache:
+    """
+    Cache of the compile artifacts of the graphs in a directory, shared by the processes.
+
+    The graphs compiled by the backend can not be loaded back, so the cache keeps the artifacts which the compiler
+    already reuses when they are present: the TBE kernels built for the graph, which are looked up in
+    `KERNEL_META_DIR`, and in auto parallel mode the searched strategy, given as strategy checkpoint to load.
+    Each graph has an entry directory named by its `compile_key`. The least recently used entries are removed
+    when the size of the cache is larger than `max_size`. If `root` is set, `max_size` bounds all the caches in
+    the sub directories of `root` together and the least recently used entries of any of them are removed.
+
+    Args:
+        path (str): The directory of the cache.
+        max_size (int): The max size of the cache in bytes.
+        root (str): The directory of the caches sharing `max_size`, each one in a sub directory, `path` being one
+            of them. Default: None, `max_size` only bounds this cache.
+    """
+    def __init__(self, path, max_size, root=None):
+        self.path = os.path.realpath(path)
+        os.makedirs(self.path, exist_ok=True)
+        if root is None:
+            self._budget = _get_budget(self.path, max_size, False)
+        else:
+            self._budget = _get_budget(os.path.realpath(root), max_size, True)
+        self._budget.max_size = max_size
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "restored_files": 0, "stored_files": 0}
+
+    @property
+    def max_size(self):
+        """The max size in bytes of the cache, or of all the caches sharing it."""
+        return self._budget.max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        self._budget.max_size = max_size
+
+    @property
+    def stats(self):
+        """Counters of the cache."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name, num=1):
+        with self._lock:
+            self._stats[name] += num
+
+    def lookup(self, key):
+        """Gets the entry directory of a key and marks it as used, None if it is not cached."""
+        entry = os.path.join(self.path, key)
+        if not os.path.isdir(entry):
+            self._count("misses")
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            return None
+        self._count("hits")
+        return entry
+
+    def store(self, key, kernel_files=(), strategy_file=None):
+        """
+        Stores the artifacts of a graph.
+
+        Args:
+            key (str): The key of the graph.
+            kernel_files (Iterable): The paths of the kernel files built for the graph.
+            strategy_file (str): The path of the strategy checkpoint of the graph. Default: None.
+        """
+        tmp_entry = os.path.join(self.path, ".tmp_{}_{}".format(key, uuid.uuid4().hex))
+        os.makedirs(os.path.join(tmp_entry, _KERNEL_DIR))
+        num = 0
+        size = 0
+        for kernel_file in kernel_files:
+            if os.path.isfile(kernel_file):
+                shutil.copyfile(kernel_file, os.path.join(tmp_entry, _KERNEL_DIR, os.path.basename(kernel_file)))
+                num += 1
+                size += os.path.getsize(kernel_file)
+        if strategy_file is not None and os.path.isfile(strategy_file):
+            shutil.copyfile(strategy_file, os.path.join(tmp_entry, _STRATEGY_FILE))
+            size += os.path.getsize(strategy_file)
+        self._commit(key, tmp_entry, num, size)
+
+    def store_contents(self, key, contents):
+        """
+        Stores an entry made of small files written from memory.
+
+        Args:
+            key (str): The key of the entry.
+            contents (dict): The bytes of the files of the entry, by file name.
+        """
+        tmp_entry = os.path.join(self.path, ".tmp_{}_{}".format(key, uuid.uuid4().hex))
+        os.makedirs(tmp_entry)
+        for file_name, data in contents.items():
+            with open(os.path.join(tmp_entry, file_name), "wb") as f:
+                f.write(data)
+        self._commit(key, tmp_entry, len(contents), sum(len(data) for data in contents.values()))
+
+    def _commit(self, key, tmp_entry, num, size):
+        """Renames a filled temporary entry to the entry of a key and counts its size."""
+        try:
+            os.rename(tmp_entry, os.path.join(self.path, key))
+        except OSError:
+            # stored by another process meanwhile
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+        self._count("stored_files", num)
+        if self._budget.add(size):
+            self._count("evictions", self._budget.evict())
+
+    def restore_kernels(self, entry, kernel_meta_dir=KERNEL_META_DIR):
+        """Copies the kernels of an entry missing in `kernel_meta_dir`, returns the number of files copied."""
+        kernel_dir = os.path.join(entry, _KERNEL_DIR)
+        existing = _list_files(kernel_meta_dir)
+        num = 0
+        for file_name in _list_files(kernel_dir):
+            if file_name not in existing:
+                os.makedirs(kernel_meta_dir, exist_ok=True)
+                shutil.copyfile(os.path.join(kernel_dir, file_name), os.path.join(kernel_meta_dir, file_name))
+                num += 1
+        self._count("restored_files", num)
+        return num
+
+    def compile(self, obj, args_list, phase, compile_fn):
+        """
+        Compiles a graph with `compile_fn`, reusing and storing the artifacts of the graph.
+
+        Args:
+            obj (Union[Cell, Function]): The cell or the function compiled.
+            args_list (tuple): The inputs of the graph.
+            phase (str): The compile phase, without the create time of the cell.
+            compile_fn (Function): Compiles the graph, returns whether it succeeded.
+
+        Returns:
+            The result of `compile_fn`.
+        """
+        from mindspore.parallel._auto_parallel_context import auto_parallel_context
+        key = compile_key(obj, args_list, phase)
+        entry = self.lookup(key)
+        parallel_context = auto_parallel_context()
+        # the strategy is only cached when the user does not load or save it
+        cache_strategy = parallel_context.get_parallel_mode() == "auto_parallel" and \
+            not parallel_context.get_strategy_ckpt_load_file() and not parallel_context.get_strategy_ckpt_save_file()
+
+        if entry is not None:
+            num = self.restore_kernels(entry)
+            logger.info("Compile cache hit for phase %s, %d kernels restored.", phase, num)
+            strategy_file = os.path.join(entry, _STRATEGY_FILE)
+            if not cache_strategy or not os.path.isfile(strategy_file):
+                return compile_fn()
+            parallel_context.set_strategy_ckpt_load_file(strategy_file)
+            try:
+                return compile_fn()
+            finally:
+                parallel_context.set_strategy_ckpt_load_file("")
+
+        kernels_before = _list_files(KERNEL_META_DIR)
+        strategy_file = None
+        if cache_strategy:
+            strategy_file = os.path.join(self.path, ".tmp_strategy_{}_{}".format(key, uuid.uuid4().hex))
+            parallel_context.set_strategy_ckpt_save_file(strategy_file)
+        start_time = time.time()
+        try:
+            result = compile_fn()
+        finally:
+            if cache_strategy:
+                parallel_context.set_strategy_ckpt_save_file("")
+        try:
+            if result:
+                kernel_files = [os.path.join(KERNEL_META_DIR, file_name)
+                                for file_name in sorted(_list_files(KERNEL_META_DIR) - kernels_before)]
+                self.store(key, kernel_files, strategy_file)
+                logger.info("Compile cache miss for phase %s, compiled in %.2fs, %d kernels stored.", phase,
+                            time.time() - start_time, len(kernel_files))
+        except OSError as e:
+            logger.warning("Failed to store the compile cache of phase %s: %s.", phase, e)
+        finally:
+            if strategy_file is not None and os.path.isfile(strategy_file):
+                os.remove(strategy_file)
+        return result
+
+
+_compile_caches = {}
+
+
+def get_compile_cache(name="graph"):
+    """
+    Gets a compile cache in the directory configured in the context, None if it is disabled.
+
+    The caches of all the kinds share the `compile_cache_max_size` of the context.
+
+    Args:
+        name (str): The kind of artifacts, each kind has its cache in a sub directory. Default: "graph".
+    """
+    root = context.get_context("compile_cache_path")
+    if not root:
+        return None
+    path = os.path.realpath(os.path.join(root, name))
+    max_size = int(float(context.get_context("compile_cache_max_size")[:-2]) * 1024 * 1024 * 1024)
+    cache = _compile_caches.get(path)
+    if cache is None:
+        cache = CompileCache(path, max_size, root)
+        _compile_caches[path] = cache
+    cache.max_size = max_size
+    return cache
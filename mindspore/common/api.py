@@ -23,6 +23,7 @@ from mindspore import log as logger
 from .._c_expression import generate_key, Executor_, Tensor, MetaTensor, PynativeExecutor_
 from .._c_expression import verify_inputs_signature, init_exec_dataset, _set_dataset_mode_config, init_backend
 from .tensor import Tensor as MsTensor
+from ._compile_cache import get_compile_cache
 
 # store ms_function class compiled pipeline cache
 ms_compile_cache = {}
@@ -167,11 +168,14 @@ class _MindSporeFunction:
         key = generate_key(generate_name, dic)
         phase = str(key[1]) + generate_name
         if key not in ms_compile_cache.keys():
-            is_compile = False
-            if self.obj is None:
-                is_compile = self._executor.compile(self.fn, args_list, phase, True)
+            obj = self.fn if self.obj is None else self.obj
+            compile_cache = get_compile_cache()
+            if compile_cache is not None:
+                cache_phase = self.fn.__module__ + "." + self.fn.__qualname__
+                is_compile = compile_cache.compile(obj, args_list, cache_phase,
+                                                   lambda: self._executor.compile(obj, args_list, phase, True))
             else:
-                is_compile = self._executor.compile(self.obj, args_list, phase, True)
+                is_compile = self._executor.compile(obj, args_list, phase, True)
             if not is_compile:
                 raise RuntimeError("Executor compile failed.")
             if context.get_context("enable_ge"):
@@ -401,6 +405,7 @@ class _Executor:
         dic = dict(zip(args_names, args_list))
         key = generate_key(phase, dic)
         self.phase_prefix = str(key[1])
+        cache_phase = phase
         if phase == 'export':
             phase = phase + '.' + self.phase_prefix + '.' + str(obj.create_time)
         else:
@@ -416,7 +421,12 @@ class _Executor:
             logger.debug("%r graph has existed.", phase)
             return phase, False
 
-        result = self._executor.compile(obj, args_list, phase, use_vm)
+        compile_cache = get_compile_cache()
+        if compile_cache is not None:
+            result = compile_cache.compile(obj, args_list, cache_phase,
+                                           lambda: self._executor.compile(obj, args_list, phase, use_vm))
+        else:
+            result = self._executor.compile(obj, args_list, phase, use_vm)
         self.compile_cache[phase] = phase
         if not result:
             raise RuntimeError("Executor compile failed.")
@@ -143,6 +143,8 @@ class _Context:
         self._thread_local_info = _ThreadLocalInfo()
         self._context_switches = _ContextSwitchInfo(True)
         self._context_handle = MSContext.get_instance()
+        self._compile_cache_path = ""
+        self._compile_cache_max_size = "2GB"
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -407,6 +409,26 @@ class _Context:
     def enable_sparse(self, enable_sparse):
         self._context_handle.set_enable_sparse(enable_sparse)
 
+    @property
+    def compile_cache_path(self):
+        return self._compile_cache_path
+
+    @compile_cache_path.setter
+    def compile_cache_path(self, compile_cache_path):
+        if compile_cache_path:
+            compile_cache_path = _make_directory(compile_cache_path)
+        self._compile_cache_path = compile_cache_path
+
+    @property
+    def compile_cache_max_size(self):
+        return self._compile_cache_max_size
+
+    @compile_cache_max_size.setter
+    def compile_cache_max_size(self, compile_cache_max_size):
+        if not check_input_format(compile_cache_max_size):
+            raise ValueError("Context param compile_cache_max_size should be in correct format! Such as \"2GB\"")
+        self._compile_cache_max_size = compile_cache_max_size
+
 def check_input_format(x):
     import re
     pattern = r'[1-9][0-9]*(\.)?[0-9]*GB|0\.[0-9]*GB'
@@ -545,7 +567,7 @@ def reset_auto_parallel_context():
                  save_dump_path=str, enable_reduce_precision=bool, variable_memory_max_size=str,
                  enable_profiling=bool, profiling_options=str, enable_auto_mixed_precision=bool,
                  enable_graph_kernel=bool, check_bprop=bool, max_device_memory=str, print_file_path=str,
-                 enable_sparse=bool)
+                 enable_sparse=bool, compile_cache_path=str, compile_cache_max_size=str)
 def set_context(**kwargs):
     """
     Sets context for running environment.
@@ -604,6 +626,13 @@ def set_context(**kwargs):
             a file by default, and turn off printing to the screen. If the file already exists, add a timestamp
             suffix to the file.
         enable_sparse (bool): Whether to enable sparsity feature. Default: False.
+        compile_cache_path (str): The directory of the persistent compile cache, shared by the processes. The TBE
+            kernels built for a graph and its searched strategy in auto parallel mode are stored there and reused
+            when the same network is compiled again with the same inputs, context and version, as well as each
+            TBE kernel by its description. An empty string disables the cache. Default: "".
+        compile_cache_max_size (str): The max size of the whole compile cache, the graphs, the kernels and the
+            parsed sources together, the least recently used ones are removed beyond it. The format is "xxGB".
+            Default: "2GB".
 
     Raises:
         ValueError: If input key is not an attribute in context.
@@ -625,6 +654,7 @@ def set_context(**kwargs):
         >>> context.set_context(enable_profiling=True, profiling_options="training_trace")
         >>> context.set_context(max_device_memory="3.5GB")
         >>> context.set_context(print_file_path="print.pb")
+        >>> context.set_context(compile_cache_path="./compile_cache", compile_cache_max_size="4GB")
     """
     for key, value in kwargs.items():
         if not hasattr(_context(), key):
@@ -18,13 +18,19 @@ MNIST, Cifar10/100, Manifest, MindRecord, etc. This module could load data in
 high performance and parse data precisely. It also provides the following
 operations for users to preprocess data: shuffle, batch, repeat, map, and zip.
 """
+import atexit
+import collections
 import glob
 import json
 import math
 import os
+import time
 import uuid
+import weakref
 import multiprocessing
 import queue
+import traceback
+from concurrent.futures import Future
 from enum import Enum
 from importlib import import_module
 import threading
@@ -433,6 +439,8 @@ class Dataset:
                 parallel (default=None, the value from the config will be used).
             python_multiprocessing (bool, optional): Parallelize python operations with multiple worker process. This
                 option could be beneficial if the python operation is computational heavy (default=False).
+                The rows are sent to the worker processes in chunks, and the worker processes are kept alive
+                for all the iterators using the same operations, see `get_python_multiprocessing_stats`.
             cache (DatasetCache, optional): Tensor cache to use. (default=None which means no cache is used)
 
         Returns:
@@ -1836,26 +1844,238 @@ class ShuffleDataset(DatasetOp):
         return True
 
 
-# Pyfunc collection for multiprocess pyfunc
-# This global variable will only be used within subprocesses
-_GLOBAL_PYFUNC_LIST = []
+# Pyfunc worker process loop
+# The python callables are inherited from the master process when the worker is forked, since python
+# multiprocessing library forbid sending lambda function through pipe. A task is a chunk of calls, the results
+# are written into the shared memory slot of the chunk, and pickled only when they do not fit it.
+def _pyfunc_worker_loop(pyfunc_list, task_queue, result_queue, row_buffer):
+    """
+    Multiprocessing pyfunc worker process loop.
+    """
+    while True:
+        try:
+            task = task_queue.get()
+        except KeyboardInterrupt:
+            raise Exception("Multiprocess MapOp worker receives KeyboardInterrupt")
+        if task is None:
+            return
+        slot, calls = task
+        results, errors, costs = [], [], []
+        for idx, args in calls:
+            start_time = time.time()
+            try:
+                result = pyfunc_list[idx](*args)
+                error = None
+            except KeyboardInterrupt:
+                raise Exception("Multiprocess MapOp worker receives KeyboardInterrupt")
+            except Exception:  # pylint: disable=broad-except
+                # The error is raised by the master process in the calling thread
+                result, error = None, traceback.format_exc()
+            costs.append(time.time() - start_time)
+            results.append(result)
+            errors.append(error)
+
+        arrays, layout = [], []
+        for result in results:
+            row = result if isinstance(result, tuple) else (result,)
+            if not all(isinstance(x, np.ndarray) for x in row):
+                arrays = None
+                break
+            layout.append((isinstance(result, tuple), len(row)))
+            arrays.extend(row)
+        meta = row_buffer.write(slot, arrays) if arrays is not None else None
+        if meta is not None:
+            result_queue.put((slot, (layout, meta), None, errors, costs))
+        else:
+            result_queue.put((slot, None, results, errors, costs))
+        del task, calls, results
+
+
+class _PyFuncWorkerPool:
+    """
+    Worker processes executing the python callables of a MapDataset.
+
+    The calls made concurrently by the MapOp threads are queued, and sent to the worker processes in chunks of up
+    to `CHUNK_SIZE` calls per message, a chunk being sent as soon as a worker may take it. The results of a chunk are
+    returned through its slot of shared memory. The pool lives as long as one of the MapDatasets of the callables,
+    so the iterators built on the same callables reuse the same worker processes.
+
+    Args:
+        pyfunc_list (list): The python callables.
+        num_workers (int): Number of worker processes.
+    """
+    # the largest number of calls sent in one message
+    CHUNK_SIZE = 16
+    # size in MB of the shared memory returning the results of a chunk
+    MAX_CHUNK_SIZE_MB = 16
+
+    def __init__(self, pyfunc_list, num_workers):
+        self.pyfunc_list = pyfunc_list
+        num_slots = num_workers * 2
+        self._row_buffer = _SharedRowBuffer(num_slots, self.MAX_CHUNK_SIZE_MB * 1024 * 1024)
+        self._task_queue = multiprocessing.Queue()
+        self._result_queue = multiprocessing.Queue()
+        self._workers = []
+        for _ in range(num_workers):
+            worker = multiprocessing.Process(target=_pyfunc_worker_loop,
+                                             args=(pyfunc_list, self._task_queue, self._result_queue,
+                                                   self._row_buffer))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+        self._cond = threading.Condition()
+        self._pending = collections.deque()
+        self._free_slots = list(range(num_slots))
+        self._in_flight = {}
+        self._closed = False
+        self._stats = {"calls": [0] * len(pyfunc_list), "cost": [0.0] * len(pyfunc_list), "chunks": 0,
+                       "max_pending": 0, "max_in_flight": 0}
+        self._threads = [threading.Thread(target=self._dispatch), threading.Thread(target=self._collect)]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def execute(self, idx, args):
+        """
+        Execute a python callable in the worker processes, block until its result is received.
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise Exception("Multiprocess MapOp worker pool has been terminated")
+            self._pending.append((idx, args, future))
+            self._stats["max_pending"] = max(self._stats["max_pending"], len(self._pending))
+            self._cond.notify_all()
+        return future.result()
+
+    def _dispatch(self):
+        """Thread sending the queued calls to the worker processes."""
+        while True:
+            with self._cond:
+                while not self._closed and not (self._pending and self._free_slots):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                slot = self._free_slots.pop()
+                chunk = [self._pending.popleft() for _ in range(min(self.CHUNK_SIZE, len(self._pending)))]
+                self._in_flight[slot] = chunk
+                self._stats["chunks"] += 1
+                self._stats["max_in_flight"] = max(self._stats["max_in_flight"], len(self._in_flight))
+            self._task_queue.put((slot, [(idx, args) for idx, args, _ in chunk]))
+
+    def _collect(self):
+        """Thread receiving the results of the worker processes."""
+        while True:
+            item = self._result_queue.get()
+            if item is None:
+                return
+            slot, shared, results, errors, costs = item
+            if shared is not None:
+                # copy the results out of the shared memory, so the slot can be reused right away
+                layout, meta = shared
+                arrays = [np.array(x) for x in self._row_buffer.read(slot, meta)]
+                results, start = [], 0
+                for is_tuple, size in layout:
+                    row = tuple(arrays[start:start + size])
+                    results.append(row if is_tuple else row[0])
+                    start += size
+            with self._cond:
+                chunk = self._in_flight.pop(slot)
+                self._free_slots.append(slot)
+                for (idx, _, _), cost in zip(chunk, costs):
+                    self._stats["calls"][idx] += 1
+                    self._stats["cost"][idx] += cost
+                self._cond.notify_all()
+            for (_, _, future), result, error in zip(chunk, results, errors):
+                if error is not None:
+                    future.set_exception(Exception("Multiprocess MapOp worker fails:\n" + error))
+                else:
+                    future.set_result(result)
+
+    def get_stats(self):
+        """
+        Get the counters of the pool.
 
+        Returns:
+            dict, the number of calls, total and average seconds spent in each python callable, the number of chunks
+            sent, the largest number of calls waiting to be sent and of chunks being executed.
+        """
+        with self._cond:
+            operations = []
+            for pyfunc, calls, cost in zip(self.pyfunc_list, self._stats["calls"], self._stats["cost"]):
+                operations.append({"name": getattr(pyfunc, "__name__", type(pyfunc).__name__), "calls": calls,
+                                   "total_time": cost, "average_time": cost / calls if calls else 0.0})
+            return {"operations": operations, "chunks": self._stats["chunks"],
+                    "pending": len(self._pending), "max_pending": self._stats["max_pending"],
+                    "in_flight": len(self._in_flight), "max_in_flight": self._stats["max_in_flight"]}
+
+    def terminate(self):
+        """Stop the worker processes, the calls still waiting fail."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._pending) + [call for chunk in self._in_flight.values() for call in chunk]
+            self._pending.clear()
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.terminate()
+            worker.join()
+        self._result_queue.put(None)
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(Exception("Multiprocess MapOp worker pool has been terminated"))
+
+
+# Worker pools of the python callables of MapDataset, indexed by the ids of the callables and the number of workers,
+# and the number of MapDatasets using each key. The users hold the callables, so their ids cannot be reused while
+# a pool lives, and the pool is terminated when its last user is collected.
+_PYFUNC_WORKER_POOLS = {}
+_PYFUNC_WORKER_POOL_USERS = collections.Counter()
+_PYFUNC_WORKER_POOLS_LOCK = threading.Lock()
+
+
+def _pyfunc_worker_pool_key(pyfunc_list, num_workers):
+    return tuple(id(pyfunc) for pyfunc in pyfunc_list), num_workers
+
+
+def _acquire_pyfunc_worker_pool(key):
+    """Add a user of the worker pool of a key, the pool itself is created by the first iterator."""
+    with _PYFUNC_WORKER_POOLS_LOCK:
+        _PYFUNC_WORKER_POOL_USERS[key] += 1
+
+
+def _release_pyfunc_worker_pool(key):
+    """Remove a user of the worker pool of a key, the pool is terminated when it has no user left."""
+    with _PYFUNC_WORKER_POOLS_LOCK:
+        _PYFUNC_WORKER_POOL_USERS[key] -= 1
+        if _PYFUNC_WORKER_POOL_USERS[key] > 0:
+            return
+        del _PYFUNC_WORKER_POOL_USERS[key]
+        pool = _PYFUNC_WORKER_POOLS.pop(key, None)
+    if pool is not None:
+        pool.terminate()
 
-# Pyfunc worker init function
-# Python multiprocessing library forbid sending lambda function through pipe.
-# This init function allow us to add all python function to a global collection and then fork afterwards.
-def _pyfunc_worker_init(pyfunc_list):
-    global _GLOBAL_PYFUNC_LIST
-    _GLOBAL_PYFUNC_LIST = pyfunc_list
+
+def _get_pyfunc_worker_pool(pyfunc_list, key, create=True):
+    """
+    Get the worker pool of the python callables, it is created if `create` is True and it does not exist yet.
+    """
+    with _PYFUNC_WORKER_POOLS_LOCK:
+        pool = _PYFUNC_WORKER_POOLS.get(key)
+        if pool is None and create:
+            pool = _PyFuncWorkerPool(pyfunc_list, key[1])
+            _PYFUNC_WORKER_POOLS[key] = pool
+        return pool
 
 
-# Pyfunc worker execution function
-# All exceptions will be raised to main processes
-def _pyfunc_worker_exec(index, *args):
-    try:
-        return _GLOBAL_PYFUNC_LIST[index](*args)
-    except KeyboardInterrupt:
-        raise Exception("Multiprocess MapOp worker receives KeyboardInterrupt")
+@atexit.register
+def _terminate_pyfunc_worker_pools():
+    with _PYFUNC_WORKER_POOLS_LOCK:
+        for pool in _PYFUNC_WORKER_POOLS.values():
+            pool.terminate()
+        _PYFUNC_WORKER_POOLS.clear()
 
 
 # PythonCallable wrapper for multiprocess pyfunc
@@ -1864,23 +2084,26 @@ class _PythonCallable:
     Internal python function wrapper for multiprocessing pyfunc.
     """
 
-    def __init__(self, py_callable, idx, pool=None):
+    def __init__(self, py_callable, idx, pool=None, release=None):
         # Original python callable from user.
         self.py_callable = py_callable
-        # Process pool created for current iterator.
+        # Worker pool shared by the iterators of the callables.
         self.pool = pool
-        # Python callable index for subprocess _GLOBAL_PYFUNC_LIST
+        # Python callable index for the pool
         self.idx = idx
+        # Releases the dataset's use of the pool, only the last user terminates it
+        self.release = release
 
     def __call__(self, *args):
         if self.pool is not None:
             try:
-                # This call will send the tensors along with Python callable index to the process pool.
+                # This call will send the tensors along with Python callable index to the worker pool.
                 # Block, yield GIL. Current thread will reacquire GIL once result is returned.
-                return self.pool.apply(_pyfunc_worker_exec, [self.idx, *args])
+                return self.pool.execute(self.idx, args)
             except KeyboardInterrupt:
-                self.pool.terminate()
-                self.pool.join()
+                # The pool may be used by other datasets
+                if self.release is not None:
+                    self.release()
                 raise Exception("Multiprocess MapOp worker receives KeyboardInterrupt")
         # Invoke original python callable in master process in case the pool is gone.
         return self.py_callable(*args)
@@ -1938,6 +2161,20 @@ class MapDataset(DatasetOp):
         self._input_indexs = input_dataset.input_indexs
         self.python_multiprocessing = python_multiprocessing
         self.process_pool = None
+        self._pyfunc_pool_key = None
+        self._pyfunc_pool_release = None
+        if python_multiprocessing and self.operations:
+            callable_list = [op for op in self.operations if callable(op)]
+            if callable_list:
+                num_workers = self.num_parallel_workers or multiprocessing.cpu_count()
+                self._use_pyfunc_worker_pool(_pyfunc_worker_pool_key(callable_list, num_workers))
+
+    def _use_pyfunc_worker_pool(self, key):
+        """Count this dataset as a user of the worker pool of key until it is collected or released."""
+        self._pyfunc_pool_key = key
+        _acquire_pyfunc_worker_pool(key)
+        # calling the finalizer releases the pool early, it only runs once
+        self._pyfunc_pool_release = weakref.finalize(self, _release_pyfunc_worker_pool, key)
 
     def get_args(self):
         args = super().get_args()
@@ -1973,11 +2210,17 @@ class MapDataset(DatasetOp):
         new_op.python_multiprocessing = copy.deepcopy(self.python_multiprocessing, memodict)
         new_op.cache = copy.deepcopy(self.cache, memodict)
         new_op.operations = self.operations
+        new_op.process_pool = None
+        new_op._pyfunc_pool_key = None
+        new_op._pyfunc_pool_release = None
+        if self._pyfunc_pool_key is not None:
+            new_op._use_pyfunc_worker_pool(self._pyfunc_pool_key)
         return new_op
 
     # Iterator bootstrap will be called on iterator construction.
     # A deep copy of Dataset object is created prior of iterator_bootstrap.
-    # This method will create per iterator process pool and bind pyfunc execution to the pool.
+    # This method will bind pyfunc execution to the worker pool of the callables, which is created by the first
+    # iterator and kept alive for the following ones while the dataset lives.
     def iterator_bootstrap(self):
         """
         Per iterator bootstrap callback.
@@ -1991,27 +2234,47 @@ class MapDataset(DatasetOp):
                 if callable(op):
                     callable_list.append(op)
 
-            if callable_list:
-                # Construct pool with the callable list
-                # The callable list and _pyfunc_worker_init are used to pass lambda function in to subprocesses
-                self.process_pool = multiprocessing.Pool(processes=self.num_parallel_workers,
-                                                         initializer=_pyfunc_worker_init,
-                                                         initargs=(callable_list,))
+            if callable_list and self._pyfunc_pool_key is not None:
+                # Get the pool of the callable list, the worker processes are forked with the callables
+                self.process_pool = _get_pyfunc_worker_pool(callable_list, self._pyfunc_pool_key)
                 # Pass #2
                 idx = 0
                 for op in self.operations:
                     if callable(op):
                         # Wrap python callable into _PythonCallable
-                        iter_specific_operations.append(_PythonCallable(op, idx, self.process_pool))
+                        iter_specific_operations.append(_PythonCallable(op, idx, self.process_pool,
+                                                                        self._pyfunc_pool_release))
                         idx += 1
                     else:
                         # CPP ops remain the same
                         iter_specific_operations.append(op)
                 self.operations = iter_specific_operations
 
-    def __del__(self):
-        if hasattr(self, 'process_pool') and self.process_pool is not None:
-            self.process_pool.terminate()
+    def get_python_multiprocessing_stats(self):
+        """
+        Get the counters of the worker processes running the python operations with python_multiprocessing.
+
+        The counters cover all the iterators created on this dataset since its worker processes were started.
+
+        Returns:
+            dict, None if there is no worker process. It contains:
+
+            - operations: list of dict with the name of each python operation, its number of calls, and
+              the total and average seconds spent in it by the workers.
+            - chunks: number of chunks of rows sent to the workers.
+            - pending, max_pending: current and largest number of rows waiting for a worker.
+            - in_flight, max_in_flight: current and largest number of chunks being processed by the workers.
+
+        Examples:
+            >>> data = data.map(input_columns="image", operations=py_op, python_multiprocessing=True)
+            >>> for _ in data.create_dict_iterator():
+            >>>     pass
+            >>> print(data.get_python_multiprocessing_stats())
+        """
+        if self._pyfunc_pool_key is None:
+            return None
+        pool = _get_pyfunc_worker_pool(None, self._pyfunc_pool_key, create=False)
+        return pool.get_stats() if pool is not None else None
 
 
 class FilterDataset(DatasetOp):
@@ -2933,20 +3196,20 @@ def _cpp_sampler_fn(sampler, dataset):
         yield tuple([np.array(x, copy=False) for x in val])
 
 
-def _cpp_sampler_fn_mp(sampler, dataset, num_worker):
+def _cpp_sampler_fn_mp(sampler, dataset, worker_pool):
     """
     Multiprocessing generator function wrapper for mappable dataset with cpp sampler.
     """
     indices = sampler.get_indices()
-    return _sampler_fn_mp(indices, dataset, num_worker)
+    return worker_pool.fetch(indices)
 
 
-def _py_sampler_fn_mp(sampler, num_samples, dataset, num_worker):
+def _py_sampler_fn_mp(sampler, num_samples, worker_pool):
     """
     Multiprocessing generator function wrapper for mappable dataset with python sampler.
     """
     indices = _fetch_py_sampler_indices(sampler, num_samples)
-    return _sampler_fn_mp(indices, dataset, num_worker)
+    return worker_pool.fetch(indices)
 
 
 def _fetch_py_sampler_indices(sampler, num_samples):
@@ -2966,82 +3229,83 @@ def _fetch_py_sampler_indices(sampler, num_samples):
     return [i for i in sampler]
 
 
-def _fill_worker_indices(workers, indices, idx):
+class _SharedRowBuffer:
     """
-    Worker index queue filler, fill worker index queue in round robin order.
+    Fixed size slots in shared memory, the generator workers copy the rows they produce into them.
+
+    The buffer is allocated by the master process before the workers are started, so the workers inherit it.
     """
-    num_worker = len(workers)
-    while idx < len(indices):
-        try:
-            workers[idx % num_worker].put(indices[idx])
-            idx += 1
-        except queue.Full:
-            break
-    return idx
+    # alignment of the arrays inside a slot
+    ALIGNMENT = 64
 
+    def __init__(self, num_slots, slot_size):
+        self.slot_size = slot_size
+        self._shm = multiprocessing.RawArray('B', num_slots * slot_size)
+        self._buffer = None
 
-def _sampler_fn_mp(indices, dataset, num_worker):
-    """
-    Multiprocessing generator function wrapper master process.
-    """
-    workers = []
-    # Event for end of epoch
-    eoe = multiprocessing.Event()
-
-    # Create workers
-    for _ in range(num_worker):
-        worker = _GeneratorWorker(dataset, eoe)
-        worker.daemon = True
-        workers.append(worker)
-
-    # Fill initial index queues
-    idx_cursor = 0
-    idx_cursor = _fill_worker_indices(workers, indices, idx_cursor)
-
-    # Start all workers
-    for w in workers:
-        w.start()
-
-    # Fetch results
-    for i in range(len(indices)):
-        # Fetch result and put index
-        try:
-            result = workers[i % num_worker].get()
-        except queue.Empty:
-            raise Exception("Generator worker process timeout")
-        except KeyboardInterrupt:
-            for w in workers:
-                w.terminate()
-                w.join()
-            raise Exception("Generator worker receives KeyboardInterrupt")
-        if idx_cursor < len(indices):
-            idx_cursor = _fill_worker_indices(workers, indices, idx_cursor)
-        # Set eoe event once all indices are sent
-        if idx_cursor == len(indices) and not eoe.is_set():
-            eoe.set()
-        yield tuple([np.array(x, copy=False) for x in result])
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_buffer'] = None
+        return state
+
+    def _slot(self, slot):
+        if self._buffer is None:
+            self._buffer = np.frombuffer(self._shm, dtype=np.uint8)
+        return self._buffer[slot * self.slot_size:(slot + 1) * self.slot_size]
+
+    def write(self, slot, row):
+        """
+        Copy the arrays of a row into a slot.
+
+        Returns:
+            list, the (dtype, shape, offset) of each array, None if the row does not fit the slot.
+        """
+        arrays = [np.asarray(x) for x in row]
+        meta, offset = [], 0
+        for array in arrays:
+            if array.dtype.hasobject:
+                return None
+            offset = -(-offset // self.ALIGNMENT) * self.ALIGNMENT
+            meta.append((array.dtype.str, array.shape, offset))
+            offset += array.nbytes
+        if offset > self.slot_size:
+            return None
+        buffer = self._slot(slot)
+        for array, (dtype, shape, offset) in zip(arrays, meta):
+            np.copyto(np.ndarray(shape, dtype, buffer=buffer, offset=offset), array)
+        return meta
+
+    def read(self, slot, meta):
+        """
+        Wrap the arrays written into a slot, without copying them.
+        """
+        buffer = self._slot(slot)
+        return tuple([np.ndarray(shape, dtype, buffer=buffer, offset=offset) for dtype, shape, offset in meta])
 
 
-def _generator_worker_loop(dataset, idx_queue, result_queue, eoe):
+def _generator_worker_loop(dataset, idx_queue, result_queue, row_buffer):
     """
     Multiprocessing generator worker process loop.
     """
     while True:
-        # Fetch index, block
+        # Fetch task, block
         try:
-            idx = idx_queue.get()
+            task = idx_queue.get()
         except KeyboardInterrupt:
             raise Exception("Generator worker receives KeyboardInterrupt")
-        if idx is None:
-            # When the queue is out of scope from master process, a None item can be fetched from the queue.
-            # Upon receiving None, worker process should check if EOE is set.
-            assert eoe.is_set(), ""
+        if task is None:
             return
-        # Fetch data, any exception from __getitem__ will terminate worker and timeout master process
-        result = dataset[idx]
-        # Send data, block
+        epoch, seq, idx, slot = task
+        try:
+            result = dataset[idx]
+        except Exception:  # pylint: disable=broad-except
+            # The master process re-raises the error
+            result_queue.put((epoch, seq, slot, None, None, traceback.format_exc()))
+            continue
+        meta = row_buffer.write(slot, result) if row_buffer is not None else None
+        # Send the row itself when it does not fit the shared memory, block
         try:
-            result_queue.put(result)
+            result_queue.put((epoch, seq, slot, meta, None if meta is not None else result, None))
         except KeyboardInterrupt:
             raise Exception("Generator worker receives KeyboardInterrupt")
         del result, idx
@@ -3052,25 +3316,164 @@ class _GeneratorWorker(multiprocessing.Process):
     Worker process for multiprocess Generator.
     """
 
-    def __init__(self, dataset, eoe):
-        self.idx_queue = multiprocessing.Queue(16)
-        self.res_queue = multiprocessing.Queue(16)
-        super().__init__(target=_generator_worker_loop, args=(dataset, self.idx_queue, self.res_queue, eoe))
+    def __init__(self, dataset, idx_queue, res_queue, row_buffer):
+        super().__init__(target=_generator_worker_loop, args=(dataset, idx_queue, res_queue, row_buffer))
+        self.daemon = True
+
+    def __del__(self):
+        self.terminate()
+
+
+class _GeneratorWorkerGroup:
+    """
+    Worker processes of multiprocess Generator with their queues and shared memory slots, reused by the epochs.
+
+    The tasks are tagged with the epoch they belong to. When an epoch is given up before its end, the results of
+    its tasks still running are dropped as they come and their slots are given back then, since the workers may
+    still be writing into them.
+    """
+
+    def __init__(self, dataset, num_worker, num_slots, max_rowsize):
+        self.idx_queue = multiprocessing.Queue()
+        self.res_queue = multiprocessing.Queue()
+        self.row_buffer = None
+        if max_rowsize:
+            self.row_buffer = _SharedRowBuffer(num_slots, max_rowsize * 1024 * 1024)
+        self.free_slots = list(range(num_slots))
+        self.epoch = 0
+        self.workers = [_GeneratorWorker(dataset, self.idx_queue, self.res_queue, self.row_buffer)
+                        for _ in range(num_worker)]
+        for w in self.workers:
+            w.start()
 
-    def put(self, item):
+    def put(self, seq, idx):
         """
-        Put function for worker index queue. Never block. Raise queue.Full on failure.
+        Queue the index of a row of the current epoch in a free slot.
         """
-        self.idx_queue.put_nowait(item)
+        self.idx_queue.put((self.epoch, seq, idx, self.free_slots.pop()))
 
-    def get(self):
+    def get(self, timeout):
         """
-        Get function for worker result queue. Block with timeout.
+        Get the next result of the current epoch, block with timeout. Raise queue.Empty on timeout.
         """
-        return self.res_queue.get(timeout=5)
+        while True:
+            epoch, seq, slot, meta, result, error = self.res_queue.get(timeout=timeout)
+            if epoch == self.epoch:
+                return seq, slot, meta, result, error
+            self.free_slots.append(slot)
 
-    def __del__(self):
-        self.terminate()
+    def close(self):
+        """
+        Let the workers exit.
+        """
+        for _ in self.workers:
+            self.idx_queue.put(None)
+        for w in self.workers:
+            w.join()
+
+    def terminate(self):
+        """
+        Kill the workers, their tasks are lost.
+        """
+        for w in self.workers:
+            w.terminate()
+            w.join()
+
+
+def _close_generator_worker_groups(groups):
+    while groups:
+        groups.pop().close()
+
+
+class _GeneratorWorkerPool:
+    """
+    Master side of multiprocess Generator.
+
+    The workers take the indices from a shared queue, so a slow sample only holds back one worker, and the rows
+    are yielded in the order of the indices whatever the order they complete in. At most `prefetch_size` rows are
+    in flight, each one owns a slot of the shared memory in which its arrays are written by the worker, the master
+    wraps them without copying. The slot is given back once the next row is requested, so the arrays yielded are
+    only valid until then.
+
+    The worker processes and the shared memory are created by the first epoch and reused by the next ones, so
+    the workers keep the dataset as it was then. They are only created again after an epoch was interrupted by
+    a timeout, or for an epoch fetched while another one is still running.
+
+    Args:
+        dataset (Random Accessible): The python data source.
+        num_worker (int): Number of worker processes.
+        prefetch_size (int, optional): Number of rows in flight (default=None, twice the number of workers).
+        max_rowsize (int, optional): Size in MB of the shared memory of a row, 0 to send the rows through the
+            result queue. The rows larger than that are sent through the result queue (default=6).
+        timeout (int, optional): Seconds to wait for a row before raising an error (default=5).
+    """
+
+    def __init__(self, dataset, num_worker, prefetch_size=None, max_rowsize=6, timeout=5):
+        self.dataset = dataset
+        self.num_worker = num_worker
+        self.prefetch_size = prefetch_size if prefetch_size is not None else num_worker * 2
+        self.max_rowsize = max_rowsize
+        self.timeout = timeout
+        # the worker groups not used by an epoch, their workers exit with the pool
+        self._idle_groups = []
+        self._lock = threading.Lock()
+        # at exit the workers are killed as daemons, without waiting for their current rows
+        weakref.finalize(self, _close_generator_worker_groups, self._idle_groups).atexit = False
+
+    def _acquire_group(self):
+        with self._lock:
+            if self._idle_groups:
+                return self._idle_groups.pop()
+        return _GeneratorWorkerGroup(self.dataset, self.num_worker, self.prefetch_size, self.max_rowsize)
+
+    def _release_group(self, group):
+        with self._lock:
+            self._idle_groups.append(group)
+
+    def fetch(self, indices):
+        """
+        Generator of the rows of the given indices.
+        """
+        group = self._acquire_group()
+        group.epoch += 1
+        idx_cursor = 0
+        completed = {}
+        slot = None
+        try:
+            for seq in range(len(indices)):
+                while group.free_slots and idx_cursor < len(indices):
+                    group.put(idx_cursor, indices[idx_cursor])
+                    idx_cursor += 1
+                while seq not in completed:
+                    try:
+                        done_seq, done_slot, meta, result, error = group.get(self.timeout)
+                    except queue.Empty:
+                        # The workers may be stuck, they are not reused
+                        group.terminate()
+                        group = None
+                        raise Exception("Generator worker process timeout")
+                    completed[done_seq] = (done_slot, meta, result, error)
+                slot, meta, result, error = completed.pop(seq)
+                if error is not None:
+                    raise Exception("Generator worker fails to get item {}:\n{}".format(indices[seq], error))
+                if meta is not None:
+                    result = group.row_buffer.read(slot, meta)
+                yield tuple([np.array(x, copy=False) for x in result])
+                del result
+                group.free_slots.append(slot)
+                slot = None
+        except KeyboardInterrupt:
+            group.terminate()
+            group = None
+            raise Exception("Generator worker receives KeyboardInterrupt")
+        finally:
+            # The rows received but not yielded give back their slots now, the ones of the rows still running when
+            # they complete in a later epoch
+            if group is not None:
+                if slot is not None:
+                    group.free_slots.append(slot)
+                group.free_slots.extend(done_slot for done_slot, _, _, _ in completed.values())
+                self._release_group(group)
 
 
 class GeneratorDataset(MappableDataset):
@@ -3130,6 +3533,14 @@ class GeneratorDataset(MappableDataset):
             When this argument is specified, 'num_samples' will not effect. Random accessible input is required.
         shard_id (int, optional): The shard ID within num_shards (default=None). This argument should be specified only
             when num_shards is also specified. Random accessible input is required.
+        max_rowsize (int, optional): Size in MB of the shared memory holding a row produced by a subprocess
+            (default=6). Rows larger than that, and all rows if it is 0, are pickled through a queue instead.
+            Only used when num_parallel_workers is greater than 1 with a random accessible input.
+        prefetch_size (int, optional): Number of rows being fetched in advance by the subprocesses
+            (default=None, twice num_parallel_workers). It bounds the shared memory used to
+            prefetch_size * max_rowsize MB.
+        worker_timeout (int, optional): Seconds to wait for a row from the subprocesses before raising an error
+            (default=5).
 
     Examples:
         >>> import mindspore.dataset as ds
@@ -3166,7 +3577,8 @@ class GeneratorDataset(MappableDataset):
 
     @check_generatordataset
     def __init__(self, source, column_names=None, column_types=None, schema=None, num_samples=None,
-                 num_parallel_workers=1, shuffle=None, sampler=None, num_shards=None, shard_id=None):
+                 num_parallel_workers=1, shuffle=None, sampler=None, num_shards=None, shard_id=None,
+                 max_rowsize=6, prefetch_size=None, worker_timeout=5):
         super().__init__(num_parallel_workers)
         self.sampler = _select_sampler(num_samples, sampler, shuffle, num_shards, shard_id)
         if self.sampler is not None and hasattr(source, "__getitem__"):
@@ -3177,12 +3589,16 @@ class GeneratorDataset(MappableDataset):
                 sampler_instance.set_num_rows(len(source))
                 sampler_instance.initialize()
                 if num_parallel_workers > 1:
-                    self.source = (lambda: _cpp_sampler_fn_mp(sampler_instance, source, num_parallel_workers))
+                    worker_pool = _GeneratorWorkerPool(source, num_parallel_workers, prefetch_size, max_rowsize,
+                                                       worker_timeout)
+                    self.source = (lambda: _cpp_sampler_fn_mp(sampler_instance, source, worker_pool))
                 else:
                     self.source = (lambda: _cpp_sampler_fn(sampler_instance, source))
             else:
                 if num_parallel_workers > 1:
-                    self.source = (lambda: _py_sampler_fn_mp(self.sampler, num_samples, source, num_parallel_workers))
+                    worker_pool = _GeneratorWorkerPool(source, num_parallel_workers, prefetch_size, max_rowsize,
+                                                       worker_timeout)
+                    self.source = (lambda: _py_sampler_fn_mp(self.sampler, num_samples, worker_pool))
                 else:
                     self.source = (lambda: _py_sampler_fn(self.sampler, num_samples, source))
         else:
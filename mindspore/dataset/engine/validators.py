@@ -25,7 +25,7 @@ from mindspore._c_expression import typing
 from ..core.validator_helpers import parse_user_args, type_check, type_check_list, check_value, \
     INT32_MAX, check_valid_detype, check_dir, check_file, check_sampler_shuffle_shard_options, \
     validate_dataset_param_value, check_padding_options, check_gnn_list_or_ndarray, check_num_parallel_workers, \
-    check_columns, check_pos_int32
+    check_columns, check_pos_int32, check_positive
 
 from . import datasets
 from . import samplers
@@ -330,6 +330,16 @@ def check_generatordataset(method):
         nreq_param_bool = ["shuffle"]
         validate_dataset_param_value(nreq_param_bool, param_dict, bool)
 
+        max_rowsize = param_dict.get("max_rowsize")
+        type_check(max_rowsize, (int,), "max_rowsize")
+        check_value(max_rowsize, [0, INT32_MAX], "max_rowsize")
+        prefetch_size = param_dict.get("prefetch_size")
+        if prefetch_size is not None:
+            check_pos_int32(prefetch_size, "prefetch_size")
+        worker_timeout = param_dict.get("worker_timeout")
+        type_check(worker_timeout, (int, float), "worker_timeout")
+        check_positive(worker_timeout, "worker_timeout")
+
         num_shards = param_dict.get("num_shards")
         shard_id = param_dict.get("shard_id")
         if (num_shards is None) != (shard_id is None):
@@ -0,0 +1,287 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Augmentation functions on batches of Numpy images.
+
+The functions take a batch of shape (N, H, W, C) or (N, C, H, W), draw the random parameters of all the samples at
+once as arrays with `numpy.random`, and write the whole batch into one output array, which can be supplied by the
+caller through `out`.
+"""
+import numbers
+
+import numpy as np
+
+
+def to_batch(images):
+    """
+    Get the images as one array of shape (N, H, W, C) or (N, C, H, W).
+
+    Args:
+        images (Union[numpy.ndarray, list[numpy.ndarray]]): A batch array, or the list of images of a batch as
+            given to `per_batch_map`, which must all have the same shape.
+
+    Returns:
+        numpy.ndarray, the batch array.
+    """
+    if isinstance(images, (list, tuple)):
+        if not images:
+            raise ValueError('The batch should not be empty.')
+        images = np.stack(images)
+    if not isinstance(images, np.ndarray):
+        raise TypeError('images should be a Numpy array or a list of Numpy arrays. Got {}'.format(type(images)))
+    if images.ndim != 4:
+        raise TypeError('images shape should be (N, H, W, C) or (N, C, H, W). Got {}'.format(images.shape))
+    return images
+
+
+def from_batch(batch, like):
+    """Return `batch` as a list of images if the input `like` was a list, as given to `per_batch_map`."""
+    if isinstance(like, (list, tuple)):
+        return list(batch)
+    return batch
+
+
+def _hw_axes(is_hwc):
+    """Get the axes of the height and the width in a batch."""
+    return (1, 2) if is_hwc else (2, 3)
+
+
+def _check_out(out, shape, dtype):
+    """Allocate the output array if None, or check its shape."""
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != tuple(shape):
+        raise ValueError('out should be of shape {}. Got {}'.format(tuple(shape), out.shape))
+    return out
+
+
+def _channel_values(value, num_channels, is_hwc):
+    """Get a fill value as an array broadcastable to one image."""
+    value = np.asarray(value)
+    if value.ndim == 0:
+        return value
+    if value.shape != (num_channels,):
+        raise ValueError('The fill value should be a single value or have {} values. Got {}'.format(num_channels,
+                                                                                                 value.shape))
+    return value if is_hwc else value[:, None, None]
+
+
+def random_horizontal_flip(images, prob, is_hwc=True, out=None):
+    """
+    Randomly flip each image of a batch horizontally.
+
+    Args:
+        images (numpy.ndarray): Batch of shape (N, H, W, C) or (N, C, H, W).
+        prob (float): Probability of each image being flipped.
+        is_hwc (bool): If True, the batch is (N, H, W, C), otherwise (N, C, H, W).
+        out (numpy.ndarray, optional): Array of the same shape to write the result into (default=None).
+
+    Returns:
+        numpy.ndarray, the batch with its images randomly flipped, or `out`.
+    """
+    flips = np.random.random_sample(images.shape[0]) < prob
+    flipped = images[flips]
+    if out is not images:
+        out = _check_out(out, images.shape, images.dtype)
+        out[...] = images
+    # flip the selected images along their width axis, all at once
+    out[flips] = np.flip(flipped, axis=_hw_axes(is_hwc)[1])
+    return out
+
+
+def random_crop(images, size, padding=(0, 0, 0, 0), fill_value=0, is_hwc=True, out=None):
+    """
+    Crop each image of a batch at its own random location.
+
+    Args:
+        images (numpy.ndarray): Batch of shape (N, H, W, C) or (N, C, H, W).
+        size (Union[int, sequence]): The output size (height, width) of the crops, or a single side length.
+        padding (sequence): The left, top, right and bottom paddings applied before cropping (default=(0, 0, 0, 0)).
+        fill_value (Union[int, sequence]): The value of the padded pixels, for all channels or each of them
+            (default=0).
+        is_hwc (bool): If True, the batch is (N, H, W, C), otherwise (N, C, H, W).
+        out (numpy.ndarray, optional): Array to write the crops into (default=None).
+
+    Returns:
+        numpy.ndarray, the batch of crops, or `out`.
+    """
+    if isinstance(size, numbers.Number):
+        size = (int(size), int(size))
+    crop_h, crop_w = size
+    h_axis, w_axis = _hw_axes(is_hwc)
+    left, top, right, bottom = padding
+    image_h = images.shape[h_axis] + top + bottom
+    image_w = images.shape[w_axis] + left + right
+    if crop_h > image_h or crop_w > image_w:
+        raise ValueError('Crop size {} is larger than the padded image size {}.'.format(size, (image_h, image_w)))
+
+    if any(padding):
+        # pad the whole batch once instead of every image
+        padded_shape = list(images.shape)
+        padded_shape[h_axis], padded_shape[w_axis] = image_h, image_w
+        padded = np.empty(padded_shape, dtype=images.dtype)
+        padded[...] = _channel_values(fill_value, images.shape[3 if is_hwc else 1], is_hwc)
+        index = [slice(None)] * 4
+        index[h_axis] = slice(top, top + images.shape[h_axis])
+        index[w_axis] = slice(left, left + images.shape[w_axis])
+        padded[tuple(index)] = images
+        images = padded
+
+    num = images.shape[0]
+    tops = np.random.randint(0, image_h - crop_h + 1, size=num)
+    lefts = np.random.randint(0, image_w - crop_w + 1, size=num)
+    out_shape = list(images.shape)
+    out_shape[h_axis], out_shape[w_axis] = crop_h, crop_w
+    out = _check_out(out, out_shape, images.dtype)
+    # one slice copy per image, a fancy-index gather of every pixel is much slower for large crops
+    for k in range(num):
+        i, j = tops[k], lefts[k]
+        if is_hwc:
+            out[k] = images[k, i:i + crop_h, j:j + crop_w]
+        else:
+            out[k] = images[k, :, i:i + crop_h, j:j + crop_w]
+    return out
+
+
+def normalize(images, mean, std, is_hwc=True, hwc2chw=False, out=None):
+    """
+    Normalize a batch with the given mean and standard deviation of each channel.
+
+    Integer batches are first rescaled from [0, 255] to [0.0, 1.0] like `ToTensor`, in the same pass.
+
+    Args:
+        images (numpy.ndarray): Batch of shape (N, H, W, C) or (N, C, H, W).
+        mean (sequence): Mean value of each channel.
+        std (sequence): Standard deviation of each channel.
+        is_hwc (bool): If True, the batch is (N, H, W, C), otherwise (N, C, H, W).
+        hwc2chw (bool): If True and `is_hwc` is True, the result is transposed to (N, C, H, W).
+        out (numpy.ndarray, optional): float32 array to write the result into (default=None).
+
+    Returns:
+        numpy.ndarray, the normalized float32 batch, or `out`.
+    """
+    num_channels = images.shape[3 if is_hwc else 1]
+    if len(mean) != num_channels or len(std) != num_channels:
+        raise ValueError('Length of mean and std must equal the number of channels {}.'.format(num_channels))
+    scale = 1.0 / np.asarray(std, dtype=np.float32)
+    if np.issubdtype(images.dtype, np.integer):
+        scale = scale / np.float32(255)
+    shift = -np.asarray(mean, dtype=np.float32) / np.asarray(std, dtype=np.float32)
+    if is_hwc and hwc2chw:
+        images = np.moveaxis(images, 3, 1)
+        is_hwc = False
+    if not is_hwc:
+        scale = scale[:, None, None]
+        shift = shift[:, None, None]
+    out = _check_out(out, images.shape, np.float32)
+    # x * (1 / std) - mean / std, the transposition is done by the first ufunc writing into out
+    np.multiply(images, scale, out=out, casting='unsafe')
+    out += shift
+    return out
+
+
+def get_erase_params(num, image_h, image_w, scale, ratio, max_attempts, bounded=True):
+    """
+    Draw the rectangles to erase in each image of a batch, like `py_transforms_util.get_erase_params`.
+
+    All the attempts of all the images are drawn at once, and each image keeps its first valid attempt.
+
+    Args:
+        num (int): Number of images.
+        image_h (int): Height of the images.
+        image_w (int): Width of the images.
+        scale (sequence): Range of the erased area relative to the image area.
+        ratio (sequence): Range of the aspect ratio of the erased area.
+        max_attempts (int): Number of attempts to find a rectangle fitting in the image.
+        bounded (bool): If True, the rectangles are inside the images, otherwise they are centered at a random
+            pixel and clipped to the image (default=True).
+
+    Returns:
+        tuple, the arrays of the tops, lefts, heights and widths of the rectangles, and the boolean array of
+        the images where a rectangle was found.
+    """
+    size = (num, max_attempts)
+    erase_area = np.random.uniform(scale[0], scale[1], size=size) * (image_h * image_w)
+    aspect_ratio = np.random.uniform(ratio[0], ratio[1], size=size)
+    erase_w = np.rint(np.sqrt(erase_area * aspect_ratio)).astype(np.int64)
+    erase_h = np.rint(erase_w / aspect_ratio).astype(np.int64)
+    valid = (erase_h < image_h) & (erase_w < image_w)
+    found = valid.any(axis=1)
+    attempt = valid.argmax(axis=1)
+    rows = np.arange(num)
+    erase_h = np.where(found, erase_h[rows, attempt], 0)
+    erase_w = np.where(found, erase_w[rows, attempt], 0)
+
+    if bounded:
+        tops = (np.random.random_sample(num) * (image_h - erase_h + 1)).astype(np.int64)
+        lefts = (np.random.random_sample(num) * (image_w - erase_w + 1)).astype(np.int64)
+    else:
+        y = np.random.randint(0, image_h + 1, size=num)
+        x = np.random.randint(0, image_w + 1, size=num)
+        tops = np.clip(y - erase_h // 2, 0, image_h)
+        lefts = np.clip(x - erase_w // 2, 0, image_w)
+        erase_h = np.clip(y + erase_h // 2, 0, image_h) - tops
+        erase_w = np.clip(x + erase_w // 2, 0, image_w) - lefts
+    return tops, lefts, erase_h, erase_w, found
+
+
+def erase_mask(image_h, image_w, tops, lefts, heights, widths):
+    """
+    Build the boolean mask of shape (N, H, W) of the given rectangles of each image.
+
+    Args:
+        image_h (int): Height of the images.
+        image_w (int): Width of the images.
+        tops (numpy.ndarray): Top of the rectangle of each image.
+        lefts (numpy.ndarray): Left of the rectangle of each image.
+        heights (numpy.ndarray): Height of the rectangle of each image, 0 to erase nothing.
+        widths (numpy.ndarray): Width of the rectangle of each image, 0 to erase nothing.
+
+    Returns:
+        numpy.ndarray, the mask of the pixels to erase.
+    """
+    rows = np.arange(image_h)[None, :]
+    cols = np.arange(image_w)[None, :]
+    in_rows = (rows >= tops[:, None]) & (rows < (tops + heights)[:, None])
+    in_cols = (cols >= lefts[:, None]) & (cols < (lefts + widths)[:, None])
+    return in_rows[:, :, None] & in_cols[:, None, :]
+
+
+def erase(images, mask, value, is_hwc=True, out=None):
+    """
+    Erase the masked pixels of a batch to the given value.
+
+    Args:
+        images (numpy.ndarray): Batch of shape (N, H, W, C) or (N, C, H, W).
+        mask (numpy.ndarray): Boolean mask of shape (N, H, W) of the pixels to erase.
+        value (Union[int, sequence, str]): A single value, a value per channel, or 'random' to draw the values
+            from a standard normal distribution.
+        is_hwc (bool): If True, the batch is (N, H, W, C), otherwise (N, C, H, W).
+        out (numpy.ndarray, optional): Array of the same shape to write the result into, may be `images`
+            (default=None).
+
+    Returns:
+        numpy.ndarray, the erased batch, or `out`.
+    """
+    if out is not images:
+        out = _check_out(out, images.shape, images.dtype)
+        out[...] = images
+    mask = mask[:, :, :, None] if is_hwc else mask[:, None, :, :]
+    if isinstance(value, (str, bytes)):
+        value = np.random.normal(loc=0.0, scale=1.0, size=images.shape)
+    else:
+        value = _channel_values(value, images.shape[3 if is_hwc else 1], is_hwc)
+    np.copyto(out, value, casting='unsafe', where=mask)
+    return out
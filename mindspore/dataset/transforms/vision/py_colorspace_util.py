@@ -0,0 +1,165 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Vectorized colorspace functions on Numpy images.
+
+The functions take a single image of shape (H, W, C) or (C, H, W), or a batch of shape (N, H, W, C) or
+(N, C, H, W), and process the whole array with a few array operations. They follow the formulas of the `colorsys`
+module, computed in float64. The result can be written into a caller-supplied `out` array, which may be the input
+itself.
+"""
+import numpy as np
+
+
+def _channel_axis(images, is_hwc):
+    """Get the axis of the channels, checking there are 3 of them."""
+    if images.ndim not in (3, 4):
+        raise TypeError('img shape should be (H, W, C)/(N, H, W, C)/(C,H,W)/(N,C,H,W). Got {}'.format(images.shape))
+    axis = images.ndim - 1 if is_hwc else images.ndim - 3
+    if images.shape[axis] != 3:
+        raise TypeError('img should be 3 channels RGB img. Got {} channels'.format(images.shape[axis]))
+    return axis
+
+
+def _split(images, axis):
+    """Get the channels of the images in float64."""
+    return [np.asarray(channel, dtype=np.float64) for channel in np.moveaxis(images, axis, 0)]
+
+
+def _merge(channels, axis, shape, dtype, out):
+    """Write the channels into `out`, which is allocated if None."""
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError('out should be of shape {}. Got {}'.format(shape, out.shape))
+    out_channels = np.moveaxis(out, axis, 0)
+    for out_channel, channel in zip(out_channels, channels):
+        if np.issubdtype(out.dtype, np.integer):
+            info = np.iinfo(out.dtype)
+            channel = np.clip(np.rint(channel), info.min, info.max)
+        out_channel[...] = channel
+    return out
+
+
+def _rgb_to_hsv_channels(r, g, b):
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    delta = maxc - minc
+    gray = delta == 0
+    # gray pixels have no hue and no saturation, avoid dividing by 0 for them
+    safe_delta = np.where(gray, 1, delta)
+    s = np.where(gray, 0, delta / np.where(maxc == 0, 1, maxc))
+    rc = (maxc - r) / safe_delta
+    gc = (maxc - g) / safe_delta
+    bc = (maxc - b) / safe_delta
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0, (h / 6.0) % 1.0)
+    return h, s, maxc
+
+
+def _hsv_to_rgb_channels(h, s, v):
+    i = np.trunc(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    r = np.choose(i, (v, q, p, p, t, v))
+    g = np.choose(i, (t, v, v, q, p, p))
+    b = np.choose(i, (p, p, t, v, v, q))
+    return r, g, b
+
+
+def rgb_to_hsv(images, is_hwc=True, out=None):
+    """
+    Convert RGB images to HSV images.
+
+    Args:
+        images (numpy.ndarray): RGB image(s) of shape (H, W, C), (N, H, W, C), (C, H, W) or (N, C, H, W).
+        is_hwc (bool): If True, the channels are the last axis, otherwise they come before the height.
+        out (numpy.ndarray, optional): Array of the same shape to write the result into (default=None).
+
+    Returns:
+        numpy.ndarray, the HSV image(s) in float64, or `out`.
+    """
+    axis = _channel_axis(images, is_hwc)
+    h, s, v = _rgb_to_hsv_channels(*_split(images, axis))
+    return _merge((h, s, v), axis, images.shape, np.float64, out)
+
+
+def hsv_to_rgb(images, is_hwc=True, out=None):
+    """
+    Convert HSV images to RGB images.
+
+    Args:
+        images (numpy.ndarray): HSV image(s) of shape (H, W, C), (N, H, W, C), (C, H, W) or (N, C, H, W).
+        is_hwc (bool): If True, the channels are the last axis, otherwise they come before the height.
+        out (numpy.ndarray, optional): Array of the same shape to write the result into (default=None).
+
+    Returns:
+        numpy.ndarray, the RGB image(s) in float64, or `out`.
+    """
+    axis = _channel_axis(images, is_hwc)
+    r, g, b = _hsv_to_rgb_channels(*_split(images, axis))
+    return _merge((r, g, b), axis, images.shape, np.float64, out)
+
+
+def adjust_hue(images, hue_factor, is_hwc=True, out=None):
+    """
+    Shift the hue of RGB images.
+
+    Args:
+        images (numpy.ndarray): RGB image(s) of shape (H, W, C), (N, H, W, C), (C, H, W) or (N, C, H, W).
+        hue_factor (float): Amount to shift the hue channel, in [-0.5, 0.5]. 0 gives the original images.
+        is_hwc (bool): If True, the channels are the last axis, otherwise they come before the height.
+        out (numpy.ndarray, optional): Array of the same shape to write the result into (default=None).
+            Integer results are rounded and clipped to the range of their type.
+
+    Returns:
+        numpy.ndarray, the adjusted image(s) of the type of `images`, or `out`.
+    """
+    if not -0.5 <= hue_factor <= 0.5:
+        raise ValueError('image_hue_factor {} is not in [-0.5, 0.5].'.format(hue_factor))
+    axis = _channel_axis(images, is_hwc)
+    h, s, v = _rgb_to_hsv_channels(*_split(images, axis))
+    h = (h + hue_factor) % 1.0
+    r, g, b = _hsv_to_rgb_channels(h, s, v)
+    return _merge((r, g, b), axis, images.shape, images.dtype, out)
+
+
+def adjust_saturation(images, saturation_factor, is_hwc=True, out=None):
+    """
+    Adjust the saturation of RGB images, by blending them with their grayscale like PIL ImageEnhance.Color.
+
+    Args:
+        images (numpy.ndarray): RGB image(s) of shape (H, W, C), (N, H, W, C), (C, H, W) or (N, C, H, W).
+        saturation_factor (float): A non negative number, 0 gives black and white images, 1 the original ones.
+        is_hwc (bool): If True, the channels are the last axis, otherwise they come before the height.
+        out (numpy.ndarray, optional): Array of the same shape to write the result into (default=None).
+            Integer results are rounded and clipped to the range of their type.
+
+    Returns:
+        numpy.ndarray, the adjusted image(s) of the type of `images`, or `out`.
+    """
+    if saturation_factor < 0:
+        raise ValueError('saturation_factor {} should be non negative.'.format(saturation_factor))
+    axis = _channel_axis(images, is_hwc)
+    r, g, b = _split(images, axis)
+    # ITU-R 601-2 luma transform, as used by PIL for the conversion to mode 'L'
+    gray = r * 0.299 + g * 0.587 + b * 0.114
+    if np.issubdtype(images.dtype, np.integer):
+        gray = np.rint(gray)
+    channels = [gray + saturation_factor * (channel - gray) for channel in (r, g, b)]
+    return _merge(channels, axis, images.shape, images.dtype, out)
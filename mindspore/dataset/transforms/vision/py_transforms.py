@@ -23,17 +23,20 @@ PIL.
 """
 import numbers
 import random
+import threading
 
 import numpy as np
 from PIL import Image
 
+from . import py_batch_util as batch_util
 from . import py_transforms_util as util
 from .c_transforms import parse_padding
 from .validators import check_prob, check_crop, check_resize_interpolation, check_random_resize_crop, \
     check_normalize_py, check_random_crop, check_random_color_adjust, check_random_rotation, \
     check_transforms_list, check_random_apply, check_ten_crop, check_num_channels, check_pad, \
     check_random_perspective, check_random_erasing, check_cutout, check_linear_transform, check_random_affine, \
-    check_mix_up, check_positive_degrees, check_uniform_augment_py, check_compose_list
+    check_mix_up, check_positive_degrees, check_uniform_augment_py, check_compose_list, check_batch_prob, \
+    check_batch_random_crop, check_batch_normalize, check_batch_random_erasing, check_batch_cutout
 from .utils import Inter, Border
 
 DE_PY_INTER_MODE = {Inter.NEAREST: Image.NEAREST,
@@ -57,8 +60,16 @@ class ComposeOp:
         with py_transforms classes and check out FiveCrop or TenCrop for the use of them in conjunction with lambda
         functions.
 
+    Runs of ToTensor or HWC2CHW followed by Normalize and ToType are fused into one stage, which reads the input
+    image once and allocates only the final array, running the later steps in place with the same arithmetic as the
+    separate transforms. The stages are listed in the `transforms` attribute of the returned function, which shows
+    in the serialized pipeline.
+
     Args:
         transforms (list): List of transformations to be applied.
+        reuse_buffer (bool, optional): If True, a fused stage writes into the same array on every call from a
+            thread, instead of allocating a new one (default=False). The result must then be consumed, e.g. by
+            `map`, before the next image is processed in the same thread.
 
     Examples:
         >>> import mindspore.dataset as ds
@@ -77,17 +88,166 @@ class ComposeOp:
     """
 
     @check_compose_list
-    def __init__(self, transforms):
+    def __init__(self, transforms, reuse_buffer=False):
         self.transforms = transforms
+        self.reuse_buffer = reuse_buffer
 
     def __call__(self):
         """
         Call method.
 
         Returns:
-            lambda function, Lambda function that takes in an img to apply transformations on.
+            function, Function that takes in an img to apply transformations on.
         """
-        return lambda img: util.compose(img, self.transforms)
+        transforms = _fuse_transforms(self.transforms, self.reuse_buffer)
+
+        def compose(img):
+            return util.compose(img, transforms)
+
+        compose.transforms = [_transform_name(transform) for transform in transforms]
+        return compose
+
+
+def _transform_name(transform):
+    """Get the name of a transform as reported by ComposeOp."""
+    if isinstance(transform, _FusedTransforms):
+        return transform.name
+    return getattr(transform, '__name__', type(transform).__name__)
+
+
+def _fuse_transforms(transforms, reuse_buffer=False):
+    """Replace the runs of transforms supported by _FusedTransforms with fused stages."""
+    fused = []
+    run = []
+    for transform in transforms + [None]:
+        if run and isinstance(transform, (Normalize, ToType)):
+            run.append(transform)
+            continue
+        if len(run) > 1:
+            fused.append(_FusedTransforms(run, reuse_buffer))
+        else:
+            fused.extend(run)
+        run = []
+        if isinstance(transform, (ToTensor, HWC2CHW)):
+            run.append(transform)
+        elif transform is not None:
+            fused.append(transform)
+    return fused
+
+
+class _FusedTransforms:
+    """
+    Apply a ToTensor or HWC2CHW transform followed by Normalize and ToType transforms as one stage.
+
+    The first transform writes the (C, H, W) image into a new array, and the next ones run in place with the same
+    Numpy operations and types as the transforms themselves, so the result is identical. A ToType is merged into
+    the output of the operation before it. Images the stage cannot handle, e.g. with a non floating type before a
+    Normalize, go through the transforms one by one, which also raises their usual errors.
+
+    Args:
+        transforms (list): The transforms to fuse.
+        reuse_buffer (bool): If True, the final array is reused by the next calls from the same thread.
+    """
+
+    def __init__(self, transforms, reuse_buffer=False):
+        self.transforms = transforms
+        self.reuse_buffer = reuse_buffer
+        self.name = 'Fused[{}]'.format(', '.join(type(transform).__name__ for transform in transforms))
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _plan(self, img):
+        """
+        Get the (C, H, W) view of the input and the steps to apply to it.
+
+        Each step is (ufunc or None for a copy, operand, type of the computation, type of the output), or the
+        plan is None if the image must go through the transforms one by one.
+        """
+        first = self.transforms[0]
+        if isinstance(first, ToTensor):
+            if not (util.is_pil(img) or util.is_numpy(img)):
+                return None
+            img = np.asarray(img)
+            if img.ndim == 2:
+                img = img[:, :, None]
+            if img.ndim != 3:
+                return None
+            # the type of img / 255. depends on the input type, as in to_tensor
+            steps = [(np.true_divide, 255., (img[:0] / 255.).dtype, np.dtype(first.output_type))]
+        else:
+            if not util.is_numpy(img) or img.ndim != 3:
+                return None
+            steps = [(None, None, img.dtype, img.dtype)]
+        src = img.transpose(2, 0, 1)
+
+        for transform in self.transforms[1:]:
+            func, operand, dtype, out_dtype = steps[-1]
+            if isinstance(transform, ToType):
+                if out_dtype == dtype:
+                    # casting the result of the step is the same as casting it afterwards
+                    steps[-1] = (func, operand, dtype, np.dtype(transform.output_type))
+                else:
+                    steps.append((None, None, out_dtype, np.dtype(transform.output_type)))
+                continue
+            mean, std = transform.mean, transform.std
+            if not np.issubdtype(out_dtype, np.floating) or len(mean) != len(std):
+                return None
+            if len(mean) == 1:
+                mean, std = list(mean) * src.shape[0], list(std) * src.shape[0]
+            elif len(mean) != src.shape[0]:
+                return None
+            steps.append((np.subtract, np.array(mean, dtype=out_dtype)[:, None, None], out_dtype, out_dtype))
+            steps.append((np.true_divide, np.array(std, dtype=out_dtype)[:, None, None], out_dtype, out_dtype))
+        return src, steps
+
+    def _empty(self, shape, dtype, reuse):
+        """Allocate an array, or get the one of the thread if reused."""
+        if not reuse:
+            return np.empty(shape, dtype=dtype)
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._local.buffer = buffer
+        return buffer
+
+    def __call__(self, img):
+        """
+        Call method.
+
+        Args:
+            img (PIL Image or numpy.ndarray): Image to be transformed.
+
+        Returns:
+            img (numpy.ndarray), Transformed image.
+        """
+        plan = self._plan(img)
+        if plan is None:
+            for transform in self.transforms:
+                img = transform(img)
+            return img
+        src, steps = plan
+        # a step needs a new array when the type changes, the last of them can be reused
+        allocations = [k for k, step in enumerate(steps) if k == 0 or step[3] != steps[k - 1][3]]
+        img = src
+        for k, (func, operand, _, out_dtype) in enumerate(steps):
+            if k in allocations:
+                out = self._empty(src.shape, out_dtype, self.reuse_buffer and k == allocations[-1])
+            else:
+                out = img
+            if func is None:
+                np.copyto(out, img, casting='unsafe')
+            else:
+                func(img, operand, out=out, casting='unsafe')
+            img = out
+        return img
 
 
 class ToTensor:
@@ -1240,6 +1400,238 @@ class MixUp:
         return util.mix_up_muti(self, self.batch_size, image, label, self.alpha)
 
 
+class BatchRandomHorizontalFlip:
+    """
+    Randomly flip each image of a batch horizontally with a given probability.
+
+    The batch operations process a whole batch of Numpy images at once: a batch array of shape (N, H, W, C) or
+    (N, C, H, W) after `batch`, or the list of images of a batch given to `per_batch_map`, in which case a list is
+    returned. The random parameters of all the images are drawn together, and the result is written into a single
+    new array.
+
+    Args:
+        prob (float, optional): Probability of each image being flipped (default=0.5).
+        is_hwc (bool, optional): If True, the images are (H, W, C), otherwise (C, H, W) (default=True).
+
+    Examples:
+        >>> def augment(images, batch_info):
+        >>>     return (py_transforms.BatchRandomHorizontalFlip(0.5)(images),)
+        >>> data = data.batch(32, input_columns=["image"], per_batch_map=augment)
+    """
+
+    @check_batch_prob
+    def __init__(self, prob=0.5, is_hwc=True):
+        self.prob = prob
+        self.is_hwc = is_hwc
+
+    def __call__(self, images):
+        """
+        Call method.
+
+        Args:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]): Batch of images to be flipped horizontally.
+
+        Returns:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]), Randomly flipped images.
+        """
+        batch = batch_util.to_batch(images)
+        return batch_util.from_batch(batch_util.random_horizontal_flip(batch, self.prob, self.is_hwc), images)
+
+
+class BatchRandomCrop:
+    """
+    Crop each image of a batch at its own random location, see `BatchRandomHorizontalFlip` for the batch input.
+
+    Args:
+        size (int or sequence): The output size of the cropped images.
+            If size is an int, square crops of size (size, size) are returned.
+            If size is a sequence of length 2, it should be (height, width).
+        padding (int or sequence, optional): The number of pixels to pad the images (default=None).
+            If a single number is provided, it pads all borders with this value.
+            If a tuple or list of 2 values are provided, it pads the (left and top)
+            with the first value and (right and bottom) with the second value.
+            If 4 values are provided as a list or tuple,
+            it pads the left, top, right and bottom respectively.
+        fill_value (int or tuple, optional): The pixel intensity of the padded borders (default=0).
+            If it is a 3-tuple, it is used to fill R, G, B channels respectively.
+        is_hwc (bool, optional): If True, the images are (H, W, C), otherwise (C, H, W) (default=True).
+
+    Examples:
+        >>> def augment(images, batch_info):
+        >>>     return (py_transforms.BatchRandomCrop(32, padding=4)(images),)
+        >>> data = data.batch(32, input_columns=["image"], per_batch_map=augment)
+    """
+
+    @check_batch_random_crop
+    def __init__(self, size, padding=None, fill_value=0, is_hwc=True):
+        if padding is None:
+            padding = (0, 0, 0, 0)
+        else:
+            padding = parse_padding(padding)
+        self.size = size
+        self.padding = padding
+        self.fill_value = fill_value
+        self.is_hwc = is_hwc
+
+    def __call__(self, images):
+        """
+        Call method.
+
+        Args:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]): Batch of images to be randomly cropped.
+
+        Returns:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]), Cropped images.
+        """
+        batch = batch_util.to_batch(images)
+        return batch_util.from_batch(batch_util.random_crop(batch, self.size, self.padding, self.fill_value,
+                                                            self.is_hwc), images)
+
+
+class BatchNormalize:
+    """
+    Normalize each image of a batch with the given mean and standard deviation, see `BatchRandomHorizontalFlip`
+    for the batch input.
+
+    Integer images, such as decoded uint8 images, are first rescaled to [0.0, 1.0] like `ToTensor`, so this
+    operation can replace `ToTensor` and `Normalize` together. The result is float32.
+
+    Args:
+        mean (sequence): List or tuple of mean values for each channel, w.r.t channel order.
+        std (sequence): List or tuple of standard deviations for each channel, w.r.t. channel order.
+        is_hwc (bool, optional): If True, the images are (H, W, C), otherwise (C, H, W) (default=True).
+        hwc2chw (bool, optional): If True, (H, W, C) images are also transposed to (C, H, W) (default=False).
+
+    Examples:
+        >>> def augment(images, batch_info):
+        >>>     normalize = py_transforms.BatchNormalize((0.491, 0.482, 0.447), (0.247, 0.243, 0.262), hwc2chw=True)
+        >>>     return (normalize(images),)
+        >>> data = data.batch(32, input_columns=["image"], per_batch_map=augment)
+    """
+
+    @check_batch_normalize
+    def __init__(self, mean, std, is_hwc=True, hwc2chw=False):
+        self.mean = mean
+        self.std = std
+        self.is_hwc = is_hwc
+        self.hwc2chw = hwc2chw
+
+    def __call__(self, images):
+        """
+        Call method.
+
+        Args:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]): Batch of images to be normalized.
+
+        Returns:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]), Normalized images.
+        """
+        batch = batch_util.to_batch(images)
+        return batch_util.from_batch(batch_util.normalize(batch, self.mean, self.std, self.is_hwc, self.hwc2chw),
+                                     images)
+
+
+class BatchRandomErasing:
+    """
+    Erase the pixels of a random rectangle of each image of a batch, see `BatchRandomHorizontalFlip` for the
+    batch input.
+
+    The rectangles are drawn like in `RandomErasing`, independently for each image.
+
+    Args:
+        prob (float, optional): Probability of erasing each image (default=0.5).
+        scale (sequence of floats, optional): Range of the relative erase area to the
+            original image (default=(0.02, 0.33)).
+        ratio (sequence of floats, optional): Range of the aspect ratio of the erase
+            area (default=(0.3, 3.3)).
+        value (int or sequence): Erasing value (default=0).
+            If value is a single int, it is applied to all pixels to be erases.
+            If value is a sequence of length 3, it is applied to R, G, B channels respectively.
+            If value is a str 'random', the erase value will be obtained from a standard normal distribution,
+            which is meant for normalized float images.
+        max_attempts (int, optional): The maximum number of attempts to propose a valid
+            erase_area (default=10). If exceeded, the image is left unchanged.
+        is_hwc (bool, optional): If True, the images are (H, W, C), otherwise (C, H, W) (default=True).
+
+    Examples:
+        >>> def augment(images, batch_info):
+        >>>     return (py_transforms.BatchRandomErasing(value=(125, 122, 113))(images),)
+        >>> data = data.batch(32, input_columns=["image"], per_batch_map=augment)
+    """
+
+    @check_batch_random_erasing
+    def __init__(self, prob=0.5, scale=(0.02, 0.33), ratio=(0.3, 3.3), value=0, max_attempts=10, is_hwc=True):
+        self.prob = prob
+        self.scale = scale
+        self.ratio = ratio
+        self.value = value
+        self.max_attempts = max_attempts
+        self.is_hwc = is_hwc
+
+    def __call__(self, images):
+        """
+        Call method.
+
+        Args:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]): Batch of images to be randomly erased.
+
+        Returns:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]), Erased images.
+        """
+        batch = batch_util.to_batch(images)
+        image_h, image_w = (batch.shape[1], batch.shape[2]) if self.is_hwc else (batch.shape[2], batch.shape[3])
+        tops, lefts, heights, widths, found = batch_util.get_erase_params(batch.shape[0], image_h, image_w,
+                                                                          self.scale, self.ratio, self.max_attempts)
+        erased = found & (np.random.random_sample(batch.shape[0]) < self.prob)
+        mask = batch_util.erase_mask(image_h, image_w, tops, lefts, heights * erased, widths * erased)
+        return batch_util.from_batch(batch_util.erase(batch, mask, self.value, self.is_hwc), images)
+
+
+class BatchCutout:
+    """
+    Randomly cut (mask) out a given number of square patches from each image of a batch, see
+    `BatchRandomHorizontalFlip` for the batch input.
+
+    The patches are drawn like in `Cutout`, independently for each image.
+
+    Args:
+        length (int): The side length of each square patch.
+        num_patches (int, optional): Number of patches to be cut out of each image (default=1).
+        is_hwc (bool, optional): If True, the images are (H, W, C), otherwise (C, H, W) (default=True).
+
+    Examples:
+        >>> def augment(images, batch_info):
+        >>>     return (py_transforms.BatchCutout(16)(images),)
+        >>> data = data.batch(32, input_columns=["image"], per_batch_map=augment)
+    """
+
+    @check_batch_cutout
+    def __init__(self, length, num_patches=1, is_hwc=True):
+        self.length = length
+        self.num_patches = num_patches
+        self.is_hwc = is_hwc
+
+    def __call__(self, images):
+        """
+        Call method.
+
+        Args:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]): Batch of images to be cut out.
+
+        Returns:
+            images (Union[numpy.ndarray, list[numpy.ndarray]]), Images with square patches cut out.
+        """
+        batch = batch_util.to_batch(images)
+        image_h, image_w = (batch.shape[1], batch.shape[2]) if self.is_hwc else (batch.shape[2], batch.shape[3])
+        scale = (self.length * self.length) / (image_h * image_w)
+        mask = np.zeros((batch.shape[0], image_h, image_w), dtype=np.bool_)
+        for _ in range(self.num_patches):
+            tops, lefts, heights, widths, _ = batch_util.get_erase_params(batch.shape[0], image_h, image_w,
+                                                                          (scale, scale), (1, 1), 1, bounded=False)
+            mask |= batch_util.erase_mask(image_h, image_w, tops, lefts, heights, widths)
+        return batch_util.from_batch(batch_util.erase(batch, mask, 0, self.is_hwc), images)
+
+
 class RgbToHsv:
     """
     Convert a Numpy RGB image or one batch Numpy RGB images to HSV images.
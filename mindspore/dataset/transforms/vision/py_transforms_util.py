@@ -18,11 +18,11 @@ import io
 import math
 import numbers
 import random
-import colorsys
 
 import numpy as np
 from PIL import Image, ImageOps, ImageEnhance, __version__
 
+from . import py_colorspace_util
 from .utils import Inter
 
 augment_error_message = 'img should be PIL Image. Got {}. Use Decode() for encoded data or ToPIL() for decoded data.'
@@ -1291,18 +1291,7 @@ def rgb_to_hsv(np_rgb_img, is_hwc):
     Returns:
         np_hsv_img (numpy.ndarray), Numpy HSV image with same type of np_rgb_img.
     """
-    if is_hwc:
-        r, g, b = np_rgb_img[:, :, 0], np_rgb_img[:, :, 1], np_rgb_img[:, :, 2]
-    else:
-        r, g, b = np_rgb_img[0, :, :], np_rgb_img[1, :, :], np_rgb_img[2, :, :]
-    to_hsv = np.vectorize(colorsys.rgb_to_hsv)
-    h, s, v = to_hsv(r, g, b)
-    if is_hwc:
-        axis = 2
-    else:
-        axis = 0
-    np_hsv_img = np.stack((h, s, v), axis=axis)
-    return np_hsv_img
+    return py_colorspace_util.rgb_to_hsv(np_rgb_img, is_hwc)
 
 
 def rgb_to_hsvs(np_rgb_imgs, is_hwc):
@@ -1327,24 +1316,15 @@ def rgb_to_hsvs(np_rgb_imgs, is_hwc):
         raise TypeError('img shape should be (H, W, C)/(N, H, W, C)/(C,H,W)/(N,C,H,W). \
                          Got {}'.format(np_rgb_imgs.shape))
 
-    if shape_size == 3:
-        batch_size = 0
-        if is_hwc:
-            num_channels = np_rgb_imgs.shape[2]
-        else:
-            num_channels = np_rgb_imgs.shape[0]
+    if is_hwc:
+        num_channels = np_rgb_imgs.shape[-1]
     else:
-        batch_size = np_rgb_imgs.shape[0]
-        if is_hwc:
-            num_channels = np_rgb_imgs.shape[3]
-        else:
-            num_channels = np_rgb_imgs.shape[1]
+        num_channels = np_rgb_imgs.shape[-3]
 
     if num_channels != 3:
         raise TypeError('img should be 3 channels RGB img. Got {} channels'.format(num_channels))
-    if batch_size == 0:
-        return rgb_to_hsv(np_rgb_imgs, is_hwc)
-    return np.array([rgb_to_hsv(img, is_hwc) for img in np_rgb_imgs])
+    # the whole batch is converted at once
+    return py_colorspace_util.rgb_to_hsv(np_rgb_imgs, is_hwc)
 
 
 def hsv_to_rgb(np_hsv_img, is_hwc):
@@ -1358,19 +1338,7 @@ def hsv_to_rgb(np_hsv_img, is_hwc):
     Returns:
         np_rgb_img (numpy.ndarray), Numpy HSV image with same shape of np_hsv_img.
     """
-    if is_hwc:
-        h, s, v = np_hsv_img[:, :, 0], np_hsv_img[:, :, 1], np_hsv_img[:, :, 2]
-    else:
-        h, s, v = np_hsv_img[0, :, :], np_hsv_img[1, :, :], np_hsv_img[2, :, :]
-    to_rgb = np.vectorize(colorsys.hsv_to_rgb)
-    r, g, b = to_rgb(h, s, v)
-
-    if is_hwc:
-        axis = 2
-    else:
-        axis = 0
-    np_rgb_img = np.stack((r, g, b), axis=axis)
-    return np_rgb_img
+    return py_colorspace_util.hsv_to_rgb(np_hsv_img, is_hwc)
 
 
 def hsv_to_rgbs(np_hsv_imgs, is_hwc):
@@ -1395,24 +1363,15 @@ def hsv_to_rgbs(np_hsv_imgs, is_hwc):
         raise TypeError('img shape should be (H, W, C)/(N, H, W, C)/(C,H,W)/(N,C,H,W). \
                          Got {}'.format(np_hsv_imgs.shape))
 
-    if shape_size == 3:
-        batch_size = 0
-        if is_hwc:
-            num_channels = np_hsv_imgs.shape[2]
-        else:
-            num_channels = np_hsv_imgs.shape[0]
+    if is_hwc:
+        num_channels = np_hsv_imgs.shape[-1]
     else:
-        batch_size = np_hsv_imgs.shape[0]
-        if is_hwc:
-            num_channels = np_hsv_imgs.shape[3]
-        else:
-            num_channels = np_hsv_imgs.shape[1]
+        num_channels = np_hsv_imgs.shape[-3]
 
     if num_channels != 3:
         raise TypeError('img should be 3 channels RGB img. Got {} channels'.format(num_channels))
-    if batch_size == 0:
-        return hsv_to_rgb(np_hsv_imgs, is_hwc)
-    return np.array([hsv_to_rgb(img, is_hwc) for img in np_hsv_imgs])
+    # the whole batch is converted at once
+    return py_colorspace_util.hsv_to_rgb(np_hsv_imgs, is_hwc)
 
 
 def random_color(img, degrees):
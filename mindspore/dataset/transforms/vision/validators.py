@@ -424,6 +424,90 @@ def check_cutout(method):
     return new_method
 
 
+def check_batch_prob(method):
+    """Wrapper method to check the parameters of batch operations with a probability."""
+
+    @wraps(method)
+    def new_method(self, *args, **kwargs):
+        [prob, is_hwc], _ = parse_user_args(method, *args, **kwargs)
+        type_check(prob, (float, int,), "prob")
+        check_value(prob, [0., 1.], "prob")
+        type_check(is_hwc, (bool,), "is_hwc")
+
+        return method(self, *args, **kwargs)
+
+    return new_method
+
+
+def check_batch_random_crop(method):
+    """Wrapper method to check the parameters of batch random crop."""
+
+    @wraps(method)
+    def new_method(self, *args, **kwargs):
+        [size, padding, fill_value, is_hwc], _ = parse_user_args(method, *args, **kwargs)
+        check_crop_size(size)
+        if padding is not None:
+            check_padding(padding)
+        check_fill_value(fill_value)
+        type_check(is_hwc, (bool,), "is_hwc")
+
+        return method(self, *args, **kwargs)
+
+    return new_method
+
+
+def check_batch_normalize(method):
+    """Wrapper method to check the parameters of batch normalize."""
+
+    @wraps(method)
+    def new_method(self, *args, **kwargs):
+        [mean, std, is_hwc, hwc2chw], _ = parse_user_args(method, *args, **kwargs)
+        check_normalize_py_param(mean, std)
+        for std_value in std:
+            check_positive(std_value, "std_value")
+        type_check(is_hwc, (bool,), "is_hwc")
+        type_check(hwc2chw, (bool,), "hwc2chw")
+
+        return method(self, *args, **kwargs)
+
+    return new_method
+
+
+def check_batch_random_erasing(method):
+    """Wrapper method to check the parameters of batch random erasing."""
+
+    @wraps(method)
+    def new_method(self, *args, **kwargs):
+        [prob, scale, ratio, value, max_attempts, is_hwc], _ = parse_user_args(method, *args, **kwargs)
+
+        check_value(prob, [0., 1.], "prob")
+        check_range(scale, [0, FLOAT_MAX_INTEGER])
+        check_range(ratio, [0, FLOAT_MAX_INTEGER])
+        check_erasing_value(value)
+        check_value(max_attempts, (1, FLOAT_MAX_INTEGER))
+        type_check(is_hwc, (bool,), "is_hwc")
+
+        return method(self, *args, **kwargs)
+
+    return new_method
+
+
+def check_batch_cutout(method):
+    """Wrapper method to check the parameters of batch cutout."""
+
+    @wraps(method)
+    def new_method(self, *args, **kwargs):
+        [length, num_patches, is_hwc], _ = parse_user_args(method, *args, **kwargs)
+
+        check_value(length, (1, FLOAT_MAX_INTEGER))
+        check_value(num_patches, (1, FLOAT_MAX_INTEGER))
+        type_check(is_hwc, (bool,), "is_hwc")
+
+        return method(self, *args, **kwargs)
+
+    return new_method
+
+
 def check_linear_transform(method):
     """Wrapper method to check the parameters of linear transform."""
 
@@ -603,11 +687,12 @@ def check_compose_list(method):
 
     @wraps(method)
     def new_method(self, *args, **kwargs):
-        [transforms], _ = parse_user_args(method, *args, **kwargs)
+        [transforms, reuse_buffer], _ = parse_user_args(method, *args, **kwargs)
 
         type_check(transforms, (list,), transforms)
         if not transforms:
             raise ValueError("transforms list is empty.")
+        type_check(reuse_buffer, (bool,), "reuse_buffer")
 
         return method(self, *args, **kwargs)
 
@@ -25,6 +25,7 @@ corresponding sub-module.
 from .filewriter import FileWriter
 from .filereader import FileReader
 from .mindpage import MindPage
+from .randomaccessreader import RandomAccessReader
 from .common.exceptions import *
 from .shardutils import SUCCESS, FAILED
 from .tools.cifar10_to_mr import Cifar10ToMR
@@ -34,6 +35,6 @@ from .tools.imagenet_to_mr import ImageNetToMR
 from .tools.mnist_to_mr import MnistToMR
 from .tools.tfrecord_to_mr import TFRecordToMR
 
-__all__ = ['FileWriter', 'FileReader', 'MindPage',
+__all__ = ['FileWriter', 'FileReader', 'MindPage', 'RandomAccessReader',
            'Cifar10ToMR', 'Cifar100ToMR', 'CsvToMR', 'ImageNetToMR', 'MnistToMR', 'TFRecordToMR',
            'SUCCESS', 'FAILED']
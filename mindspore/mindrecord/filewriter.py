@@ -30,6 +30,57 @@ from .common.exceptions import ParamValueError, ParamTypeError, MRMInvalidSchema
 
 __all__ = ['FileWriter']
 
+# the kinds of numpy dtypes allowed for each type of schema
+_NUMPY_KINDS = {"int32": "iu", "int64": "iu", "float32": "f", "float64": "f", "string": "U", "bytes": "biuf"}
+
+
+def _shape_matches(size, shape):
+    """Whether an array of `size` elements can be reshaped to `shape`, one dimension of which can be -1."""
+    known_size = int(np.prod([dim for dim in shape if dim != -1]))
+    if -1 in shape:
+        return known_size != 0 and size % known_size == 0
+    return size == known_size
+
+
+def _value_checker(field_schema):
+    """Get a function checking whether a value matches the schema of a field, the check of each type is cached."""
+    field_type = field_schema["type"]
+    shape = field_schema.get("shape")
+    type_valid = {}
+
+    def check_value(value):
+        value_type = type(value)
+        valid = type_valid.get(value_type)
+        if valid is None:
+            name = value_type.__name__
+            valid = name in VALUE_TYPE_MAP and field_type in VALUE_TYPE_MAP[name] and \
+                (name != 'ndarray' or shape is not None)
+            type_valid[value_type] = valid
+        if valid and shape is not None and isinstance(value, np.ndarray):
+            return _shape_matches(value.size, shape)
+        return valid
+
+    return check_value
+
+
+def _check_column(column, field_schema):
+    """Check the values of a column against the schema of a field, returns whether each one is valid."""
+    num_rows = len(column)
+    if not isinstance(column, np.ndarray) or column.dtype == np.object_:
+        return np.fromiter(map(_value_checker(field_schema), column), dtype=np.bool_, count=num_rows)
+
+    field_type = field_schema["type"]
+    shape = field_schema.get("shape")
+    if shape is not None:
+        # each row is an array
+        valid = column.dtype.kind in "iuf" and _shape_matches(int(np.prod(column.shape[1:])), shape)
+        return np.full(num_rows, valid, dtype=np.bool_)
+    if column.dtype.kind not in _NUMPY_KINDS[field_type] or (field_type != "bytes" and column.ndim != 1):
+        return np.zeros(num_rows, dtype=np.bool_)
+    if field_type in ("int32", "int64") and np.iinfo(column.dtype).max > np.iinfo(field_type).max:
+        return (column >= np.iinfo(field_type).min) & (column <= np.iinfo(field_type).max)
+    return np.ones(num_rows, dtype=np.bool_)
+
 class FileWriter:
     """
     Class to write user defined raw data into MindRecord File series.
@@ -166,6 +217,7 @@ class FileWriter:
         error_data_dic = {}
         schema_content = self._header.schema
         for field in schema_content:
+            check_value = _value_checker(schema_content[field])
             for i, v in enumerate(raw_data):
                 if i in error_data_dic:
                     continue
@@ -174,31 +226,60 @@ class FileWriter:
                     error_data_dic[i] = "for schema, {} th data is wrong, " \
                     "there is not '{}' object in the raw data.".format(i, field)
                     continue
-                field_type = type(v[field]).__name__
-                if field_type not in VALUE_TYPE_MAP:
+                if not check_value(v[field]):
                     error_data_dic[i] = "for schema, {} th data is wrong, " \
                     "data type for '{}' is not matched.".format(i, field)
-                    continue
+        if not error_data_dic:
+            return
+        for i, v in sorted(error_data_dic.items()):
+            logger.warning(v)
+        raw_data[:] = [v for i, v in enumerate(raw_data) if i not in error_data_dic]
 
-                if schema_content[field]["type"] not in VALUE_TYPE_MAP[field_type]:
-                    error_data_dic[i] = "for schema, {} th data is wrong, " \
-                    "data type for '{}' is not matched.".format(i, field)
-                    continue
+    def _verify_columns(self, raw_data):
+        """
+        Verify data given by columns according to schema, whole columns at once, and remove the rows of invalid data.
 
-                if field_type == 'ndarray':
-                    if 'shape' not in schema_content[field]:
-                        error_data_dic[i] = "for schema, {} th data is wrong, " \
-                                            "data type for '{}' is not matched.".format(i, field)
-                    else:
-                        try:
-                            np.reshape(v[field], schema_content[field]['shape'])
-                        except ValueError:
-                            error_data_dic[i] = "for schema, {} th data is wrong, " \
-                                                "data type for '{}' is not matched.".format(i, field)
-        error_data_dic = sorted(error_data_dic.items(), reverse=True)
-        for i, v in error_data_dic:
-            raw_data.pop(i)
-            logger.warning(v)
+        Args:
+           raw_data (Union[dict, numpy.ndarray]): Dict of the columns of the fields, or structured array.
+
+        Returns:
+            dict, the columns of the valid rows.
+            int, the number of valid rows.
+
+        Raises:
+            ParamTypeError: If a column is not list or numpy.ndarray.
+            ParamValueError: If the columns have different lengths or a field of schema has no column.
+        """
+        if isinstance(raw_data, np.ndarray):
+            columns = {name: raw_data[name] for name in raw_data.dtype.names}
+        else:
+            columns = dict(raw_data)
+        for field, column in columns.items():
+            if not isinstance(column, (list, tuple, np.ndarray)):
+                raise ParamTypeError('raw_data column {}'.format(field), 'list or numpy.ndarray')
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ParamValueError("The columns of raw data should have the same length, but got {}.".format(
+                {field: len(column) for field, column in columns.items()}))
+        num_rows = lengths.pop() if lengths else 0
+
+        valid = np.ones(num_rows, dtype=np.bool_)
+        schema_content = self._header.schema
+        for field in schema_content:
+            if field not in columns:
+                raise ParamValueError("For schema, there is not '{}' column in the raw data.".format(field))
+            field_valid = _check_column(columns[field], schema_content[field])
+            invalid_num = num_rows - int(np.count_nonzero(field_valid))
+            if invalid_num:
+                logger.warning("for schema, {} data is wrong, data type for '{}' is not matched.".format(
+                    invalid_num, field))
+                valid &= field_valid
+        if valid.all():
+            return columns, num_rows
+        index = np.flatnonzero(valid)
+        columns = {field: column[index] if isinstance(column, np.ndarray) else [column[i] for i in index]
+                   for field, column in columns.items()}
+        return columns, len(index)
 
     def open_and_set_header(self):
         """
@@ -215,12 +296,19 @@ class FileWriter:
         Write raw data and generate sequential pair of MindRecord File and \
         validate data based on predefined schema by default.
 
+        The raw data can also be given by columns, as a dict of the lists or the numpy arrays of the values of
+        each field, or as a numpy structured array. The columns are validated at once and are not turned into
+        dicts of rows, which is faster for large batches. The array of a blob field can have several dimensions,
+        the bytes of each row being the blob.
+
         Args:
-           raw_data (list[dict]): List of raw data.
+           raw_data (Union[list[dict], dict, numpy.ndarray]): List of raw data, dict of the columns of raw data,
+               or structured array of raw data.
            parallel_writer (bool, optional): Load data parallel if it equals to True (default=False).
 
         Raises:
             ParamTypeError: If index field is invalid.
+            ParamValueError: If the columns of raw data are invalid.
             MRMOpenError: If failed to open MindRecord File.
             MRMValidateDataError: If data does not match blob fields.
             MRMSetHeaderError: If failed to set header.
@@ -230,6 +318,9 @@ class FileWriter:
             self._writer.open(self._paths)
         if not self._writer.get_shard_header():
             self._writer.set_shard_header(self._header)
+        if isinstance(raw_data, dict) or (isinstance(raw_data, np.ndarray) and raw_data.dtype.names):
+            columns, num_rows = self._verify_columns(raw_data)
+            return self._writer.write_columns(columns, num_rows, True, parallel_writer)
         if not isinstance(raw_data, list):
             raise ParamTypeError('raw_data', 'list')
         for each_raw in raw_data:
@@ -0,0 +1,293 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+This module is to read records from mindrecord by position or by index field.
+"""
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import numpy as np
+
+import mindspore._c_mindrecord as ms
+from mindspore import log as logger
+from .shardutils import populate_data, check_filename, MAX_HEADER_SIZE
+from .common.exceptions import ParamValueError, ParamTypeError, MRMOpenError
+
+__all__ = ['RandomAccessReader']
+
+# length of the sizes written before the raw data and the blob data of a row
+INT64_LEN = 8
+# the blob integer arrays are compressed since this version
+COMPRESS_VERSION = "3.0"
+
+_INDEX_COLUMNS = "ROW_ID, PAGE_ID_RAW, PAGE_OFFSET_RAW, PAGE_OFFSET_RAW_END, " \
+                 "PAGE_ID_BLOB, PAGE_OFFSET_BLOB, PAGE_OFFSET_BLOB_END"
+_INT_TYPES = ("<i1", "<i2", "<i4", "<i8")
+
+
+def _read_header(file_name):
+    """Reads the json header at the start of a MindRecord File."""
+    try:
+        with open(file_name, "rb") as f:
+            header_size = struct.unpack("<Q", f.read(INT64_LEN))[0]
+            if header_size > MAX_HEADER_SIZE:
+                raise MRMOpenError
+            return json.loads(f.read(header_size).decode())
+    except (OSError, struct.error, ValueError):
+        logger.error("Failed to read the header of {}.".format(file_name))
+        raise MRMOpenError
+
+
+def _uncompress_int(data, dtype):
+    """
+    Restores an integer array of a blob compressed by the writer.
+
+    The compressed array is the number of elements in 4 bytes big endian, a bitmap of the size of each element,
+    2 bits per element giving 1, 2, 4 or 8 bytes, and the elements in little endian.
+    """
+    num = int.from_bytes(data[:4], "big")
+    bitmap_size = (num + 3) // 4
+    src = np.frombuffer(data, np.uint8)
+    bitmap = src[4:4 + bitmap_size]
+    int_types = ((bitmap[:, None] >> np.array([6, 4, 2, 0], np.uint8)) & 3).reshape(-1)[:num]
+    widths = np.left_shift(1, int_types.astype(np.int64))
+    starts = 4 + bitmap_size + np.cumsum(widths) - widths
+    result = np.empty(num, dtype)
+    for int_type, int_dtype in enumerate(_INT_TYPES):
+        selected = int_types == int_type
+        if selected.any():
+            positions = starts[selected, None] + np.arange(1 << int_type)
+            result[selected] = src[positions].view(int_dtype).reshape(-1)
+    return result.tobytes()
+
+
+class RandomAccessReader:
+    """
+    Class to read the records of MindRecord File series by position or by index field.
+
+    The offsets of all the records in the pages, i.e. the page table, are read once from the index databases of
+    the files and kept in memory, and the files are mapped with `mmap`, so reading a record is one read of its raw
+    data and one read of its blob data, without scanning. The records are numbered in the order of the files,
+    then of the rows in each file.
+
+    Args:
+        file_name (str, list[str]): One of MindRecord File or file list.
+        columns (list[str], optional): List of fields which correspond data would be read (default=None).
+
+    Raises:
+        ParamValueError: If file_name or columns is invalid.
+        MRMOpenError: If failed to open MindRecord File or its index database.
+
+    Examples:
+        >>> reader = RandomAccessReader("/path/to/imagenet.mindrecord")
+        >>> record = reader[10]
+        >>> records = reader.take([5, 2, 7])
+        >>> records = reader.get_by_index_field("file_name", "001.jpg")
+    """
+    def __init__(self, file_name, columns=None):
+        if isinstance(file_name, list):
+            for f in file_name:
+                check_filename(f)
+            header = _read_header(file_name[0])
+            file_names = file_name
+        else:
+            check_filename(file_name)
+            header = _read_header(file_name)
+            parent_dir = os.path.dirname(os.path.realpath(file_name))
+            file_names = [os.path.join(parent_dir, address) for address in header["shard_addresses"]]
+        if columns:
+            if not isinstance(columns, list):
+                raise ParamTypeError('columns', 'list')
+        else:
+            columns = None
+
+        self._schema = header["schema"][0]["schema"]
+        self._blob_fields = header["schema"][0]["blob_fields"]
+        if columns:
+            for column in columns:
+                if column not in self._schema:
+                    raise ParamValueError("Column {} is not in schema.".format(column))
+        self._columns = columns
+        self._index_fields = {field["index_field"]: field["schema_id"] for field in header["index_fields"]}
+        compress = header["version"] >= COMPRESS_VERSION and \
+            any(field in self._blob_fields and "shape" in value and value["type"] in ("int32", "int64")
+                for field, value in self._schema.items())
+        self._compressed_fields = {field for field in self._blob_fields if compress and
+                                   self._schema[field]["type"] in ("int32", "int64")}
+        self._loaded_blob_fields = [column for column in columns if column in self._blob_fields] \
+            if columns else self._blob_fields
+
+        self._files = []
+        self._mmaps = []
+        self._dbs = []
+        self._lock = threading.Lock()
+        try:
+            self._open(file_names)
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, file_names):
+        """Maps the files and reads the offsets of their records from the index databases."""
+        row_ids = []
+        offsets = []
+        for shard_id, file_name in enumerate(file_names):
+            header = _read_header(file_name)
+            header_size = header["header_size"]
+            page_size = header["page_size"]
+            if not os.path.isfile(file_name + ".db"):
+                logger.error("Index database of {} does not exist.".format(file_name))
+                raise MRMOpenError
+            db = sqlite3.connect(file_name + ".db", check_same_thread=False)
+            self._dbs.append(db)
+            f = open(file_name, "rb")
+            self._files.append(f)
+            self._mmaps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+            rows = np.array(db.execute("SELECT DISTINCT {} FROM INDEXES ORDER BY ROW_ID;".format(_INDEX_COLUMNS))
+                            .fetchall(), dtype=np.int64).reshape(-1, 7)
+            row_ids.append(rows[:, 0])
+            shard_offsets = np.empty((rows.shape[0], 5), np.int64)
+            shard_offsets[:, 0] = shard_id
+            shard_offsets[:, 1] = header_size + page_size * rows[:, 1] + rows[:, 2] + INT64_LEN
+            shard_offsets[:, 2] = header_size + page_size * rows[:, 1] + rows[:, 3]
+            shard_offsets[:, 3] = header_size + page_size * rows[:, 4] + rows[:, 5] + INT64_LEN
+            shard_offsets[:, 4] = header_size + page_size * rows[:, 4] + rows[:, 6]
+            offsets.append(shard_offsets)
+        self._row_ids = row_ids
+        self._shard_starts = np.cumsum([0] + [len(ids) for ids in row_ids])
+        # shard id, start and end of the raw data, start and end of the blob data of each record
+        self._offsets = np.concatenate(offsets) if offsets else np.empty((0, 5), np.int64)
+
+    def __len__(self):
+        return self._offsets.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Read the record at a position.
+
+        Args:
+            index (int): Position of the record, negative to count from the end.
+
+        Returns:
+            dict, the record.
+
+        Raises:
+            ParamTypeError: If index is not int.
+            IndexError: If index is out of range.
+        """
+        if not isinstance(index, (int, np.integer)) or isinstance(index, bool):
+            raise ParamTypeError('index', 'int')
+        if index < -len(self) or index >= len(self):
+            raise IndexError("Index {} is out of range of {} records.".format(index, len(self)))
+        return self._read(int(index) % len(self))
+
+    def take(self, indices):
+        """
+        Read the records at several positions.
+
+        The records are read in the order of their offsets in the files, which makes the reads of the pages
+        sequential for sorted or clustered positions.
+
+        Args:
+            indices (Union[list[int], numpy.ndarray]): Positions of the records.
+
+        Returns:
+            list[dict], the records in the order of indices.
+
+        Raises:
+            IndexError: If one of indices is out of range.
+        """
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        if indices.size and (indices.min() < -len(self) or indices.max() >= len(self)):
+            raise IndexError("Indices are out of range of {} records.".format(len(self)))
+        indices = indices % max(len(self), 1)
+        records = [None] * indices.size
+        order = np.lexsort((self._offsets[indices, 1], self._offsets[indices, 0]))
+        for i in order:
+            records[i] = self._read(indices[i])
+        return records
+
+    def get_by_index_field(self, field, value):
+        """
+        Read the records whose index field equals value, looked up in the index databases.
+
+        Args:
+            field (str): Index field, added by `FileWriter.add_index`.
+            value (Union[int, float, str]): Value of the field.
+
+        Returns:
+            list[dict], the records in the order of their positions.
+
+        Raises:
+            ParamValueError: If field is not an index field.
+        """
+        if not isinstance(field, str):
+            raise ParamTypeError('field', 'str')
+        if field not in self._index_fields:
+            raise ParamValueError("Field '{}' is not an index field.".format(field))
+        # the name of the column written by the index generator
+        column = field.replace('-', '_').replace('.', '_') + "_" + str(self._index_fields[field])
+        if isinstance(value, np.generic):
+            value = value.item()
+        indices = []
+        with self._lock:
+            for shard_id, db in enumerate(self._dbs):
+                rows = db.execute("SELECT DISTINCT ROW_ID FROM INDEXES WHERE {} = ?;".format(column),
+                                  (value,)).fetchall()
+                row_ids = np.array([row[0] for row in rows], dtype=np.int64)
+                indices.append(self._shard_starts[shard_id] + np.searchsorted(self._row_ids[shard_id], row_ids))
+        if not indices:
+            return []
+        return self.take(np.sort(np.concatenate(indices)))
+
+    def _read(self, index):
+        """Read the raw data and the blob data of a record and rebuild it."""
+        shard_id, raw_start, raw_end, blob_start, blob_end = (int(x) for x in self._offsets[index])
+        page = self._mmaps[shard_id]
+        raw = ms.from_msgpack(page[raw_start:raw_end])
+        if self._columns:
+            raw = {k: v for k, v in raw.items() if k in self._columns}
+        blob = self._split_blob(page[blob_start:blob_end]) if self._loaded_blob_fields else []
+        return populate_data(raw, blob, self._columns, self._blob_fields, self._schema)
+
+    def _split_blob(self, blob):
+        """Splits the blob data of a record by field, in the order of the loaded blob fields."""
+        if len(self._blob_fields) == 1:
+            fields = {self._blob_fields[0]: blob}
+        else:
+            fields = {}
+            pos = 0
+            for field in self._blob_fields:
+                size = int.from_bytes(blob[pos:pos + INT64_LEN], "big")
+                fields[field] = blob[pos + INT64_LEN:pos + INT64_LEN + size]
+                pos += INT64_LEN + size
+        return [_uncompress_int(fields[field], self._schema[field]["type"]) if field in self._compressed_fields
+                else fields[field] for field in self._loaded_blob_fields]
+
+    def close(self):
+        """Unmap the files and close the index databases."""
+        for page in self._mmaps:
+            page.close()
+        for f in self._files:
+            f.close()
+        for db in self._dbs:
+            db.close()
+        self._mmaps = []
+        self._files = []
+        self._dbs = []
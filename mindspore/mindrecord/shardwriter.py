@@ -23,6 +23,63 @@ from .common.exceptions import MRMOpenError, MRMOpenForAppendError, MRMInvalidHe
 
 __all__ = ['ShardWriter']
 
+
+def _blob_value(value):
+    """Get a blob value as an object exporting its bytes."""
+    if isinstance(value, np.ndarray):
+        return np.ascontiguousarray(value).reshape(-1).view(np.uint8)
+    return value
+
+
+def pack_blobs(blob_columns, num_rows):
+    """
+    Pack the blob fields of rows into one buffer.
+
+    A single blob field is stored as is, each of several ones is preceded by its size in 8 bytes big-endian.
+    The buffer is allocated once for all the rows, a single blob field given as an ndarray is not even copied.
+
+    Args:
+        blob_columns (list): The values of each blob field, a list of bytes or ndarray, or an ndarray of the
+            rows whose bytes are the blobs.
+        num_rows (int): Number of rows.
+
+    Returns:
+        Union[bytearray, numpy.ndarray], the buffer.
+        list[int], the offsets of the blobs of the rows in the buffer and the end of the last one, empty if there
+        is no blob field or no row.
+    """
+    if not blob_columns or not num_rows:
+        return bytearray(), []
+    prefix_size = 0 if len(blob_columns) == 1 else 8
+    columns = []
+    sizes = np.zeros(num_rows, dtype=np.int64)
+    for column in blob_columns:
+        if isinstance(column, np.ndarray) and column.dtype != np.object_:
+            column = np.ascontiguousarray(column).reshape(num_rows, -1).view(np.uint8)
+            lengths = np.full(num_rows, column.shape[1], dtype=np.int64)
+        else:
+            column = [_blob_value(value) for value in column]
+            lengths = np.fromiter((memoryview(value).nbytes for value in column), dtype=np.int64, count=num_rows)
+        columns.append((column, lengths))
+        sizes += lengths + prefix_size
+    offsets = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+
+    if len(columns) == 1 and isinstance(columns[0][0], np.ndarray):
+        return columns[0][0].reshape(-1), offsets.tolist()
+    buffer = bytearray(int(offsets[-1]))
+    view = memoryview(buffer)
+    positions = offsets[:-1].copy()
+    for column, lengths in columns:
+        for position, value, length in zip(positions.tolist(), column, lengths.tolist()):
+            if prefix_size:
+                view[position:position + prefix_size] = length.to_bytes(prefix_size, 'big')
+                position += prefix_size
+            view[position:position + length] = value
+        positions += lengths + prefix_size
+    view.release()
+    return buffer, offsets.tolist()
+
 class ShardWriter:
     """
     Wrapper class which is represent shardWrite class in c++ module.
@@ -153,49 +210,54 @@ class ShardWriter:
         Raises:
             MRMWriteCVError: If failed to write cv type dataset.
         """
-        blob_data = []
+        blob_fields = self._header.blob_fields
+        raw_fields = self._header.schema.keys() - blob_fields
         raw_data = []
-        # slice data to blob data and raw data
+        # filter raw data according to schema
         for item in data:
-            row_blob = self._merge_blob({field: item[field] for field in self._header.blob_fields})
-            if row_blob:
-                blob_data.append(list(row_blob))
-            # filter raw data according to schema
-            row_raw = {field: item[field]
-                       for field in self._header.schema.keys() - self._header.blob_fields if field in item}
+            row_raw = {field: item[field] for field in raw_fields if field in item}
             if row_raw:
                 raw_data.append(row_raw)
-        raw_data = {0: raw_data} if raw_data else {}
-        ret = self._writer.write_raw_data(raw_data, blob_data, validate, parallel_writer)
-        if ret != ms.MSRStatus.SUCCESS:
-            logger.error("Failed to write dataset.")
-            raise MRMWriteDatasetError
-        return ret
+        blob_columns = [[item[field] for item in data] for field in blob_fields]
+        return self._write(raw_data, blob_columns, len(data), validate, parallel_writer)
 
-    def _merge_blob(self, blob_data):
+    def write_columns(self, columns, num_rows, validate=True, parallel_writer=False):
         """
-        Merge multiple blob data whose type is bytes or ndarray
+        Write raw data of cv dataset given by columns.
 
         Args:
-           blob_data (dict): Dict of blob data
+           columns (dict): The values of each field, list or numpy.ndarray of `num_rows` items. The ndarray of a
+               blob field can have several dimensions, the bytes of each row being a blob.
+           num_rows (int): Number of rows.
+           validate (bool, optional): verify data according schema if it equals to True.
+           parallel_writer (bool, optional): Load data parallel if it equals to True.
 
         Returns:
-            bytes, merged blob data
-        """
-        if len(blob_data) == 1:
-            values = [v for v in blob_data.values()]
-            return bytes(values[0])
-        # convert int to bytes
-        def int_to_bytes(x: int) -> bytes:
-            return x.to_bytes(8, 'big')
-        merged = bytes()
-        for _, v in blob_data.items():
-            # convert ndarray to bytes
-            if isinstance(v, np.ndarray):
-                v = v.tobytes()
-            merged += int_to_bytes(len(v))
-            merged += v
-        return merged
+            MSRStatus, SUCCESS or FAILED.
+
+        Raises:
+            MRMWriteCVError: If failed to write cv type dataset.
+        """
+        blob_fields = self._header.blob_fields
+        raw_fields = [field for field in self._header.schema if field not in blob_fields and field in columns]
+        raw_data = []
+        if raw_fields:
+            # the json conversion of the writer takes python scalars
+            raw_columns = [columns[field].tolist() if isinstance(columns[field], np.ndarray) else columns[field]
+                           for field in raw_fields]
+            raw_data = [dict(zip(raw_fields, values)) for values in zip(*raw_columns)]
+        blob_columns = [columns[field] for field in blob_fields]
+        return self._write(raw_data, blob_columns, num_rows, validate, parallel_writer)
+
+    def _write(self, raw_data, blob_columns, num_rows, validate, parallel_writer):
+        """Write the raw data with the blob data of the rows packed in one buffer."""
+        blob_buffer, blob_offsets = pack_blobs(blob_columns, num_rows)
+        raw_data = {0: raw_data} if raw_data else {}
+        ret = self._writer.write_packed_raw_data(raw_data, blob_buffer, blob_offsets, validate, parallel_writer)
+        if ret != ms.MSRStatus.SUCCESS:
+            logger.error("Failed to write dataset.")
+            raise MRMWriteDatasetError
+        return ret
 
     def commit(self):
         """
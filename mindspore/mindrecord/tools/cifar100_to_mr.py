@@ -17,6 +17,7 @@ Cifar100 convert tool for MindRecord.
 """
 
 from importlib import import_module
+from functools import partial
 import os
 import numpy as np
 
@@ -39,11 +40,13 @@ class Cifar100ToMR:
     Args:
         source (str): the cifar100 directory to be transformed.
         destination (str): the MindRecord file path to transform into.
+        num_workers (int, optional): number of threads encoding the images (default=None, the number of cpus
+            plus 4, at most 32).
 
     Raises:
-        ValueError: If source or destination is invalid.
+        ValueError: If source, destination or num_workers is invalid.
     """
-    def __init__(self, source, destination):
+    def __init__(self, source, destination, num_workers=None):
         check_filename(source)
         self.source = source
 
@@ -63,6 +66,8 @@ class Cifar100ToMR:
 
         check_filename(destination)
         self.destination = destination
+        check_num_workers(num_workers)
+        self.num_workers = num_workers
         self.writer = None
 
     def transform(self, fields=None):
@@ -95,35 +100,37 @@ class Cifar100ToMR:
         test_coarse_labels = cifar100_data.Test.coarse_labels
         logger.info("test images coarse label: {}".format(coarse_labels.shape))
 
-        data_list = _construct_raw_data(images, fine_labels, coarse_labels)
-        test_data_list = _construct_raw_data(test_images, test_fine_labels, test_coarse_labels)
+        if not cv2:
+            raise ModuleNotFoundError("opencv-python module not found, please use pip install it.")
+        construct_data = partial(_construct_raw_data, images, fine_labels, coarse_labels)
+        construct_test_data = partial(_construct_raw_data, test_images, test_fine_labels, test_coarse_labels)
 
-        if _generate_mindrecord(self.destination, data_list, fields, "img_train") != SUCCESS:
+        if _generate_mindrecord(self.destination, len(images), construct_data, fields, "img_train",
+                                self.num_workers) != SUCCESS:
             return FAILED
-        if _generate_mindrecord(self.destination + "_test", test_data_list, fields, "img_test") != SUCCESS:
+        if _generate_mindrecord(self.destination + "_test", len(test_images), construct_test_data, fields,
+                                "img_test", self.num_workers) != SUCCESS:
             return FAILED
         return SUCCESS
 
-def _construct_raw_data(images, fine_labels, coarse_labels):
+def _construct_raw_data(images, fine_labels, coarse_labels, indexes):
     """
-    Construct raw data from cifar100 data.
+    Construct raw data from cifar100 data, called in the threads of the pipeline.
 
     Args:
         images (list): image list from cifar100.
         fine_labels (list): fine label list from cifar100.
         coarse_labels (list): coarse label list from cifar100.
+        indexes (list[int]): indexes of the images to construct.
 
     Returns:
-        SUCCESS/FAILED, whether successfully written into MindRecord.
+        list[dict], the raw data of the images.
     """
-    if not cv2:
-        raise ModuleNotFoundError("opencv-python module not found, please use pip install it.")
-
     raw_data = []
-    for i, img in enumerate(images):
+    for i in indexes:
         fine_label = np.int(fine_labels[i][0])
         coarse_label = np.int(coarse_labels[i][0])
-        _, img = cv2.imencode(".jpeg", img[..., [2, 1, 0]])
+        _, img = cv2.imencode(".jpeg", images[i][..., [2, 1, 0]])
         row_data = {"id": int(i),
                     "data": img.tobytes(),
                     "fine_label": int(fine_label),
@@ -131,16 +138,18 @@ def _construct_raw_data(images, fine_labels, coarse_labels):
         raw_data.append(row_data)
     return raw_data
 
-def _generate_mindrecord(file_name, raw_data, fields, schema_desc):
+def _generate_mindrecord(file_name, num_images, construct_fn, fields, schema_desc, num_workers):
     """
     Generate MindRecord file from raw data.
 
     Args:
         file_name (str): File name of MindRecord File.
+        num_images (int): Number of images.
+        construct_fn (Function): Constructs the raw data of the images of a list of indexes.
         fields (list[str]): Fields would be set as index which
           could not belong to blob fields and type could not be 'array' or 'bytes'.
-        raw_data (dict): Dict of raw data.
         schema_desc (str): String of schema description.
+        num_workers (int): Number of threads encoding the images, None for the default.
 
     Returns:
         SUCCESS/FAILED, whether successfully written into MindRecord.
@@ -154,5 +163,5 @@ def _generate_mindrecord(file_name, raw_data, fields, schema_desc):
     writer.add_schema(schema, schema_desc)
     if fields and isinstance(fields, list):
         writer.add_index(fields)
-    writer.write_raw_data(raw_data)
+    write_parallel(writer, chunks(range(num_images), 1024), construct_fn, num_workers)
     return writer.commit()
@@ -17,6 +17,7 @@ Cifar10 convert tool for MindRecord.
 """
 
 from importlib import import_module
+from functools import partial
 import os
 import numpy as np
 
@@ -25,6 +26,7 @@ from .cifar10 import Cifar10
 from ..common.exceptions import PathNotExistsError
 from ..filewriter import FileWriter
 from ..shardutils import check_filename, SUCCESS, FAILED
+from .parallel_convert import check_num_workers, chunks, write_parallel
 try:
     cv2 = import_module("cv2")
 except ModuleNotFoundError:
@@ -39,11 +41,13 @@ class Cifar10ToMR:
     Args:
         source (str): the cifar10 directory to be transformed.
         destination (str): the MindRecord file path to transform into.
+        num_workers (int, optional): number of threads encoding the images (default=None, the number of cpus
+            plus 4, at most 32).
 
     Raises:
-        ValueError: If source or destination is invalid.
+        ValueError: If source, destination or num_workers is invalid.
     """
-    def __init__(self, source, destination):
+    def __init__(self, source, destination, num_workers=None):
         check_filename(source)
         self.source = source
 
@@ -63,6 +67,8 @@ class Cifar10ToMR:
 
         check_filename(destination)
         self.destination = destination
+        check_num_workers(num_workers)
+        self.num_workers = num_workers
         self.writer = None
 
     def transform(self, fields=None):
@@ -77,6 +83,8 @@ class Cifar10ToMR:
         """
         if fields and not isinstance(fields, list):
             raise ValueError("The parameter fields should be None or list")
+        if not cv2:
+            raise ModuleNotFoundError("opencv-python module not found, please use pip install it.")
 
         cifar10_data = Cifar10(self.source, False)
         cifar10_data.load_data()
@@ -91,49 +99,51 @@ class Cifar10ToMR:
         test_labels = cifar10_data.Test.labels
         logger.info("test images label: {}".format(test_labels.shape))
 
-        data_list = _construct_raw_data(images, labels)
-        test_data_list = _construct_raw_data(test_images, test_labels)
+        construct_data = partial(_construct_raw_data, images, labels)
+        construct_test_data = partial(_construct_raw_data, test_images, test_labels)
 
-        if _generate_mindrecord(self.destination, data_list, fields, "img_train") != SUCCESS:
+        if _generate_mindrecord(self.destination, len(images), construct_data, fields, "img_train",
+                                self.num_workers) != SUCCESS:
             return FAILED
-        if _generate_mindrecord(self.destination + "_test", test_data_list, fields, "img_test") != SUCCESS:
+        if _generate_mindrecord(self.destination + "_test", len(test_images), construct_test_data, fields,
+                                "img_test", self.num_workers) != SUCCESS:
             return FAILED
         return SUCCESS
 
-def _construct_raw_data(images, labels):
+def _construct_raw_data(images, labels, indexes):
     """
-    Construct raw data from cifar10 data.
+    Construct raw data from cifar10 data, called in the threads of the pipeline.
 
     Args:
         images (list): image list from cifar10.
         labels (list): label list from cifar10.
+        indexes (list[int]): indexes of the images to construct.
 
     Returns:
-        SUCCESS/FAILED, whether successfully written into MindRecord.
+        list[dict], the raw data of the images.
     """
-    if not cv2:
-        raise ModuleNotFoundError("opencv-python module not found, please use pip install it.")
-
     raw_data = []
-    for i, img in enumerate(images):
+    for i in indexes:
         label = np.int(labels[i][0])
-        _, img = cv2.imencode(".jpeg", img[..., [2, 1, 0]])
+        _, img = cv2.imencode(".jpeg", images[i][..., [2, 1, 0]])
         row_data = {"id": int(i),
                     "data": img.tobytes(),
                     "label": int(label)}
         raw_data.append(row_data)
     return raw_data
 
-def _generate_mindrecord(file_name, raw_data, fields, schema_desc):
+def _generate_mindrecord(file_name, num_images, construct_fn, fields, schema_desc, num_workers):
     """
     Generate MindRecord file from raw data.
 
     Args:
         file_name (str): File name of MindRecord File.
+        num_images (int): Number of images.
+        construct_fn (Function): Constructs the raw data of the images of a list of indexes.
         fields (list[str]): Fields would be set as index which
           could not belong to blob fields and type could not be 'array' or 'bytes'.
-        raw_data (dict): dict of raw data.
         schema_desc (str): String of schema description.
+        num_workers (int): Number of threads encoding the images, None for the default.
 
     Returns:
         SUCCESS/FAILED, whether successfully written into MindRecord.
@@ -147,5 +157,5 @@ def _generate_mindrecord(file_name, raw_data, fields, schema_desc):
     writer.add_schema(schema, schema_desc)
     if fields and isinstance(fields, list):
         writer.add_index(fields)
-    writer.write_raw_data(raw_data)
+    write_parallel(writer, chunks(range(num_images), 1024), construct_fn, num_workers)
     return writer.commit()
@@ -17,10 +17,12 @@ Csv format convert tool for MindRecord.
 """
 from importlib import import_module
 import os
+import numpy as np
 
 from mindspore import log as logger
 from ..filewriter import FileWriter
 from ..shardutils import check_filename
+from .parallel_convert import check_num_workers, write_parallel
 
 try:
     pd = import_module("pandas")
@@ -29,6 +31,19 @@ except ModuleNotFoundError:
 
 __all__ = ['CsvToMR']
 
+# number of rows of the chunks the csv file is read in
+CSV_CHUNK_SIZE = 10000
+
+
+def _merge_dtypes(dtypes):
+    """Merges the types of a column in the chunks like pandas reading the whole file, e.g. int64 and float64."""
+    if len(dtypes) == 1:
+        return dtypes.pop()
+    if dtypes <= {"int64", "float64"}:
+        return "float64"
+    return "object"
+
+
 class CsvToMR:
     """
     Class is for transformation from csv to MindRecord.
@@ -38,13 +53,21 @@ class CsvToMR:
         destination (str): the MindRecord file path to transform into.
         columns_list(list[str], optional): List of columns to be read(default=None).
         partition_number (int, optional): partition size (default=1).
+        num_workers (int, optional): number of threads converting the chunks of the csv file (default=None,
+            the number of cpus plus 4, at most 32).
+
+    Note:
+        The csv file is read twice in chunks of `CSV_CHUNK_SIZE` rows. The first pass infers the types of the
+        columns over the whole file, like pandas reading it at once, e.g. a column of integers with a missing
+        value is float64 and a column of bools with a missing value is string. The rows with a missing value in
+        a string column are skipped with a warning.
 
     Raises:
-        ValueError: If source, destination, partition_number is invalid.
+        ValueError: If source, destination, partition_number or num_workers is invalid.
         RuntimeError: If columns_list is invalid.
     """
 
-    def __init__(self, source, destination, columns_list=None, partition_number=1):
+    def __init__(self, source, destination, columns_list=None, partition_number=1, num_workers=None):
         if not pd:
             raise Exception("Module pandas is not found, please use pip install it.")
         if isinstance(source, str):
@@ -69,6 +92,10 @@ class CsvToMR:
         else:
             raise ValueError("The parameter partition_number must be int")
 
+        check_num_workers(num_workers)
+        self.num_workers = num_workers
+        self.schema = None
+
         self.writer = FileWriter(self.destination, self.partition_number)
 
     def _check_columns(self, columns, columns_name):
@@ -80,24 +107,36 @@ class CsvToMR:
             else:
                 raise ValueError("The parameter {} must be list of str.".format(columns_name))
 
-    def _get_schema(self, df):
+    def _infer_dtypes(self):
         """
-        Construct schema from df columns
+        Infer the types of the columns over the whole csv file, reading only the converted columns.
         """
+        header = pd.read_csv(self.source, nrows=0)
         if self.columns_list:
             for col in self.columns_list:
-                if col not in df.columns:
+                if col not in header.columns:
                     raise RuntimeError("The parameter columns_list is illegal, column {} does not exist.".format(col))
         else:
-            self.columns_list = df.columns
+            self.columns_list = list(header.columns)
 
+        dtypes = {col: set() for col in self.columns_list}
+        for chunk in pd.read_csv(self.source, usecols=self.columns_list, chunksize=CSV_CHUNK_SIZE):
+            for col in self.columns_list:
+                dtypes[col].add(str(chunk[col].dtype))
+        return {col: _merge_dtypes(col_dtypes) if col_dtypes else str(header[col].dtype)
+                for col, col_dtypes in dtypes.items()}
+
+    def _get_schema(self, dtypes):
+        """
+        Construct schema from the types of the columns
+        """
         schema = {}
         for col in self.columns_list:
-            if str(df[col].dtype) == 'int64':
+            if dtypes[col] == 'int64':
                 schema[col] = {"type": "int64"}
-            elif str(df[col].dtype) == 'float64':
+            elif dtypes[col] == 'float64':
                 schema[col] = {"type": "float64"}
-            elif str(df[col].dtype) == 'bool':
+            elif dtypes[col] == 'bool':
                 schema[col] = {"type": "int32"}
             else:
                 schema[col] = {"type": "string"}
@@ -105,16 +144,18 @@ class CsvToMR:
             raise RuntimeError("Failed to generate schema from csv file.")
         return schema
 
-    def _get_row_of_csv(self, df):
-        """Get row data from csv file."""
-        for _, r in df.iterrows():
-            row = {}
-            for col in self.columns_list:
-                if str(df[col].dtype) == 'bool':
-                    row[col] = int(r[col])
-                else:
-                    row[col] = r[col]
-            yield row
+    def _get_rows_of_chunk(self, df):
+        """Get the rows of a chunk of the csv file, converted column by column to the types of the schema."""
+        columns = []
+        for col in self.columns_list:
+            values = df[col]
+            field_type = self.schema[col]["type"]
+            if field_type == "int32":
+                values = values.astype(np.int32)
+            elif field_type == "float64" and values.dtype != np.float64:
+                values = values.astype(np.float64)
+            columns.append(values.tolist())
+        return [dict(zip(self.columns_list, row)) for row in zip(*columns)]
 
     def transform(self):
         """
@@ -127,9 +168,8 @@ class CsvToMR:
             raise IOError("Csv file {} do not exist.".format(self.source))
 
         pd.set_option('display.max_columns', None)
-        df = pd.read_csv(self.source)
-
-        csv_schema = self._get_schema(df)
+        csv_schema = self._get_schema(self._infer_dtypes())
+        self.schema = csv_schema
 
         logger.info("transformed MindRecord schema is: {}".format(csv_schema))
 
@@ -145,23 +185,12 @@ class CsvToMR:
         # add the index
         self.writer.add_index(list(self.columns_list))
 
-        csv_iter = self._get_row_of_csv(df)
-        batch_size = 256
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(csv_iter.__next__())
-                    transform_count += 1
-                self.writer.write_raw_data(data_list)
-                logger.info("transformed {} record...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    self.writer.write_raw_data(data_list)
-                    logger.info(
-                        "transformed {} record...".format(transform_count))
-                break
+        # the chunks are read one by one and converted by a pool of threads, the values of the string columns
+        # are read as str, and the types of the other columns of every chunk can be cast to the schema
+        string_columns = {col: str for col in self.columns_list if csv_schema[col]["type"] == "string"}
+        chunk_iter = pd.read_csv(self.source, usecols=self.columns_list, dtype=string_columns,
+                                 chunksize=CSV_CHUNK_SIZE)
+        write_parallel(self.writer, chunk_iter, self._get_rows_of_chunk, self.num_workers, queue_size=4)
 
         ret = self.writer.commit()
 
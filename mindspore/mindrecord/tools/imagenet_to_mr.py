@@ -22,6 +22,7 @@ from mindspore import log as logger
 from ..common.exceptions import PathNotExistsError
 from ..filewriter import FileWriter
 from ..shardutils import check_filename
+from .parallel_convert import check_num_workers, chunks, write_parallel
 
 __all__ = ['ImageNetToMR']
 
@@ -43,11 +44,13 @@ class ImageNetToMR:
         image_dir (str): image directory contains n02119789, n02100735, n02110185, n02096294 dir.
         destination (str): the MindRecord file path to transform into.
         partition_number (int, optional): partition size (default=1).
+        num_workers (int, optional): number of threads reading the images (default=None, the number of cpus
+            plus 4, at most 32).
 
     Raises:
-        ValueError: If map_file, image_dir or destination is invalid.
+        ValueError: If map_file, image_dir, destination or num_workers is invalid.
     """
-    def __init__(self, map_file, image_dir, destination, partition_number=1):
+    def __init__(self, map_file, image_dir, destination, partition_number=1, num_workers=None):
         check_filename(map_file)
         self.map_file = map_file
 
@@ -64,14 +67,17 @@ class ImageNetToMR:
         else:
             raise ValueError("The parameter partition_number must be int")
 
+        check_num_workers(num_workers)
+        self.num_workers = num_workers
+
         self.writer = FileWriter(self.destination, self.partition_number)
 
-    def _get_imagenet_as_dict(self):
+    def _get_imagenet_files(self):
         """
-        Get data from imagenet as dict.
+        Get the image files of imagenet with their labels.
 
         Yields:
-            data (dict of list): imagenet data list which contains dict.
+            tuple, the file name and the label of an image.
         """
         if not os.path.exists(self.map_file):
             raise IOError("map file {} not exists".format(self.map_file))
@@ -96,26 +102,34 @@ class ImageNetToMR:
         if not dir_paths:
             raise PathNotExistsError("not valid image dir in {}".format(self.image_dir))
 
-        # get the filename, label and image binary as a dict
         for label in dir_paths:
             for item in os.listdir(dir_paths[label]):
                 file_name = os.path.join(dir_paths[label], item)
                 if not item.endswith("JPEG") and not item.endswith("jpg"):
                     logger.warning("{} file is not suffix with JPEG/jpg, skip it.".format(file_name))
                     continue
-                data = {}
-                data["file_name"] = str(file_name)
-                data["label"] = int(label)
+                yield file_name, int(label)
+
+    @staticmethod
+    def _load_images(files):
+        """
+        Read a chunk of image files, called in the threads of the pipeline.
+
+        Args:
+            files (list[tuple]): the file names and the labels of the images.
 
-                # get the image data
-                image_file = open(file_name, "rb")
+        Returns:
+            list[dict], the file name, label and image binary of the images.
+        """
+        data_list = []
+        for file_name, label in files:
+            with open(file_name, "rb") as image_file:
                 image_bytes = image_file.read()
-                image_file.close()
-                if not image_bytes:
-                    logger.warning("The image file: {} is invalid.".format(file_name))
-                    continue
-                data["image"] = image_bytes
-                yield data
+            if not image_bytes:
+                logger.warning("The image file: {} is invalid.".format(file_name))
+                continue
+            data_list.append({"file_name": str(file_name), "label": label, "image": image_bytes})
+        return data_list
 
     def transform(self):
         """
@@ -144,22 +158,8 @@ class ImageNetToMR:
         # add the index
         self.writer.add_index(["label", "file_name"])
 
-        imagenet_iter = self._get_imagenet_as_dict()
-        batch_size = 256
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(imagenet_iter.__next__())
-                    transform_count += 1
-                self.writer.write_raw_data(data_list)
-                logger.info("transformed {} record...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    self.writer.write_raw_data(data_list)
-                    logger.info("transformed {} record...".format(transform_count))
-                break
+        # the images are read by a pool of threads, in chunks small enough to keep the queued images in memory
+        write_parallel(self.writer, chunks(self._get_imagenet_files(), 64), self._load_images, self.num_workers)
 
         ret = self.writer.commit()
 
@@ -24,6 +24,7 @@ import numpy as np
 from mindspore import log as logger
 from ..filewriter import FileWriter
 from ..shardutils import check_filename, SUCCESS, FAILED
+from .parallel_convert import check_num_workers, chunks, write_parallel
 
 try:
     cv2 = import_module("cv2")
@@ -42,12 +43,14 @@ class MnistToMR:
                       train-labels-idx1-ubyte.gz.
         destination (str): the MindRecord file directory to transform into.
         partition_number (int, optional): partition size (default=1).
+        num_workers (int, optional): number of threads encoding the images (default=None, the number of cpus
+            plus 4, at most 32).
 
     Raises:
-        ValueError: If source/destination/partition_number is invalid.
+        ValueError: If source/destination/partition_number/num_workers is invalid.
     """
 
-    def __init__(self, source, destination, partition_number=1):
+    def __init__(self, source, destination, partition_number=1, num_workers=None):
         self.image_size = 28
         self.num_channels = 1
 
@@ -72,6 +75,9 @@ class MnistToMR:
         else:
             raise ValueError("The parameter partition_number must be int")
 
+        check_num_workers(num_workers)
+        self.num_workers = num_workers
+
         self.writer_train = FileWriter("{}_train.mindrecord".format(destination), self.partition_number)
         self.writer_test = FileWriter("{}_test.mindrecord".format(destination), self.partition_number)
 
@@ -94,31 +100,22 @@ class MnistToMR:
             labels = np.frombuffer(buf, dtype=np.uint8).astype(np.int64)
             return labels
 
-    def _mnist_train_iterator(self):
+    @staticmethod
+    def _encode_images(items):
         """
-        get data from mnist train data and label file.
+        Encode a chunk of mnist images, called in the threads of the pipeline.
 
-        Yields:
-            data (dict of list): mnist data list which contains dict.
-        """
-        train_data = self._extract_images(self.train_data_filename_)
-        train_labels = self._extract_labels(self.train_labels_filename_)
-        for data, label in zip(train_data, train_labels):
-            _, img = cv2.imencode(".jpeg", data)
-            yield {"label": int(label), "data": img.tobytes()}
-
-    def _mnist_test_iterator(self):
-        """
-        get data from mnist test data and label file.
+        Args:
+            items (list[tuple]): the images and their labels.
 
-        Yields:
-            data (dict of list): mnist data list which contains dict.
+        Returns:
+            list[dict], mnist data list which contains dict.
         """
-        test_data = self._extract_images(self.test_data_filename_)
-        test_labels = self._extract_labels(self.test_labels_filename_)
-        for data, label in zip(test_data, test_labels):
+        data_list = []
+        for data, label in items:
             _, img = cv2.imencode(".jpeg", data)
-            yield {"label": int(label), "data": img.tobytes()}
+            data_list.append({"label": int(label), "data": img.tobytes()})
+        return data_list
 
     def _transform_train(self):
         """
@@ -142,22 +139,10 @@ class MnistToMR:
         # add the index
         self.writer_train.add_index(["label"])
 
-        train_iter = self._mnist_train_iterator()
-        batch_size = 256
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(train_iter.__next__())
-                    transform_count += 1
-                self.writer_train.write_raw_data(data_list)
-                logger.info("transformed {} record...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    self.writer_train.write_raw_data(data_list)
-                    logger.info("transformed {} record...".format(transform_count))
-                break
+        train_data = self._extract_images(self.train_data_filename_)
+        train_labels = self._extract_labels(self.train_labels_filename_)
+        write_parallel(self.writer_train, chunks(zip(train_data, train_labels), 1024), self._encode_images,
+                       self.num_workers)
 
         ret = self.writer_train.commit()
 
@@ -191,22 +176,10 @@ class MnistToMR:
         # add the index
         self.writer_test.add_index(["label"])
 
-        train_iter = self._mnist_test_iterator()
-        batch_size = 256
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(train_iter.__next__())
-                    transform_count += 1
-                self.writer_test.write_raw_data(data_list)
-                logger.info("transformed {} record...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    self.writer_test.write_raw_data(data_list)
-                    logger.info("transformed {} record...".format(transform_count))
-                break
+        test_data = self._extract_images(self.test_data_filename_)
+        test_labels = self._extract_labels(self.test_labels_filename_)
+        write_parallel(self.writer_test, chunks(zip(test_data, test_labels), 1024), self._encode_images,
+                       self.num_workers)
 
         ret = self.writer_test.commit()
 
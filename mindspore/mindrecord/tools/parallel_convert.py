@@ -0,0 +1,162 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Parallel conversion pipeline shared by the convert tools of MindRecord.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+
+from mindspore import log as logger
+
+__all__ = ['write_parallel', 'default_num_workers', 'check_num_workers', 'chunks']
+
+# interval of the progress reports in seconds
+REPORT_INTERVAL = 10
+
+
+def default_num_workers():
+    """The default number of the threads loading the records, they mostly wait for reads or in native code."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def check_num_workers(num_workers):
+    """Checks the number of threads given to a convert tool, None is the default."""
+    if num_workers is not None and (not isinstance(num_workers, int) or isinstance(num_workers, bool) or
+                                    num_workers <= 0):
+        raise ValueError("The parameter num_workers must be None or int greater than 0.")
+
+
+def chunks(items, chunk_size):
+    """Splits an iterable in lists of `chunk_size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _row_size(row):
+    return sum(len(value) for value in row.values() if isinstance(value, (bytes, str)))
+
+
+def _batch_stats(rows):
+    """Gets the number of records and the size of their strings and bytes of a list of dict or a dict of columns."""
+    if not isinstance(rows, dict):
+        return len(rows), sum(_row_size(row) for row in rows)
+    num_rows = 0
+    size = 0
+    for column in rows.values():
+        num_rows = len(column)
+        if not isinstance(column, np.ndarray):
+            size += sum(len(value) for value in column if isinstance(value, (bytes, str)))
+    return num_rows, size
+
+
+def write_parallel(writer, tasks, load_fn, num_workers=None, queue_size=None, executor=None):
+    """
+    Loads the records of tasks with a pool of threads and writes them into a FileWriter.
+
+    The tasks are taken from `tasks` by a producer thread, `load_fn` turns each one into a batch of records in
+    the pool, and the batches are written in the order of the tasks, each with one call of `write_raw_data`.
+    At most `queue_size` tasks are loaded ahead of the writer, which bounds the memory used. The number of
+    records written and the throughput are reported every `REPORT_INTERVAL` seconds.
+
+    Args:
+        writer (FileWriter): The writer, with its schema added.
+        tasks (Iterable): The tasks, e.g. lists of files to read or chunks of a table, taken lazily.
+        load_fn (Function): Loads the records of a task, returns a list of dict or a dict of columns.
+        num_workers (int, optional): Number of threads loading the records (default=None, the number of cpus
+            plus 4, at most 32).
+        queue_size (int, optional): Max number of tasks loaded ahead of the writer (default=None, twice
+            `num_workers`).
+        executor (Executor, optional): Executor running `load_fn` instead of the pool of threads, e.g. a
+            ProcessPoolExecutor of `num_workers` processes, it is not shut down (default=None).
+
+    Returns:
+        int, number of records written.
+    """
+    num_workers = num_workers or default_num_workers()
+    queue_size = queue_size or 2 * num_workers
+    loaded = queue.Queue(queue_size)
+    stop_event = threading.Event()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(num_workers)
+
+    def put(item):
+        while not stop_event.is_set():
+            try:
+                loaded.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for task in tasks:
+                if not put(executor.submit(load_fn, task)):
+                    return
+        except Exception as e:  # pylint: disable=broad-except
+            failed = Future()
+            failed.set_exception(e)
+            put(failed)
+        put(None)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    start_time = time.time()
+    last_report = start_time
+    count = 0
+    size = 0
+    try:
+        while True:
+            future = loaded.get()
+            if future is None:
+                break
+            rows = future.result()
+            if not rows:
+                continue
+            # the records not matching the schema are dropped by the writer
+            writer.write_raw_data(rows)
+            num_rows, rows_size = _batch_stats(rows)
+            count += num_rows
+            size += rows_size
+            now = time.time()
+            if now - last_report >= REPORT_INTERVAL:
+                logger.info("transformed {} records, {:.1f} records/s, {:.1f} MB/s...".format(
+                    count, count / (now - start_time), size / (now - start_time) / 1024 / 1024))
+                last_report = now
+    finally:
+        stop_event.set()
+        producer.join()
+        # the tasks not loaded yet are dropped when the writing failed
+        while not loaded.empty():
+            future = loaded.get_nowait()
+            if future is not None:
+                future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
+    total_time = max(time.time() - start_time, 1e-6)
+    logger.info("transformed {} records in {:.2f}s, {:.1f} records/s, {:.1f} MB/s.".format(
+        count, total_time, count / total_time, size / total_time / 1024 / 1024))
+    return count
@@ -0,0 +1,196 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+TFRecord reader without TensorFlow.
+
+A TFRecord file is a sequence of records, each one is the length of the data in 8 bytes little endian, the masked
+crc32c of the length in 4 bytes, the data and the masked crc32c of the data in 4 bytes. The data of the records
+converted here are serialized `tf.train.Example` protos, parsed with a protobuf class built from their descriptor.
+"""
+from importlib import import_module
+import mmap
+import os
+import struct
+
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+try:
+    crc32c_module = import_module("crc32c")    # just used to check the crc of the data of the records
+except ModuleNotFoundError:
+    crc32c_module = None
+
+__all__ = ['masked_crc32c', 'split_tfrecord', 'read_records', 'parse_example']
+
+HEADER_LEN = 12
+FOOTER_LEN = 4
+
+_CRC32C_POLY = 0x82F63B78
+_MASK_DELTA = 0xa282ead8
+
+
+def _make_crc32c_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ _CRC32C_POLY if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+def _crc32c(data):
+    if crc32c_module is not None:
+        return crc32c_module.crc32c(data)
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = _CRC32C_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+def masked_crc32c(data):
+    """The crc32c of data masked like in TFRecord files."""
+    crc = _crc32c(data)
+    return (((crc >> 15) | (crc << 17)) + _MASK_DELTA) & 0xFFFFFFFF
+
+
+def _build_example_class():
+    """Builds the class of the tf.train.Example protos from their descriptor."""
+    file_proto = descriptor_pb2.FileDescriptorProto(name="mindrecord_tfrecord_example.proto",
+                                                    package="mindrecord.tfrecord", syntax="proto3")
+    field_proto = descriptor_pb2.FieldDescriptorProto
+    for name, field_type in (("BytesList", field_proto.TYPE_BYTES), ("FloatList", field_proto.TYPE_FLOAT),
+                             ("Int64List", field_proto.TYPE_INT64)):
+        message = file_proto.message_type.add(name=name)
+        message.field.add(name="value", number=1, type=field_type, label=field_proto.LABEL_REPEATED)
+    feature = file_proto.message_type.add(name="Feature")
+    feature.oneof_decl.add(name="kind")
+    for number, name in enumerate(("bytes_list", "float_list", "int64_list"), 1):
+        feature.field.add(name=name, number=number, type=field_proto.TYPE_MESSAGE, label=field_proto.LABEL_OPTIONAL,
+                          type_name=".mindrecord.tfrecord." + name.title().replace("_", ""), oneof_index=0)
+    features = file_proto.message_type.add(name="Features")
+    entry = features.nested_type.add(name="FeatureEntry")
+    entry.options.map_entry = True
+    entry.field.add(name="key", number=1, type=field_proto.TYPE_STRING, label=field_proto.LABEL_OPTIONAL)
+    entry.field.add(name="value", number=2, type=field_proto.TYPE_MESSAGE, label=field_proto.LABEL_OPTIONAL,
+                    type_name=".mindrecord.tfrecord.Feature")
+    features.field.add(name="feature", number=1, type=field_proto.TYPE_MESSAGE, label=field_proto.LABEL_REPEATED,
+                       type_name=".mindrecord.tfrecord.Features.FeatureEntry")
+    example = file_proto.message_type.add(name="Example")
+    example.field.add(name="features", number=1, type=field_proto.TYPE_MESSAGE, label=field_proto.LABEL_OPTIONAL,
+                      type_name=".mindrecord.tfrecord.Features")
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    descriptor = pool.FindMessageTypeByName("mindrecord.tfrecord.Example")
+    if hasattr(message_factory, "GetMessageClass"):
+        return message_factory.GetMessageClass(descriptor)
+    return message_factory.MessageFactory(pool).GetPrototype(descriptor)
+
+
+_Example = _build_example_class()
+
+
+def parse_example(data):
+    """
+    Parse a serialized tf.train.Example.
+
+    Args:
+        data (bytes): The data of a record.
+
+    Returns:
+        Mapping of the feature names to the Feature protos, the kind of which is given by
+        `WhichOneof("kind")`, one of "bytes_list", "float_list" and "int64_list".
+    """
+    return _Example.FromString(data).features.feature
+
+
+def split_tfrecord(file_names, split_size):
+    """
+    Splits TFRecord files in byte ranges, read by `read_records`.
+
+    Args:
+        file_names (list[str]): The TFRecord files.
+        split_size (int): The size of the ranges in bytes.
+
+    Returns:
+        list[tuple], the file name, start and end of each range.
+    """
+    splits = []
+    for file_name in file_names:
+        file_size = os.path.getsize(file_name)
+        splits.extend((file_name, start, min(start + split_size, file_size))
+                      for start in range(0, file_size, split_size))
+    return splits
+
+
+def _check_header(data, pos, file_size):
+    """Gets the end of the record starting at pos, None if there is no valid header there."""
+    if pos + HEADER_LEN > file_size:
+        return None
+    length, length_crc = struct.unpack_from("<QI", data, pos)
+    if masked_crc32c(data[pos:pos + 8]) != length_crc:
+        return None
+    record_end = pos + HEADER_LEN + length + FOOTER_LEN
+    return record_end if record_end <= file_size else None
+
+
+def _find_record(data, start, end, file_size):
+    """Finds the first record starting in [start, end), a valid header followed by the end or another one."""
+    for pos in range(start, end):
+        record_end = _check_header(data, pos, file_size)
+        if record_end is not None and (record_end == file_size or
+                                       _check_header(data, record_end, file_size) is not None):
+            return pos
+    return end
+
+
+def read_records(file_name, start=0, end=None):
+    """
+    Reads the data of the records starting in a byte range of a TFRecord file.
+
+    A range not starting at 0 is synchronized on the first valid record header in it, so the ranges given by
+    `split_tfrecord` read each record once. The crc of the data is checked if the module crc32c is installed.
+
+    Args:
+        file_name (str): The TFRecord file.
+        start (int): The start of the range. Default: 0.
+        end (int): The end of the range, None for the end of the file. Default: None.
+
+    Yields:
+        bytes, the data of a record.
+
+    Raises:
+        ValueError: If a record is corrupted.
+    """
+    file_size = os.path.getsize(file_name)
+    end = file_size if end is None else min(end, file_size)
+    if start >= end:
+        return
+    with open(file_name, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        pos = start if start == 0 else _find_record(data, start, end, file_size)
+        while pos < end:
+            record_end = _check_header(data, pos, file_size)
+            if record_end is None:
+                raise ValueError("The record at {} of TFRecord file {} is corrupted.".format(pos, file_name))
+            record = data[pos + HEADER_LEN:record_end - FOOTER_LEN]
+            if crc32c_module is not None and \
+                    masked_crc32c(record) != struct.unpack_from("<I", data, record_end - FOOTER_LEN)[0]:
+                raise ValueError("The data of the record at {} of TFRecord file {} is corrupted."
+                                 .format(pos, file_name))
+            yield record
+            pos = record_end
@@ -15,54 +15,82 @@
 TFRecord convert tool for MindRecord
 """
 
-from importlib import import_module
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
 from string import punctuation
 import numpy as np
 
 from mindspore import log as logger
 from ..filewriter import FileWriter
 from ..shardutils import check_filename
+from .parallel_convert import check_num_workers, write_parallel
+from .tfrecord import split_tfrecord, read_records, parse_example
 
-try:
-    tf = import_module("tensorflow")    # just used to convert tfrecord to mindrecord
-except ModuleNotFoundError:
-    tf = None
+__all__ = ['TFRecordToMR', 'FixedLenFeature']
 
-__all__ = ['TFRecordToMR']
+# size of the ranges of the TFRecord files converted by each task in bytes
+SPLIT_SIZE = 1 << 24
+
+FixedLenFeature = namedtuple("FixedLenFeature", ["shape", "dtype", "default_value"])
+FixedLenFeature.__new__.__defaults__ = (None,)
+FixedLenFeature.__doc__ = """
+Description of a feature of fixed length, the same as `tf.io.FixedLenFeature`, to use without tensorflow.
+
+Args:
+    shape (list[int]): [] for a scalar, [n] for a list of n values.
+    dtype (str): The type of the feature, e.g. "string", "int64" or "float32".
+    default_value (optional): The value of the examples without the feature (default=None, they are invalid).
+"""
+
+# the description of a feature used to convert its values
+_FieldSpec = namedtuple("_FieldSpec", ["key", "name", "kind", "shape", "default_value", "mr_type", "is_bytes"])
+
+
+def _dtype_name(dtype):
+    """The name of a type given as str or tf.DType."""
+    return dtype if isinstance(dtype, str) else dtype.name
 
-SupportedTensorFlowVersion = '2.1.0'
 
 def _cast_type(value):
     """
     Cast complex data type to basic datatype for MindRecord to recognize.
 
     Args:
-        value: the TFRecord data type
+        value (str): the name of the TFRecord data type.
 
     Returns:
         str, which is MindRecord field type.
     """
-    tf_type_to_mr_type = {tf.string: "string",
-                          tf.int8: "int32",
-                          tf.int16: "int32",
-                          tf.int32: "int32",
-                          tf.int64: "int64",
-                          tf.uint8: "int32",
-                          tf.uint16: "int32",
-                          tf.uint32: "int64",
-                          tf.uint64: "int64",
-                          tf.float16: "float32",
-                          tf.float32: "float32",
-                          tf.float64: "float64",
-                          tf.double: "float64",
-                          tf.bool: "int32"}
-    unsupport_tf_type_to_mr_type = {tf.complex64: "None",
-                                    tf.complex128: "None"}
+    tf_type_to_mr_type = {"string": "string",
+                          "int8": "int32",
+                          "int16": "int32",
+                          "int32": "int32",
+                          "int64": "int64",
+                          "uint8": "int32",
+                          "uint16": "int32",
+                          "uint32": "int64",
+                          "uint64": "int64",
+                          "float16": "float32",
+                          "float32": "float32",
+                          "float64": "float64",
+                          "double": "float64",
+                          "bool": "int32"}
 
     if value in tf_type_to_mr_type:
         return tf_type_to_mr_type[value]
 
-    raise ValueError("Type " + value + " is not supported in MindRecord.")
+    raise ValueError("Type {} is not supported in MindRecord.".format(value))
+
+def _cast_feature_kind(value):
+    """Cast the name of the TFRecord data type to the kind of list storing it in tf.train.Feature."""
+    mr_type = _cast_type(value)
+    if mr_type == "string":
+        return "bytes_list"
+    if mr_type.startswith("int"):
+        return "int64_list"
+    return "float_list"
 
 def _cast_string_type_to_np_type(value):
     """Cast string type like: int32/int64/float32/float64 to np.int32/np.int64/np.float32/np.float64"""
@@ -97,38 +125,110 @@ def _cast_name(key):
     casted_key = ''.join(new_key)
     return casted_key
 
+def _feature_values(features, spec):
+    """Get the values of a feature of an example, checked against its description."""
+    if spec.key in features:
+        feature = features[spec.key]
+        kind = feature.WhichOneof("kind")
+        if kind != spec.kind:
+            raise ValueError("The response key: {} from TFRecord is {}, it should be {}."
+                             .format(spec.key, kind, spec.kind))
+        values = getattr(feature, kind).value
+    elif spec.default_value is not None:
+        values = np.asarray(spec.default_value).reshape(-1).tolist()
+    else:
+        raise ValueError("The response key: {} is not in the example of TFRecord.".format(spec.key))
+    expected_len = spec.shape[0] if spec.shape else 1
+    if len(values) != expected_len:
+        raise ValueError("The response key: {} from TFRecord has {} values, it should have {}."
+                         .format(spec.key, len(values), expected_len))
+    return values
+
+
+def _example_to_row(record, specs):
+    """Convert a serialized example to a dict with key to be fields in schema, and value to be data."""
+    features = parse_example(record)
+    ms_dict = {}
+    for spec in specs:
+        values = _feature_values(features, spec)
+        if spec.shape:
+            ms_dict[spec.name] = np.asarray(values, _cast_string_type_to_np_type(spec.mr_type))
+        elif spec.kind == "bytes_list":
+            ms_dict[spec.name] = values[0] if spec.is_bytes else str(values[0], encoding="utf-8")
+        elif spec.kind == "int64_list":
+            ms_dict[spec.name] = int(values[0])
+        else:
+            ms_dict[spec.name] = float(values[0])
+    return ms_dict
+
+
+def _load_columns(split, specs):
+    """Convert the examples of a range of a TFRecord file to a dict of columns, run in the worker processes."""
+    columns = {spec.name: [] for spec in specs}
+    num_rows = 0
+    for record in read_records(*split):
+        features = parse_example(record)
+        for spec in specs:
+            columns[spec.name].append(_feature_values(features, spec))
+        num_rows += 1
+    if not num_rows:
+        return []
+    for spec in specs:
+        values = columns[spec.name]
+        if spec.shape:
+            columns[spec.name] = np.array(values, _cast_string_type_to_np_type(spec.mr_type)).reshape(num_rows, -1)
+        elif spec.kind == "bytes_list":
+            columns[spec.name] = [value[0] if spec.is_bytes else str(value[0], encoding="utf-8") for value in values]
+        elif spec.kind == "int64_list":
+            columns[spec.name] = np.array([value[0] for value in values], np.int64)
+        else:
+            columns[spec.name] = np.array([value[0] for value in values], np.float64)
+    return columns
+
+
 class TFRecordToMR:
     """
     Class is for tranformation from TFRecord to MindRecord.
 
+    The TFRecord files are read without tensorflow: they are split in ranges of `SPLIT_SIZE` bytes, the examples of
+    which are parsed into columns by a pool of worker processes, and written in order by the FileWriter.
+
     Args:
-        source (str): the TFRecord file to be transformed.
+        source (str, list[str]): the TFRecord file or files to be transformed.
         destination (str): the MindRecord file path to tranform into.
         feature_dict (dict): a dictionary than states the feature type, i.e.
             feature_dict = {"xxxx": tf.io.FixedLenFeature([], tf.string), \
                             "yyyy": tf.io.FixedLenFeature([], tf.int64)}
 
+            or without tensorflow
+
+            feature_dict = {"xxxx": FixedLenFeature([], "string"), \
+                            "yyyy": FixedLenFeature([], "int64")}
+
             **Follow case which uses VarLenFeature not support**
 
             feature_dict = {"context": {"xxxx": tf.io.FixedLenFeature([], tf.string), \
                                         "yyyy": tf.io.VarLenFeature(tf.int64)}, \
                             "sequence": {"zzzz": tf.io.FixedLenSequenceFeature([], tf.float32)}}
         bytes_fields (list, optional): the bytes fields which are in feature_dict and can be images bytes.
+        partition_number (int, optional): number of the MindRecord files written (default=1).
+        num_workers (int, optional): number of processes parsing the examples (default=None, the number of cpus).
+
+    Note:
+        The crc of the data of the records is checked only if the module crc32c is installed.
 
     Raises:
         ValueError: If parameter is invalid.
-        Exception: when tensorflow module not found or version is not correct.
     """
-    def __init__(self, source, destination, feature_dict, bytes_fields=None):
-        if not tf:
-            raise Exception("Module tensorflow is not found, please use pip install it.")
-
-        if tf.__version__ < SupportedTensorFlowVersion:
-            raise Exception("Module tensorflow version must be greater or equal {}.".format(SupportedTensorFlowVersion))
-
-        if not isinstance(source, str):
-            raise ValueError("Parameter source must be string.")
-        check_filename(source)
+    def __init__(self, source, destination, feature_dict, bytes_fields=None, partition_number=1, num_workers=None):
+        if isinstance(source, str):
+            source = [source]
+        if not isinstance(source, list) or not source:
+            raise ValueError("Parameter source must be string or list of string.")
+        for item in source:
+            if not isinstance(item, str):
+                raise ValueError("Parameter source must be string or list of string.")
+            check_filename(item)
 
         if not isinstance(destination, str):
             raise ValueError("Parameter destination must be string.")
@@ -137,11 +237,17 @@ class TFRecordToMR:
         self.source = source
         self.destination = destination
 
+        if not isinstance(partition_number, int) or isinstance(partition_number, bool):
+            raise ValueError("Parameter partition_number must be int.")
+        self.partition_number = partition_number
+        check_num_workers(num_workers)
+        self.num_workers = num_workers
+
         if feature_dict is None or not isinstance(feature_dict, dict):
             raise ValueError("Parameter feature_dict is None or not dict.")
 
         for key, val in feature_dict.items():
-            if not isinstance(val, tf.io.FixedLenFeature):
+            if not hasattr(val, "shape") or not hasattr(val, "dtype") or not hasattr(val, "default_value"):
                 raise ValueError("Parameter feature_dict: {} only support FixedLenFeature.".format(feature_dict))
 
         self.feature_dict = feature_dict
@@ -161,7 +267,7 @@ class TFRecordToMR:
                 if not isinstance(self.feature_dict[item].shape, list):
                     raise ValueError("Parameter feature_dict[{}].shape should be a list.".format(item))
 
-                if self.feature_dict[item].dtype != tf.string:
+                if _dtype_name(self.feature_dict[item].dtype) != "string":
                     raise ValueError("Parameter bytes_field: {} should be tf.string in feature_dict.".format(item))
 
                 casted_bytes_field = _cast_name(item)
@@ -172,68 +278,36 @@ class TFRecordToMR:
         self.list_set = set()
 
         mindrecord_schema = {}
+        specs = []
         for key, val in self.feature_dict.items():
-            if not val.shape:
+            dtype = _dtype_name(val.dtype)
+            shape = list(val.shape)
+            if not shape:
                 self.scalar_set.add(_cast_name(key))
                 if _cast_name(key) in self.bytes_fields_list:
                     mindrecord_schema[_cast_name(key)] = {"type": "bytes"}
                 else:
-                    mindrecord_schema[_cast_name(key)] = {"type": _cast_type(val.dtype)}
+                    mindrecord_schema[_cast_name(key)] = {"type": _cast_type(dtype)}
             else:
-                if len(val.shape) != 1:
-                    raise ValueError("Parameter len(feature_dict[{}].shape) should be 1.")
-                if val.shape[0] < 1:
+                if len(shape) != 1:
+                    raise ValueError("Parameter len(feature_dict[{}].shape) should be 1.".format(key))
+                if shape[0] < 1:
                     raise ValueError("Parameter feature_dict[{}].shape[0] should > 0".format(key))
-                if val.dtype == tf.string:
+                if dtype == "string":
                     raise ValueError("Parameter feautre_dict[{}].dtype is tf.string which shape[0] " \
                         "is not None. It is not supported.".format(key))
                 self.list_set.add(_cast_name(key))
-                mindrecord_schema[_cast_name(key)] = {"type": _cast_type(val.dtype), "shape": [val.shape[0]]}
+                mindrecord_schema[_cast_name(key)] = {"type": _cast_type(dtype), "shape": [shape[0]]}
+            specs.append(_FieldSpec(key, _cast_name(key), _cast_feature_kind(dtype), shape, val.default_value,
+                                    _cast_type(dtype), _cast_name(key) in self.bytes_fields_list))
         self.mindrecord_schema = mindrecord_schema
-
-    def _parse_record(self, example):
-        """Returns features for a single example"""
-        features = tf.io.parse_single_example(example, features=self.feature_dict)
-        return features
-
-    def _get_data_when_scalar_field(self, ms_dict, cast_key, key, val):
-        """put data in ms_dict when field type is string"""
-        if isinstance(val.numpy(), (np.ndarray, list)):
-            raise ValueError("The response key: {}, value: {} from TFRecord should be a scalar.".format(key, val))
-        if self.feature_dict[key].dtype == tf.string:
-            if cast_key in self.bytes_fields_list:
-                ms_dict[cast_key] = val.numpy()
-            else:
-                ms_dict[cast_key] = str(val.numpy(), encoding="utf-8")
-        elif _cast_type(self.feature_dict[key].dtype).startswith("int"):
-            ms_dict[cast_key] = int(val.numpy())
-        else:
-            ms_dict[cast_key] = float(val.numpy())
+        self._specs = specs
 
     def tfrecord_iterator(self):
         """Yield a dict with key to be fields in schema, and value to be data."""
-        dataset = tf.data.TFRecordDataset(self.source)
-        dataset = dataset.map(self._parse_record)
-        iterator = dataset.__iter__()
-        index_id = 0
-        try:
-            for features in iterator:
-                ms_dict = {}
-                index_id = index_id + 1
-                for key, val in features.items():
-                    cast_key = _cast_name(key)
-                    if cast_key in self.scalar_set:
-                        self._get_data_when_scalar_field(ms_dict, cast_key, key, val)
-                    else:
-                        if not isinstance(val.numpy(), np.ndarray) and not isinstance(val.numpy(), list):
-                            raise ValueError("The response key: {}, value: {} from TFRecord should be a ndarray or " \
-                                "list.".format(key, val))
-                        # list set
-                        ms_dict[cast_key] = \
-                            np.asarray(val, _cast_string_type_to_np_type(self.mindrecord_schema[cast_key]["type"]))
-                yield ms_dict
-        except tf.errors.InvalidArgumentError:
-            raise ValueError("TFRecord feature_dict parameter error.")
+        for source in self.source:
+            for record in read_records(source):
+                yield _example_to_row(record, self._specs)
 
     def transform(self):
         """
@@ -242,28 +316,14 @@ class TFRecordToMR:
         Returns:
             SUCCESS/FAILED, whether successfuly written into MindRecord.
         """
-        writer = FileWriter(self.destination)
+        writer = FileWriter(self.destination, self.partition_number)
         logger.info("Transformed MindRecord schema is: {}, TFRecord feature dict is: {}"
                     .format(self.mindrecord_schema, self.feature_dict))
 
         writer.add_schema(self.mindrecord_schema, "TFRecord to MindRecord")
 
-        tf_iter = self.tfrecord_iterator()
-        batch_size = 256
-
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(tf_iter.__next__())
-                    transform_count += 1
-
-                writer.write_raw_data(data_list)
-                logger.info("Transformed {} records...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    writer.write_raw_data(data_list)
-                    logger.info("Transformed {} records...".format(transform_count))
-                break
+        num_workers = self.num_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(num_workers) as executor:
+            write_parallel(writer, split_tfrecord(self.source, SPLIT_SIZE), partial(_load_columns, specs=self._specs),
+                           num_workers, executor=executor)
         return writer.commit()
@@ -26,6 +26,7 @@ from .recall import Recall
 from .fbeta import Fbeta, F1
 from .topk import TopKCategoricalAccuracy, Top1CategoricalAccuracy, Top5CategoricalAccuracy
 from .loss import Loss
+from .auc import AUC
 
 __all__ = [
     "names", "get_metric_fn",
@@ -40,6 +41,7 @@ __all__ = [
     "Top1CategoricalAccuracy",
     "Top5CategoricalAccuracy",
     "Loss",
+    "AUC",
 ]
 
 __factory__ = {
@@ -54,6 +56,7 @@ __factory__ = {
     'mae': MAE,
     'mse': MSE,
     'loss': Loss,
+    'auc': AUC,
 }
 
 
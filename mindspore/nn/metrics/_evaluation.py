@@ -19,6 +19,28 @@ from .metric import Metric
 _eval_types = {'classification', 'multilabel'}
 
 
+def _count_classes(y_pred, y, class_num):
+    """
+    Counts the predictions, the labels and the correct predictions of each class.
+
+    The counts are computed with `np.bincount` on the class indices, without building one-hot matrices.
+
+    Args:
+        y_pred (numpy.ndarray): Predict array of shape (N, C, ...).
+        y (numpy.ndarray): Target class indices of shape (N, ...).
+        class_num (int): The number of classes C.
+
+    Returns:
+        Tuple of 3 arrays of shape (C,), the numbers of positives, actual positives and true positives.
+    """
+    y = y.reshape(-1).astype(np.int64)
+    indices = y_pred.argmax(axis=1).reshape(-1)
+    positives = np.bincount(indices, minlength=class_num)
+    actual_positives = np.bincount(y, minlength=class_num)
+    true_positives = np.bincount(y[indices == y], minlength=class_num)
+    return positives, actual_positives, true_positives
+
+
 class EvaluationBase(Metric):
     """
     Base class of evaluation.
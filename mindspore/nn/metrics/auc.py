@@ -0,0 +1,148 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""AUC."""
+import numpy as np
+from .metric import Metric
+
+
+class AUC(Metric):
+    r"""
+    Calculates the area under the ROC curve of binary classification.
+
+    The AUC is the probability that a random positive sample gets a higher score than a random negative one.
+    By default, the scores in :math:`[0, 1]` are counted in `num_bins` equal bins, separately for the positive
+    and the negative samples, so `update` is O(batch) and the memory does not grow with the number of samples.
+    The pairs falling in the same bin are counted as half ordered, which bounds the error of the result by the
+    fraction of such pairs. The histograms of metrics updated on different devices can be added with `merge`.
+    With `exact=True`, all the scores are kept and the AUC is computed exactly from their ranks, which is meant
+    for small evaluation sets.
+
+    Note:
+        The method `update` must be called with the form `update(y_pred, y)`.
+
+    Args:
+        num_bins (int): Number of bins of the histograms of the scores. Default: 10000.
+        exact (bool): Whether to keep all the scores and compute the exact AUC. Default: False.
+
+    Raises:
+        TypeError: If `num_bins` is not int or `exact` is not bool.
+        ValueError: If `num_bins` is less than 1.
+
+    Examples:
+        >>> x = Tensor(np.array([0.1, 0.4, 0.35, 0.8]), mindspore.float32)
+        >>> y = Tensor(np.array([0, 0, 1, 1]), mindspore.float32)
+        >>> metric = nn.AUC()
+        >>> metric.clear()
+        >>> metric.update(x, y)
+        >>> auc = metric.eval()
+    """
+    def __init__(self, num_bins=10000, exact=False):
+        super(AUC, self).__init__()
+        if not isinstance(num_bins, int) or isinstance(num_bins, bool):
+            raise TypeError('num_bins should be integer type, but got {}'.format(type(num_bins)))
+        if num_bins < 1:
+            raise ValueError('num_bins must be at least 1, but got {}'.format(num_bins))
+        if not isinstance(exact, bool):
+            raise TypeError('exact should be bool type, but got {}'.format(type(exact)))
+        self.num_bins = num_bins
+        self.exact = exact
+        self.clear()
+
+    def clear(self):
+        """Clears the internal evaluation result."""
+        self.positive_counts = np.zeros(self.num_bins, dtype=np.int64)
+        self.negative_counts = np.zeros(self.num_bins, dtype=np.int64)
+        self._scores = []
+        self._labels = []
+
+    def update(self, *inputs):
+        """
+        Updates the internal evaluation result with `y_pred` and `y`.
+
+        Args:
+            inputs: Input `y_pred` and `y`. `y_pred` and `y` are Tensor, list or numpy.ndarray of the same
+                number of elements. `y_pred` contains the scores of the samples in :math:`[0, 1]`, e.g. the
+                probabilities of being positive, values out of this range are counted in the first or the last
+                bin. `y` contains the labels of the samples, 1 for positive and 0 for negative.
+
+        Raises:
+            ValueError: If the number of the input is not 2, their sizes differ or `y` is not 0 or 1.
+        """
+        if len(inputs) != 2:
+            raise ValueError('AUC need 2 inputs (y_pred, y), but got {}'.format(len(inputs)))
+        y_pred = self._convert_data(inputs[0]).reshape(-1)
+        y = self._convert_data(inputs[1]).reshape(-1)
+        if y_pred.shape != y.shape:
+            raise ValueError('AUC need y_pred and y of the same size, but got {} and {}'.format(y_pred.size, y.size))
+        if not np.equal(y ** 2, y).all():
+            raise ValueError('For AUC, the values of y must be 1 or 0.')
+        positive = y.astype(np.bool_)
+
+        if self.exact:
+            self._scores.append(y_pred.astype(np.float64))
+            self._labels.append(positive)
+        bins = np.clip(y_pred * self.num_bins, 0, self.num_bins - 1).astype(np.int64)
+        self.positive_counts += np.bincount(bins[positive], minlength=self.num_bins)
+        self.negative_counts += np.bincount(bins[~positive], minlength=self.num_bins)
+
+    def merge(self, *others):
+        """
+        Adds the samples of other AUC metrics to this one, e.g. the metrics updated on other devices.
+
+        Args:
+            others (AUC): Metrics with the same `num_bins` and `exact`.
+
+        Raises:
+            ValueError: If a metric is not an AUC with the same `num_bins` and `exact`.
+        """
+        for other in others:
+            if not isinstance(other, AUC) or other.num_bins != self.num_bins or other.exact != self.exact:
+                raise ValueError('AUC can only merge AUC metrics with num_bins {} and exact {}'.format(
+                    self.num_bins, self.exact))
+            self.positive_counts += other.positive_counts
+            self.negative_counts += other.negative_counts
+            self._scores.extend(other._scores)
+            self._labels.extend(other._labels)
+
+    def eval(self):
+        """
+        Computes the AUC.
+
+        Returns:
+            Float, the computed result.
+
+        Raises:
+            RuntimeError: If there is no positive or no negative sample.
+        """
+        positives_num = self.positive_counts.sum()
+        negatives_num = self.negative_counts.sum()
+        if positives_num == 0 or negatives_num == 0:
+            raise RuntimeError('AUC can not be calculated without positive and negative samples, but got {} positive '
+                               'and {} negative samples.'.format(positives_num, negatives_num))
+
+        if self.exact:
+            scores = np.concatenate(self._scores)
+            labels = np.concatenate(self._labels)
+            # Mann-Whitney statistic, with the ranks of the tied scores averaged
+            _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+            average_ranks = np.cumsum(counts) - (counts - 1) / 2.0
+            positive_ranks = average_ranks[inverse[labels]].sum()
+            return float((positive_ranks - positives_num * (positives_num + 1) / 2.0) /
+                         (positives_num * negatives_num))
+
+        # for each bin, the negatives are below the positives of the higher bins and tied with the ones of the bin
+        positives_above = positives_num - np.cumsum(self.positive_counts)
+        ordered_pairs = (self.negative_counts * (positives_above + 0.5 * self.positive_counts)).sum()
+        return float(ordered_pairs / (positives_num * negatives_num))
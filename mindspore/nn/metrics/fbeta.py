@@ -14,9 +14,9 @@
 # ============================================================================
 """Fbeta."""
 import sys
-import numpy as np
 from mindspore._checkparam import Validator as validator
 from .metric import Metric
+from ._evaluation import _count_classes
 
 
 class Fbeta(Metric):
@@ -82,13 +82,7 @@ class Fbeta(Metric):
         if y.max() + 1 > class_num:
             raise ValueError('y_pred contains {} classes less than y contains {} classes.'.
                              format(class_num, y.max() + 1))
-        y = np.eye(class_num)[y.reshape(-1)]
-        indices = y_pred.argmax(axis=1).reshape(-1)
-        y_pred = np.eye(class_num)[indices]
-
-        positives = y_pred.sum(axis=0)
-        actual_positives = y.sum(axis=0)
-        true_positives = (y * y_pred).sum(axis=0)
+        positives, actual_positives, true_positives = _count_classes(y_pred, y, class_num)
 
         self._true_positives += true_positives
         self._positives += positives
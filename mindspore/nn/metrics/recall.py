@@ -18,7 +18,7 @@ import sys
 import numpy as np
 
 from mindspore._checkparam import Validator as validator
-from ._evaluation import EvaluationBase
+from ._evaluation import EvaluationBase, _count_classes
 
 
 class Recall(EvaluationBase):
@@ -57,8 +57,9 @@ class Recall(EvaluationBase):
         """Clears the internal evaluation result."""
         self._class_num = 0
         if self._type == "multilabel":
-            self._true_positives = np.empty(0)
-            self._actual_positives = np.empty(0)
+            # the counts of each sample, concatenated by eval
+            self._true_positives = []
+            self._actual_positives = []
             self._true_positives_average = 0
             self._actual_positives_average = 0
         else:
@@ -104,24 +105,19 @@ class Recall(EvaluationBase):
             if y.max() + 1 > class_num:
                 raise ValueError('y_pred contains {} classes less than y contains {} classes.'.
                                  format(class_num, y.max() + 1))
-            y = np.eye(class_num)[y.reshape(-1)]
-            indices = y_pred.argmax(axis=1).reshape(-1)
-            y_pred = np.eye(class_num)[indices]
+            _, actual_positives, true_positives = _count_classes(y_pred, y, class_num)
+            self._true_positives += true_positives
+            self._actual_positives += actual_positives
         elif self._type == "multilabel":
             y_pred = y_pred.swapaxes(1, 0).reshape(class_num, -1)
             y = y.swapaxes(1, 0).reshape(class_num, -1)
 
-        actual_positives = y.sum(axis=0)
-        true_positives = (y * y_pred).sum(axis=0)
-
-        if self._type == "multilabel":
+            actual_positives = y.sum(axis=0)
+            true_positives = (y * y_pred).sum(axis=0)
             self._true_positives_average += np.sum(true_positives / (actual_positives + self.eps))
             self._actual_positives_average += len(actual_positives)
-            self._true_positives = np.concatenate((self._true_positives, true_positives), axis=0)
-            self._actual_positives = np.concatenate((self._actual_positives, actual_positives), axis=0)
-        else:
-            self._true_positives += true_positives
-            self._actual_positives += actual_positives
+            self._true_positives.append(true_positives)
+            self._actual_positives.append(actual_positives)
 
     def eval(self, average=False):
         """
@@ -137,10 +133,12 @@ class Recall(EvaluationBase):
             raise RuntimeError('Input number of samples can not be 0.')
 
         validator.check_value_type("average", average, [bool], self.__class__.__name__)
-        result = self._true_positives / (self._actual_positives + self.eps)
+        if self._type == "multilabel":
+            if average:
+                return np.mean(self._true_positives_average / (self._actual_positives_average + self.eps))
+            return np.concatenate(self._true_positives) / (np.concatenate(self._actual_positives) + self.eps)
 
+        result = self._true_positives / (self._actual_positives + self.eps)
         if average:
-            if self._type == "multilabel":
-                result = self._true_positives_average / (self._actual_positives_average + self.eps)
             return result.mean()
         return result
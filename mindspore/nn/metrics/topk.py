@@ -73,11 +73,14 @@ class TopKCategoricalAccuracy(Metric):
         y = self._convert_data(inputs[1])
         if y_pred.ndim == y.ndim and self._check_onehot_data(y):
             y = y.argmax(axis=1)
-        indices = np.argsort(-y_pred, axis=1)[:, :self.k]
-        repeated_y = y.reshape(-1, 1).repeat(self.k, axis=1)
-        correct = np.equal(indices, repeated_y).sum(axis=1)
-        self._correct_num += correct.sum()
-        self._samples_num += repeated_y.shape[0]
+        y = y.reshape(-1, 1)
+        if self.k < y_pred.shape[1]:
+            # only the set of the k largest scores matters, partition them to the end instead of sorting
+            indices = np.argpartition(y_pred, -self.k, axis=1)[:, -self.k:]
+            self._correct_num += np.equal(indices, y).sum()
+        else:
+            self._correct_num += y.shape[0]
+        self._samples_num += y.shape[0]
 
     def eval(self):
         """
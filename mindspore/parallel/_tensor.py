@@ -13,6 +13,8 @@
 # limitations under the License.
 # ============================================================================
 """load tensor and combine tensor"""
+import functools
+import itertools
 import numpy as np
 
 from mindspore.common.tensor import Tensor
@@ -118,35 +120,6 @@ def _convert_to_new_device_coordinate(device_coordinate, tensor_map):
     return device_coordinate_new
 
 
-def _chunk_tensor(np_tensor, strategy, depth):
-    """
-    Recursive function to chunk tensor.
-
-    Args:
-        np_tensor (NDarray): The matrix to be split.
-        strategy (list): The split strategy with the same size of np_tensor.
-        depth (int): Recursion depth.
-
-    Returns:
-        NDarray, the splited matrix.
-
-    Raises:
-        ValueError: If np_tensor can not be split by strategy.
-    """
-    output = []
-    axis = len(np_tensor.shape) - depth
-    if np_tensor.shape[axis] % strategy[0] != 0:
-        raise ValueError("np_tensor can not be split by strategy!")
-    ret = list(np.split(np_tensor, strategy[0], axis))
-    if depth == 1:
-        return ret
-    for ret_ in ret:
-        output.extend(
-            _chunk_tensor(ret_, strategy[len(strategy) - depth + 1:len(strategy)], depth - 1))
-
-    return output
-
-
 def _chunk_tensor_by_strategy(np_tensor, strategy):
     """
     Split the input by strategy.
@@ -156,7 +129,7 @@ def _chunk_tensor_by_strategy(np_tensor, strategy):
         strategy (list): The split strategy with the same size of np_tensor.
 
     Returns:
-        NDarray, the splited matrix.
+        List of NDarray, the views of the slices.
 
     Raises:
         TypeError: If np_tensor is not ndarray
@@ -166,7 +139,13 @@ def _chunk_tensor_by_strategy(np_tensor, strategy):
         raise TypeError("np_tensor should be ndarray!")
     if len(strategy) != len(np_tensor.shape):
         raise ValueError("The length of np_tensor does not match the length of strategy!")
-    return _chunk_tensor(np_tensor, strategy, len(strategy))
+    for dim, split in zip(np_tensor.shape, strategy):
+        if dim % split != 0:
+            raise ValueError("np_tensor can not be split by strategy!")
+    slice_shape = [dim // split for dim, split in zip(np_tensor.shape, strategy)]
+    # the slices are views of np_tensor, in the order of their slice index
+    return [np_tensor[tuple(slice(index * size, (index + 1) * size) for index, size in zip(coordinate, slice_shape))]
+            for coordinate in itertools.product(*[range(split) for split in strategy])]
 
 def _get_slice_index(dev_mat, tensor_map):
     """
@@ -184,6 +163,34 @@ def _get_slice_index(dev_mat, tensor_map):
     tensor_slice_index = _get_tensor_slice_index(dev_mat, tensor_strategy, tensor_map, rank)
     return tensor_slice_index
 
+def _get_slice_box(dev_mat, tensor_map, full_shape, rank_index):
+    """
+    Get the region of the whole tensor held by a device.
+
+    Args:
+        dev_mat (list): The device matrix of devices.
+        tensor_map (list): The split strategy of tensor.
+        full_shape (list): The shape of the whole tensor.
+        rank_index (int): The rank of the device.
+
+    Returns:
+        List, (start, stop) of the slice in every dimension of the whole tensor.
+
+    Raises:
+        ValueError: If the tensor can not be split by the strategy.
+    """
+    tensor_strategy = _get_tensor_strategy(dev_mat, tensor_map)
+    tensor_slice_index = _get_tensor_slice_index(dev_mat, tensor_strategy, tensor_map, rank_index)
+    slice_coordinate = _rank_to_coordinate(int(tensor_slice_index), tensor_strategy)
+    box = []
+    for dim, split, coordinate in zip(full_shape, tensor_strategy, slice_coordinate):
+        if dim % split != 0:
+            raise ValueError("The shape {} can not be split by strategy {}.".format(full_shape, tensor_strategy))
+        size = dim // split
+        box.append((int(coordinate) * size, (int(coordinate) + 1) * size))
+    return box
+
+
 def _load_tensor(tensor, dev_mat, tensor_map):
     """
     Get the tensor slice of the local device by the device matrix and the tensor map
@@ -203,12 +210,10 @@ def _load_tensor(tensor, dev_mat, tensor_map):
         >>> tensor_slice = _load_tensor(tensor, dev_mat, tensor_map)
     """
     rank = get_rank()
-    tensor_strategy = _get_tensor_strategy(dev_mat, tensor_map)
-    tensor_slice_index = _get_tensor_slice_index(dev_mat, tensor_strategy, tensor_map, rank)
     np_tensor = tensor.asnumpy()
-    np_tensor_list = _chunk_tensor_by_strategy(np_tensor, tensor_strategy)
-    np_tensor_slice = np_tensor_list[int(tensor_slice_index)]
-    tensor_slice = Tensor(np_tensor_slice)
+    box = _get_slice_box(dev_mat, tensor_map, np_tensor.shape, rank)
+    np_tensor_slice = np_tensor[tuple(slice(start, stop) for start, stop in box)]
+    tensor_slice = Tensor(np.ascontiguousarray(np_tensor_slice))
     return tensor_slice
 
 
@@ -261,35 +266,48 @@ def _reshape_param_data(param_data, dev_mat, tensor_map):
     for dim in dev_mat:
         device_count *= dim
 
-    tensor_slices = np.split(param_data.asnumpy(), device_count, axis=0)
+    np_param_data = param_data.asnumpy()
+    slice_shape = (np_param_data.shape[0] // device_count,) + np_param_data.shape[1:]
     tensor_strategy = _get_tensor_strategy(dev_mat, tensor_map)
+    dev_index, dev_perm, expand_index = _get_merge_permutation(tuple(dev_mat), tuple(tensor_map))
 
-    # get the actual number of slices,as: different devices may load the same slice
-    slice_count = 1
-    for dim in tensor_strategy:
-        slice_count *= dim
+    # view the gathered slices as (strategy..., slice_shape...), keeping one of the duplicated slices
+    slices = np_param_data.reshape(tuple(dev_mat) + slice_shape)[dev_index]
+    slices = slices.transpose(dev_perm + tuple(range(len(dev_perm), slices.ndim)))[expand_index]
 
-    # reorder slices and remove duplicates based on device matrix and tensor_map
-    tensor_slices_new = list(range(slice_count))
-    for i in range(device_count):
-        slice_index = _get_tensor_slice_index(dev_mat, tensor_strategy, tensor_map, i)
-        tensor_slices_new[int(slice_index)] = np.array(tensor_slices[i])
-
-    # combine slices to generate complete parameter
+    # view the output as (strategy..., slice_shape...) too, the merge is then a single copy
+    full_shape = [split * dim for split, dim in zip(tensor_strategy, slice_shape)]
+    merged = np.empty(full_shape, np_param_data.dtype)
+    interleaved_shape = [dim for pair in zip(tensor_strategy, slice_shape) for dim in pair]
     dim_len = len(tensor_strategy)
-    for i in range(dim_len):
-        ele_count = int(len(tensor_slices_new) / tensor_strategy[dim_len - 1 - i])
-        tensor_slices_new_inner = []
-        for j in range(ele_count):
-            new_tensor = tensor_slices_new[j * tensor_strategy[dim_len - 1 - i]]
-            for l in range(j * tensor_strategy[dim_len - 1 - i] + 1,
-                           (j + 1) * tensor_strategy[dim_len - 1 - i]):
-                new_tensor = np.concatenate((new_tensor, tensor_slices_new[l]), axis=dim_len - 1 - i)
+    merged_view = merged.reshape(interleaved_shape).transpose(list(range(0, 2 * dim_len, 2)) +
+                                                              list(range(1, 2 * dim_len, 2)))
+    merged_view[...] = slices
+    return Tensor(merged)
+
+
+@functools.lru_cache()
+def _get_merge_permutation(dev_mat, tensor_map):
+    """
+    Get how to view the gathered slices, shaped as (dev_mat..., slice_shape...), as (strategy..., slice_shape...).
 
-            tensor_slices_new_inner.insert(len(tensor_slices_new_inner), np.array(new_tensor))
-        tensor_slices_new = tensor_slices_new_inner
+    Args:
+        dev_mat (tuple): The device matrix of devices.
+        tensor_map (tuple): The split strategy of tensor.
+
+    Returns:
+        Tuple, the index selecting one device along the device dimensions not used by the tensor map, the
+        permutation of the remaining device dimensions, and the index adding the dimensions of size 1 for the
+        tensor dimensions which are not split.
+    """
+    dev_dim_len = len(dev_mat)
+    used_dims = [dev_dim_len - 1 - dim for dim in tensor_map if dim != -1]
+    dev_index = tuple(slice(None) if dim in used_dims else 0 for dim in range(dev_dim_len))
+    kept_dims = sorted(used_dims)
+    dev_perm = tuple(kept_dims.index(dim) for dim in used_dims)
+    expand_index = tuple(None if dim == -1 else slice(None) for dim in tensor_map) + (Ellipsis,)
+    return dev_index, dev_perm, expand_index
 
-    return Tensor(tensor_slices_new[0])
 
 def _reshape_param_data_with_weight(param_data, dev_mat, field_size):
     """
@@ -312,15 +330,9 @@ def _reshape_param_data_with_weight(param_data, dev_mat, field_size):
     for dim in dev_mat:
         device_count *= dim
 
-    tensor_slices = np.split(param_data.asnumpy(), device_count, axis=0)
-    tensor_slices_col = []
-    for i in range(len(tensor_slices[0][0])):
-        tensor_slices_new = np.array(tensor_slices[0][:, i]).reshape(field_size[0], -1)
-        for j in range(1, device_count):
-            tensor_slices_new = np.concatenate((tensor_slices_new,\
-                                   np.array(tensor_slices[j][:, i]).reshape(field_size[0], -1)), axis=1)
-        tensor_slices_col.append(tensor_slices_new)
-    new_tensor = np.array(tensor_slices_col[0]).reshape(-1, 1)
-    for i in range(1, len(tensor_slices_col)):
-        new_tensor = np.concatenate((new_tensor, np.array(tensor_slices_col[i]).reshape(-1, 1)), axis=1)
+    # the slice of each device holds, for every column, field_size blocks of rows which are merged block by block
+    np_param_data = param_data.asnumpy()
+    col_count = np_param_data.shape[-1]
+    tensor_slices = np_param_data.reshape(device_count, field_size[0], -1, col_count)
+    new_tensor = tensor_slices.transpose(1, 0, 2, 3).reshape(-1, col_count)
     return Tensor(new_tensor)
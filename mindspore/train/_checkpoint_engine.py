@@ -0,0 +1,223 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Asynchronous checkpoint saving."""
+import atexit
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from mindspore import log as logger
+from mindspore.train._checkpoint_io import CheckpointWriter
+from mindspore.train.serialization import _param_header
+
+ASYNC_SAVE_POLICIES = ("block", "skip", "coalesce")
+
+
+class _SnapshotBuffer:
+    """Host buffers holding one snapshot of the parameters, reused from one save to the next."""
+    def __init__(self):
+        self._arrays = {}
+        self.records = []
+
+    def fill(self, parameter_list):
+        """
+        Copies the parameters into the buffer, returns the number of bytes copied.
+
+        `asnumpy` syncs the data of a tensor into its own host memory and returns a view of it, so each parameter
+        is copied once, straight into its array of the buffer. The arrays are only allocated again when the shape
+        or the type of a parameter changes.
+        """
+        arrays = {}
+        self.records = []
+        nbytes = 0
+        for param in parameter_list:
+            name = param["name"]
+            dims, tensor_type = _param_header(param)
+            data = param["data"].asnumpy()
+            array = self._arrays.get(name)
+            if array is None or array.shape != data.shape or array.dtype != data.dtype:
+                array = np.empty(data.shape, data.dtype)
+            np.copyto(array, data)
+            arrays[name] = array
+            self.records.append((name, dims, tensor_type, array.reshape(-1)))
+            nbytes += array.nbytes
+        self._arrays = arrays
+        return nbytes
+
+
+class _SaveJob:
+    """A snapshot waiting to be written."""
+    def __init__(self, ckpt_file_name, buffer):
+        self.ckpt_file_name = ckpt_file_name
+        self.buffer = buffer
+        self.submit_time = time.time()
+
+
+class AsyncCheckpointEngine:
+    """
+    Saves checkpoints from a dedicated writer thread.
+
+    On `submit` the training thread only copies the parameters into a host snapshot buffer, the file is then
+    written by the writer thread. The snapshot buffers are allocated once and reused, there are `num_buffers`
+    of them, so at most `num_buffers` saves are in flight. When no buffer is free the `policy` decides:
+
+    - block: wait until the writer releases a buffer.
+    - skip: drop the new save.
+    - coalesce: replace the newest save which is still waiting to be written, or wait if there is none.
+
+    Args:
+        policy (str): What to do when all snapshot buffers are busy, one of "block", "skip" or "coalesce".
+            Default: "block".
+        num_buffers (int): Number of snapshot buffers. Default: 2.
+    """
+    def __init__(self, policy="block", num_buffers=2):
+        if policy not in ASYNC_SAVE_POLICIES:
+            raise ValueError("The async save policy must be one of {}, but got {}.".format(ASYNC_SAVE_POLICIES,
+                                                                                      policy))
+        if num_buffers < 1:
+            raise ValueError("The num_buffers must be positive, but got {}.".format(num_buffers))
+        self._policy = policy
+        self._cond = threading.Condition()
+        self._free_buffers = deque(_SnapshotBuffer() for _ in range(num_buffers))
+        self._jobs = deque()
+        self._running = 0
+        self._closed = False
+        self._stats = {"saved": 0, "skipped": 0, "coalesced": 0, "failed": 0, "bytes_written": 0,
+                       "last_snapshot_time": 0.0, "last_write_time": 0.0, "last_latency": 0.0}
+        self._thread = threading.Thread(target=self._run, name="ckpt_writer")
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def closed(self):
+        """Whether the engine has been closed."""
+        return self._closed
+
+    @property
+    def stats(self):
+        """
+        Counters of the engine.
+
+        `last_snapshot_time` is the time the training thread was stalled by the last save, `last_write_time`
+        the time spent writing it and `last_latency` the time from submit until the file was complete.
+        """
+        with self._cond:
+            return dict(self._stats)
+
+    def _acquire_buffer(self):
+        """Gets a free snapshot buffer according to the policy, returns None if the save must be skipped."""
+        with self._cond:
+            if not self._free_buffers:
+                if self._policy == "skip":
+                    self._stats["skipped"] += 1
+                    return None
+                if self._policy == "coalesce" and self._jobs:
+                    job = self._jobs.pop()
+                    self._stats["coalesced"] += 1
+                    logger.warning("Checkpoint %s is replaced by a newer one before being written.",
+                                   job.ckpt_file_name)
+                    return job.buffer
+                while not self._free_buffers:
+                    self._cond.wait()
+            return self._free_buffers.popleft()
+
+    def submit(self, parameter_list, ckpt_file_name):
+        """
+        Takes a snapshot of the parameters and queues it for writing.
+
+        Args:
+            parameter_list (list): Parameters list, each element is a dict like {"name":xx, "data":xx}.
+            ckpt_file_name (str): Checkpoint file name.
+
+        Returns:
+            bool, whether the save has been queued.
+        """
+        if self._closed:
+            raise RuntimeError("The checkpoint engine has been closed.")
+        buffer = self._acquire_buffer()
+        if buffer is None:
+            logger.warning("Skip saving checkpoint %s, the previous saves are still running.", ckpt_file_name)
+            return False
+
+        start_time = time.time()
+        try:
+            buffer.fill(parameter_list)
+        except BaseException:
+            with self._cond:
+                self._free_buffers.append(buffer)
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._stats["last_snapshot_time"] = time.time() - start_time
+            self._jobs.append(_SaveJob(ckpt_file_name, buffer))
+            self._cond.notify_all()
+        return True
+
+    def _run(self):
+        """Writer thread."""
+        while True:
+            with self._cond:
+                while not self._jobs and not self._closed:
+                    self._cond.wait()
+                if not self._jobs:
+                    return
+                job = self._jobs.popleft()
+                self._running += 1
+
+            start_time = time.time()
+            bytes_written = None
+            try:
+                with CheckpointWriter(job.ckpt_file_name) as writer:
+                    for name, dims, tensor_type, array in job.buffer.records:
+                        writer.write(name, dims, tensor_type, array)
+                bytes_written = writer.bytes_written
+            except BaseException as e:
+                logger.error("Failed to save the checkpoint file %s: %s.", job.ckpt_file_name, e.__str__())
+
+            end_time = time.time()
+            with self._cond:
+                if bytes_written is not None:
+                    self._stats["saved"] += 1
+                    self._stats["bytes_written"] += bytes_written
+                    self._stats["last_write_time"] = end_time - start_time
+                    self._stats["last_latency"] = end_time - job.submit_time
+                    logger.info("Async save checkpoint %s, %d bytes, write time %.3f s, latency %.3f s.",
+                                job.ckpt_file_name, bytes_written, end_time - start_time,
+                                end_time - job.submit_time)
+                else:
+                    self._stats["failed"] += 1
+                self._running -= 1
+                self._free_buffers.append(job.buffer)
+                self._cond.notify_all()
+
+    def wait(self):
+        """Blocks until every queued save has been written."""
+        with self._cond:
+            while self._jobs or self._running:
+                self._cond.wait()
+
+    def close(self):
+        """Writes the queued saves, stops the writer thread and releases the snapshot buffers."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._free_buffers.clear()
+        atexit.unregister(self.close)
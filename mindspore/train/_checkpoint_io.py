@@ -0,0 +1,493 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Low level checkpoint file access.
+
+The checkpoint file is a serialized `Checkpoint` protobuf message. Instead of parsing the whole message into
+memory, the helpers here walk the protobuf wire format over a memory-mapped file and only record, for every
+parameter, its name, type, dims and the (offset, length) of its raw `tensor_content` payload. Tensor data is
+then exposed as `np.frombuffer` views on the mapping, so nothing is copied before a parameter is used.
+
+Writing goes the other way round: `CheckpointWriter` emits the same wire format one parameter at a time, so a
+checkpoint never has to be assembled as a whole message in memory.
+"""
+import os
+import json
+import stat
+import hashlib
+import time
+import mmap
+from collections import namedtuple
+
+import numpy as np
+
+from mindspore import log as logger
+
+# protobuf wire types
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+# field numbers of checkpoint.proto
+_CHECKPOINT_VALUE = 1
+_VALUE_TAG = 1
+_VALUE_TENSOR = 2
+_TENSOR_DIMS = 1
+_TENSOR_TYPE = 2
+_TENSOR_CONTENT = 3
+
+# small records are gathered in a buffer of this size before being written, large payloads bypass it
+_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+# max size of one write call, a raw write of more than about 2GB is short on Linux
+_MAX_WRITE_SIZE = 1 << 30
+
+# reserved names used by incremental checkpoints
+DELTA_MANIFEST_NAME = "__delta_manifest__"
+DELTA_ROWS_SUFFIX = "@delta_rows"
+# reserved name of the parameter layouts saved with the slices of a sharded checkpoint
+SHARD_LAYOUT_NAME = "__shard_layout__"
+
+# size of the reads when hashing a file
+_DIGEST_CHUNK_SIZE = 16 * 1024 * 1024
+# digests of the files already hashed, by real path: (size, mtime, digest)
+_file_digests = {}
+
+CheckpointEntry = namedtuple("CheckpointEntry", ["name", "tensor_type", "dims", "offset", "nbytes"])
+
+
+def _decode_varint(buf, pos, end):
+    """Decodes a base 128 varint starting at `pos`, returns the value and the position after it."""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= end:
+            raise ValueError("Truncated varint in checkpoint file.")
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ValueError("Too many bytes when decoding varint in checkpoint file.")
+
+
+def _encode_varint(value):
+    """Encodes an int64 as a base 128 varint."""
+    value &= 0xffffffffffffffff
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _encode_key(field_number, wire_type):
+    """Encodes the key of a field."""
+    return _encode_varint((field_number << 3) | wire_type)
+
+
+def _to_signed64(value):
+    """Interprets a decoded varint as int64."""
+    if value >= 1 << 63:
+        value -= 1 << 64
+    return value
+
+
+def _iter_fields(buf, pos, end):
+    """
+    Iterates the fields of a message stored in buf[pos:end].
+
+    Yields (field_number, wire_type, value, start, stop): for varint fields `value` is the decoded integer,
+    for length delimited fields the payload is buf[start:stop] and `value` is None.
+    """
+    while pos < end:
+        key, pos = _decode_varint(buf, pos, end)
+        field_number = key >> 3
+        wire_type = key & 0x7
+        if wire_type == _WIRE_VARINT:
+            value, pos = _decode_varint(buf, pos, end)
+            yield field_number, wire_type, value, pos, pos
+        elif wire_type == _WIRE_LENGTH_DELIMITED:
+            length, pos = _decode_varint(buf, pos, end)
+            if pos + length > end:
+                raise ValueError("Truncated field {} in checkpoint file.".format(field_number))
+            yield field_number, wire_type, None, pos, pos + length
+            pos += length
+        elif wire_type == _WIRE_FIXED64:
+            pos += 8
+        elif wire_type == _WIRE_FIXED32:
+            pos += 4
+        else:
+            raise ValueError("Unsupported wire type {} in checkpoint file.".format(wire_type))
+    if pos != end:
+        raise ValueError("Truncated message in checkpoint file.")
+
+
+def _parse_tensor(buf, pos, end):
+    """Parses a `TensorProto` without touching its content, returns (tensor_type, dims, offset, nbytes)."""
+    tensor_type = None
+    dims = []
+    offset, nbytes = None, 0
+    for field_number, wire_type, value, start, stop in _iter_fields(buf, pos, end):
+        if field_number == _TENSOR_DIMS:
+            if wire_type == _WIRE_VARINT:
+                dims.append(_to_signed64(value))
+            else:
+                # packed encoding
+                dim_pos = start
+                while dim_pos < stop:
+                    dim, dim_pos = _decode_varint(buf, dim_pos, stop)
+                    dims.append(_to_signed64(dim))
+        elif field_number == _TENSOR_TYPE:
+            tensor_type = bytes(buf[start:stop]).decode()
+        elif field_number == _TENSOR_CONTENT:
+            offset, nbytes = start, stop - start
+    if tensor_type is None or offset is None:
+        raise ValueError("Required field of TensorProto is missing in checkpoint file.")
+    return tensor_type, dims, offset, nbytes
+
+
+def scan_checkpoint(buf):
+    """
+    Builds the offset table of a serialized `Checkpoint` message.
+
+    Only the field headers are read, the tensor payloads are skipped over, so on a memory-mapped file the
+    cost is proportional to the number of parameters rather than to the checkpoint size.
+
+    Args:
+        buf (Union[bytes, mmap.mmap]): Serialized checkpoint.
+
+    Returns:
+        List of CheckpointEntry, in the order they are stored in the file.
+
+    Raises:
+        ValueError: The content is not a valid checkpoint.
+    """
+    entries = []
+    for field_number, wire_type, _, start, stop in _iter_fields(buf, 0, len(buf)):
+        if field_number != _CHECKPOINT_VALUE or wire_type != _WIRE_LENGTH_DELIMITED:
+            continue
+        name, tensor = None, None
+        for value_field, value_wire_type, _, value_start, value_stop in _iter_fields(buf, start, stop):
+            if value_wire_type != _WIRE_LENGTH_DELIMITED:
+                continue
+            if value_field == _VALUE_TAG:
+                name = bytes(buf[value_start:value_stop]).decode()
+            elif value_field == _VALUE_TENSOR:
+                tensor = _parse_tensor(buf, value_start, value_stop)
+        if name is None or tensor is None:
+            raise ValueError("Required field of Checkpoint.Value is missing in checkpoint file.")
+        entries.append(CheckpointEntry(name, *tensor))
+    return entries
+
+
+class CheckpointReader:
+    """
+    Read only, memory-mapped view of a checkpoint file.
+
+    Args:
+        ckpt_file_name (str): Checkpoint file name.
+
+    Raises:
+        ValueError: The content is not a valid checkpoint.
+    """
+    def __init__(self, ckpt_file_name):
+        with open(ckpt_file_name, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._entries = scan_checkpoint(self._mmap)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    @property
+    def entries(self):
+        """Offset table of the checkpoint."""
+        return self._entries
+
+    def is_delta(self):
+        """Whether the file is an incremental checkpoint."""
+        return any(entry.name == DELTA_MANIFEST_NAME for entry in self._entries)
+
+    def tensor_view(self, entry, np_type):
+        """Returns a read only 1-D numpy view on the payload of `entry`, no data is copied."""
+        return np.frombuffer(self._mmap, dtype=np_type, count=entry.nbytes // np.dtype(np_type).itemsize,
+                             offset=entry.offset)
+
+    def read_json(self, entry):
+        """Decodes an entry written by `encode_json`."""
+        return json.loads(bytes(self.tensor_view(entry, np.uint8)).decode())
+
+
+def _encode_value_header(name, dims, tensor_type, nbytes):
+    """
+    Encodes a `Checkpoint.Value` record up to, but excluding, the raw tensor content.
+
+    The field order and encoding are the ones produced by `Checkpoint.SerializeToString`, so the written file
+    is byte for byte the same as a checkpoint serialized as a whole.
+    """
+    tensor = bytearray()
+    for dim in dims:
+        tensor += _encode_key(_TENSOR_DIMS, _WIRE_VARINT)
+        tensor += _encode_varint(dim)
+    type_bytes = tensor_type.encode()
+    tensor += _encode_key(_TENSOR_TYPE, _WIRE_LENGTH_DELIMITED)
+    tensor += _encode_varint(len(type_bytes))
+    tensor += type_bytes
+    tensor += _encode_key(_TENSOR_CONTENT, _WIRE_LENGTH_DELIMITED)
+    tensor += _encode_varint(nbytes)
+
+    value = bytearray()
+    name_bytes = name.encode()
+    value += _encode_key(_VALUE_TAG, _WIRE_LENGTH_DELIMITED)
+    value += _encode_varint(len(name_bytes))
+    value += name_bytes
+    value += _encode_key(_VALUE_TENSOR, _WIRE_LENGTH_DELIMITED)
+    value += _encode_varint(len(tensor) + nbytes)
+    value += tensor
+
+    header = bytearray()
+    header += _encode_key(_CHECKPOINT_VALUE, _WIRE_LENGTH_DELIMITED)
+    header += _encode_varint(len(value) + nbytes)
+    header += value
+    return header
+
+
+class CheckpointWriter:
+    """
+    Streams parameters into a checkpoint file.
+
+    Every parameter is encoded and written as soon as `write` is called, so the caller can release its host
+    copy right away. The data goes to a temporary file next to the target which is fsync'd and atomically
+    renamed on `close`, a reader never sees a partially written checkpoint.
+
+    Args:
+        ckpt_file_name (str): Checkpoint file name.
+        buffer_size (int): Size in bytes of the write buffer used to gather small records. Default: 4MB.
+
+    Examples:
+        >>> with CheckpointWriter("./net.ckpt") as writer:
+        >>>     writer.write("conv.weight", [64, 3, 3, 3], "Float32", weight)
+    """
+    def __init__(self, ckpt_file_name, buffer_size=_WRITE_BUFFER_SIZE):
+        self._file_name = ckpt_file_name
+        self._tmp_file_name = ckpt_file_name + ".tmp"
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._bytes_written = 0
+        self._start_time = time.time()
+        self._file = open(self._tmp_file_name, "wb", buffering=0)
+
+    @property
+    def bytes_written(self):
+        """Number of bytes written so far."""
+        return self._bytes_written
+
+    def _write_all(self, data):
+        """Writes all the bytes of data, the raw writes of the unbuffered file can be short."""
+        view = memoryview(data).cast("B")
+        pos = 0
+        while pos < view.nbytes:
+            written = self._file.write(view[pos:pos + _MAX_WRITE_SIZE])
+            if not written:
+                raise IOError("Failed to write the checkpoint file {}.".format(self._tmp_file_name))
+            pos += written
+
+    def _flush_buffer(self):
+        if self._buffer:
+            self._write_all(self._buffer)
+            self._buffer = bytearray()
+
+    def write(self, name, dims, tensor_type, data):
+        """
+        Appends one parameter to the checkpoint.
+
+        Args:
+            name (str): Parameter name.
+            dims (list): Dims recorded for the parameter.
+            tensor_type (str): Tensor type name, e.g. "Float32".
+            data (numpy.ndarray): Parameter data.
+        """
+        content = memoryview(np.ascontiguousarray(data)).cast("B")
+        header = _encode_value_header(name, dims, tensor_type, content.nbytes)
+        self._buffer += header
+        if len(self._buffer) + content.nbytes <= self._buffer_size:
+            self._buffer += content
+        else:
+            self._flush_buffer()
+            self._write_all(content)
+        if len(self._buffer) >= self._buffer_size:
+            self._flush_buffer()
+        self._bytes_written += len(header) + content.nbytes
+
+    def close(self):
+        """
+        Flushes the data to disk and moves the file to its final name.
+
+        Raises:
+            IOError: If the size of the file is not the number of bytes written.
+        """
+        self._flush_buffer()
+        os.fsync(self._file.fileno())
+        file_size = os.fstat(self._file.fileno()).st_size
+        self._file.close()
+        if file_size != self._bytes_written:
+            raise IOError("The checkpoint file {} has {} bytes, but {} bytes were written.".format(
+                self._tmp_file_name, file_size, self._bytes_written))
+        os.chmod(self._tmp_file_name, stat.S_IRUSR)
+        if os.path.exists(self._file_name):
+            os.chmod(self._file_name, stat.S_IWUSR | stat.S_IRUSR)
+        os.replace(self._tmp_file_name, self._file_name)
+
+        cost_time = max(time.time() - self._start_time, 1e-6)
+        logger.info("Saved checkpoint %s, %d bytes in %.3f s, %.2f MB/s.", self._file_name, self._bytes_written,
+                    cost_time, self._bytes_written / cost_time / 1024 / 1024)
+
+    def abort(self):
+        """Drops the partially written file."""
+        self._buffer = bytearray()
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_file_name):
+            os.chmod(self._tmp_file_name, stat.S_IWUSR | stat.S_IRUSR)
+            os.remove(self._tmp_file_name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            try:
+                self.close()
+            except BaseException:
+                self.abort()
+                raise
+        else:
+            self.abort()
+
+
+def encode_json(obj):
+    """Encodes a json serializable object as a uint8 array, to be saved as a reserved checkpoint entry."""
+    return np.frombuffer(json.dumps(obj).encode(), np.uint8)
+
+
+def file_digest(file_name):
+    """
+    Gets the sha256 digest of a file.
+
+    The digest is kept with the size and the modification time of the file, so a base shared by several
+    incremental checkpoints is only hashed again once it has been rewritten.
+    """
+    file_name = os.path.realpath(file_name)
+    file_stat = os.stat(file_name)
+    cached = _file_digests.get(file_name)
+    if cached is not None and cached[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+        return cached[2]
+    sha256 = hashlib.sha256()
+    with open(file_name, "rb") as file:
+        for chunk in iter(lambda: file.read(_DIGEST_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    digest = sha256.hexdigest()
+    _file_digests[file_name] = (file_stat.st_size, file_stat.st_mtime_ns, digest)
+    return digest
+
+
+def encode_delta_manifest(base_file_name, patched, removed):
+    """Encodes the manifest of an incremental checkpoint as a uint8 array."""
+    manifest = {"base": os.path.basename(base_file_name),
+                "base_size": os.path.getsize(base_file_name),
+                "base_digest": file_digest(base_file_name),
+                "patched": patched,
+                "removed": removed}
+    return encode_json(manifest)
+
+
+class DeltaCheckpointReader:
+    """
+    Merged view of an incremental checkpoint and of the full checkpoint it is based on.
+
+    An incremental checkpoint only holds the parameters which changed since its base. Parameters listed as
+    `patched` in its manifest only hold the changed rows, their row indices are stored under the parameter name
+    followed by `DELTA_ROWS_SUFFIX`. The base is looked up next to the incremental checkpoint and must have the
+    sha256 digest recorded in the manifest, so a base overwritten by a later full checkpoint of the same size is
+    not merged.
+
+    Args:
+        ckpt_file_name (str): Incremental checkpoint file name.
+        reader (CheckpointReader): Reader of the incremental checkpoint. Default: None, the file is opened.
+
+    Raises:
+        ValueError: The base checkpoint is missing or does not match the manifest.
+    """
+    def __init__(self, ckpt_file_name, reader=None):
+        self._delta = reader if reader is not None else CheckpointReader(ckpt_file_name)
+        delta_entries = {entry.name: entry for entry in self._delta.entries}
+        manifest_entry = delta_entries.pop(DELTA_MANIFEST_NAME)
+        manifest = self._delta.read_json(manifest_entry)
+
+        base_file_name = os.path.join(os.path.dirname(os.path.realpath(ckpt_file_name)), manifest["base"])
+        if not os.path.exists(base_file_name) or os.path.getsize(base_file_name) != manifest["base_size"] \
+                or file_digest(base_file_name) != manifest["base_digest"]:
+            raise ValueError("The base checkpoint {} of the incremental checkpoint {} is missing or has been "
+                             "modified.".format(base_file_name, ckpt_file_name))
+        self._base = CheckpointReader(base_file_name)
+        if self._base.is_delta():
+            raise ValueError("The base checkpoint {} is an incremental checkpoint.".format(base_file_name))
+
+        patched = set(manifest["patched"])
+        removed = set(manifest["removed"])
+        self._sources = {}
+        self._entries = []
+        for entry in self._base.entries:
+            if entry.name in removed:
+                continue
+            if entry.name in patched:
+                rows_entry = delta_entries.pop(entry.name + DELTA_ROWS_SUFFIX)
+                self._sources[entry.name] = (entry, delta_entries.pop(entry.name), rows_entry)
+            elif entry.name in delta_entries:
+                entry = delta_entries.pop(entry.name)
+                self._sources[entry.name] = (None, entry, None)
+            else:
+                self._sources[entry.name] = (entry, None, None)
+            self._entries.append(entry)
+        for entry in delta_entries.values():
+            self._sources[entry.name] = (None, entry, None)
+            self._entries.append(entry)
+
+    @property
+    def entries(self):
+        """Entries of the merged checkpoint."""
+        return self._entries
+
+    def is_delta(self):
+        """The merged view is a complete checkpoint."""
+        return False
+
+    def tensor_view(self, entry, np_type):
+        """Returns the 1-D data of `entry`, a view on the file unless rows have to be patched."""
+        base_entry, delta_entry, rows_entry = self._sources[entry.name]
+        if base_entry is None:
+            return self._delta.tensor_view(delta_entry, np_type)
+        if delta_entry is None:
+            return self._base.tensor_view(base_entry, np_type)
+
+        data = np.array(self._base.tensor_view(base_entry, np_type))
+        rows = self._delta.tensor_view(rows_entry, np.int64)
+        row_data = self._delta.tensor_view(delta_entry, np_type)
+        data.reshape(base_entry.dims[0], -1)[rows] = row_data.reshape(rows.size, -1)
+        return data
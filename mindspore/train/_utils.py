@@ -144,8 +144,13 @@ def _to_tensor(elem, scaling_sens=None):
     return lst[0] if len(lst) == 1 else tuple(lst)
 
 
-def _to_full_tensor(elem, device_num, global_rank, scaling_sens=None):
-    """Conver numpy to tensor, expanding batch dimension according to device_num, adapt to minddata feed solution."""
+def _to_full_tensor(elem, device_num, global_rank, scaling_sens=None, buffers=None):
+    """
+    Conver numpy to tensor, expanding batch dimension according to device_num, adapt to minddata feed solution.
+
+    If `buffers` is a dict, the expanded numpy arrays are kept in it and reused by the next calls with the same
+    shapes and types, as only the slice of the global rank changes and the Tensors copy the arrays.
+    """
     lst = []
     if not isinstance(elem, (tuple, list)):
         elem = [elem]
@@ -168,7 +173,14 @@ def _to_full_tensor(elem, device_num, global_rank, scaling_sens=None):
                 batchsize_per_device = item
             else:
                 new_shape += (item,)
-        new_tensor_numpy = np.zeros(new_shape, dtype_to_nptype(type_))
+        np_type = dtype_to_nptype(type_)
+        new_tensor_numpy = None
+        if buffers is not None:
+            new_tensor_numpy = buffers.get(len(lst))
+        if new_tensor_numpy is None or new_tensor_numpy.shape != new_shape or new_tensor_numpy.dtype != np_type:
+            new_tensor_numpy = np.zeros(new_shape, np_type)
+            if buffers is not None:
+                buffers[len(lst)] = new_tensor_numpy
         start = global_rank * batchsize_per_device
         new_tensor_numpy[start: start + batchsize_per_device] = data.asnumpy()
         new_tensor = Tensor(new_tensor_numpy)
@@ -20,9 +20,11 @@ import time
 
 import mindspore.context as context
 from mindspore import log as logger
-from mindspore._checkparam import check_bool, check_int_non_negative
+from mindspore._checkparam import check_bool, check_int_non_negative, check_int_positive, check_string
 from mindspore.train._utils import _make_directory
-from mindspore.train.serialization import _exec_save_checkpoint, _save_graph
+from mindspore.train.serialization import _exec_save_checkpoint, _exec_save_delta_checkpoint, \
+    _get_save_param_list, _save_graph
+from mindspore.train._checkpoint_engine import AsyncCheckpointEngine, ASYNC_SAVE_POLICIES
 from ._callback import Callback, set_cur_net
 
 
@@ -86,6 +88,15 @@ class CheckpointConfig:
         integrated_save (bool): Whether to intergrated save in automatic model parallel scene. Default: True.
             Integrated save function is only supported in automatic parallel scene, not supported in manual parallel.
         async_save (bool): Whether asynchronous execute save checkpoint into file. Default: False
+        async_save_policy (str): What to do in asynchronous mode when a new checkpoint is due while the previous
+            ones are still being written, one of "block", "skip" or "coalesce". "block" waits for a snapshot buffer
+            to be free, "skip" drops the new checkpoint and "coalesce" replaces the pending one which has not been
+            written yet. Default: "block".
+        incremental_save (bool): Whether to save incremental checkpoints, holding only the parameters, or rows of
+            parameters, which changed since the last full checkpoint. Loading an incremental checkpoint needs the
+            full checkpoint it is based on. Can't be used with async_save at the same time. Default: False.
+        full_save_interval (int): In incremental mode, one checkpoint out of full_save_interval is a full one.
+            Default: 10.
 
     Raises:
         ValueError: If the input_param is None or 0.
@@ -101,7 +112,10 @@ class CheckpointConfig:
                  keep_checkpoint_max=5,
                  keep_checkpoint_per_n_minutes=0,
                  integrated_save=True,
-                 async_save=False):
+                 async_save=False,
+                 async_save_policy="block",
+                 incremental_save=False,
+                 full_save_interval=10):
 
         if not save_checkpoint_steps and not save_checkpoint_seconds and \
                 not keep_checkpoint_max and not keep_checkpoint_per_n_minutes:
@@ -131,6 +145,11 @@ class CheckpointConfig:
 
         self._integrated_save = check_bool(integrated_save)
         self._async_save = check_bool(async_save)
+        self._async_save_policy = check_string(async_save_policy, ASYNC_SAVE_POLICIES)
+        self._incremental_save = check_bool(incremental_save)
+        self._full_save_interval = check_int_positive(full_save_interval)
+        if self._incremental_save and self._async_save:
+            raise ValueError("The incremental_save and async_save can't be used at the same time.")
 
     @property
     def save_checkpoint_steps(self):
@@ -162,6 +181,21 @@ class CheckpointConfig:
         """Get the value of _async_save."""
         return self._async_save
 
+    @property
+    def async_save_policy(self):
+        """Get the value of _async_save_policy."""
+        return self._async_save_policy
+
+    @property
+    def incremental_save(self):
+        """Get the value of _incremental_save."""
+        return self._incremental_save
+
+    @property
+    def full_save_interval(self):
+        """Get the value of _full_save_interval."""
+        return self._full_save_interval
+
     def get_checkpoint_policy(self):
         """Get the policy of checkpoint."""
         checkpoint_policy = {'save_checkpoint_steps': self._save_checkpoint_steps,
@@ -218,6 +252,16 @@ class ModelCheckpoint(Callback):
         self._manager = CheckpointManager()
         self._prefix = _chg_ckpt_file_name_if_same_exist(self._directory, self._prefix)
         self._graph_saved = False
+        self._base_ckpt_file = None
+        self._delta_count = 0
+        self._async_engine = None
+
+    @property
+    def async_save_stats(self):
+        """Return the counters of the asynchronous saving, None if no checkpoint has been saved asynchronously."""
+        if self._async_engine is None:
+            return None
+        return self._async_engine.stats
 
     def step_end(self, run_context):
         """
@@ -244,6 +288,8 @@ class ModelCheckpoint(Callback):
         cb_params = run_context.original_args()
         _to_save_last_ckpt = True
         self._save_ckpt(cb_params, _to_save_last_ckpt)
+        if self._async_engine is not None:
+            self._async_engine.close()
 
         from mindspore.parallel._cell_wrapper import destroy_allgather_cell
         destroy_allgather_cell()
@@ -296,11 +342,33 @@ class ModelCheckpoint(Callback):
                 set_cur_net(cb_params.train_network)
                 cb_params.train_network.exec_checkpoint_graph()
 
-            _exec_save_checkpoint(cb_params.train_network, cur_file, self._config.integrated_save,
-                                  self._config.async_save)
+            if self._config.async_save:
+                # the engine and its writer thread live from the first save until the end of the training
+                if self._async_engine is None or self._async_engine.closed:
+                    self._async_engine = AsyncCheckpointEngine(self._config.async_save_policy)
+                param_list = _get_save_param_list(cb_params.train_network, self._config.integrated_save)
+                if not self._async_engine.submit(param_list, cur_file):
+                    return
+            elif self._config.incremental_save:
+                self._save_incremental_ckpt(cb_params, cur_file)
+            else:
+                _exec_save_checkpoint(cb_params.train_network, cur_file, self._config.integrated_save)
 
             self._latest_ckpt_file_name = cur_file
 
+    def _save_incremental_ckpt(self, cb_params, cur_file):
+        """Save a full checkpoint every full_save_interval checkpoints and incremental ones in between."""
+        if self._base_ckpt_file is None or not os.path.exists(self._base_ckpt_file) \
+                or self._delta_count + 1 >= self._config.full_save_interval:
+            _exec_save_checkpoint(cb_params.train_network, cur_file, self._config.integrated_save)
+            self._base_ckpt_file = cur_file
+            self._delta_count = 0
+            return
+        _exec_save_delta_checkpoint(cb_params.train_network, cur_file, self._base_ckpt_file,
+                                    self._config.integrated_save)
+        self._manager.add_delta_ckpoint(cur_file, self._base_ckpt_file)
+        self._delta_count += 1
+
     @property
     def latest_ckpt_file_name(self):
         """Return the latest checkpoint path and file name."""
@@ -311,6 +379,7 @@ class CheckpointManager:
     """Manage checkpoint files according to train_config of checkpoint."""
     def __init__(self):
         self._ckpoint_filelist = []
+        self._delta_bases = {}
 
     @property
     def ckpoint_filelist(self):
@@ -335,12 +404,22 @@ class CheckpointManager:
                         flag = False
                 if flag:
                     self._ckpoint_filelist.append(directory + '/' + filename)
+        self._delta_bases = {delta: base for delta, base in self._delta_bases.items() if os.path.exists(delta)}
+
+    def add_delta_ckpoint(self, delta_file_name, base_file_name):
+        """Record that an incremental checkpoint file depends on a full checkpoint file."""
+        self._delta_bases[os.path.realpath(delta_file_name)] = os.path.realpath(base_file_name)
+
+    def _is_delta_base(self, file_name):
+        """Whether the file is the base of an existing incremental checkpoint file."""
+        return os.path.realpath(file_name) in self._delta_bases.values()
 
     def remove_ckpoint_file(self, file_name):
         """Remove the specified checkpoint file from this checkpoint manager and also from the directory."""
         try:
             os.chmod(file_name, stat.S_IWRITE)
             os.remove(file_name)
+            self._delta_bases.pop(os.path.realpath(file_name), None)
             self._ckpoint_filelist.remove(file_name)
         except OSError:
             logger.warning("OSError, failed to remove the older ckpt file %s.", file_name)
@@ -350,7 +429,11 @@ class CheckpointManager:
     def remove_oldest_ckpoint_file(self):
         """Remove the oldest checkpoint file from this checkpoint manager and also from the directory."""
         ckpoint_files = sorted(self._ckpoint_filelist, key=os.path.getmtime)
-        self.remove_ckpoint_file(ckpoint_files[0])
+        for ckpoint_file in ckpoint_files:
+            # a full checkpoint is kept as long as incremental checkpoints based on it are kept
+            if not self._is_delta_base(ckpoint_file):
+                self.remove_ckpoint_file(ckpoint_file)
+                return
 
     def keep_one_ckpoint_per_minutes(self, minutes, cur_time):
         """Only keep the latest one ckpt file per minutes, remove other files generated in [last_time, cur_time]."""
@@ -367,6 +450,6 @@ class CheckpointManager:
                     oldest_file = ck_file
 
         for mv_file in movs:
-            if mv_file == oldest_file:
+            if mv_file == oldest_file or self._is_delta_base(mv_file):
                 continue
             self.remove_ckpoint_file(mv_file)
@@ -108,6 +108,14 @@ class SummaryCollector(Callback):
         custom_lineage_data (Union[dict, None]): Allows you to customize the data and present it on the MingInsight
             lineage page. In the custom data, the key type support str, and the value type support str/int/float.
             Default: None, it means there is no custom data.
+        histogram_max_samples (Union[int, None]): Reduce each parameter collected for the histograms to a random
+            sample of at most this number of values before sending it to the summary writer. The count, min, max and
+            sum of the histograms stay exact, the buckets are estimated from the sample.
+            Default: None, it means the whole parameters are used.
+        histogram_params_per_step (Union[int, None]): Collect the histograms of at most this number of parameters at
+            each collection step, going through the parameters selected by `histogram_regular` in a rolling schedule,
+            so the cost of a collection step is bounded whatever the number of parameters.
+            Default: None, it means all the selected parameters are collected at each collection step.
 
     Raises:
         ValueError: If the parameter value is not expected.
@@ -146,7 +154,8 @@ class SummaryCollector(Callback):
     }
 
     def __init__(self, summary_dir, collect_freq=10, collect_specified_data=None,
-                 keep_default_action=True, custom_lineage_data=None):
+                 keep_default_action=True, custom_lineage_data=None, histogram_max_samples=None,
+                 histogram_params_per_step=None):
         super(SummaryCollector, self).__init__()
 
         self._summary_dir = self._process_summary_dir(summary_dir)
@@ -164,6 +173,12 @@ class SummaryCollector(Callback):
         self._check_custom_lineage_data(custom_lineage_data)
         self._custom_lineage_data = custom_lineage_data
 
+        self._check_histogram_limit('histogram_max_samples', histogram_max_samples)
+        self._histogram_max_samples = histogram_max_samples
+        self._check_histogram_limit('histogram_params_per_step', histogram_params_per_step)
+        self._histogram_params_per_step = histogram_params_per_step
+        self._histogram_offset = 0
+
         self._temp_optimizer = None
         self._has_saved_train_network = False
         self._has_saved_custom_data = False
@@ -204,6 +219,13 @@ class SummaryCollector(Callback):
         if freq <= 0:
             raise ValueError(f'For `collect_freq` the value should be greater than 0, but got `{freq}`.')
 
+    @staticmethod
+    def _check_histogram_limit(name, limit):
+        """Check the limit of the histogram collection is None or a positive int."""
+        check_value_type(name, limit, [int, type(None)])
+        if limit is not None and limit <= 0:
+            raise ValueError(f'For `{name}` the value should be greater than 0, but got `{limit}`.')
+
     @staticmethod
     def _check_custom_lineage_data(custom_lineage_data):
         """
@@ -533,16 +555,24 @@ class SummaryCollector(Callback):
         parameters = optimizer.parameters
         regular = self._collect_specified_data.get('histogram_regular')
         if regular is not None:
-            for parameter in parameters:
-                if re.match(regular, parameter.name):
-                    self._record.add_value(PluginEnum.HISTOGRAM.value, parameter.name+'/auto', parameter.data)
-            return
-
-        # Note: If `histogram_regular` in `self._collect_specified_data` and the value is None,
-        # we will collect the first five parameters.
-        default_parameter_count = 5
-        for parameter in parameters[:default_parameter_count]:
-            self._record.add_value(PluginEnum.HISTOGRAM.value, parameter.name+'/auto', parameter.data)
+            parameters = [parameter for parameter in parameters if re.match(regular, parameter.name)]
+        else:
+            # Note: If `histogram_regular` in `self._collect_specified_data` and the value is None,
+            # we will collect the first five parameters.
+            default_parameter_count = 5
+            parameters = parameters[:default_parameter_count]
+
+        if self._histogram_params_per_step is not None and len(parameters) > self._histogram_params_per_step:
+            start = self._histogram_offset % len(parameters)
+            parameters = (parameters[start:] + parameters[:start])[:self._histogram_params_per_step]
+            self._histogram_offset = start + self._histogram_params_per_step
+
+        for parameter in parameters:
+            if self._histogram_max_samples is None:
+                self._record.add_value(PluginEnum.HISTOGRAM.value, parameter.name+'/auto', parameter.data)
+            else:
+                self._record.add_reduced_histogram(parameter.name+'/auto', parameter.data,
+                                                   self._histogram_max_samples)
 
     @staticmethod
     def _get_learning_rate(optimizer):
@@ -15,8 +15,12 @@
 """Dataset help for minddata dataset"""
 import math
 import os
+import queue
+import threading
+import time
 
-from mindspore._checkparam import check_bool
+from mindspore._checkparam import check_bool, check_int_non_negative
+from mindspore import log as logger
 from .. import context
 from ._utils import _exec_datagraph, _get_types_and_shapes, _to_tensor, \
     _construct_tensor_list, _to_full_shapes, _to_full_tensor
@@ -45,14 +49,18 @@ class DatasetHelper:
         dataset (DataSet): The dataset.
         dataset_sink_mode (bool): If true use GetNext to fetch the data, or else feed the data from host.
             Default: True.
+        prefetch_size (int): When feeding the data from host, the number of batches converted to Tensor in
+            advance by a background thread while the current step runs, 0 converts them on the calling thread.
+            Default: 2.
 
     Examples:
         >>> dataset_helper = DatasetHelper(dataset)
         >>> for inputs in dataset_helper:
         >>>     outputs = network(*inputs)
     """
-    def __init__(self, dataset, dataset_sink_mode=True):
+    def __init__(self, dataset, dataset_sink_mode=True, prefetch_size=2):
         check_bool(dataset_sink_mode)
+        check_int_non_negative(prefetch_size)
 
         if dataset_sink_mode:
             if context.get_context("enable_ge"):
@@ -68,9 +76,9 @@ class DatasetHelper:
                         iterclass = _DatasetIterMS
                 elif context.get_context("device_target") == "CPU":
                     raise RuntimeError("Currently dataset sink mode is not supported when the device target is CPU.")
+            self.iter = iterclass(dataset)
         else:
-            iterclass = _DatasetIterFeed
-        self.iter = iterclass(dataset)
+            self.iter = _DatasetIterFeed(dataset, prefetch_size)
 
     def __iter__(self):
         return self.iter.__iter__()
@@ -84,6 +92,23 @@ class DatasetHelper:
         """Get loop_size for every iteration."""
         return self.iter.loop_size
 
+    @property
+    def stats(self):
+        """
+        Step time counters when feeding the data from host, None in dataset sink mode.
+
+        `data_wait_time` is the time spent waiting for the batches and `compute_time` the time spent by the
+        caller between getting a batch and asking for the next one, both in seconds and summed over `steps`.
+        """
+        if isinstance(self.iter, _DatasetIterFeed):
+            return self.iter.stats
+        return None
+
+    def stop(self):
+        """Stops the background prefetching of the current epoch, before leaving it early or resetting the dataset."""
+        if isinstance(self.iter, _DatasetIterFeed):
+            self.iter.stop()
+
 
 class _DatasetIter:
     """Base iter for dataset help"""
@@ -190,9 +215,62 @@ class _DatasetIterGE(_DatasetIter):
         self.op = op
 
 
+class _FeedPrefetcher:
+    """
+    Converts the batches of one epoch in a background thread.
+
+    At most `prefetch_size` converted batches are waiting in the queue, an exception raised by the dataset or the
+    conversion is raised again by `get` on the calling thread.
+    """
+    def __init__(self, iterator, convert, count, prefetch_size):
+        self._iterator = iterator
+        self._convert = convert
+        self._count = count
+        self._queue = queue.Queue(prefetch_size)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="feed_prefetcher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        """Puts an item in the queue, returns False if stopped before there is room for it."""
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        """Prefetcher thread."""
+        for _ in range(self._count):
+            if self._stop_event.is_set():
+                return
+            try:
+                item = (self._convert(self._iterator.__next__()), None)
+            except BaseException as e:  # pylint: disable=broad-except
+                self._put((None, e))
+                return
+            if not self._put(item):
+                return
+
+    def get(self):
+        """Gets the next converted batch."""
+        data, error = self._queue.get()
+        if error is not None:
+            raise error
+        return data
+
+    def stop(self):
+        """Stops the thread and waits for it, the batches not got yet are dropped."""
+        self._stop_event.set()
+        self._thread.join()
+
+
 class _DatasetIterFeed:
     """Iter for normal(non sink) mode, feed the data from host."""
-    def __init__(self, dataset):
+    def __init__(self, dataset, prefetch_size=2):
         self.dataset = dataset
         self.device_num = _get_device_num()
         self.global_rank = _get_global_rank()
@@ -200,20 +278,54 @@ class _DatasetIterFeed:
         self.repeat_ind = 0
         self.loop_count = dataset.get_dataset_size()
         self.ind = 0
+        self.prefetch_size = prefetch_size
+        self._prefetcher = None
+        # the expanded arrays of _to_full_tensor, the Tensors copy them so they can be refilled every step
+        self._full_buffers = {}
+        self._stats = {"steps": 0, "data_wait_time": 0.0, "compute_time": 0.0}
+        self._last_step_end = None
+
+    @property
+    def stats(self):
+        return dict(self._stats)
+
+    def _convert(self, data):
+        if _need_to_full():
+            return _to_full_tensor(data, self.device_num, self.global_rank, buffers=self._full_buffers)
+        return _to_tensor(data)
+
+    def stop(self):
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+        self._last_step_end = None
 
     def __iter__(self):
+        self.stop()
         if self.repeat_ind % self.repeat_count == 0:
             self.iter = self.dataset.__iter__()
 
         self.repeat_ind += 1
         self.ind = 0
+        if self.prefetch_size > 0:
+            self._prefetcher = _FeedPrefetcher(self.iter, self._convert, self.loop_count, self.prefetch_size)
         return self
 
     def __next__(self):
+        start_time = time.perf_counter()
+        if self._last_step_end is not None:
+            self._stats["compute_time"] += start_time - self._last_step_end
         if self.ind >= self.loop_count:
+            self._last_step_end = None
+            logger.debug("Fed %d steps, data wait time: %.3fs, compute time: %.3fs.", self._stats["steps"],
+                         self._stats["data_wait_time"], self._stats["compute_time"])
             raise StopIteration()
         self.ind += 1
-        data = self.iter.__next__()
-        if _need_to_full():
-            return _to_full_tensor(data, self.device_num, self.global_rank)
-        return _to_tensor(data)
+        if self._prefetcher is not None:
+            data = self._prefetcher.get()
+        else:
+            data = self._convert(self.iter.__next__())
+        self._last_step_end = time.perf_counter()
+        self._stats["data_wait_time"] += self._last_step_end - start_time
+        self._stats["steps"] += 1
+        return data
@@ -481,6 +481,7 @@ class Model:
                 if should_stop:
                     break
 
+            dataset_helper.stop()
             train_dataset.reset()
 
             list_callback.epoch_end(run_context)
@@ -15,13 +15,16 @@
 """Model and parameters serialization."""
 import os
 import stat
+from collections.abc import MutableMapping
 from threading import Thread, Lock
 import numpy as np
 
 import mindspore.nn as nn
 import mindspore.context as context
 from mindspore import log as logger
-from mindspore.train.checkpoint_pb2 import Checkpoint
+from mindspore.train._checkpoint_io import CheckpointReader, CheckpointWriter, CheckpointEntry, \
+    DeltaCheckpointReader, encode_delta_manifest, encode_json, DELTA_MANIFEST_NAME, DELTA_ROWS_SUFFIX, \
+    SHARD_LAYOUT_NAME
 from mindspore.train.print_pb2 import Print
 from mindspore.common.tensor import Tensor
 from mindspore.common.initializer import initializer
@@ -30,7 +33,8 @@ from mindspore.common.api import _executor
 from mindspore.common import dtype as mstype
 from mindspore._checkparam import check_input_data
 
-__all__ = ["save_checkpoint", "load_checkpoint", "load_param_into_net", "export", "parse_print"]
+__all__ = ["save_checkpoint", "load_checkpoint", "load_distributed_checkpoint", "load_param_into_net", "export",
+           "parse_print"]
 
 tensor_to_ms_type = {"Int8": mstype.int8, "Uint8": mstype.uint8, "Int16": mstype.int16, "Uint16": mstype.uint16,
                      "Int32": mstype.int32, "Uint32": mstype.uint32, "Int64": mstype.int64, "Uint64": mstype.uint64,
@@ -105,30 +109,45 @@ def _update_param(param, new_param):
 
 def _exec_save(ckpt_file_name, data_list):
     """Execute save checkpoint into file process."""
-    checkpoint_list = Checkpoint()
-
     try:
         with _ckpt_mutex:
-            for name, value in data_list.items():
-                param_value = checkpoint_list.value.add()
-                param_value.tag = name
-                param_tensor = param_value.tensor
-                param_tensor.dims.extend(value[0])
-                param_tensor.tensor_type = value[1]
-                param_tensor.tensor_content = value[2].tostring()
-
-            with open(ckpt_file_name, "wb") as f:
-                f.write(checkpoint_list.SerializeToString())
-                os.chmod(ckpt_file_name, stat.S_IRUSR)
+            with CheckpointWriter(ckpt_file_name) as writer:
+                for name, value in data_list.items():
+                    writer.write(name, value[0], value[1], value[2])
 
     except BaseException as e:
         logger.error("Failed to save the checkpoint file %s.", ckpt_file_name)
         raise RuntimeError(e.__str__())
 
+
+def _param_header(param):
+    """Initializes a parameter of the save list, returns its dims and tensor type."""
+    if isinstance(param["data"], Parameter):
+        param["data"].init_data()
+    dims = []
+    if param['data'].shape == ():
+        dims.append(0)
+    else:
+        for dim in param['data'].shape:
+            dims.append(dim)
+    tensor_type = str(param["data"].dtype)
+    return dims, tensor_type
+
+
+def _param_to_host(param):
+    """Copies a parameter of the save list to host, returns its dims, tensor type and flattened data."""
+    dims, tensor_type = _param_header(param)
+    data = param["data"].asnumpy().reshape(-1)
+    return [dims, tensor_type, data]
+
+
 def save_checkpoint(parameter_list, ckpt_file_name, async_save=False):
     """
     Saves checkpoint info to a specified file.
 
+    In synchronous mode the parameters are streamed into the file, each one is written as soon as it is copied
+    to host, so the host memory needed does not grow with the model size.
+
     Args:
         parameter_list (list): Parameters list, each element is a dict
                                like {"name":xx, "type":xx, "shape":xx, "data":xx}.
@@ -140,47 +159,92 @@ def save_checkpoint(parameter_list, ckpt_file_name, async_save=False):
     """
     logger.info("Execute save checkpoint process.")
 
-    data_list = {}
-    with _ckpt_mutex:
-        for param in parameter_list:
-            key = param["name"]
-            data_list[key] = []
-            if isinstance(param["data"], Parameter):
-                param["data"].init_data()
-            dims = []
-            if param['data'].shape == ():
-                dims.append(0)
-            else:
-                for dim in param['data'].shape:
-                    dims.append(dim)
-            data_list[key].append(dims)
-            tensor_type = str(param["data"].dtype)
-            data_list[key].append(tensor_type)
-            data = param["data"].asnumpy().reshape(-1)
-            data_list[key].append(data)
-
     if async_save:
+        data_list = {}
+        with _ckpt_mutex:
+            for param in parameter_list:
+                data_list[param["name"]] = _param_to_host(param)
         thr = Thread(target=_exec_save, args=(ckpt_file_name, data_list))
         thr.start()
     else:
-        _exec_save(ckpt_file_name, data_list)
+        try:
+            with _ckpt_mutex:
+                with CheckpointWriter(ckpt_file_name) as writer:
+                    for param in parameter_list:
+                        dims, tensor_type, data = _param_to_host(param)
+                        writer.write(param["name"], dims, tensor_type, data)
+
+        except BaseException as e:
+            logger.error("Failed to save the checkpoint file %s.", ckpt_file_name)
+            raise RuntimeError(e.__str__())
     logger.info("Save checkpoint process finish.")
 
 
-def load_checkpoint(ckpt_file_name, net=None):
-    """
-    Loads checkpoint info from a specified file.
+def _build_param_from_entry(reader, entry):
+    """Creates the Parameter of a checkpoint entry, this is where the tensor data is copied out of the file."""
+    np_type = tensor_to_np_type[entry.tensor_type]
+    ms_type = tensor_to_ms_type[entry.tensor_type]
+    param_data = reader.tensor_view(entry, np_type)
+    dims = entry.dims
 
-    Args:
-        ckpt_file_name (str): Checkpoint file name.
-        net (Cell): Cell network. Default: None
+    if dims == [0]:
+        if 'Float' in entry.tensor_type:
+            param_data = float(param_data[0])
+        elif 'Int' in entry.tensor_type:
+            param_data = int(param_data[0])
+        return Parameter(Tensor(param_data, ms_type), name=entry.name)
+    if dims == [1]:
+        return Parameter(Tensor(param_data, ms_type), name=entry.name)
+    return Parameter(Tensor(param_data.reshape(dims), ms_type), name=entry.name)
 
-    Returns:
-        Dict, key is parameter name, value is a Parameter.
 
-    Raises:
-        ValueError: Checkpoint file is incorrect.
+class _LazyParameterDict(MutableMapping):
+    """
+    Parameter dict whose values are created on first access.
+
+    Until a parameter is looked up, its value is a CheckpointEntry pointing into the memory-mapped checkpoint
+    file, so only the parameters actually used, e.g. by `load_param_into_net`, are read and copied. It is not a
+    subclass of dict, so every way of reading a value, e.g. `pop`, `dict(d)` or `{**d}`, goes through
+    `__getitem__` and gets a Parameter.
     """
+    def __init__(self, reader):
+        self._reader = reader
+        self._params = {}
+
+    def _add_entry(self, entry):
+        self._params[entry.name] = entry
+
+    def __getitem__(self, key):
+        value = self._params[key]
+        if isinstance(value, CheckpointEntry):
+            value = _build_param_from_entry(self._reader, value)
+            self._params[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._params[key] = value
+
+    def __delitem__(self, key):
+        del self._params[key]
+
+    def __iter__(self):
+        return iter(self._params)
+
+    def __len__(self):
+        return len(self._params)
+
+    def __contains__(self, key):
+        return key in self._params
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, list(self._params))
+
+    def copy(self):
+        return {key: self[key] for key in self}
+
+
+def _check_checkpoint_file(ckpt_file_name):
+    """Checks the name and the size of a checkpoint file to load."""
     if not isinstance(ckpt_file_name, str):
         raise ValueError("The ckpt_file_name must be string.")
 
@@ -193,41 +257,51 @@ def load_checkpoint(ckpt_file_name, net=None):
     if os.path.getsize(ckpt_file_name) == 0:
         raise ValueError("The checkpoint file may be empty, please make sure enter the correct file name.")
 
+
+def load_checkpoint(ckpt_file_name, net=None, lazy_load=False):
+    """
+    Loads checkpoint info from a specified file.
+
+    The checkpoint file is memory-mapped and the tensor data is read straight from the mapping, without
+    holding the serialized file in memory. If the file is an incremental checkpoint, it is merged with the
+    full checkpoint it is based on, which must be in the same directory.
+
+    Args:
+        ckpt_file_name (str): Checkpoint file name.
+        net (Cell): Cell network. Default: None
+        lazy_load (bool): Whether to create each Parameter only when it is first accessed in the returned dict,
+            keeping the peak memory to the parameters actually used. Default: False.
+
+    Returns:
+        Dict, key is parameter name, value is a Parameter. With `lazy_load`, a mutable mapping which is not a
+        subclass of dict.
+
+    Raises:
+        ValueError: Checkpoint file is incorrect.
+    """
+    _check_checkpoint_file(ckpt_file_name)
+
     logger.info("Execute load checkpoint process.")
-    checkpoint_list = Checkpoint()
 
     try:
-        with open(ckpt_file_name, "rb") as f:
-            pb_content = f.read()
-        checkpoint_list.ParseFromString(pb_content)
+        reader = CheckpointReader(ckpt_file_name)
+        if reader.is_delta():
+            reader = DeltaCheckpointReader(ckpt_file_name, reader)
     except BaseException as e:
         logger.error("Failed to read the checkpoint file `%s`, please check the correct of the file.", ckpt_file_name)
         raise ValueError(e.__str__())
 
-    parameter_dict = {}
+    parameter_dict = _LazyParameterDict(reader) if lazy_load else {}
     try:
-        for element in checkpoint_list.value:
-            data = element.tensor.tensor_content
-            data_type = element.tensor.tensor_type
-            np_type = tensor_to_np_type[data_type]
-            ms_type = tensor_to_ms_type[data_type]
-            param_data = np.fromstring(data, np_type)
-            dims = element.tensor.dims
-
-            if dims == [0]:
-                if 'Float' in data_type:
-                    param_data = float(param_data[0])
-                elif 'Int' in data_type:
-                    param_data = int(param_data[0])
-                parameter_dict[element.tag] = Parameter(Tensor(param_data, ms_type), name=element.tag)
-            elif dims == [1]:
-                parameter_dict[element.tag] = Parameter(Tensor(param_data, ms_type), name=element.tag)
+        for entry in reader.entries:
+            if entry.name == SHARD_LAYOUT_NAME:
+                continue
+            if entry.tensor_type not in tensor_to_np_type:
+                raise ValueError("Unsupported tensor type {} of parameter {}.".format(entry.tensor_type, entry.name))
+            if lazy_load:
+                parameter_dict._add_entry(entry)
             else:
-                param_dim = []
-                for dim in dims:
-                    param_dim.append(dim)
-                param_value = param_data.reshape(param_dim)
-                parameter_dict[element.tag] = Parameter(Tensor(param_value, ms_type), name=element.tag)
+                parameter_dict[entry.name] = _build_param_from_entry(reader, entry)
 
         logger.info("Load checkpoint process finish.")
 
@@ -241,6 +315,129 @@ def load_checkpoint(ckpt_file_name, net=None):
     return parameter_dict
 
 
+def load_distributed_checkpoint(ckpt_file_names, net=None, rank_id=None):
+    """
+    Loads the checkpoint files saved by every device with `integrated_save=False`.
+
+    In that mode each device saves only its own slices of the split parameters, together with their layouts.
+    The slices held by the target device are assembled from the regions of the saved slices which overlap them,
+    the files are memory-mapped so only these regions are read. The target layout may use another device
+    matrix or tensor map than the saved one.
+
+    Args:
+        ckpt_file_names (list[str]): Checkpoint file names, one per saving device.
+        net (Cell): Compiled Cell network, its parameter layouts give the slices to load, of the parameters saved
+            in slices as well as of the ones saved whole. If None or if a parameter is not split in `net`, the whole
+            parameter is loaded. Default: None.
+        rank_id (int): The rank to load the slices of. Default: None, the rank of the current device.
+
+    Returns:
+        Dict, key is parameter name, value is a Parameter.
+
+    Raises:
+        ValueError: Checkpoint files are incorrect or do not hold the whole parameters.
+    """
+    if not isinstance(ckpt_file_names, (list, tuple)) or not ckpt_file_names:
+        raise ValueError("The ckpt_file_names must be a non empty list of checkpoint file names.")
+    for ckpt_file_name in ckpt_file_names:
+        _check_checkpoint_file(ckpt_file_name)
+
+    logger.info("Execute load distributed checkpoint process.")
+    slices = {}
+    whole_params = {}
+    try:
+        for ckpt_file_name in ckpt_file_names:
+            reader = CheckpointReader(ckpt_file_name)
+            entries = {entry.name: entry for entry in reader.entries}
+            layouts = {}
+            rank = 0
+            if SHARD_LAYOUT_NAME in entries:
+                shard_manifest = reader.read_json(entries.pop(SHARD_LAYOUT_NAME))
+                layouts = shard_manifest["params"]
+                rank = shard_manifest["rank"]
+            for name, entry in entries.items():
+                if name in layouts:
+                    slices.setdefault(name, []).append((reader, entry, layouts[name], rank))
+                elif name not in whole_params:
+                    whole_params[name] = (reader, entry)
+    except BaseException as e:
+        logger.error("Failed to read the checkpoint files, please check the correct of the files.")
+        raise ValueError(e.__str__())
+
+    target_layouts = net.parameter_layout_dict if net is not None else {}
+    if rank_id is None and target_layouts:
+        from mindspore.parallel._utils import _get_global_rank
+        rank_id = _get_global_rank()
+
+    parameter_dict = {}
+    for name, (reader, entry) in whole_params.items():
+        box = _get_target_box(target_layouts.get(name), entry.dims, rank_id)
+        if box is None:
+            parameter_dict[name] = _build_param_from_entry(reader, entry)
+        else:
+            parameter_dict[name] = _build_param_from_whole(reader, entry, box)
+    for name, param_slices in slices.items():
+        full_shape = param_slices[0][2]["full_shape"]
+        box = _get_target_box(target_layouts.get(name), full_shape, rank_id)
+        if box is None:
+            box = [(0, dim) for dim in full_shape]
+        parameter_dict[name] = _build_param_from_slices(name, param_slices, box)
+
+    logger.info("Load distributed checkpoint process finish.")
+    if net:
+        load_param_into_net(net, parameter_dict)
+
+    return parameter_dict
+
+
+def _get_target_box(target_layout, full_shape, rank_id):
+    """Gets the region of a parameter held by the target device, None if the parameter is not split."""
+    if not target_layout or len(target_layout) < 2 or all(dim == -1 for dim in target_layout[1]):
+        return None
+    from mindspore.parallel._tensor import _get_slice_box
+    return _get_slice_box(target_layout[0], target_layout[1], full_shape, rank_id)
+
+
+def _build_param_from_whole(reader, entry, box):
+    """Creates the Parameter holding the region `box` of a parameter saved whole, only this region is read."""
+    np_type = tensor_to_np_type[entry.tensor_type]
+    data = reader.tensor_view(entry, np_type).reshape(entry.dims)
+    data = np.array(data[tuple(slice(start, stop) for start, stop in box)])
+    return Parameter(Tensor(data, tensor_to_ms_type[entry.tensor_type]), name=entry.name)
+
+
+def _build_param_from_slices(name, param_slices, box):
+    """Creates the Parameter holding the region `box` of a parameter, from the saved slices overlapping it."""
+    from mindspore.parallel._tensor import _get_slice_box
+    tensor_type = param_slices[0][1].tensor_type
+    np_type = tensor_to_np_type[tensor_type]
+    data = np.empty([stop - start for start, stop in box], np_type)
+    copied_boxes = set()
+    copied_size = 0
+    for reader, entry, layout, rank in param_slices:
+        if layout["field_size"][0]:
+            raise ValueError("Parameter {} is split with a field size, it can not be loaded from slices."
+                             .format(name))
+        slice_box = _get_slice_box(layout["dev_mat"], layout["tensor_map"], layout["full_shape"], rank)
+        # slices duplicated on several devices are only copied once
+        if tuple(slice_box) in copied_boxes:
+            continue
+        copied_boxes.add(tuple(slice_box))
+        overlap = [(max(start, slice_start), min(stop, slice_stop))
+                   for (start, stop), (slice_start, slice_stop) in zip(box, slice_box)]
+        if any(start >= stop for start, stop in overlap):
+            continue
+        slice_data = reader.tensor_view(entry, np_type).reshape([stop - start for start, stop in slice_box])
+        data[tuple(slice(start - box_start, stop - box_start) for (start, stop), (box_start, _)
+                   in zip(overlap, box))] = \
+            slice_data[tuple(slice(start - slice_start, stop - slice_start) for (start, stop), (slice_start, _)
+                             in zip(overlap, slice_box))]
+        copied_size += int(np.prod([stop - start for start, stop in overlap]))
+    if copied_size != data.size:
+        raise ValueError("The checkpoint files do not hold the whole data of parameter {}.".format(name))
+    return Parameter(Tensor(data, tensor_to_ms_type[tensor_type]), name=name)
+
+
 def load_param_into_net(net, parameter_dict):
     """
     Loads parameters into network.
@@ -257,7 +454,7 @@ def load_param_into_net(net, parameter_dict):
         msg = ("Argument net should be a Cell, but got {}.".format(type(net)))
         raise TypeError(msg)
 
-    if not isinstance(parameter_dict, dict):
+    if not isinstance(parameter_dict, (dict, _LazyParameterDict)):
         logger.error("Failed to combine the net and the parameters.")
         msg = ("Argument parameter_dict should be a dict, but got {}.".format(type(parameter_dict)))
         raise TypeError(msg)
@@ -312,6 +509,82 @@ def _load_dismatch_prefix_params(net, parameter_dict, param_not_load):
                     param_not_load.remove(param.name)
 
 
+def _save_delta_checkpoint(parameter_list, ckpt_file_name, base_file_name):
+    """
+    Saves an incremental checkpoint, holding only what changed since a full checkpoint.
+
+    A parameter which differs from the base in less than half of its rows is saved as the changed rows and
+    their indices, other changed parameters are saved whole and unchanged parameters are not saved at all.
+    Data is compared bitwise against the memory-mapped base file, so no copy of the base is kept in memory.
+
+    Args:
+        parameter_list (list): Parameters list, each element is a dict like {"name":xx, "data":xx}.
+        ckpt_file_name (str): Incremental checkpoint file name.
+        base_file_name (str): Full checkpoint file name, must be in the same directory as `ckpt_file_name`.
+
+    Raises:
+        RuntimeError: Failed to save the Checkpoint file.
+    """
+    logger.info("Execute save incremental checkpoint process.")
+
+    try:
+        with _ckpt_mutex:
+            base = CheckpointReader(base_file_name)
+            base_entries = {entry.name: entry for entry in base.entries}
+            patched = []
+            saved_names = set()
+            with CheckpointWriter(ckpt_file_name) as writer:
+                for param in parameter_list:
+                    name = param["name"]
+                    saved_names.add(name)
+                    dims, tensor_type, data = _param_to_host(param)
+                    base_entry = base_entries.get(name)
+                    if base_entry is None or base_entry.dims != dims or base_entry.tensor_type != tensor_type:
+                        writer.write(name, dims, tensor_type, data)
+                        continue
+
+                    base_data = base.tensor_view(base_entry, tensor_to_np_type[tensor_type])
+                    rows = dims[0] if len(dims) > 1 else 1
+                    if data.size == 0 or rows <= 1:
+                        if not np.array_equal(data.view(np.uint8), base_data.view(np.uint8)):
+                            writer.write(name, dims, tensor_type, data)
+                        continue
+
+                    changed = (data.view(np.uint8).reshape(rows, -1) != base_data.view(np.uint8).reshape(rows, -1))
+                    changed_rows = np.flatnonzero(changed.any(axis=1))
+                    if changed_rows.size * 2 > rows:
+                        writer.write(name, dims, tensor_type, data)
+                    elif changed_rows.size:
+                        row_data = data.reshape(rows, -1)[changed_rows]
+                        writer.write(name, [changed_rows.size] + dims[1:], tensor_type, row_data)
+                        writer.write(name + DELTA_ROWS_SUFFIX, [changed_rows.size], "Int64",
+                                     changed_rows.astype(np.int64))
+                        patched.append(name)
+
+                removed = [name for name in base_entries if name not in saved_names]
+                manifest = encode_delta_manifest(base_file_name, patched, removed)
+                writer.write(DELTA_MANIFEST_NAME, [manifest.size], "Uint8", manifest)
+
+    except BaseException as e:
+        logger.error("Failed to save the checkpoint file %s.", ckpt_file_name)
+        raise RuntimeError(e.__str__())
+    logger.info("Save incremental checkpoint process finish.")
+
+
+def _exec_save_delta_checkpoint(train_network, ckpt_file_name, base_file_name, integrated_save=True):
+    """
+    Saves incremental checkpoint for 'ms' backend.
+
+    Args:
+        train_network (Network): The train network for training.
+        ckpt_file_name (str): The name of incremental checkpoint file.
+        base_file_name (str): The name of the full checkpoint file it is based on.
+        integrated_save (bool): Whether to integrated save in automatic model parallel scene.
+    """
+    param_list = _get_save_param_list(train_network, integrated_save)
+    _save_delta_checkpoint(param_list, ckpt_file_name, base_file_name)
+
+
 def _save_graph(network, file_name):
     """
     Saves the graph of network to a file.
@@ -339,12 +612,27 @@ def _exec_save_checkpoint(train_network, ckpt_file_name, integrated_save=True, a
         integrated_save (bool): Whether to integrated save in automatic model parallel scene.
         async_save (bool): Whether asynchronous execute save checkpoint into file. Default: False.
     """
+    param_list = _get_save_param_list(train_network, integrated_save)
+    save_checkpoint(param_list, ckpt_file_name, async_save)
+
 
+def _get_save_param_list(train_network, integrated_save=True):
+    """
+    Gets the parameters list to save of a network.
+
+    Args:
+        train_network (Network): The train network for training.
+        integrated_save (bool): Whether to integrated save in automatic model parallel scene.
+
+    Returns:
+        List, each element is a dict like {"name":xx, "data":xx}.
+    """
     param_dict = {}
     for _, param in train_network.parameters_and_names():
         param_dict[param.name] = param
 
     param_list = []
+    shard_layouts = {}
     for (key, value) in param_dict.items():
         each_param = {"name": key}
         value.init_data()
@@ -355,13 +643,37 @@ def _exec_save_checkpoint(train_network, ckpt_file_name, integrated_save=True, a
 
         # in automatic model parallel scenario, some parameters were spliteds to all the devices,
         # which should be combined before saving
-        if integrated_save and key in train_network.parameter_layout_dict:
-            param_data = _get_merged_param_data(train_network, key, param_data)
+        if key in train_network.parameter_layout_dict:
+            if integrated_save:
+                param_data = _get_merged_param_data(train_network, key, param_data)
+            else:
+                layout = _get_shard_layout(train_network.parameter_layout_dict[key], param_data.shape)
+                if layout is not None:
+                    shard_layouts[key] = layout
 
         each_param["data"] = param_data
         param_list.append(each_param)
 
-    save_checkpoint(param_list, ckpt_file_name, async_save)
+    # each device only saves its own slices, together with their layouts
+    if shard_layouts:
+        from mindspore.parallel._utils import _get_global_rank
+        shard_manifest = {"rank": _get_global_rank(), "params": shard_layouts}
+        param_list.append({"name": SHARD_LAYOUT_NAME, "data": Tensor(encode_json(shard_manifest))})
+
+    return param_list
+
+
+def _get_shard_layout(layout, slice_shape):
+    """Gets the layout recorded in a sharded checkpoint for a parameter slice, None if it is not split."""
+    if len(layout) < 2:
+        return None
+    dev_mat = list(layout[0])
+    tensor_map = list(layout[1])
+    field_size = list(layout[3]) if len(layout) > 3 else [0]
+    from mindspore.parallel._tensor import _get_tensor_strategy
+    tensor_strategy = _get_tensor_strategy(dev_mat, tensor_map)
+    full_shape = [dim * split for dim, split in zip(slice_shape, tensor_strategy)]
+    return {"dev_mat": dev_mat, "tensor_map": tensor_map, "full_shape": full_shape, "field_size": field_size}
 
 
 def _get_merged_param_data(net, param_name, param_data):
@@ -127,7 +127,7 @@ def package_summary_event(data_list, step, wall_time):
             if not _fill_image_summary(tag, data, summary_value.image, MS_IMAGE_TENSOR_FORMAT):
                 del summary.value[-1]
         elif summary_type == 'Histogram':
-            _fill_histogram_summary(tag, data, summary_value.histogram)
+            _fill_histogram_summary(tag, data, summary_value.histogram, value.get("stats"))
         else:
             # The data is invalid ,jump the data
             logger.error(f"Summary type({summary_type}) is error, tag = {tag}")
@@ -257,7 +257,69 @@ def _calc_histogram_bins(count):
     return max_bins
 
 
-def _fill_histogram_summary(tag: str, np_value: np.ndarray, summary) -> None:
+def _calc_histogram_stats(np_value: np.ndarray):
+    """
+    Calculates the statistics of a histogram with as few passes over the data as possible.
+
+    Args:
+        np_value (np.ndarray): Summary data.
+
+    Returns:
+        tuple, the valid values of `np_value` and the statistics `(count, nan_count, pos_inf_count, neg_inf_count,
+        min, max, sum)`, min, max and sum being None if there is no valid value.
+    """
+    total = np_value.size
+    nan_count = pos_inf_count = neg_inf_count = 0
+    valid_value = np_value.reshape(-1)
+    if issubclass(np_value.dtype.type, np.floating) and total:
+        finite = np.isfinite(valid_value)
+        invalid_count = total - np.count_nonzero(finite)
+        if invalid_count:
+            nan_count = np.count_nonzero(np.isnan(valid_value))
+            pos_inf_count = np.count_nonzero(valid_value == np.inf)
+            neg_inf_count = invalid_count - nan_count - pos_inf_count
+            valid_value = valid_value[finite]
+
+    if not valid_value.size:
+        return valid_value, (total, nan_count, pos_inf_count, neg_inf_count, None, None, None)
+    stats = (total, nan_count, pos_inf_count, neg_inf_count,
+             valid_value.min(), valid_value.max(), valid_value.sum(dtype=np.float64))
+    return valid_value, stats
+
+
+def _reduce_histogram(np_value: np.ndarray, max_samples: int, rng=np.random):
+    """
+    Reduces a tensor to a random sample of its valid values and the statistics of the whole tensor.
+
+    Only the sample has to be sent to the summary writer, the buckets of the histogram are estimated from it.
+
+    Args:
+        np_value (np.ndarray): Summary data.
+        max_samples (int): The largest number of values to keep.
+        rng (Union[numpy.random, numpy.random.RandomState]): The random generator drawing the sample.
+
+    Returns:
+        tuple, the sample and the statistics as returned by `_calc_histogram_stats`.
+    """
+    valid_value, stats = _calc_histogram_stats(np_value)
+    if valid_value.size > max_samples:
+        # drawn with replacement, which costs O(max_samples) whatever the size of the tensor
+        indices = np.sort(rng.randint(0, valid_value.size, size=max_samples))
+        valid_value = valid_value[indices]
+    return valid_value, stats
+
+
+def _scale_counts(counts, total):
+    """Scales the counts of the buckets of a sample to integers summing to `total`, by largest remainders."""
+    scaled = counts * (total / counts.sum())
+    result = np.floor(scaled).astype(np.int64)
+    remainder = total - int(result.sum())
+    if remainder > 0:
+        result[np.argsort(result - scaled, kind="stable")[:remainder]] += 1
+    return result
+
+
+def _fill_histogram_summary(tag: str, np_value: np.ndarray, summary, stats=None) -> None:
     """
     Package the histogram summary.
 
@@ -265,52 +327,44 @@ def _fill_histogram_summary(tag: str, np_value: np.ndarray, summary) -> None:
         tag (str): Summary tag describe.
         np_value (np.ndarray): Summary data.
         summary (summary_pb2.Summary.Histogram): Summary histogram data.
+        stats (tuple): The statistics of the whole tensor when `np_value` is a sample of its valid values,
+            see `_reduce_histogram`. Default: None.
     """
     logger.debug(f"Set({tag}) the histogram summary value")
-    # Default bucket for tensor with no valid data.
-    ma_value = np.ma.masked_invalid(np_value)
-    total, valid = np_value.size, ma_value.count()
-    invalids = []
-    for isfn in np.isnan, np.isposinf, np.isneginf:
-        if total - valid > sum(invalids):
-            count = np.count_nonzero(isfn(np_value))
-            invalids.append(count)
-        else:
-            invalids.append(0)
+    if stats is None:
+        np_value, stats = _calc_histogram_stats(np_value)
+    total, nan_count, pos_inf_count, neg_inf_count, min_value, max_value, sum_value = stats
+    valid = total - nan_count - pos_inf_count - neg_inf_count
 
     summary.count = total
-    summary.nan_count, summary.pos_inf_count, summary.neg_inf_count = invalids
+    summary.nan_count, summary.pos_inf_count, summary.neg_inf_count = nan_count, pos_inf_count, neg_inf_count
     if not valid:
-        logger.warning(f'There are no valid values in the ndarray(size={total}, shape={np_value.shape})')
+        logger.warning(f'There are no valid values in the ndarray(size={total})')
         # summary.{min, max, sum} are 0s by default, no need to explicitly set
-    else:
-        # BUG: max of a masked array with dtype np.float16 returns inf
-        # See numpy issue#15077
-        if issubclass(np_value.dtype.type, np.floating):
-            summary.min = ma_value.min(fill_value=np.PINF)
-            summary.max = ma_value.max(fill_value=np.NINF)
-            if summary.min < F32_MIN or summary.max > F32_MAX:
-                logger.warning(f'Values({summary.min}, {summary.max}) are too large, '
-                               f'you may encounter some undefined behaviours hereafter.')
-        else:
-            summary.min = ma_value.min()
-            summary.max = ma_value.max()
-        summary.sum = ma_value.sum(dtype=np.float64)
-        bins = _calc_histogram_bins(valid)
-        first_edge, last_edge = summary.min, summary.max
-
-        if not first_edge < last_edge:
-            first_edge -= 0.5
-            last_edge += 0.5
-
-        bins = np.linspace(first_edge, last_edge, bins + 1, dtype=np_value.dtype)
-        hists, edges = np.histogram(np_value, bins=bins)
-
-        for hist, edge1, edge2 in zip(hists, edges, edges[1:]):
-            bucket = summary.buckets.add()
-            bucket.width = edge2 - edge1
-            bucket.count = hist
-            bucket.left = edge1
+        return
+
+    summary.min, summary.max, summary.sum = min_value, max_value, sum_value
+    if issubclass(np_value.dtype.type, np.floating) and (summary.min < F32_MIN or summary.max > F32_MAX):
+        logger.warning(f'Values({summary.min}, {summary.max}) are too large, '
+                       f'you may encounter some undefined behaviours hereafter.')
+
+    bins = _calc_histogram_bins(valid)
+    first_edge, last_edge = summary.min, summary.max
+    if not first_edge < last_edge:
+        first_edge -= 0.5
+        last_edge += 0.5
+
+    # equal width buckets let the counts be computed in one pass instead of a binary search per value, the edges
+    # are the float64 ones np.histogram counts with, so that integer tensors do not report truncated edges
+    hists, edges = np.histogram(np_value, bins=bins, range=(float(first_edge), float(last_edge)))
+    if np_value.size != valid:
+        hists = _scale_counts(hists, valid)
+
+    for hist, edge1, edge2 in zip(hists, edges, edges[1:]):
+        bucket = summary.buckets.add()
+        bucket.width = edge2 - edge1
+        bucket.count = hist
+        bucket.left = edge1
 
 
 def _fill_image_summary(tag: str, np_value, summary_image, input_format='NCHW'):
@@ -17,6 +17,7 @@ import os
 import time
 from collections import deque
 from multiprocessing import Pool, Process, Queue, cpu_count
+from queue import Empty
 
 import mindspore.log as logger
 
@@ -35,49 +36,126 @@ def _pack_data(datadict, wall_time):
             elif plugin in ('train_lineage', 'eval_lineage', 'custom_lineage_data', 'dataset_graph'):
                 result.append([plugin, serialize_to_lineage_event(plugin, data.get('value'))])
             elif plugin in ('scalar', 'tensor', 'histogram', 'image'):
-                summaries.append({'_type': plugin.title(), 'name': data.get('tag'), 'data': data.get('value')})
+                summaries.append({'_type': plugin.title(), 'name': data.get('tag'), 'data': data.get('value'),
+                                  'stats': data.get('stats')})
                 step = data.get('step')
     if summaries:
         result.append(['summary', package_summary_event(summaries, step, wall_time).SerializeToString()])
     return result
 
 
+def _pack_data_batch(datadicts, wall_time):
+    """Pack a batch of data dicts, keeping their order."""
+    result = []
+    for datadict in datadicts:
+        result.extend(_pack_data(datadict, wall_time))
+    return result
+
+
 class WriterPool(Process):
     """
     Use a set of pooled resident processes for writing a list of file.
 
+    The writer process blocks on its queue when there is nothing to do. The data received are packed in
+    batches, either by a pool of processes or inline if `max_workers` is 0, and the packed events are written in
+    the order they were received. At most `max_pending` batches are being packed at a time, beyond that the
+    writer process stops reading its queue, which is bounded, so `write` blocks until the packing catches up.
+
     Args:
         base_dir (str): The base directory to hold all the files.
+        max_workers (int): The number of processes packing the data, 0 to pack in the writer process.
+            Default: None, min(cpu_count(), 32).
+        queue_size (int): The capacity of the queue of data to write. Default: None, cpu_count() * 2.
+        flush_time (int): Interval in seconds to flush the written data to disk, 0 to only flush on demand.
+            Default: 0.
         filelist (str): The mapping from short name to long filename.
     """
+    # the largest number of data dicts packed by a single task of the pool
+    BATCH_SIZE = 16
+    # time to wait for new data before checking again the batches being packed
+    RESULT_WAIT_TIME = 0.1
 
-    def __init__(self, base_dir, **filedict) -> None:
+    def __init__(self, base_dir, max_workers=None, queue_size=None, flush_time=0, **filedict) -> None:
         super().__init__()
         self._base_dir, self._filedict = base_dir, filedict
-        self._queue, self._writers_ = Queue(cpu_count() * 2), None
+        self._max_workers = min(cpu_count(), 32) if max_workers is None else max_workers
+        self._max_pending = max(self._max_workers, 1) * 2
+        self._flush_time = flush_time
+        self._queue, self._writers_ = Queue(queue_size or cpu_count() * 2), None
         self.start()
 
+    def _get_action(self, timeout):
+        """Get the next action of the queue, None if nothing was received before the timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def _take_write_batch(self, data):
+        """Take the data to write waiting in the queue after `data`, returns the batch and the next action."""
+        batch = [data]
+        while len(batch) < self.BATCH_SIZE:
+            try:
+                action, data = self._queue.get_nowait()
+            except Empty:
+                return batch, None
+            if action != 'WRITE':
+                return batch, (action, data)
+            batch.append(data)
+        return batch, None
+
     def run(self):
-        with Pool(min(cpu_count(), 32)) as pool:
-            deq = deque()
-            while True:
-                while deq and deq[0].ready():
-                    for plugin, data in deq.popleft().get():
-                        self._write(plugin, data)
-
-                if not self._queue.empty() and self._writers:
-                    action, data = self._queue.get()
-                    if action == 'WRITE':
-                        deq.append(pool.apply_async(_pack_data, (data, time.time())))
-                    elif action == 'FLUSH':
-                        self._flush()
-                    elif action == 'END':
-                        break
-            for result in deq:
-                for plugin, data in result.get():
+        pool = None
+        deq = deque()
+        last_flush = time.time()
+        dirty = False
+        next_action = None
+        while True:
+            while deq and (deq[0].ready() or len(deq) >= self._max_pending):
+                for plugin, data in deq.popleft().get():
                     self._write(plugin, data)
-
-            self._close()
+                dirty = True
+
+            if dirty and self._flush_time and time.time() - last_flush >= self._flush_time:
+                self._flush()
+                dirty, last_flush = False, time.time()
+
+            # block until new data come, or until a batch may have been packed or the data have to be flushed
+            timeout = self.RESULT_WAIT_TIME if deq else None
+            if dirty and self._flush_time:
+                flush_wait = max(last_flush + self._flush_time - time.time(), 0)
+                timeout = flush_wait if timeout is None else min(timeout, flush_wait)
+            if next_action is None:
+                next_action = self._get_action(timeout)
+            if next_action is None:
+                continue
+            (action, data), next_action = next_action, None
+            if action == 'WRITE':
+                batch, next_action = self._take_write_batch(data)
+                if self._max_workers:
+                    if pool is None:
+                        pool = Pool(self._max_workers)
+                    deq.append(pool.apply_async(_pack_data_batch, (batch, time.time())))
+                else:
+                    for plugin, packed in _pack_data_batch(batch, time.time()):
+                        self._write(plugin, packed)
+                    dirty = True
+            elif action == 'FLUSH':
+                while deq:
+                    for plugin, packed in deq.popleft().get():
+                        self._write(plugin, packed)
+                self._flush()
+                dirty, last_flush = False, time.time()
+            elif action == 'END':
+                break
+
+        for result in deq:
+            for plugin, data in result.get():
+                self._write(plugin, data)
+        if pool is not None:
+            pool.close()
+            pool.join()
+        self._close()
 
     @property
     def _writers(self):
@@ -23,7 +23,7 @@ from mindspore import log as logger
 from ..._c_expression import Tensor
 from ..._checkparam import _check_str_by_regular
 from .._utils import _check_lineage_value, _check_to_numpy, _make_directory
-from ._summary_adapter import get_event_file_name, package_graph_event
+from ._summary_adapter import _reduce_histogram, get_event_file_name, package_graph_event
 from ._writer_pool import WriterPool
 
 # for the moment, this lock is for caution's sake,
@@ -75,14 +75,18 @@ class SummaryRecord:
 
     Args:
         log_dir (str): The log_dir is a directory location to save the summary.
-        queue_max_size (int): The capacity of event queue.(reserved). Default: 0.
+        queue_max_size (int): The capacity of event queue, 0 means twice the number of CPUs. Once the queue is
+            full, `record` blocks until the writer catches up. Default: 0.
         flush_time (int): Frequency to flush the summaries to disk, the unit is second. Default: 120.
         file_prefix (str): The prefix of file. Default: "events".
         file_suffix (str): The suffix of file. Default: "_MS".
         network (Cell): Obtain a pipeline through network for saving graph summary. Default: None.
+        max_workers (int): The number of processes packing the summary data, 0 to pack them in the writer
+            process. Default: None, the number of CPUs, up to 32.
 
     Raises:
-        TypeError: If `queue_max_size` and `flush_time` is not int, or `file_prefix` and `file_suffix` is not str.
+        TypeError: If `queue_max_size`, `flush_time` and `max_workers` is not int, or `file_prefix` and
+            `file_suffix` is not str.
         RuntimeError: If the log_dir can not be resolved to a canonicalized absolute pathname.
 
     Examples:
@@ -103,7 +107,8 @@ class SummaryRecord:
                  flush_time=120,
                  file_prefix="events",
                  file_suffix="_MS",
-                 network=None):
+                 network=None,
+                 max_workers=None):
 
         self._closed, self._event_writer = False, None
         self._mode, self._data_pool = 'train', _dictlist()
@@ -117,6 +122,11 @@ class SummaryRecord:
             raise TypeError("`queue_max_size` and `flush_time` should be int")
         if not isinstance(file_prefix, str) or not isinstance(file_suffix, str):
             raise TypeError("`file_prefix` and `file_suffix`  should be str.")
+        if max_workers is not None and (not isinstance(max_workers, int) or isinstance(max_workers, bool)):
+            raise TypeError("`max_workers` should be int")
+        if max_workers is not None and max_workers < 0:
+            logger.warning("The max_workers(%r) set error, will use the default value: None", max_workers)
+            max_workers = None
 
         self.queue_max_size = queue_max_size
         if queue_max_size < 0:
@@ -142,6 +152,9 @@ class SummaryRecord:
             raise RuntimeError(ex)
 
         self._event_writer = WriterPool(log_dir,
+                                        max_workers=max_workers,
+                                        queue_size=self.queue_max_size or None,
+                                        flush_time=self.flush_time,
                                         summary=self.full_file_name,
                                         lineage=get_event_file_name('events', '_lineage'))
         atexit.register(self.close)
@@ -229,6 +242,39 @@ class SummaryRecord:
         else:
             raise ValueError(f'No such plugin of {repr(plugin)}')
 
+    def add_reduced_histogram(self, name, value, max_samples):
+        """
+        Add the histogram of a tensor reduced to a random sample of its values, to be record later on.
+
+        Only the sample is kept until the record, which saves memory and time for large tensors. The count, min,
+        max and sum of the histogram are exact, the counts of its buckets are estimated from the sample.
+
+        Args:
+            name (str): The tag name for the value.
+            value (Tensor): The tensor to summarize.
+            max_samples (int): The largest number of values kept in the sample.
+
+        Raises:
+            ValueError: When the name is not valid or max_samples is not a positive int.
+            TypeError: When the value is not a Tensor.
+
+        Examples:
+            >>> with SummaryRecord(log_dir="./summary_dir", file_prefix="xxx_", file_suffix="_yyy") as summary_record:
+            >>>     summary_record.add_reduced_histogram('weight', Tensor(np.ones([1024, 1024])), 4096)
+        """
+        if not name or not isinstance(name, str):
+            raise ValueError(f'{repr(name)} is not a valid tag name.')
+        if not isinstance(value, Tensor):
+            raise TypeError(f'Expect the value to be Tensor, but got {type(value).__name__}')
+        if not isinstance(max_samples, int) or isinstance(max_samples, bool) or max_samples <= 0:
+            raise ValueError(f'`max_samples` should be a positive int, but got {repr(max_samples)}.')
+        np_value = _check_to_numpy('histogram', value)
+        sample, stats = _reduce_histogram(np_value, max_samples)
+        if name in {item['tag'] for item in self._data_pool['histogram']}:
+            entry = repr(f'{name}/histogram')
+            logger.warning(f'{entry} has duplicate values. Only the newest one will be recorded.')
+        self._data_pool['histogram'].append(dict(tag=name, value=sample, stats=stats))
+
     def record(self, step, train_network=None):
         """
         Record the summary.
@@ -17,45 +17,79 @@
 Area under cure metric
 """
 
-from sklearn.metrics import roc_auc_score
-from mindspore import context
-from mindspore.nn.metrics import Metric
+import numpy as np
+from mindspore import context, nn, Tensor
+from mindspore.train.parallel_utils import ParallelMode
+from mindspore.nn.metrics import Metric, AUC
+from mindspore.ops import operations as P
 from mindspore.communication.management import get_rank, get_group_size
 
+
+class HistogramAllReduce(nn.Cell):
+    """
+    Sum the score histograms of the AUC metrics of all the devices
+    """
+
+    def __init__(self):
+        super(HistogramAllReduce, self).__init__()
+        self.all_reduce = P.AllReduce()
+
+    def construct(self, x):
+        return self.all_reduce(x)
+
+
+# the counts are summed by digits of this number of bits in int32, AllReduce has no 64 bits type, so a sum is
+# exact for up to 2**15 devices, and the 3 digits count up to 2**48 samples per bin
+COUNT_DIGIT_BITS = 16
+NUM_COUNT_DIGITS = 3
+
+
 class AUCMetric(Metric):
     """
     Area under cure metric
+
+    The scores are counted in the fixed bins of mindspore.nn.AUC. In data parallel mode, the bins of all the
+    devices are summed, so every device reports the AUC of the whole evaluation dataset.
     """
 
     def __init__(self):
         super(AUCMetric, self).__init__()
+        self.auc = AUC()
         self.clear()
         self.full_batch = context.get_auto_parallel_context("full_batch")
+        self.data_parallel = context.get_auto_parallel_context("parallel_mode") == ParallelMode.DATA_PARALLEL
+        self.all_reduce = HistogramAllReduce() if self.data_parallel else None
 
     def clear(self):
         """Clear the internal evaluation result."""
-        self.true_labels = []
-        self.pred_probs = []
+        self.auc.clear()
 
     def update(self, *inputs): # inputs
-        """Update list of predicts and labels."""
-        all_predict = inputs[1].asnumpy().flatten().tolist() # predict
-        all_label = inputs[2].asnumpy().flatten().tolist() # label
-        self.pred_probs.extend(all_predict)
+        """Update the histograms of predicts and labels."""
+        all_predict = inputs[1].asnumpy().flatten() # predict
+        all_label = inputs[2].asnumpy().flatten() # label
         if self.full_batch:
             rank_id = get_rank()
             group_size = get_group_size()
             gap = len(all_label) // group_size
-            self.true_labels.extend(all_label[rank_id*gap: (rank_id+1)*gap])
-        else:
-            self.true_labels.extend(all_label)
-
-    def eval(self):
-        if len(self.true_labels) != len(self.pred_probs):
+            all_label = all_label[rank_id*gap: (rank_id+1)*gap]
+        if all_label.size != all_predict.size:
             raise RuntimeError(
                 'true_labels.size is not equal to pred_probs.size()')
+        self.auc.update(all_predict, all_label)
 
-        auc = roc_auc_score(self.true_labels, self.pred_probs)
+    def eval(self):
+        auc_metric = self.auc
+        if self.data_parallel and get_group_size() > 1:
+            counts = np.stack((auc_metric.positive_counts, auc_metric.negative_counts)).astype(np.int64)
+            shifts = np.arange(NUM_COUNT_DIGITS, dtype=np.int64)[:, None, None] * COUNT_DIGIT_BITS
+            digits = ((counts >> shifts) & ((1 << COUNT_DIGIT_BITS) - 1)).astype(np.int32)
+            digits = self.all_reduce(Tensor(digits)).asnumpy().astype(np.int64)
+            counts = (digits << shifts).sum(axis=0)
+            auc_metric = AUC(auc_metric.num_bins)
+            auc_metric.positive_counts = counts[0]
+            auc_metric.negative_counts = counts[1]
+        auc = auc_metric.eval()
         print("====" * 20 + " auc_metric  end")
         print("====" * 20 + " auc: {}".format(auc))
         return auc
@@ -0,0 +1,322 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Preprocess the criteo data into mindrecord with several processes.
+
+The file is split in blocks of lines, each one parsed at once by pandas in a worker process. The first pass
+counts the categories and gets the min and max of the values of each block, which are merged in the main
+process. The second pass maps the blocks to ids and weights and assigns each line to the train or the test
+data by a hash of its offset in the file, so the split does not need the indices of all the lines.
+The mindrecord files have the schema and the names of the ones of preprocess_data.py.
+"""
+import os
+import io
+import csv
+import time
+import pickle
+import argparse
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from mindspore.mindrecord import FileWriter
+
+NUM_VALS = 13
+NUM_CATS = 26
+FIELD_SIZE = NUM_VALS + NUM_CATS
+VAL_COLS = ["val_{}".format(i + 1) for i in range(NUM_VALS)]
+CAT_COLS = ["cat_{}".format(i + 1) for i in range(NUM_CATS)]
+BLOCK_SIZE = 1 << 26
+SCAN_SIZE = 1 << 22
+
+_TAB = ord("\t")
+_NEWLINE = ord("\n")
+
+# the vocabularies of the categories in the worker processes, set by _init_worker
+_cat_index = None
+_val_max = None
+
+
+def mkdir_path(file_path):
+    if not os.path.exists(file_path):
+        os.makedirs(file_path)
+
+
+def split_blocks(file_path, block_size=BLOCK_SIZE):
+    """Splits a file in byte ranges, each line belongs to the range where it starts."""
+    file_size = os.path.getsize(file_path)
+    return [(file_path, start, min(start + block_size, file_size)) for start in range(0, file_size, block_size)]
+
+
+def _scan_lines(array):
+    """
+    Gets the ends of the lines of a block and their numbers of tabs.
+
+    The block is scanned by slices of `SCAN_SIZE` bytes, so the masks and the cumulative sums of the tabs stay
+    small next to the block.
+    """
+    line_ends = []
+    tab_counts = []
+    total = 0
+    for start in range(0, len(array), SCAN_SIZE):
+        part = array[start:start + SCAN_SIZE]
+        ends = np.flatnonzero(part == _NEWLINE)
+        tabs = np.cumsum(part == _TAB, dtype=np.int32)
+        line_ends.append(ends + start)
+        tab_counts.append(tabs[ends].astype(np.int64) + total)
+        total += int(tabs[-1])
+    line_ends = np.concatenate(line_ends)
+    return line_ends, np.diff(np.concatenate(tab_counts), prepend=0)
+
+
+def read_block(file_path, start, end):
+    """
+    Reads the lines starting in a byte range of the file.
+
+    Returns:
+        bytes, the lines with 40 fields.
+        numpy.ndarray, the offsets of these lines in the file.
+        int, the number of the other lines.
+    """
+    # the byte before start is read to know whether a line starts at start
+    read_start = max(start - 1, 0)
+    with open(file_path, "rb") as file_in:
+        file_in.seek(read_start)
+        data = file_in.read(end - read_start)
+        if data and not data.endswith(b"\n"):
+            data += file_in.readline()
+    pos = data.find(b"\n") + 1 if start > 0 else 0
+    if pos == 0 and start > 0:
+        return b"", np.empty(0, np.int64), 0
+    data = data[pos:]
+    if not data:
+        return b"", np.empty(0, np.int64), 0
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    line_ends, num_tabs = _scan_lines(np.frombuffer(data, np.uint8))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    valid = num_tabs == FIELD_SIZE
+    offsets = read_start + pos + line_starts[valid]
+    if not valid.all():
+        data = b"".join(data[s:e + 1] for s, e in zip(line_starts[valid], line_ends[valid]))
+    return data, offsets, int((~valid).sum())
+
+
+def parse_block(data):
+    """Parses the lines of a block, the empty values are NaN and the empty categories are ''."""
+    names = ["label"] + VAL_COLS + CAT_COLS
+    dtype = {"label": np.float32}
+    dtype.update({col: np.float64 for col in VAL_COLS})
+    dtype.update({col: str for col in CAT_COLS})
+    if not data:
+        return pd.DataFrame({name: pd.Series(dtype=dtype[name]) for name in names})
+    return pd.read_csv(io.BytesIO(data), sep="\t", header=None, names=names, dtype=dtype,
+                       na_values={col: [""] for col in VAL_COLS}, keep_default_na=False,
+                       quoting=csv.QUOTE_NONE, engine="c")
+
+
+def block_stats(block):
+    """Gets the number of lines, the min and max of the values and the counts of the categories of a block."""
+    data, offsets, num_errors = read_block(*block)
+    frame = parse_block(data)
+    vals = frame[VAL_COLS].to_numpy()
+    # the min and the max start at 0 like in CriteoStatsDict
+    val_min = np.fmin(np.nanmin(np.vstack((vals, np.zeros((1, NUM_VALS)))), axis=0), 0)
+    val_max = np.fmax(np.nanmax(np.vstack((vals, np.zeros((1, NUM_VALS)))), axis=0), 0)
+    cat_counts = [frame[col].value_counts(sort=False).to_dict() for col in CAT_COLS]
+    return len(offsets), num_errors, val_min, val_max, cat_counts
+
+
+class CriteoStats():
+    """Statistics of the criteo data merged from the ones of the blocks."""
+
+    def __init__(self):
+        self.num_lines = 0
+        self.num_errors = 0
+        self.val_min = np.zeros(NUM_VALS)
+        self.val_max = np.zeros(NUM_VALS)
+        self.cat_counts = [collections.Counter() for _ in CAT_COLS]
+
+    def merge(self, stats):
+        num_lines, num_errors, val_min, val_max, cat_counts = stats
+        self.num_lines += num_lines
+        self.num_errors += num_errors
+        self.val_min = np.minimum(self.val_min, val_min)
+        self.val_max = np.maximum(self.val_max, val_max)
+        for counter, counts in zip(self.cat_counts, cat_counts):
+            counter.update(counts)
+
+    def save_dict(self, dict_path, prefix=""):
+        """Saves the statistics like CriteoStatsDict.save_dict."""
+        val_max_dict = dict(zip(VAL_COLS, self.val_max.tolist()))
+        val_min_dict = dict(zip(VAL_COLS, self.val_min.tolist()))
+        cat_count_dict = {col: dict(counter) for col, counter in zip(CAT_COLS, self.cat_counts)}
+        for name, value in (("val_max_dict", val_max_dict), ("val_min_dict", val_min_dict),
+                            ("cat_count_dict", cat_count_dict)):
+            with open(os.path.join(dict_path, "{}{}.pkl".format(prefix, name)), "wb") as file_wrt:
+                pickle.dump(value, file_wrt)
+
+    def get_vocabs(self, threshold=100):
+        """
+        Gets the categories seen more than threshold times of each field, sorted.
+
+        The ids are given like CriteoStatsDict.cat2id_dict: the values have the ids 0 to 12, the categories out
+        of the vocabularies have the ids 13 to 38 and the categories of the vocabularies the following ones,
+        field by field.
+        """
+        vocabs = [sorted(cat for cat, count in counter.items() if count > threshold) for counter in self.cat_counts]
+        print("cat2id_dict.size:{}".format(FIELD_SIZE + sum(len(vocab) for vocab in vocabs)))
+        return vocabs
+
+
+def _init_worker(vocabs, val_max):
+    global _cat_index, _val_max
+    _cat_index = [pd.Index(vocab, dtype=object) for vocab in vocabs]
+    _val_max = val_max
+
+
+def hash_split(offsets, test_size, seed):
+    """Whether each line is in the test data, by a splitmix64 hash of the offset of the line and the seed."""
+    x = offsets.astype(np.uint64) + np.uint64(seed * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53)) < test_size
+
+
+def map_block(block, test_size, seed):
+    """Maps the lines of a block to ids, weights and labels, and assigns them to the train or the test data."""
+    data, offsets, _ = read_block(*block)
+    frame = parse_block(data)
+    num_lines = len(frame)
+    ids = np.empty((num_lines, FIELD_SIZE), np.int32)
+    wts = np.ones((num_lines, FIELD_SIZE), np.float32)
+
+    ids[:, :NUM_VALS] = np.arange(NUM_VALS)
+    vals = frame[VAL_COLS].to_numpy()
+    scale = np.divide(1.0, _val_max, out=np.zeros(NUM_VALS), where=_val_max != 0)
+    wts[:, :NUM_VALS] = np.nan_to_num(vals * scale)
+
+    next_id = FIELD_SIZE
+    for i, col in enumerate(CAT_COLS):
+        positions = _cat_index[i].get_indexer(frame[col].to_numpy())
+        ids[:, NUM_VALS + i] = np.where(positions < 0, NUM_VALS + i, next_id + positions)
+        next_id += len(_cat_index[i])
+
+    labels = frame["label"].to_numpy(np.float32)
+    is_test = hash_split(offsets, test_size, seed)
+    return ids, wts, labels, is_test
+
+
+class SampleWriter():
+    """Writes the lines into mindrecord by samples of line_per_sample lines, the last partial sample is dropped."""
+
+    def __init__(self, file_name, shard_num, desc, line_per_sample):
+        self.writer = FileWriter(file_name, shard_num)
+        schema = {"label": {"type": "float32", "shape": [-1]}, "feat_vals": {"type": "float32", "shape": [-1]},
+                  "feat_ids": {"type": "int32", "shape": [-1]}}
+        self.writer.add_schema(schema, desc)
+        self.line_per_sample = line_per_sample
+        self.pending = None
+        self.num_samples = 0
+
+    def write(self, ids, wts, labels):
+        """Writes the full samples of the lines and keeps the others for the next call."""
+        if self.pending is not None:
+            ids, wts, labels = (np.concatenate((old, new)) for old, new in zip(self.pending, (ids, wts, labels)))
+        num_samples = len(labels) // self.line_per_sample
+        num_lines = num_samples * self.line_per_sample
+        self.pending = (ids[num_lines:], wts[num_lines:], labels[num_lines:])
+        if num_samples == 0:
+            return
+        self.writer.write_raw_data({"feat_ids": ids[:num_lines].reshape(num_samples, -1),
+                                    "feat_vals": wts[:num_lines].reshape(num_samples, -1),
+                                    "label": labels[:num_lines].reshape(num_samples, -1)})
+        self.num_samples += num_samples
+
+    def commit(self):
+        self.writer.commit()
+        return self.num_samples
+
+
+def _ordered_results(executor, fn, blocks, args, queue_size):
+    """Yields the results of fn on the blocks in order, with at most queue_size blocks in flight."""
+    futures = collections.deque()
+    for block in blocks:
+        futures.append(executor.submit(fn, block, *args))
+        if len(futures) >= queue_size:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+def statsdata(file_path, dict_output_path, executor, num_workers, block_size=BLOCK_SIZE):
+    """Gets the statistics of the data with the processes of executor and saves them."""
+    stats = CriteoStats()
+    start_time = time.time()
+    for block_stat in _ordered_results(executor, block_stats, split_blocks(file_path, block_size), (),
+                                       2 * num_workers):
+        stats.merge(block_stat)
+        print("Have handled {} lines in {:.1f}s.".format(stats.num_lines, time.time() - start_time))
+    print("error lines: {}.".format(stats.num_errors))
+    stats.save_dict(dict_output_path)
+    return stats
+
+
+def hash_split_trans2mindrecord(input_file_path, output_file_path, executor, num_workers, line_per_sample=1000,
+                                test_size=0.1, seed=2020, block_size=BLOCK_SIZE):
+    """Maps the data to ids with the processes of executor, splits them by hash and saves mindrecord."""
+    writer_train = SampleWriter(os.path.join(output_file_path, "train_input_part.mindrecord"), 21,
+                                "CRITEO_TRAIN", line_per_sample)
+    writer_test = SampleWriter(os.path.join(output_file_path, "test_input_part.mindrecord"), 3,
+                               "CRITEO_TEST", line_per_sample)
+    count = 0
+    start_time = time.time()
+    for ids, wts, labels, is_test in _ordered_results(executor, map_block, split_blocks(input_file_path, block_size),
+                                                      (test_size, seed), 2 * num_workers):
+        is_train = ~is_test
+        writer_train.write(ids[is_train], wts[is_train], labels[is_train])
+        writer_test.write(ids[is_test], wts[is_test], labels[is_test])
+        count += len(labels)
+        print("Have handled {} lines in {:.1f}s.".format(count, time.time() - start_time))
+    print("train samples: {}, test samples: {}.".format(writer_train.commit(), writer_test.commit()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="criteo data")
+    parser.add_argument("--data_path", type=str, default="./criteo_data/")
+    parser.add_argument("--num_workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threshold", type=int, default=100)
+    parser.add_argument("--line_per_sample", type=int, default=1000)
+    parser.add_argument("--test_size", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=2020)
+
+    args, _ = parser.parse_known_args()
+    data_path = args.data_path
+    data_file_path = data_path + "origin_data/train.txt"
+    stats_output_path = data_path + "stats_dict/"
+    mkdir_path(stats_output_path)
+    output_path = data_path + "mindrecord/"
+    mkdir_path(output_path)
+
+    with ProcessPoolExecutor(args.num_workers) as stats_executor:
+        criteo_stats = statsdata(data_file_path, stats_output_path, stats_executor, args.num_workers)
+    cat_vocabs = criteo_stats.get_vocabs(threshold=args.threshold)
+
+    # the vocabularies are sent once to each process
+    with ProcessPoolExecutor(args.num_workers, initializer=_init_worker,
+                             initargs=(cat_vocabs, criteo_stats.val_max)) as map_executor:
+        hash_split_trans2mindrecord(data_file_path, output_path, map_executor, args.num_workers,
+                                    line_per_sample=args.line_per_sample, test_size=args.test_size, seed=args.seed)
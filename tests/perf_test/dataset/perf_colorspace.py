@@ -0,0 +1,80 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""micro-benchmark of the vectorized colorspace functions against the colorsys based implementation"""
+import colorsys
+import time
+
+import numpy as np
+
+from mindspore.dataset.transforms.vision import py_colorspace_util
+
+BATCH_SIZE = 8
+IMAGE_SIZE = 224
+REPEAT = 3
+
+
+def colorsys_rgb_to_hsvs(np_rgb_imgs):
+    """The former implementation, colorsys.rgb_to_hsv called on every pixel of every image."""
+    to_hsv = np.vectorize(colorsys.rgb_to_hsv)
+    result = []
+    for img in np_rgb_imgs:
+        h, s, v = to_hsv(img[:, :, 0], img[:, :, 1], img[:, :, 2])
+        result.append(np.stack((h, s, v), axis=2))
+    return np.array(result)
+
+
+def colorsys_hsv_to_rgbs(np_hsv_imgs):
+    """The former implementation, colorsys.hsv_to_rgb called on every pixel of every image."""
+    to_rgb = np.vectorize(colorsys.hsv_to_rgb)
+    result = []
+    for img in np_hsv_imgs:
+        r, g, b = to_rgb(img[:, :, 0], img[:, :, 1], img[:, :, 2])
+        result.append(np.stack((r, g, b), axis=2))
+    return np.array(result)
+
+
+def timeit(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.time()
+        func(*args, **kwargs)
+        best = min(best, time.time() - start)
+    return best
+
+
+def main():
+    rng = np.random.RandomState(0)
+    rgb = (rng.randint(0, 256, (BATCH_SIZE, IMAGE_SIZE, IMAGE_SIZE, 3)) / 255.).astype(np.float32)
+    hsv = py_colorspace_util.rgb_to_hsv(rgb)
+    out = np.empty_like(rgb)
+    uint8_rgb = rng.randint(0, 256, (BATCH_SIZE, IMAGE_SIZE, IMAGE_SIZE, 3)).astype(np.uint8)
+
+    cases = [
+        ("rgb_to_hsv", lambda: colorsys_rgb_to_hsvs(rgb), lambda: py_colorspace_util.rgb_to_hsv(rgb, out=out)),
+        ("hsv_to_rgb", lambda: colorsys_hsv_to_rgbs(hsv), lambda: py_colorspace_util.hsv_to_rgb(hsv, out=out)),
+    ]
+    print("batch of {} images of {}x{}".format(BATCH_SIZE, IMAGE_SIZE, IMAGE_SIZE))
+    for name, former, vectorized in cases:
+        former_time, vectorized_time = timeit(former), timeit(vectorized)
+        print("{:<18} colorsys: {:8.4f}s  vectorized: {:8.4f}s  speedup: {:8.1f}x".format(
+            name, former_time, vectorized_time, former_time / vectorized_time))
+    print("{:<18} vectorized: {:8.4f}s".format(
+        "adjust_hue", timeit(py_colorspace_util.adjust_hue, uint8_rgb, 0.2, out=uint8_rgb)))
+    print("{:<18} vectorized: {:8.4f}s".format(
+        "adjust_saturation", timeit(py_colorspace_util.adjust_saturation, uint8_rgb, 0.5, out=uint8_rgb)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""memory and time of the classification metrics over a long eval run with many classes"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from mindspore.nn.metrics import Precision, Recall, F1, TopKCategoricalAccuracy
+
+CLASS_NUM = 20000
+BATCH_SIZE = 64
+STEPS = 200
+REPORT_EVERY = 50
+
+
+def one_hot_counts(y_pred, y, class_num):
+    """The former counting, with dense one-hot matrices of the labels and the predictions."""
+    y = np.eye(class_num)[y.reshape(-1)]
+    y_pred = np.eye(class_num)[y_pred.argmax(axis=1).reshape(-1)]
+    return y_pred.sum(axis=0), y.sum(axis=0), (y * y_pred).sum(axis=0)
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    rng = np.random.RandomState(0)
+    y_pred = rng.rand(BATCH_SIZE, CLASS_NUM).astype(np.float32)
+    y = rng.randint(0, CLASS_NUM, BATCH_SIZE)
+    print("{} classes, batches of {}, input batch: {:.1f}MB".format(CLASS_NUM, BATCH_SIZE, y_pred.nbytes / 2 ** 20))
+    print("one-hot counting of one batch, peak: {:.1f}MB".format(
+        peak_memory(one_hot_counts, y_pred, y, CLASS_NUM) / 2 ** 20))
+
+    metrics = [Precision(), Recall(), F1(), TopKCategoricalAccuracy(5)]
+    start = time.time()
+    for step in range(1, STEPS + 1):
+        peak = peak_memory(lambda: [metric.update(y_pred, y) for metric in metrics])
+        if step == 1 or step % REPORT_EVERY == 0:
+            print("step {:4d}  peak of the updates: {:.2f}MB".format(step, peak / 2 ** 20))
+    elapsed = time.time() - start
+    print("{} steps in {:.2f}s, {:.2f}ms per step".format(STEPS, elapsed, elapsed / STEPS * 1000))
+    print("top-5 accuracy: {:.4f}, mean F1: {:.4f}".format(metrics[3].eval(), metrics[2].eval(average=True)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""rows per second of FileWriter on a schema with several blob fields, with rows and with columns"""
+import os
+import time
+
+import numpy as np
+
+from mindspore.mindrecord import FileWriter
+
+MINDRECORD_FILE = "./multi_blob.mindrecord"
+PARTITION_NUMBER = 4
+ROWS = 20000
+BATCH_SIZE = 1000
+
+SCHEMA = {"id": {"type": "int64"},
+          "file_name": {"type": "string"},
+          "image": {"type": "bytes"},
+          "depth": {"type": "bytes"},
+          "mask": {"type": "int32", "shape": [-1]},
+          "embedding": {"type": "float32", "shape": [64]}}
+
+
+def remove_files():
+    for i in range(PARTITION_NUMBER):
+        for suffix in ("", ".db"):
+            file_name = MINDRECORD_FILE + str(i) + suffix
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+
+def make_columns(rng, start, size):
+    return {"id": np.arange(start, start + size),
+            "file_name": ["{}.jpg".format(i) for i in range(start, start + size)],
+            "image": [rng.bytes(rng.randint(2000, 4000)) for _ in range(size)],
+            "depth": [rng.bytes(1024) for _ in range(size)],
+            "mask": rng.randint(0, 2, (size, 256)).astype(np.int32),
+            "embedding": rng.rand(size, 64).astype(np.float32)}
+
+
+def to_rows(columns):
+    size = len(columns["id"])
+    return [{"id": int(columns["id"][i]),
+             "file_name": columns["file_name"][i],
+             "image": columns["image"][i],
+             "depth": columns["depth"][i],
+             "mask": columns["mask"][i],
+             "embedding": columns["embedding"][i]} for i in range(size)]
+
+
+def write(batches, name):
+    """Writes the batches and prints the rows per second of the calls of write_raw_data."""
+    remove_files()
+    writer = FileWriter(MINDRECORD_FILE, PARTITION_NUMBER)
+    writer.add_schema(SCHEMA, "multi_blob_schema")
+    writer.add_index(["id"])
+    elapsed = 0.0
+    for batch in batches:
+        start = time.time()
+        writer.write_raw_data(batch)
+        elapsed += time.time() - start
+    writer.commit()
+    print("{:8s} {:8.0f} rows/s".format(name, ROWS / elapsed))
+    remove_files()
+
+
+def main():
+    rng = np.random.RandomState(0)
+    column_batches = [make_columns(rng, start, BATCH_SIZE) for start in range(0, ROWS, BATCH_SIZE)]
+    write([to_rows(columns) for columns in column_batches], "rows")
+    write(column_batches, "columns")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Testing the batch operations of py_transforms
+"""
+import numpy as np
+import pytest
+
+import mindspore.dataset as ds
+import mindspore.dataset.transforms.vision.py_transforms as py_vision
+from mindspore import log as logger
+
+BATCH_SIZE = 4
+
+
+def generate_images(num=8, height=10, width=12):
+    np.random.seed(58)
+    return np.random.randint(0, 256, (num, height, width, 3)).astype(np.uint8)
+
+
+def test_batch_random_horizontal_flip():
+    """
+    Test BatchRandomHorizontalFlip: every image is either unchanged or flipped
+    """
+    logger.info("test_batch_random_horizontal_flip")
+    images = generate_images()
+    flipped = py_vision.BatchRandomHorizontalFlip(0.5)(images)
+    assert flipped.shape == images.shape
+    for image, flipped_image in zip(images, flipped):
+        assert np.array_equal(image, flipped_image) or np.array_equal(image[:, ::-1], flipped_image)
+
+    flipped = py_vision.BatchRandomHorizontalFlip(1.0, is_hwc=False)(np.transpose(images, (0, 3, 1, 2)))
+    np.testing.assert_array_equal(flipped, np.transpose(images, (0, 3, 1, 2))[..., ::-1])
+
+
+def test_batch_random_crop():
+    """
+    Test BatchRandomCrop: every crop is a window of its padded image
+    """
+    logger.info("test_batch_random_crop")
+    images = generate_images()
+    crops = py_vision.BatchRandomCrop((8, 9), padding=1)(images)
+    assert crops.shape == (8, 8, 9, 3)
+    padded = np.pad(images, ((0, 0), (1, 1), (1, 1), (0, 0)), mode="constant")
+    for image, crop in zip(padded, crops):
+        assert any(np.array_equal(image[i:i + 8, j:j + 9], crop) for i in range(5) for j in range(6))
+
+    with pytest.raises(ValueError, match="larger than the padded image"):
+        py_vision.BatchRandomCrop(20)(images)
+
+
+def test_batch_normalize():
+    """
+    Test BatchNormalize against ToTensor and Normalize applied to each image
+    """
+    logger.info("test_batch_normalize")
+    images = generate_images()
+    mean, std = (0.491, 0.482, 0.447), (0.247, 0.243, 0.262)
+    normalized = py_vision.BatchNormalize(mean, std, hwc2chw=True)(images)
+    assert normalized.dtype == np.float32
+    to_tensor = py_vision.ToTensor()
+    normalize = py_vision.Normalize(mean, std)
+    for image, normalized_image in zip(images, normalized):
+        np.testing.assert_allclose(normalized_image, normalize(to_tensor(image)), rtol=1e-5, atol=1e-5)
+
+    with pytest.raises(ValueError, match="greater than 0"):
+        py_vision.BatchNormalize(mean, (0.2, 0.0, 0.2))
+
+
+def test_batch_random_erasing():
+    """
+    Test BatchRandomErasing: each image has one rectangle at most set to the value
+    """
+    logger.info("test_batch_random_erasing")
+    images = generate_images(num=16)
+    erased = py_vision.BatchRandomErasing(prob=1.0, value=(1, 2, 3))(images)
+    changed = np.any(erased != images, axis=-1)
+    for image_changed, erased_image in zip(changed, erased):
+        rows, cols = np.nonzero(image_changed)
+        if rows.size:
+            box = erased_image[rows.min():rows.max() + 1, cols.min():cols.max() + 1]
+            assert (box == (1, 2, 3)).all()
+    assert changed.any()
+
+    erased = py_vision.BatchRandomErasing(prob=0.0)(images)
+    np.testing.assert_array_equal(erased, images)
+
+
+def test_batch_cutout():
+    """
+    Test BatchCutout: the patches are erased to 0 and never bigger than the given length
+    """
+    logger.info("test_batch_cutout")
+    images = generate_images(num=16) | 1
+    cut = py_vision.BatchCutout(4, num_patches=2)(images)
+    zeros = np.all(cut == 0, axis=-1)
+    assert zeros.any()
+    assert zeros.sum(axis=(1, 2)).max() <= 2 * 4 * 4
+    np.testing.assert_array_equal(cut[~zeros], images[~zeros])
+
+
+def test_batch_transforms_per_batch_map():
+    """
+    Test the batch operations on the lists of images of per_batch_map
+    """
+    logger.info("test_batch_transforms_per_batch_map")
+    images = generate_images()
+
+    def augment(image_list, batch_info):
+        assert isinstance(image_list, list)
+        image_list = py_vision.BatchRandomCrop(8)(image_list)
+        image_list = py_vision.BatchRandomHorizontalFlip()(image_list)
+        image_list = py_vision.BatchCutout(2)(image_list)
+        return (py_vision.BatchNormalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5), hwc2chw=True)(image_list),)
+
+    data = ds.NumpySlicesDataset({"image": images}, shuffle=False)
+    data = data.batch(BATCH_SIZE, input_columns=["image"], per_batch_map=augment)
+    num_iter = 0
+    for item in data.create_dict_iterator():
+        assert item["image"].shape == (BATCH_SIZE, 3, 8, 8)
+        assert item["image"].dtype == np.float32
+        assert np.all(np.abs(item["image"]) <= 1.0)
+        num_iter += 1
+    assert num_iter == 2
+
+
+if __name__ == "__main__":
+    test_batch_random_horizontal_flip()
+    test_batch_random_crop()
+    test_batch_normalize()
+    test_batch_random_erasing()
+    test_batch_cutout()
+    test_batch_transforms_per_batch_map()
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+import time
+
 import numpy as np
 import pytest
 
@@ -615,6 +618,75 @@ def test_generator_schema():
         type_tester_with_type_check_2c_schema(np_types[i], [de_types[i], de_types[i]])
 
 
+def test_generator_mp_shared_memory():
+    """
+    Test Generator MP with rows in and out of the shared memory, completed out of order
+    """
+    logger.info("Test Generator MP with shared memory")
+
+    class MyDS():
+        def __getitem__(self, item):
+            if item % 5 == 0:
+                time.sleep(0.01)
+            # every other row is too large for a shared memory slot of 1 MB
+            return (np.full([(item % 2) * 512 + 1, 1024], item, np.int32),)
+
+        def __len__(self):
+            return 64
+
+    ds1 = ds.GeneratorDataset(MyDS(), ["data"], sampler=ds.SequentialSampler(), num_parallel_workers=4,
+                              max_rowsize=1, prefetch_size=3)
+    i = 0
+    for data in ds1.create_dict_iterator():  # each data is a dictionary
+        golden = np.full([(i % 2) * 512 + 1, 1024], i, np.int32)
+        assert np.array_equal(data["data"], golden)
+        i = i + 1
+    assert i == 64
+
+
+def test_generator_mp_reuse_workers():
+    """
+    Test Generator MP reuses its worker processes from one epoch to the next
+    """
+    logger.info("Test Generator MP reuses its workers")
+
+    class MyDS():
+        def __getitem__(self, item):
+            return (np.array([os.getpid()]),)
+
+        def __len__(self):
+            return 16
+
+    ds1 = ds.GeneratorDataset(MyDS(), ["pid"], sampler=ds.SequentialSampler(), num_parallel_workers=4)
+    pids = set()
+    for _ in range(3):
+        for data in ds1.create_dict_iterator():  # each data is a dictionary
+            pids.add(int(data["pid"][0]))
+    assert len(pids) <= 4
+
+
+def test_generator_mp_error():
+    """
+    Test Generator MP with an error raised by the source
+    """
+    logger.info("Test Generator MP with an error raised by the source")
+
+    class MyDS():
+        def __getitem__(self, item):
+            if item == 10:
+                raise ValueError("invalid item")
+            return (np.array([item]),)
+
+        def __len__(self):
+            return 64
+
+    ds1 = ds.GeneratorDataset(MyDS(), ["data"], num_parallel_workers=4)
+    with pytest.raises(RuntimeError) as info:
+        for _ in ds1.create_dict_iterator():  # each data is a dictionary
+            pass
+    assert "invalid item" in str(info.value)
+
+
 def manual_test_generator_keyboard_interrupt():
     """
     Test keyboard_interrupt
@@ -653,6 +725,8 @@ if __name__ == "__main__":
     test_generator_15()
     test_generator_16()
     test_generator_17()
+    test_generator_mp_shared_memory()
+    test_generator_mp_error()
     test_generator_error_1()
     test_generator_error_2()
     test_generator_error_3()
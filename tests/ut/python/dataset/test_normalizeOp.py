@@ -319,6 +319,43 @@ def test_normalize_grayscale_exception():
         assert "Input is not within the required range" in str(e)
 
 
+def test_normalize_fused_compose_py():
+    """
+    Test ComposeOp fusing ToTensor, Normalize and ToType: same result as the separate transforms
+    expected to pass
+    """
+    logger.info("test_normalize_fused_compose_py")
+    mean = [0.475, 0.45, 0.392]
+    std = [0.275, 0.267, 0.278]
+    transforms = [
+        py_vision.Decode(),
+        py_vision.ToTensor(),
+        py_vision.Normalize(mean, std),
+        py_vision.ToType(np.float16)
+    ]
+    fused = py_vision.ComposeOp(transforms)()
+    assert fused.transforms == ["Decode", "Fused[ToTensor, Normalize, ToType]"]
+    reused = py_vision.ComposeOp(transforms, reuse_buffer=True)()
+
+    data1 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, columns_list=["image"], shuffle=False)
+    data1 = data1.map(input_columns=["image"], operations=fused)
+    serialized = ds.serialize(data1)
+    assert serialized["operations"][0]["transforms"] == fused.transforms
+    data2 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, columns_list=["image"], shuffle=False)
+    data2 = data2.map(input_columns=["image"], operations=transforms)
+    data3 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, columns_list=["image"], shuffle=False)
+    data3 = data3.map(input_columns=["image"], operations=reused)
+
+    num_iter = 0
+    for item1, item2, item3 in zip(data1.create_dict_iterator(), data2.create_dict_iterator(),
+                                   data3.create_dict_iterator()):
+        assert item1["image"].dtype == np.float16
+        np.testing.assert_array_equal(item1["image"], item2["image"])
+        np.testing.assert_array_equal(item3["image"], item2["image"])
+        num_iter += 1
+    assert num_iter == 3
+
+
 if __name__ == "__main__":
     test_decode_op()
     test_decode_normalize_op()
@@ -333,3 +370,4 @@ if __name__ == "__main__":
     test_normalize_grayscale_md5_01()
     test_normalize_grayscale_md5_02()
     test_normalize_grayscale_exception()
+    test_normalize_fused_compose_py()
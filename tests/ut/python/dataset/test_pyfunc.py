@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import gc
+
 import numpy as np
 import pytest
 
 import mindspore.dataset as ds
 from mindspore import log as logger
+from mindspore.dataset.engine.datasets import _PYFUNC_WORKER_POOLS, _PythonCallable
 
 DATA_DIR = ["../data/dataset/testPyfuncMap/data.data"]
 SCHEMA_DIR = "../data/dataset/testPyfuncMap/schema.json"
@@ -250,6 +253,95 @@ def test_case_9():
         i = i + 4
 
 
+def test_case_10():
+    """
+    Test PyFunc
+    """
+    logger.info("Test 1-1 PyFunc Multiprocess with two iterators: lambda x : x + x")
+
+    # apply dataset operations
+    data1 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, shuffle=False)
+
+    data1 = data1.map(input_columns="col0", output_columns="out", operations=(lambda x: x + x),
+                      num_parallel_workers=4, python_multiprocessing=True)
+
+    num_rows = 0
+    for _ in range(2):
+        i = 0
+        for item in data1.create_dict_iterator():  # each data is a dictionary
+            # In this test, the dataset is 2x2 sequential tensors
+            golden = np.array([[i * 2, (i + 1) * 2], [(i + 2) * 2, (i + 3) * 2]])
+            assert np.array_equal(item["out"], golden)
+            i = i + 4
+            num_rows += 1
+
+    # the second iterator reuses the worker processes of the first one
+    stats = data1.get_python_multiprocessing_stats()
+    assert stats["operations"][0]["calls"] == num_rows
+    assert stats["chunks"] <= num_rows
+    assert stats["pending"] == 0
+
+
+def test_case_10_release_workers():
+    """
+    Test PyFunc Multiprocess workers terminated when the dataset is collected
+    """
+    logger.info("Test 1-1 PyFunc Multiprocess workers released with the dataset")
+
+    data1 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, shuffle=False)
+    data1 = data1.map(input_columns="col0", output_columns="out", operations=(lambda x: x + x),
+                      num_parallel_workers=2, python_multiprocessing=True)
+    for _ in data1.create_dict_iterator():
+        pass
+    workers = list(_PYFUNC_WORKER_POOLS[data1._pyfunc_pool_key]._workers)
+    assert all(worker.is_alive() for worker in workers)
+
+    del data1
+    gc.collect()
+    assert not _PYFUNC_WORKER_POOLS
+    assert not any(worker.is_alive() for worker in workers)
+
+
+def test_case_11_interrupt_shared_workers():
+    """
+    Test a KeyboardInterrupt in a PyFunc call does not terminate the workers shared with another dataset
+    """
+    logger.info("Test 1-1 PyFunc Multiprocess workers kept by the other dataset on KeyboardInterrupt")
+
+    class InterruptedPool:
+        def execute(self, idx, args):
+            raise KeyboardInterrupt
+
+    def pyfunc(x):
+        return x + x
+
+    data1 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, shuffle=False)
+    data1 = data1.map(input_columns="col0", output_columns="out", operations=pyfunc,
+                      num_parallel_workers=2, python_multiprocessing=True)
+    data2 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, shuffle=False)
+    data2 = data2.map(input_columns="col0", output_columns="out", operations=pyfunc,
+                      num_parallel_workers=2, python_multiprocessing=True)
+    assert data1._pyfunc_pool_key == data2._pyfunc_pool_key
+    for _ in data1.create_dict_iterator():
+        pass
+    pool = _PYFUNC_WORKER_POOLS[data1._pyfunc_pool_key]
+
+    interrupted = _PythonCallable(pyfunc, 0, InterruptedPool(), data1._pyfunc_pool_release)
+    with pytest.raises(Exception) as info:
+        interrupted(np.array([1]))
+    assert "KeyboardInterrupt" in str(info.value)
+    assert _PYFUNC_WORKER_POOLS[data2._pyfunc_pool_key] is pool
+    assert all(worker.is_alive() for worker in pool._workers)
+    for _ in data2.create_dict_iterator():
+        pass
+
+    workers = list(pool._workers)
+    del data1, data2
+    gc.collect()
+    assert not _PYFUNC_WORKER_POOLS
+    assert not any(worker.is_alive() for worker in workers)
+
+
 def test_pyfunc_execption():
     logger.info("Test PyFunc Execption Throw: lambda x : raise Execption()")
 
@@ -293,5 +385,7 @@ if __name__ == "__main__":
     test_case_7()
     test_case_8()
     test_case_9()
+    test_case_10()
+    test_case_10_release_workers()
     test_pyfunc_execption()
     skip_test_pyfunc_execption_multiprocess()
@@ -23,6 +23,7 @@ from numpy.testing import assert_allclose
 import mindspore.dataset as ds
 import mindspore.dataset.transforms.vision.py_transforms as vision
 import mindspore.dataset.transforms.vision.py_transforms_util as util
+import mindspore.dataset.transforms.vision.py_colorspace_util as colorspace
 
 DATA_DIR = ["../data/dataset/test_tf_file_3_images/train-0000-of-0001.data"]
 SCHEMA_DIR = "../data/dataset/test_tf_file_3_images/datasetSchema.json"
@@ -46,6 +47,7 @@ def test_rgb_hsv_hwc():
     hsv_base = hsv_base.reshape((8, 8, 3))
     hsv_de = util.rgb_to_hsvs(rgb_np, True)
     assert hsv_base.shape == hsv_de.shape
+    assert hsv_de.dtype == np.float64
     assert_allclose(hsv_base.flatten(), hsv_de.flatten(), rtol=1e-5, atol=0)
 
     hsv_flat = hsv_base.reshape(64, 3)
@@ -130,6 +132,32 @@ def test_rgb_hsv_batch_chw():
     assert_allclose(rgb_base.flatten(), rgb_de.flatten(), rtol=1e-5, atol=0)
 
 
+def test_rgb_hsv_out():
+    rgb_imgs = generate_numpy_random_rgb((4, 8, 8, 3))
+    hsv_base = util.rgb_to_hsvs(rgb_imgs, True)
+
+    # convert in place
+    imgs = rgb_imgs.copy()
+    assert colorspace.rgb_to_hsv(imgs, True, out=imgs) is imgs
+    assert_allclose(hsv_base.flatten(), imgs.flatten(), rtol=1e-5, atol=0)
+    assert colorspace.hsv_to_rgb(imgs, True, out=imgs) is imgs
+    assert_allclose(rgb_imgs.flatten(), imgs.flatten(), rtol=1e-5, atol=1e-12)
+
+
+def test_adjust_hue_saturation_numpy():
+    rgb_imgs = np.random.randint(0, 256, (2, 3, 8, 8)).astype(np.uint8)
+    assert np.array_equal(colorspace.adjust_hue(rgb_imgs, 0.0, False), rgb_imgs)
+    assert np.array_equal(colorspace.adjust_saturation(rgb_imgs, 1.0, False), rgb_imgs)
+
+    gray = colorspace.adjust_saturation(rgb_imgs, 0.0, False)
+    assert gray.dtype == np.uint8
+    assert np.array_equal(gray[:, 0], gray[:, 1]) and np.array_equal(gray[:, 1], gray[:, 2])
+
+    # the hue shifted by 0.5 twice goes back to the original one
+    shifted = colorspace.adjust_hue(colorspace.adjust_hue(rgb_imgs, 0.5, False), 0.5, False)
+    assert np.abs(shifted.astype(np.int32) - rgb_imgs).max() <= 1
+
+
 def test_rgb_hsv_pipeline():
     # First dataset
     transforms1 = [
@@ -167,4 +195,6 @@ if __name__ == "__main__":
     test_rgb_hsv_batch_hwc()
     test_rgb_hsv_chw()
     test_rgb_hsv_batch_chw()
+    test_rgb_hsv_out()
+    test_adjust_hue_saturation_numpy()
     test_rgb_hsv_pipeline()
@@ -0,0 +1,89 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test auc"""
+import math
+import numpy as np
+import pytest
+
+from mindspore import Tensor
+from mindspore.nn.metrics import AUC, get_metric_fn
+
+
+def pairwise_auc(y_pred, y):
+    """The AUC computed on all the pairs of a positive and a negative sample."""
+    positive_scores = y_pred[y == 1][:, None]
+    negative_scores = y_pred[y == 0][None, :]
+    ordered = (positive_scores > negative_scores) + 0.5 * (positive_scores == negative_scores)
+    return ordered.mean()
+
+
+def test_auc_exact():
+    x = Tensor(np.array([0.1, 0.4, 0.35, 0.8]))
+    y = Tensor(np.array([0, 0, 1, 1]))
+    metric = AUC(exact=True)
+    metric.clear()
+    metric.update(x, y)
+    assert math.isclose(metric.eval(), 0.75)
+
+
+def test_auc_with_ties():
+    y_pred = np.array([0.5, 0.5, 0.5, 0.2, 0.9, 0.2])
+    y = np.array([1, 0, 1, 0, 1, 1])
+    expected = pairwise_auc(y_pred, y)
+    exact = AUC(exact=True)
+    exact.update(y_pred, y)
+    binned = AUC(num_bins=10)
+    binned.update(y_pred, y)
+    assert math.isclose(exact.eval(), expected)
+    assert math.isclose(binned.eval(), expected)
+
+
+def test_auc_binned_several_updates():
+    rng = np.random.RandomState(0)
+    y = rng.randint(0, 2, 4000)
+    y_pred = np.clip(rng.normal(0.4 + 0.2 * y, 0.2), 0, 1)
+    metric = get_metric_fn('auc')
+    for start in range(0, y.size, 1000):
+        metric.update(Tensor(y_pred[start:start + 1000]), Tensor(y[start:start + 1000]))
+    assert abs(metric.eval() - pairwise_auc(y_pred, y)) < 1e-3
+
+
+def test_auc_merge():
+    rng = np.random.RandomState(1)
+    y = rng.randint(0, 2, 1000)
+    y_pred = rng.rand(1000)
+    metrics = [AUC(exact=True), AUC(exact=True)]
+    metrics[0].update(y_pred[:600], y[:600])
+    metrics[1].update(y_pred[600:], y[600:])
+    metrics[0].merge(metrics[1])
+    assert math.isclose(metrics[0].eval(), pairwise_auc(y_pred, y))
+
+    with pytest.raises(ValueError):
+        metrics[0].merge(AUC(num_bins=100, exact=True))
+
+
+def test_auc_invalid():
+    with pytest.raises(TypeError):
+        AUC(num_bins=1.5)
+    with pytest.raises(ValueError):
+        AUC(num_bins=0)
+    metric = AUC()
+    with pytest.raises(ValueError):
+        metric.update(np.array([0.1, 0.2]), np.array([0, 2]))
+    with pytest.raises(ValueError):
+        metric.update(np.array([0.1, 0.2]), np.array([0, 1, 1]))
+    metric.update(np.array([0.1, 0.2]), np.array([1, 1]))
+    with pytest.raises(RuntimeError):
+        metric.eval()
@@ -47,6 +47,33 @@ def test_multilabel_precision():
     assert np.equal(precision, np.array([1, 2 / 3, 1])).all()
 
 
+def test_multilabel_precision_several_updates():
+    x = np.array([[0, 1, 0, 1], [1, 0, 1, 1], [0, 0, 0, 1]])
+    y = np.array([[0, 1, 1, 1], [0, 1, 1, 1], [0, 0, 0, 1]])
+    metric = Precision('multilabel')
+    metric.clear()
+    metric.update(Tensor(x[:2]), Tensor(y[:2]))
+    metric.update(Tensor(x[2:]), Tensor(y[2:]))
+
+    assert np.equal(metric.eval(), np.array([1, 2 / 3, 1])).all()
+    assert math.isclose(metric.eval(True), (1 + 2 / 3 + 1) / 3)
+
+
+def test_classification_precision_many_classes():
+    class_num = 100000
+    x = np.zeros((3, class_num), np.float32)
+    x[[0, 1, 2], [7, 99999, 7]] = 1
+    metric = Precision('classification')
+    metric.clear()
+    metric.update(Tensor(x), Tensor(np.array([7, 99999, 3])))
+    precision = metric.eval()
+
+    assert precision.shape == (class_num,)
+    assert precision[7] == 0.5
+    assert precision[99999] == 1
+    assert precision[3] == 0
+
+
 def test_average_precision():
     x = Tensor(np.array([[0, 1, 0, 1], [1, 0, 1, 1], [0, 0, 0, 1]]))
     y = Tensor(np.array([[0, 1, 1, 1], [0, 1, 1, 1], [0, 0, 0, 1]]))
@@ -100,3 +100,14 @@ def test_top5():
     result2 = topk(x, y2)
     assert math.isclose(result, 2 / 3)
     assert math.isclose(result2, 2 / 3)
+
+
+def test_topk_k_not_less_than_class_num():
+    """test_topk_k_not_less_than_class_num"""
+    x = Tensor(np.array([[0.2, 0.5, 0.3],
+                         [0.1, 0.35, 0.5]]))
+    y = Tensor(np.array([2, 0]))
+    topk = TopKCategoricalAccuracy(5)
+    topk.clear()
+    topk.update(x, y)
+    assert math.isclose(topk.eval(), 1)
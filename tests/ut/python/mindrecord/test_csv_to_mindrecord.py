@@ -13,6 +13,7 @@
 # limitations under the License.
 # ============================================================================
 """test csv to mindrecord tool"""
+import math
 import os
 from importlib import import_module
 import pytest
@@ -20,6 +21,7 @@ import pytest
 from mindspore import log as logger
 from mindspore.mindrecord import FileReader
 from mindspore.mindrecord import CsvToMR
+from mindspore.mindrecord.tools import csv_to_mr
 
 try:
     pd = import_module('pandas')
@@ -141,3 +143,45 @@ def test_csv_to_mindrecord_illegal_filename(remove_mindrecord_file):
     with pytest.raises(Exception, match="File name should not contains"):
         csv_trans = CsvToMR(CSV_FILE, filename)
         csv_trans.transform()
+
+def test_csv_to_mindrecord_chunks(remove_mindrecord_file):
+    """
+    test transform csv to mindrecord
+    when the csv file is read in several chunks.
+    """
+    chunk_size = csv_to_mr.CSV_CHUNK_SIZE
+    csv_to_mr.CSV_CHUNK_SIZE = 2
+    try:
+        csv_trans = CsvToMR(CSV_FILE, MINDRECORD_FILE, partition_number=PARTITION_NUMBER, num_workers=2)
+        csv_trans.transform()
+    finally:
+        csv_to_mr.CSV_CHUNK_SIZE = chunk_size
+    read(MINDRECORD_FILE + "0", ["Age", "EmployNumber", "Name", "Sales", "Over18"], 5)
+
+def test_csv_to_mindrecord_missing_values_after_first_chunk(remove_mindrecord_file):
+    """
+    test transform csv to mindrecord
+    when an int and a bool value are missing after the first chunk.
+    """
+    csv_file = "../data/mindrecord/testCsv/missing.csv"
+    with open(csv_file, "w") as f:
+        f.write("Age,Name,Over18\n21,john,True\n41,tom,True\n51,bob,\n,alice,True\n26,carol,False\n")
+    chunk_size = csv_to_mr.CSV_CHUNK_SIZE
+    csv_to_mr.CSV_CHUNK_SIZE = 2
+    try:
+        csv_trans = CsvToMR(csv_file, MINDRECORD_FILE, partition_number=PARTITION_NUMBER, num_workers=2)
+        csv_trans.transform()
+    finally:
+        csv_to_mr.CSV_CHUNK_SIZE = chunk_size
+        os.remove(csv_file)
+    assert csv_trans.schema == {"Age": {"type": "float64"}, "Name": {"type": "string"},
+                                "Over18": {"type": "string"}}
+
+    # the row missing the string value is skipped, the missing number is NaN
+    reader = FileReader(MINDRECORD_FILE + "0")
+    rows = {x["Name"]: x for _, x in enumerate(reader.get_next())}
+    reader.close()
+    assert sorted(rows) == ["alice", "carol", "john", "tom"]
+    assert rows["john"]["Age"] == 21.0 and rows["john"]["Over18"] == "True"
+    assert rows["carol"]["Over18"] == "False"
+    assert math.isnan(rows["alice"]["Age"])
@@ -114,3 +114,21 @@ def test_imagenet_to_mindrecord_illegal_filename(fixture_file):
                                             IMAGENET_IMAGE_DIR, filename,
                                             PARTITION_NUMBER)
         imagenet_transformer.transform()
+
+def test_imagenet_to_mindrecord_num_workers(fixture_file):
+    """
+    test transform imagenet dataset to mindrecord
+    with a given number of reading threads.
+    """
+    imagenet_transformer = ImageNetToMR(IMAGENET_MAP_FILE, IMAGENET_IMAGE_DIR,
+                                        MINDRECORD_FILE, PARTITION_NUMBER, num_workers=2)
+    imagenet_transformer.transform()
+    read(MINDRECORD_FILE + "0")
+
+def test_imagenet_to_mindrecord_illegal_num_workers(fixture_file):
+    """
+    test transform imagenet dataset to mindrecord
+    when num_workers is 0.
+    """
+    with pytest.raises(ValueError, match="The parameter num_workers must be None or int greater than 0."):
+        ImageNetToMR(IMAGENET_MAP_FILE, IMAGENET_IMAGE_DIR, MINDRECORD_FILE, num_workers=0)
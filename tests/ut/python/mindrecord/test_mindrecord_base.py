@@ -19,7 +19,7 @@ import numpy as np
 from utils import get_data, get_nlp_data
 
 from mindspore import log as logger
-from mindspore.mindrecord import FileWriter, FileReader, MindPage, SUCCESS
+from mindspore.mindrecord import FileWriter, FileReader, MindPage, RandomAccessReader, SUCCESS
 
 FILES_NUM = 4
 CV_FILE_NAME = "./imagenet.mindrecord"
@@ -964,3 +964,107 @@ def test_write_read_process_with_multi_bytes_and_array():
 
     os.remove("{}".format(mindrecord_file_name))
     os.remove("{}.db".format(mindrecord_file_name))
+
+
+def test_write_read_process_with_columns():
+    """write the raw data given by columns, with invalid rows, and by structured array."""
+    mindrecord_file_name = "test_columns.mindrecord"
+    schema = {"file_name": {"type": "string"},
+              "label": {"type": "int32"},
+              "mask": {"type": "int64", "shape": [-1]},
+              "segments": {"type": "float32", "shape": [2, 2]},
+              "image1": {"type": "bytes"},
+              "image2": {"type": "bytes"}}
+    columns = {"file_name": ["001.jpg", "002.jpg", "003.jpg", "004.jpg"],
+               "label": np.array([43, 91, 2 ** 40, 29]),
+               "mask": [np.array([3, 6, 9], dtype=np.int64), np.array([1, 4], dtype=np.int64),
+                        np.array([7], dtype=np.int64), np.array([2, 8, 0, 5], dtype=np.int64)],
+               "segments": np.arange(16, dtype=np.float32).reshape(4, 2, 2),
+               "image1": [b"image bytes abc", b"image bytes def", b"image bytes ghi", b"image bytes jkl"],
+               "image2": np.arange(24, dtype=np.uint8).reshape(4, 6)}
+    structured = np.zeros(2, dtype=[("file_name", "U8"), ("label", np.int32), ("mask", np.int64, (2,)),
+                                    ("segments", np.float32, (2, 2)), ("image1", np.uint8, (3,)),
+                                    ("image2", np.uint8, (2,))])
+    structured["file_name"] = ["005.jpg", "006.jpg"]
+    structured["label"] = [78, 37]
+    structured["mask"] = [[3, 1], [7, 6]]
+    writer = FileWriter(mindrecord_file_name)
+    writer.add_schema(schema, "data is so cool")
+    writer.write_raw_data(columns)
+    writer.write_raw_data(structured)
+    writer.commit()
+
+    # the label of the third row does not fit in int32, the rows of an array of a blob field are the blobs
+    expected = [{"file_name": columns["file_name"][i], "label": columns["label"][i], "mask": columns["mask"][i],
+                 "segments": columns["segments"][i], "image1": columns["image1"][i],
+                 "image2": columns["image2"][i].tobytes()} for i in (0, 1, 3)]
+    expected += [{"file_name": row["file_name"], "label": row["label"], "mask": row["mask"],
+                  "segments": row["segments"], "image1": row["image1"].tobytes(),
+                  "image2": row["image2"].tobytes()} for row in structured]
+    reader = FileReader(mindrecord_file_name)
+    count = 0
+    for x in reader.get_next():
+        assert len(x) == 6
+        for field in x:
+            if isinstance(x[field], np.ndarray):
+                assert (x[field] == expected[count][field]).all()
+            else:
+                assert x[field] == expected[count][field]
+        count = count + 1
+    assert count == 5
+    reader.close()
+
+    os.remove("{}".format(mindrecord_file_name))
+    os.remove("{}.db".format(mindrecord_file_name))
+
+
+def test_random_access_reader():
+    """read the records by position and by index field."""
+    mindrecord_file_name = "test_random_access.mindrecord"
+    data = [{"file_name": "{:03d}.jpg".format(i), "label": i % 3,
+             "mask": np.arange(i + 1, dtype=np.int64) * 1000 - 3,
+             "segments": np.full((2, 2), i, dtype=np.float32),
+             "data": bytes("image bytes {}".format(i), encoding='UTF-8')} for i in range(20)]
+    writer = FileWriter(mindrecord_file_name, 2)
+    schema = {"file_name": {"type": "string"},
+              "label": {"type": "int32"},
+              "mask": {"type": "int64", "shape": [-1]},
+              "segments": {"type": "float32", "shape": [2, 2]},
+              "data": {"type": "bytes"}}
+    writer.add_schema(schema, "data is so cool")
+    writer.add_index(["file_name", "label"])
+    writer.write_raw_data(data)
+    writer.commit()
+
+    def check_record(x, expected):
+        assert len(x) == len(expected)
+        for field in x:
+            if isinstance(x[field], np.ndarray):
+                assert (x[field] == expected[field]).all()
+            else:
+                assert x[field] == expected[field]
+
+    reader = RandomAccessReader(mindrecord_file_name + "0")
+    records = {x["file_name"]: x for x in data}
+    assert len(reader) == 20
+    for index in range(len(reader)):
+        check_record(reader[index], records[reader[index]["file_name"]])
+    for x, y in zip(reader.take([7, 3, -1, 3]), [reader[7], reader[3], reader[19], reader[3]]):
+        check_record(x, y)
+    x = reader.get_by_index_field("file_name", "011.jpg")
+    assert len(x) == 1
+    check_record(x[0], records["011.jpg"])
+    assert sorted(x["file_name"] for x in reader.get_by_index_field("label", 2)) == \
+        [x["file_name"] for x in data if x["label"] == 2]
+    assert not reader.get_by_index_field("file_name", "100.jpg")
+    reader.close()
+
+    reader = RandomAccessReader([mindrecord_file_name + "1"], columns=["mask", "file_name"])
+    for x in reader.take(list(range(len(reader)))):
+        assert set(x) == {"mask", "file_name"}
+        assert (x["mask"] == records[x["file_name"]]["mask"]).all()
+    reader.close()
+
+    for i in range(2):
+        os.remove("{}{}".format(mindrecord_file_name, i))
+        os.remove("{}{}.db".format(mindrecord_file_name, i))
@@ -15,6 +15,7 @@
 import collections
 from importlib import import_module
 import os
+import struct
 from string import punctuation
 
 import numpy as np
@@ -22,6 +23,9 @@ import pytest
 from mindspore import log as logger
 from mindspore.mindrecord import FileReader
 from mindspore.mindrecord import TFRecordToMR
+from mindspore.mindrecord.tools import tfrecord_to_mr
+from mindspore.mindrecord.tools.tfrecord import masked_crc32c
+from mindspore.mindrecord.tools.tfrecord_to_mr import FixedLenFeature
 
 SupportedTensorFlowVersion = '2.1.0'
 
@@ -560,3 +564,88 @@ def test_tfrecord_to_mindrecord_with_special_field_name():
     os.remove(MINDRECORD_FILE_NAME + ".db")
 
     os.remove(os.path.join(TFRECORD_DATA_DIR, TFRECORD_FILE_NAME))
+
+def encode_example(features):
+    """Serialize a tf.train.Example in the protobuf wire format."""
+    def varint(value):
+        value &= (1 << 64) - 1
+        out = bytearray()
+        while value > 0x7f:
+            out.append(value & 0x7f | 0x80)
+            value >>= 7
+        out.append(value)
+        return bytes(out)
+
+    def field(number, payload):
+        return varint(number << 3 | 2) + varint(len(payload)) + payload
+
+    def feature(values):
+        if isinstance(values[0], bytes):
+            return field(1, b"".join(field(1, value) for value in values))
+        if isinstance(values[0], float):
+            return field(2, field(1, struct.pack("<{}f".format(len(values)), *values)))
+        return field(3, field(1, b"".join(varint(value) for value in values)))
+
+    entries = b"".join(field(1, field(1, key.encode()) + field(2, feature(values))) for key, values in features.items())
+    return field(1, entries)
+
+def generate_tfrecord_without_tf(file_name, start, num):
+    """Write the examples of generate_tfrecord in the TFRecord format."""
+    with open(file_name, "wb") as f:
+        for i in range(start, start + num):
+            features = collections.OrderedDict()
+            features["file_name"] = [bytes("000" + str(i) + ".jpg", encoding="utf-8")]
+            features["image_bytes"] = [bytes(str("aaaabbbbcccc" + str(i)), encoding="utf-8")]
+            features["int64_scalar"] = [i]
+            features["float_scalar"] = [float(i)]
+            features["int64_list"] = [i, i+1, i+2, i+3, i+4, i+1234567890]
+            features["float_list"] = [float(i), float(i+1), float(i+2.8), float(i+3.2),
+                                      float(i+4.4), float(i+123456.9), float(i+98765432.1)]
+            data = encode_example(features)
+            length = struct.pack("<Q", len(data))
+            f.write(length + struct.pack("<I", masked_crc32c(length)) + data + struct.pack("<I", masked_crc32c(data)))
+
+def test_tfrecord_to_mindrecord_without_tf(monkeypatch):
+    """test transform tfrecord files to mindrecord with several processes, without tensorflow."""
+    tfrecord_files = [os.path.join(TFRECORD_DATA_DIR, "test{}.tfrecord".format(x)) for x in range(2)]
+    generate_tfrecord_without_tf(tfrecord_files[0], 0, 6)
+    generate_tfrecord_without_tf(tfrecord_files[1], 6, 4)
+
+    feature_dict = {"file_name": FixedLenFeature([], "string"),
+                    "image_bytes": FixedLenFeature([], "string"),
+                    "int64_scalar": FixedLenFeature([], "int64"),
+                    "float_scalar": FixedLenFeature([1], "float32"),
+                    "int64_list": FixedLenFeature([6], "int64"),
+                    "float_list": FixedLenFeature([7], "float32"),
+                    "default_scalar": FixedLenFeature([], "int64", default_value=-1),
+                    }
+
+    # the records are split between several ranges of the files
+    monkeypatch.setattr(tfrecord_to_mr, "SPLIT_SIZE", 200)
+    tfrecord_transformer = TFRecordToMR(tfrecord_files, MINDRECORD_FILE_NAME, feature_dict, ["image_bytes"],
+                                        num_workers=2)
+    tfrecord_transformer.transform()
+
+    assert os.path.exists(MINDRECORD_FILE_NAME)
+    assert os.path.exists(MINDRECORD_FILE_NAME + ".db")
+
+    fr_mindrecord = FileReader(MINDRECORD_FILE_NAME)
+    verify_data(tfrecord_transformer, fr_mindrecord)
+    fr_mindrecord.close()
+
+    os.remove(MINDRECORD_FILE_NAME)
+    os.remove(MINDRECORD_FILE_NAME + ".db")
+
+    feature_dict["float_list"] = FixedLenFeature([7], "int64")
+    with pytest.raises(ValueError):
+        tfrecord_transformer = TFRecordToMR(tfrecord_files, MINDRECORD_FILE_NAME, feature_dict, ["image_bytes"],
+                                            num_workers=2)
+        tfrecord_transformer.transform()
+
+    if os.path.exists(MINDRECORD_FILE_NAME):
+        os.remove(MINDRECORD_FILE_NAME)
+    if os.path.exists(MINDRECORD_FILE_NAME + ".db"):
+        os.remove(MINDRECORD_FILE_NAME + ".db")
+
+    for file_name in tfrecord_files:
+        os.remove(file_name)
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
 from mindspore import Tensor
-from mindspore.parallel._tensor import _reshape_param_data
+from mindspore.parallel._tensor import _reshape_param_data, _reshape_param_data_with_weight, \
+    _chunk_tensor_by_strategy, _get_tensor_strategy, _get_tensor_slice_index
 
 
 def test_reshape_param_data():
@@ -50,5 +53,26 @@ def test_reshape_param_data():
         raise AssertionError
 
 
+def test_reshape_param_data_split_chunk():
+    full = np.arange(8 * 4 * 6).reshape(8, 4, 6).astype(np.float32)
+    dev_mat = [2, 2, 2]
+    tensor_map = [2, -1, 0]
+    tensor_strategy = _get_tensor_strategy(dev_mat, tensor_map)
+    slices = _chunk_tensor_by_strategy(full, tensor_strategy)
+    assert len(slices) == 4
+    gathered = np.concatenate([slices[int(_get_tensor_slice_index(dev_mat, tensor_strategy, tensor_map, rank))]
+                               for rank in range(8)])
+    tensor = _reshape_param_data(Tensor(gathered), dev_mat, tensor_map)
+    assert (tensor.asnumpy() == full).all()
+
+
+def test_reshape_param_data_with_weight():
+    expected_tensor = Tensor([[1, 2], [3, 4], [5, 6], [7, 8]])
+    input_tensor = Tensor([[1, 2], [5, 6], [3, 4], [7, 8]])
+    tensor = _reshape_param_data_with_weight(input_tensor, [2], [2])
+    if expected_tensor.__str__() != tensor.__str__():
+        raise AssertionError
+
+
 if __name__ == '__main__':
     test_reshape_param_data()
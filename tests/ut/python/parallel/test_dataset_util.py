@@ -69,3 +69,22 @@ def test_to_full_tensor_sens_2():
     expect_tensors = (expect_tensor0, expect_tensor1, expect_tensor_sens)
 
     assert full_tensor == expect_tensors
+
+
+def test_to_full_tensor_reuse_buffers():
+    buffers = {}
+    elem = (Tensor([[1, 2, 3], [4, 5, 6]], dtype=ms.float32), Tensor([[1], [4]], dtype=ms.int32))
+    _to_full_tensor(elem, 4, 2, buffers=buffers)
+    cached = dict(buffers)
+    assert len(cached) == 2
+
+    elem = (Tensor([[7, 8, 9], [1, 2, 3]], dtype=ms.float32), Tensor([[7], [1]], dtype=ms.int32))
+    full_tensor = _to_full_tensor(elem, 4, 2, buffers=buffers)
+    assert all(buffers[i] is cached[i] for i in cached)
+    expect0 = ([[0, 0, 0], [0, 0, 0], [0, 0, 0], [0, 0, 0], [7, 8, 9], [1, 2, 3], [0, 0, 0], [0, 0, 0]])
+    expect1 = ([[0], [0], [0], [0], [7], [1], [0], [0]])
+    assert full_tensor == (Tensor(expect0, dtype=ms.float32), Tensor(expect1, dtype=ms.int32))
+
+    elem = Tensor([[1, 2], [4, 5]], dtype=ms.float32)
+    _to_full_tensor(elem, 4, 2, buffers=buffers)
+    assert buffers[0].shape == (8, 2)
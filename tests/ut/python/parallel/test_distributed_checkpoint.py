@@ -0,0 +1,107 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import stat
+
+import numpy as np
+
+import mindspore.nn as nn
+from mindspore import Tensor
+from mindspore.common.parameter import Parameter
+from mindspore.parallel._tensor import _get_slice_box
+from mindspore.train._checkpoint_io import encode_json, SHARD_LAYOUT_NAME
+from mindspore.train.serialization import save_checkpoint, load_distributed_checkpoint
+
+
+def _save_shards(full, dev_mat, tensor_map):
+    """Saves the slices of `full` held by every device as the devices would with integrated_save=False."""
+    file_names = []
+    for rank in range(int(np.prod(dev_mat))):
+        box = _get_slice_box(dev_mat, tensor_map, list(full.shape), rank)
+        local = full[tuple(slice(start, stop) for start, stop in box)]
+        layout = {"dev_mat": dev_mat, "tensor_map": tensor_map, "full_shape": list(full.shape),
+                  "field_size": [0]}
+        param_list = [{"name": "weight", "data": Tensor(local)},
+                      {"name": "bias", "data": Tensor(np.ones([4]).astype(np.float32))},
+                      {"name": SHARD_LAYOUT_NAME, "data": Tensor(encode_json({"rank": rank,
+                                                                             "params": {"weight": layout}}))}]
+        file_name = "./shard_rank_{}.ckpt".format(rank)
+        save_checkpoint(param_list, file_name)
+        file_names.append(file_name)
+    return file_names
+
+
+def _remove_files(file_names):
+    for file_name in file_names:
+        os.chmod(file_name, stat.S_IWRITE)
+        os.remove(file_name)
+
+
+def test_get_slice_box():
+    box = _get_slice_box([2, 4], [1, 0], [8, 8], 5)
+    assert box == [(4, 8), (2, 4)]
+    box = _get_slice_box([2, 4], [1, -1], [8, 8], 3)
+    assert box == [(0, 4), (0, 8)]
+
+
+def test_load_distributed_checkpoint_merged():
+    full = np.arange(8 * 8).reshape(8, 8).astype(np.float32)
+    file_names = _save_shards(full, [2, 4], [1, 0])
+    param_dict = load_distributed_checkpoint(file_names)
+    assert (param_dict["weight"].data.asnumpy() == full).all()
+    assert (param_dict["bias"].data.asnumpy() == 1).all()
+    _remove_files(file_names)
+
+
+class Net(nn.Cell):
+    def __init__(self, weight_shape):
+        super(Net, self).__init__()
+        self.weight = Parameter(Tensor(np.zeros(weight_shape).astype(np.float32)), name="weight")
+        self.bias = Parameter(Tensor(np.zeros([4]).astype(np.float32)), name="bias")
+
+    def construct(self, x):
+        return x * self.weight + self.bias
+
+
+def test_load_distributed_checkpoint_new_layout():
+    full = np.arange(8 * 8).reshape(8, 8).astype(np.float32)
+    file_names = _save_shards(full, [2, 4], [1, 0])
+
+    for rank in range(8):
+        net = Net([8, 2])
+        net.parameter_layout_dict = {"weight": [[4, 2], [-1, 1], [8, 4], [0]]}
+        load_distributed_checkpoint(file_names, net, rank_id=rank)
+        box = _get_slice_box([4, 2], [-1, 1], [8, 8], rank)
+        expected = full[box[0][0]:box[0][1], box[1][0]:box[1][1]]
+        assert (net.weight.data.asnumpy() == expected).all()
+        assert (net.bias.data.asnumpy() == 1).all()
+    _remove_files(file_names)
+
+
+def test_load_distributed_checkpoint_split_whole():
+    # the weight is saved whole, it is split in the target network
+    full = np.arange(8 * 8).reshape(8, 8).astype(np.float32)
+    file_names = ["./whole_rank_0.ckpt"]
+    save_checkpoint([{"name": "weight", "data": Tensor(full)},
+                     {"name": "bias", "data": Tensor(np.ones([4]).astype(np.float32))}], file_names[0])
+
+    for rank in range(8):
+        net = Net([8, 2])
+        net.parameter_layout_dict = {"weight": [[4, 2], [-1, 1], [8, 4], [0]]}
+        load_distributed_checkpoint(file_names, net, rank_id=rank)
+        box = _get_slice_box([4, 2], [-1, 1], [8, 8], rank)
+        expected = full[box[0][0]:box[0][1], box[1][0]:box[1][1]]
+        assert (net.weight.data.asnumpy() == expected).all()
+        assert (net.bias.data.asnumpy() == 1).all()
+    _remove_files(file_names)
@@ -0,0 +1,115 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" test the compiler processes with a fake compiler """
+import json
+import os
+import pytest
+
+from mindspore._extends.parallel_compile.compiler_process import CompilerProcess, STATUS_TIMEOUT, STATUS_EXITED
+from mindspore._extends.parallel_compile.akg_compiler import multi_process_compiler
+
+# compiles the ops like the compilers in serve mode, the action of an op tells how the compile goes
+FAKE_COMPILER = '''
+import json
+import os
+import os
+import sys
+import time
+
+if __name__ == "__main__":
+    assert sys.argv[1] == "--serve"
+    for line in iter(sys.stdin.readline, ""):
+        op = json.loads(line)
+        if op["action"] == "sleep":
+            time.sleep(60)
+        if op["action"] == "exit":
+            sys.exit(3)
+        if op["action"] == "fail":
+            response = {"status": "Exception", "out": "failed to compile " + op["op"]}
+        else:
+            response = {"status": "Success", "out": str(os.getpid())}
+        sys.stdout.write(json.dumps(response) + "\\n")
+        sys.stdout.flush()
+'''
+
+
+def op_json(name, action="build"):
+    return json.dumps({"op": name, "action": action})
+
+
+@pytest.fixture
+def fake_compiler(tmp_path):
+    script = tmp_path / "fake_compiler.py"
+    script.write_text(FAKE_COMPILER)
+    return str(script)
+
+
+def test_compile_success_reuses_process(fake_compiler):
+    compiler = CompilerProcess(fake_compiler)
+    try:
+        status, pid = compiler.compile(op_json("add"))
+        assert status == "Success"
+        assert compiler.compile(op_json("mul")) == ("Success", pid)
+    finally:
+        compiler.stop()
+
+
+def test_compile_exception(fake_compiler):
+    compiler = CompilerProcess(fake_compiler)
+    try:
+        assert compiler.compile(op_json("add", "fail")) == ("Exception", "failed to compile add")
+        assert compiler.compile(op_json("mul"))[0] == "Success"
+    finally:
+        compiler.stop()
+
+
+def test_compile_timeout_restarts(fake_compiler):
+    compiler = CompilerProcess(fake_compiler)
+    try:
+        _, pid = compiler.compile(op_json("add"))
+        status, _ = compiler.compile(op_json("mul", "sleep"), timeout=1)
+        assert status == STATUS_TIMEOUT
+        status, new_pid = compiler.compile(op_json("sub"))
+        assert status == "Success" and new_pid != pid
+    finally:
+        compiler.stop()
+
+
+def test_compile_crash_restarts(fake_compiler):
+    compiler = CompilerProcess(fake_compiler)
+    try:
+        _, pid = compiler.compile(op_json("add"))
+        status, out = compiler.compile(op_json("mul", "exit"))
+        assert status == STATUS_EXITED and "3" in out
+        status, new_pid = compiler.compile(op_json("sub"))
+        assert status == "Success" and new_pid != pid
+    finally:
+        compiler.stop()
+
+
+def test_akg_failed_kernel_does_not_abort_others(fake_compiler, monkeypatch):
+    stored = []
+    monkeypatch.setattr(multi_process_compiler, "_compiler_process", CompilerProcess(fake_compiler))
+    monkeypatch.setattr(multi_process_compiler, "restore_kernel", lambda name, key, files: False)
+    monkeypatch.setattr(multi_process_compiler, "store_kernel",
+                        lambda name, key, files: stored.append(os.path.basename(files[0])))
+    json_infos = [op_json("add"), op_json("mul", "fail"), op_json("sub", "exit"), op_json("div")]
+    assert not multi_process_compiler.compile_akg_kernel_parallel(json_infos, 2, 60)
+    assert sorted(stored) == ["add.json", "div.json"]
+
+
+def test_akg_kernels_from_cache(monkeypatch):
+    monkeypatch.setattr(multi_process_compiler, "restore_kernel", lambda name, key, files: True)
+    assert multi_process_compiler.compile_akg_kernel_parallel([op_json("add", "fail")], 2, 60)
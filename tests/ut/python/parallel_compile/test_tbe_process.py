@@ -0,0 +1,128 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" test the TBE compiler pool with the compiler stubbed """
+import json
+import os
+import pytest
+
+# the helper of the TBE compiler needs the path of the TBE ops, which are not used here
+os.environ.setdefault("TBE_IMPL_PATH", os.path.dirname(os.path.realpath(__file__)))
+# pylint: disable=wrong-import-position
+from mindspore._extends.parallel_compile.tbe_compiler import tbe_process
+
+
+class FakePool:
+    """Pool running each compile when the test finishes it, in the order chosen by the test."""
+    instances = []
+
+    def __init__(self, processes):
+        self.processes = processes
+        self.calls = []
+        FakePool.instances.append(self)
+
+    def apply_async(self, func, args, callback, error_callback):
+        self.calls.append((func, args, callback, error_callback))
+
+    def finish(self, index):
+        func, args, callback, error_callback = self.calls[index]
+        try:
+            result = func(*args)
+        except Exception as e:  # pylint: disable=broad-except
+            error_callback(e)
+            return
+        callback(result)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def fake_run_compiler(op_json):
+    kernel_name = json.loads(op_json)["op_info"]["kernel_name"]
+    if kernel_name.startswith("bad"):
+        raise RuntimeError("compiler crashed on " + kernel_name)
+    return "Success", "built " + kernel_name, 1.0
+
+
+def op_json(kernel_name, **kwargs):
+    kernel_info = {"op_info": {"kernel_name": kernel_name, "inputs": []}}
+    kernel_info.update(kwargs)
+    return json.dumps(kernel_info)
+
+
+@pytest.fixture
+def compiler_pool(monkeypatch):
+    FakePool.instances = []
+    stored = []
+    monkeypatch.setattr(tbe_process.multiprocessing, "Pool", FakePool)
+    monkeypatch.setattr(tbe_process, "run_compiler", fake_run_compiler)
+    monkeypatch.setattr(tbe_process, "restore_kernel", lambda name, key, files: key == "cached")
+    monkeypatch.setattr(tbe_process, "store_kernel", lambda name, key, files: stored.append((name, key)))
+    monkeypatch.setattr(tbe_process, "kernel_cache_key", lambda kernel_info, extra="":
+                        "cached" if kernel_info["op_info"]["kernel_name"].startswith("cached") else
+                        kernel_info["op_info"]["kernel_name"] + "_key")
+    pool = tbe_process.CompilerPool()
+    pool.stored = stored
+    yield pool
+    pool.exit()
+
+
+def test_tasks_reported_in_finish_order(compiler_pool):
+    task_ids = [compiler_pool.start_compile_op(op_json("kernel{}".format(i))) for i in range(3)]
+    fake_pool = FakePool.instances[0]
+    for index in (2, 0, 1):
+        fake_pool.finish(index)
+        assert compiler_pool.wait_one() == (task_ids[index], "Success", "built kernel{}".format(index))
+    assert compiler_pool.wait_one() == (0, "Success")
+    assert compiler_pool.stored == [("tbe", "kernel2_key"), ("tbe", "kernel0_key"), ("tbe", "kernel1_key")]
+
+
+def test_failed_task(compiler_pool):
+    bad_id = compiler_pool.start_compile_op(op_json("bad0"))
+    good_id = compiler_pool.start_compile_op(op_json("kernel0"))
+    fake_pool = FakePool.instances[0]
+    fake_pool.finish(0)
+    fake_pool.finish(1)
+    task_id, result, _ = compiler_pool.wait_one()
+    assert task_id == bad_id and result.startswith("Exception:") and "bad0" in result
+    assert compiler_pool.wait_one()[:2] == (good_id, "Success")
+    assert compiler_pool.stored == [("tbe", "kernel0_key")]
+
+
+def test_tasks_dropped_by_reset(compiler_pool):
+    compiler_pool.start_compile_op(op_json("kernel0"))
+    compiler_pool.reset_task_info()
+    task_id = compiler_pool.start_compile_op(op_json("kernel1"))
+    fake_pool = FakePool.instances[0]
+    fake_pool.finish(0)
+    fake_pool.finish(1)
+    assert compiler_pool.wait_one() == (task_id, "Success", "built kernel1")
+    assert compiler_pool.wait_one() == (0, "Success")
+
+
+def test_cache_hit_finishes_at_once(compiler_pool):
+    task_id = compiler_pool.start_compile_op(op_json("cached0"))
+    assert not FakePool.instances
+    assert compiler_pool.wait_one() == (task_id, "Success", "")
+    assert not compiler_pool.stored
+
+
+def test_pre_build_not_cached(compiler_pool):
+    task_id = compiler_pool.start_compile_op(op_json("kernel0", compile_type="pre_build"))
+    FakePool.instances[0].finish(0)
+    assert compiler_pool.wait_one() == (task_id, "Success", "built kernel0")
+    assert not compiler_pool.stored
@@ -0,0 +1,102 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" test the cache of the ast trees of the parser """
+import ast
+import importlib.util
+
+from mindspore._extends.parse import Parser, get_parse_stats
+from mindspore._extends.parse.ast_cache import AstCache
+from mindspore.common._compile_cache import CompileCache
+
+
+class Net:
+    def construct(self, x, y):
+        if x > y:
+            return x * 2 + y
+        return (x, y)
+
+
+def func(x):
+    return [x + 1 for _ in range(3)]
+
+
+def token_positions(tree):
+    return [(node.first_token.start, node.last_token.end) if hasattr(node, "first_token") else None
+            for node in ast.walk(tree)]
+
+
+def test_ast_cache_levels(tmp_path):
+    compile_cache = CompileCache(str(tmp_path), 1024 * 1024)
+    cache = AstCache()
+    entry = cache.get(Net().construct, compile_cache)
+    assert cache.get(Net().construct, compile_cache) is entry
+    assert entry.col_offset == 4
+    assert cache.stats["misses"] == 1 and cache.stats["code_hits"] == 1
+    # the token positions are an entry of the compile cache, counted in its size
+    assert compile_cache.stats["stored_files"] == 1
+
+    # a new process only reads the token positions
+    new_cache = AstCache()
+    new_entry = new_cache.get(Net().construct, compile_cache)
+    assert new_cache.stats["disk_hits"] == 1
+    assert new_entry.tree is not entry.tree
+    assert (new_entry.line_offset, new_entry.col_offset) == (entry.line_offset, entry.col_offset)
+    assert token_positions(new_entry.tree) == token_positions(entry.tree)
+    assert ast.dump(new_entry.tree) == ast.dump(entry.tree)
+
+
+def test_ast_cache_max_size():
+    cache = AstCache(max_size=1)
+    cache.get(func)
+    cache.get(Net.construct)
+    cache.get(func)
+    stats = cache.stats
+    assert stats["parses"] == 3 and stats["misses"] == 3
+    assert stats["parse_time"] > 0
+
+
+def _load_function(path, source):
+    with open(str(path), "w") as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location(path.stem, str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.func
+
+
+def test_ast_cache_same_code_in_two_files(tmp_path):
+    # the code objects compare equal before python 3.11, which ignore the file and the columns of the tokens
+    func_a = _load_function(tmp_path / "module_a.py", "def func(x):\n    return x + 1\n")
+    func_b = _load_function(tmp_path / "module_b.py", "def func(x):\n    return   x   +   1\n")
+    cache = AstCache()
+    entry_a = cache.get(func_a)
+    entry_b = cache.get(func_b)
+    assert entry_b is not entry_a
+    assert cache.stats["misses"] == 2
+    ret_a = entry_a.tree.body[0].body[0].value
+    ret_b = entry_b.tree.body[0].body[0].value
+    assert ret_a.first_token.start == (2, 11)
+    assert ret_b.first_token.start == (2, 13)
+
+
+def test_parser_location():
+    parser = Parser(Net().construct)
+    tree = parser.parse()
+    ret = tree.body[0].body[0].body[0]
+    location = parser.get_location(ret)
+    assert location[0] == parser.filename
+    assert location[1] == Net.construct.__code__.co_firstlineno + 2
+    assert location[2] == 12
+    assert get_parse_stats()["parses"] >= 1
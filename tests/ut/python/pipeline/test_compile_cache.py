@@ -0,0 +1,146 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" test the persistent compile cache """
+import os
+import numpy as np
+import pytest
+
+import mindspore.nn as nn
+from mindspore import Tensor, context
+import mindspore.common._compile_cache as compile_cache
+from mindspore.common._compile_cache import CompileCache, compile_key, get_compile_cache, KERNEL_META_DIR
+from mindspore.ops import operations as P
+
+
+class Net(nn.Cell):
+    def __init__(self, in_channels, out_channels):
+        super(Net, self).__init__()
+        self.dense = nn.Dense(in_channels, out_channels)
+        self.relu = P.ReLU()
+
+    def construct(self, x):
+        return self.relu(self.dense(x))
+
+
+def test_compile_key():
+    x = Tensor(np.ones([2, 4]).astype(np.float32))
+    key = compile_key(Net(4, 8), (x,), "train")
+    assert compile_key(Net(4, 8), (x,), "train") == key
+    assert compile_key(Net(4, 16), (x,), "train") != key
+    assert compile_key(Net(4, 8), (Tensor(np.ones([3, 4]).astype(np.float32)),), "train") != key
+    assert compile_key(Net(4, 8), (x,), "eval") != key
+
+
+def _build_kernel(name):
+    def compile_fn():
+        os.makedirs(KERNEL_META_DIR, exist_ok=True)
+        with open(os.path.join(KERNEL_META_DIR, name), "w") as f:
+            f.write(name)
+        return True
+    return compile_fn
+
+
+def test_compile_cache_restore(tmp_path, monkeypatch):
+    cache = CompileCache(str(tmp_path / "cache"), 1024 * 1024)
+    x = Tensor(np.ones([2, 4]).astype(np.float32))
+    os.makedirs(str(tmp_path / "job0"))
+    monkeypatch.chdir(str(tmp_path / "job0"))
+    assert cache.compile(Net(4, 8), (x,), "train", _build_kernel("kernel0.o"))
+
+    # a new job in another directory gets the kernels before compiling
+    os.makedirs(str(tmp_path / "job1"))
+    monkeypatch.chdir(str(tmp_path / "job1"))
+
+    def compile_fn():
+        assert os.path.isfile(os.path.join(KERNEL_META_DIR, "kernel0.o"))
+        return True
+    assert cache.compile(Net(4, 8), (x,), "train", compile_fn)
+    stats = cache.stats
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["stored_files"] == 1 and stats["restored_files"] == 1
+
+
+def test_compile_cache_eviction(tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    cache = CompileCache(str(tmp_path / "cache"), 1024)
+    kernel_files = []
+    for i in range(3):
+        kernel_file = str(tmp_path / "kernel{}.o".format(i))
+        with open(kernel_file, "wb") as f:
+            f.write(b"0" * 400)
+        kernel_files.append(kernel_file)
+    cache.store("a", kernel_files[:1])
+    cache.store("b", kernel_files[1:2])
+    os.utime(str(tmp_path / "cache" / "a"), (0, 0))
+    os.utime(str(tmp_path / "cache" / "b"), (1, 1))
+    assert cache.lookup("a") is not None
+    cache.store("c", kernel_files[2:])
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None and cache.lookup("c") is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_compile_cache_store_without_scan(tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    sized = []
+    dir_size = compile_cache._dir_size
+    monkeypatch.setattr(compile_cache, "_dir_size", lambda path: sized.append(path) or dir_size(path))
+    cache = CompileCache(str(tmp_path / "cache"), 1000)
+    kernel_file = str(tmp_path / "kernel.o")
+    with open(kernel_file, "wb") as f:
+        f.write(b"0" * 100)
+    # the cache is measured on the first store, then only when it is full
+    for i in range(9):
+        cache.store(str(i), [kernel_file])
+    assert len(sized) == 1
+    cache.store("9", [kernel_file])
+    cache.store("10", [kernel_file])
+    assert len(sized) == 12
+    assert cache.stats["evictions"] == 1
+    assert len(os.listdir(str(tmp_path / "cache"))) == 10
+
+
+def test_compile_cache_shared_size(tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    kernel_file = str(tmp_path / "kernel.o")
+    with open(kernel_file, "wb") as f:
+        f.write(b"0" * 400)
+    graph_cache = CompileCache(str(tmp_path / "cache" / "graph"), 1024, str(tmp_path / "cache"))
+    tbe_cache = CompileCache(str(tmp_path / "cache" / "tbe"), 1024, str(tmp_path / "cache"))
+    graph_cache.store("a", [kernel_file])
+    tbe_cache.store("b", [kernel_file])
+    os.utime(str(tmp_path / "cache" / "graph" / "a"), (0, 0))
+    # the entries of both caches count in the same max size, the oldest one of any cache is removed
+    tbe_cache.store("c", [kernel_file])
+    assert graph_cache.lookup("a") is None
+    assert tbe_cache.lookup("b") is not None and tbe_cache.lookup("c") is not None
+    assert tbe_cache.stats["evictions"] == 1
+
+
+def test_compile_cache_context(tmp_path):
+    assert get_compile_cache() is None
+    with pytest.raises(ValueError):
+        context.set_context(compile_cache_max_size="2")
+    context.set_context(compile_cache_path=str(tmp_path), compile_cache_max_size="0.5GB")
+    try:
+        cache = get_compile_cache()
+        assert cache.path == os.path.realpath(str(tmp_path / "graph"))
+        assert get_compile_cache("tbe").path == os.path.realpath(str(tmp_path / "tbe"))
+        assert cache.max_size == 512 * 1024 * 1024
+        context.set_context(compile_cache_max_size="1GB")
+        assert get_compile_cache("tbe").max_size == 1024 * 1024 * 1024
+        assert cache.max_size == 1024 * 1024 * 1024
+    finally:
+        context.set_context(compile_cache_path="")
@@ -178,3 +178,43 @@ def test_histogram_summary_all_nan_inf():
             assert histogram.nan_count == 3
             assert histogram.pos_inf_count == 1
             assert histogram.neg_inf_count == 1
+
+
+def test_histogram_summary_reduced():
+    """Test histogram summary of a tensor reduced to a sample."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with SummaryRecord(tmp_dir, file_suffix="_MS_HISTOGRAM") as test_writer:
+            arr = np.random.RandomState(0).normal(size=10000).astype(np.float32)
+            arr[0] = np.nan
+            test_writer.add_reduced_histogram("test_data", Tensor(arr), max_samples=100)
+            test_writer.record(step=1)
+
+        file_name = os.path.join(tmp_dir, test_writer.event_file_name)
+        with SummaryReader(file_name) as reader:
+            event = reader.read_event()
+            LOG.debug(event)
+
+            histogram = event.summary.value[0].histogram
+            assert histogram.count == arr.size
+            assert histogram.nan_count == 1
+            assert histogram.min == np.nanmin(arr)
+            assert histogram.max == np.nanmax(arr)
+            assert sum(bucket.count for bucket in histogram.buckets) == arr.size - 1
+
+
+def test_histogram_summary_int_edges():
+    """Test the buckets of the histogram summary of an integer tensor match their counts."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with SummaryRecord(tmp_dir, file_suffix="_MS_HISTOGRAM") as test_writer:
+            test_writer.add_value("histogram", "test_data", Tensor(np.arange(8).astype(np.int32)))
+            test_writer.record(step=1)
+
+        file_name = os.path.join(tmp_dir, test_writer.event_file_name)
+        with SummaryReader(file_name) as reader:
+            event = reader.read_event()
+            LOG.debug(event)
+
+            buckets = event.summary.value[0].histogram.buckets
+            assert np.allclose([bucket.left for bucket in buckets], [0, 7 / 3, 14 / 3])
+            assert np.allclose([bucket.width for bucket in buckets], [7 / 3] * 3)
+            assert [bucket.count for bucket in buckets] == [3, 2, 3]
@@ -79,6 +79,20 @@ def test_scalar_summary_sample():
         log.debug("finished test_scalar_summary_sample")
 
 
+def test_scalar_summary_sample_inline_packing():
+    """ test_scalar_summary_sample_inline_packing """
+    with SummaryRecord(SUMMARY_DIR, queue_max_size=4, file_suffix="_MS_SCALAR_INLINE",
+                       max_workers=0) as test_writer:
+        for i in range(1, 100):
+            test_data = get_test_data(i)
+            _cache_summary_tensor_data(test_data)
+            test_writer.record(i)
+        test_writer.flush()
+    file_names = [f for f in os.listdir(SUMMARY_DIR) if f.endswith("_MS_SCALAR_INLINE")]
+    assert file_names
+    assert os.path.getsize(os.path.join(SUMMARY_DIR, file_names[-1])) > 0
+
+
 def get_test_data_shape_1(step):
     """ get_test_data_shape_1 """
     test_data_list = []
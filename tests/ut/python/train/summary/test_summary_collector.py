@@ -383,6 +383,36 @@ class TestSummaryCollector:
         assert expected_names == [data[1] for data in result]
         assert expected_values == [data[2] for data in result]
 
+    @mock.patch.object(SummaryRecord, 'add_value')
+    def test_collect_histogram_rolling(self, mock_add_value):
+        """Test collect histogram of a bounded number of parameters per step."""
+        mock_add_value.side_effect = add_value
+        cb_params = _InternalCallbackParam()
+        parameters = [Parameter(Tensor(i), f'conv{i}.weight') for i in range(5)]
+        cb_params.optimizer = Optimizer(learning_rate=0.1, parameters=parameters)
+        with SummaryCollector(tempfile.mkdtemp(dir=self.base_summary_dir),
+                              histogram_params_per_step=2) as summary_collector:
+            summary_collector._collect_specified_data['histogram_regular'] = 'conv'
+            names = []
+            for _ in range(3):
+                summary_collector._collect_histogram(cb_params)
+                names.append([data[1] for data in get_value()])
+        assert names == [['conv0.weight/auto', 'conv1.weight/auto'],
+                         ['conv2.weight/auto', 'conv3.weight/auto'],
+                         ['conv4.weight/auto', 'conv0.weight/auto']]
+
+    @pytest.mark.parametrize("param_name, value, expected_error", [
+        ('histogram_max_samples', 0, ValueError),
+        ('histogram_max_samples', True, TypeError),
+        ('histogram_params_per_step', -1, ValueError),
+        ('histogram_params_per_step', 1.5, TypeError)
+    ])
+    def test_params_with_histogram_limit_invalid(self, param_name, value, expected_error):
+        """Test the limits of the histogram collection with invalid values."""
+        summary_dir = tempfile.mkdtemp(dir=self.base_summary_dir)
+        with pytest.raises(expected_error):
+            SummaryCollector(summary_dir, **{param_name: value})
+
     @pytest.mark.parametrize("specified_data, action, expected_result", [
         (None, True, SummaryCollector._DEFAULT_SPECIFIED_DATA),
         (None, False, {}),
@@ -0,0 +1,78 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test the feed mode of DatasetHelper"""
+import numpy as np
+import pytest
+
+from mindspore import Tensor
+from mindspore.train.dataset_helper import DatasetHelper
+from ....dataset_mock import MindData
+
+
+class MindDataSet(MindData):
+    def __init__(self, size, fail_at=None):
+        super(MindDataSet, self).__init__(size=size, batch_size=2, np_types=(np.float32, np.int32),
+                                          output_shapes=((2, 3), (2,)))
+        self._fail_at = fail_at
+
+    def __next__(self):
+        if self._iter_num == self._fail_at:
+            raise RuntimeError("read error")
+        self._iter_num += 1
+        return (np.full((2, 3), self._iter_num, np.float32), np.full((2,), self._iter_num, np.int32))
+
+
+@pytest.mark.parametrize("prefetch_size", [0, 1, 3])
+def test_feed_order(prefetch_size):
+    dataset = MindDataSet(5)
+    dataset_helper = DatasetHelper(dataset, dataset_sink_mode=False, prefetch_size=prefetch_size)
+    for _ in range(2):
+        steps = [inputs for inputs in dataset_helper]
+        assert len(steps) == 5
+        for i, (data, label) in enumerate(steps):
+            assert isinstance(data, Tensor)
+            assert (data.asnumpy() == i + 1).all()
+            assert (label.asnumpy() == i + 1).all()
+        dataset.reset()
+    stats = dataset_helper.stats
+    assert stats["steps"] == 10
+    assert stats["data_wait_time"] >= 0 and stats["compute_time"] >= 0
+
+
+def test_feed_stop_early():
+    dataset = MindDataSet(100)
+    dataset_helper = DatasetHelper(dataset, dataset_sink_mode=False, prefetch_size=2)
+    for i, (data, _) in enumerate(dataset_helper):
+        assert (data.asnumpy() == i + 1).all()
+        if i == 2:
+            break
+    dataset_helper.stop()
+    dataset.reset()
+    data, _ = next(iter(dataset_helper))
+    assert (data.asnumpy() == 1).all()
+    dataset_helper.stop()
+
+
+def test_feed_error():
+    dataset = MindDataSet(5, fail_at=3)
+    dataset_helper = DatasetHelper(dataset, dataset_sink_mode=False)
+    with pytest.raises(RuntimeError, match="read error"):
+        for _ in dataset_helper:
+            pass
+
+
+def test_invalid_prefetch_size():
+    with pytest.raises(ValueError):
+        DatasetHelper(MindDataSet(5), dataset_sink_mode=False, prefetch_size=-1)
@@ -29,6 +29,7 @@ from mindspore.nn.optim import Momentum
 from mindspore.train.callback import ModelCheckpoint, RunContext, LossMonitor, _InternalCallbackParam, \
     _CallbackManager, Callback, CheckpointConfig, _set_cur_net, _checkpoint_cb_for_save_op
 from mindspore.train.callback._checkpoint import _check_file_name_prefix, _chg_ckpt_file_name_if_same_exist
+from mindspore.train._checkpoint_engine import AsyncCheckpointEngine
 
 class Net(nn.Cell):
     """Net definition."""
@@ -349,6 +350,63 @@ def test_Checkpoint_Config():
     with pytest.raises(ValueError):
         CheckpointConfig(0, None, 0, 0, True)
 
+    with pytest.raises(ValueError):
+        CheckpointConfig(async_save=True, async_save_policy="drop")
+
+
+def test_checkpoint_save_ckpt_async():
+    """Test checkpoint saved by the async engine."""
+    train_config = CheckpointConfig(
+        save_checkpoint_steps=16,
+        keep_checkpoint_max=5,
+        async_save=True,
+        async_save_policy="coalesce")
+    cb_params = _InternalCallbackParam()
+    net = Net()
+    loss = nn.SoftmaxCrossEntropyWithLogits()
+    optim = Momentum(net.trainable_params(), learning_rate=0.1, momentum=0.9)
+    network_ = WithLossCell(net, loss)
+    cb_params.train_network = TrainOneStepCell(network_, optim)
+    cb_params.epoch_num = 10
+    cb_params.cur_epoch_num = 1
+    cb_params.cur_step_num = 16
+    cb_params.batch_num = 32
+    ckpt_cb = ModelCheckpoint(prefix="test_async", directory='./test_files', config=train_config)
+    assert ckpt_cb.async_save_stats is None
+    run_context = RunContext(cb_params)
+    ckpt_cb.begin(run_context)
+    ckpt_cb.step_end(run_context)
+    ckpt_cb.end(run_context)
+    stats = ckpt_cb.async_save_stats
+    assert stats["saved"] + stats["coalesced"] == 2
+    assert stats["bytes_written"] > 0
+    assert os.path.exists(ckpt_cb.latest_ckpt_file_name)
+    # the engine is closed at the end of the training, a new one is created by the next training
+    engine = ckpt_cb._async_engine
+    assert engine.closed
+    assert not engine._thread.is_alive()
+    cb_params.cur_epoch_num = 2
+    cb_params.cur_step_num = 48
+    ckpt_cb.step_end(run_context)
+    ckpt_cb.end(run_context)
+    assert ckpt_cb._async_engine is not engine
+    assert ckpt_cb._async_engine.closed
+
+
+def test_async_checkpoint_engine_skip():
+    """Test the skip policy of the async checkpoint engine."""
+    engine = AsyncCheckpointEngine(policy="skip", num_buffers=1)
+    param_list = [{"name": "weight", "data": Tensor(np.ones([1024, 1024]).astype(np.float32))}]
+    ckpt_file_name = os.path.realpath('./test_engine.ckpt')
+    results = [engine.submit(param_list, ckpt_file_name) for _ in range(4)]
+    engine.close()
+    stats = engine.stats
+    assert results[0]
+    assert stats["saved"] == results.count(True)
+    assert stats["skipped"] == results.count(False)
+    os.chmod(ckpt_file_name, stat.S_IWRITE)
+    os.remove(ckpt_file_name)
+
 
 def test_step_end_save_graph():
     """Test save checkpoint."""
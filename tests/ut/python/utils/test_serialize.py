@@ -30,8 +30,9 @@ from mindspore.nn import WithLossCell, TrainOneStepCell
 from mindspore.nn.optim.momentum import Momentum
 from mindspore.ops import operations as P
 from mindspore.train.callback import _CheckpointManager
+from mindspore.train._checkpoint_io import CheckpointEntry, CheckpointWriter
 from mindspore.train.serialization import save_checkpoint, load_checkpoint, load_param_into_net, \
-    _exec_save_checkpoint, export, _save_graph
+    _exec_save_checkpoint, _save_delta_checkpoint, export, _save_graph
 from ..ut_filter import non_graph_engine
 
 context.set_context(mode=context.GRAPH_MODE, print_file_path="print/print.pb")
@@ -113,8 +114,66 @@ def test_save_checkpoint():
 
     ckpt_file_name = os.path.join(_cur_dir, './parameters.ckpt')
     save_checkpoint(parameter_list, ckpt_file_name)
+    assert not os.path.exists(ckpt_file_name + ".tmp")
 
 
+def test_checkpoint_writer():
+    """ test_checkpoint_writer """
+    weight = np.random.rand(12, 1024).astype(np.float32)
+    ckpt_file_name = os.path.join(_cur_dir, './writer.ckpt')
+    with CheckpointWriter(ckpt_file_name, buffer_size=1024) as writer:
+        writer.write("weight", [12, 1024], "Float32", weight.reshape(-1))
+        writer.write("step", [0], "Int32", np.array([5], np.int32))
+    assert writer.bytes_written == os.path.getsize(ckpt_file_name)
+
+    par_dict = load_checkpoint(ckpt_file_name)
+    assert (par_dict['weight'].data.asnumpy() == weight).all()
+    assert par_dict['step'].data.asnumpy() == 5
+    os.chmod(ckpt_file_name, stat.S_IWRITE)
+    os.remove(ckpt_file_name)
+
+
+
+class _ShortWriteFile:
+    """File whose writes write at most 1000 bytes, like the raw writes of more than 2GB."""
+    def __init__(self, file):
+        self._file = file
+        self.closed = False
+
+    def write(self, data):
+        return self._file.write(data[:1000])
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self.closed = True
+        self._file.close()
+
+
+def test_checkpoint_writer_short_write():
+    """ test_checkpoint_writer_short_write """
+    weight = np.random.rand(12, 1024).astype(np.float32)
+    ckpt_file_name = os.path.join(_cur_dir, './writer_short.ckpt')
+    with CheckpointWriter(ckpt_file_name, buffer_size=1024) as writer:
+        writer._file = _ShortWriteFile(writer._file)
+        writer.write("weight", [12, 1024], "Float32", weight.reshape(-1))
+    assert writer.bytes_written == os.path.getsize(ckpt_file_name)
+    assert (load_checkpoint(ckpt_file_name)['weight'].data.asnumpy() == weight).all()
+    os.chmod(ckpt_file_name, stat.S_IWRITE)
+    os.remove(ckpt_file_name)
+
+
+def test_checkpoint_writer_size_mismatch():
+    """ test_checkpoint_writer_size_mismatch """
+    ckpt_file_name = os.path.join(_cur_dir, './writer_mismatch.ckpt')
+    with pytest.raises(IOError):
+        with CheckpointWriter(ckpt_file_name) as writer:
+            writer.write("step", [0], "Int32", np.array([5], np.int32))
+            writer._bytes_written += 1
+    assert not os.path.exists(ckpt_file_name)
+    assert not os.path.exists(ckpt_file_name + ".tmp")
+
 def test_load_checkpoint_error_filename():
     ckpt_file_name = 1
     with pytest.raises(ValueError):
@@ -132,6 +191,61 @@ def test_load_checkpoint():
     assert isinstance(par_dict, dict)
 
 
+def test_load_checkpoint_lazy():
+    ckpt_file_name = os.path.join(_cur_dir, './parameters.ckpt')
+    par_dict = load_checkpoint(ckpt_file_name, lazy_load=True)
+    full_dict = load_checkpoint(ckpt_file_name)
+
+    assert len(par_dict) == 3
+    assert isinstance(par_dict._params['param'], CheckpointEntry)
+    assert par_dict['param'].name == 'param'
+    assert par_dict['param'] is par_dict['param']
+    assert isinstance(par_dict._params['param'], Parameter)
+    for name, param in par_dict.items():
+        assert param.data.shape == full_dict[name].data.shape
+        assert (param.data.asnumpy() == full_dict[name].data.asnumpy()).all()
+
+    par_dict = load_checkpoint(ckpt_file_name, lazy_load=True)
+    assert all(isinstance(param, Parameter) for param in dict(par_dict).values())
+    par_dict = load_checkpoint(ckpt_file_name, lazy_load=True)
+    assert all(isinstance(param, Parameter) for param in {**par_dict}.values())
+    par_dict = load_checkpoint(ckpt_file_name, lazy_load=True)
+    assert isinstance(par_dict.pop('param'), Parameter)
+    assert isinstance(par_dict.setdefault('param_test'), Parameter)
+    assert isinstance(par_dict.popitem()[1], Parameter)
+    assert 'param' not in par_dict
+
+
+def test_load_delta_checkpoint():
+    """ test_load_delta_checkpoint """
+    embedding = np.random.rand(1000, 16).astype(np.float32)
+    weight = np.random.rand(8, 8).astype(np.float32)
+    base_file_name = os.path.join(_cur_dir, './delta_base.ckpt')
+    delta_file_name = os.path.join(_cur_dir, './delta_1.ckpt')
+    save_checkpoint([{"name": "embedding", "data": Tensor(embedding)},
+                     {"name": "weight", "data": Tensor(weight)}], base_file_name)
+
+    embedding[[3, 500]] += 1
+    _save_delta_checkpoint([{"name": "embedding", "data": Tensor(embedding)},
+                            {"name": "weight", "data": Tensor(weight)}], delta_file_name, base_file_name)
+    assert os.path.getsize(delta_file_name) < os.path.getsize(base_file_name) / 100
+
+    par_dict = load_checkpoint(delta_file_name)
+    assert len(par_dict) == 2
+    assert (par_dict['embedding'].data.asnumpy() == embedding).all()
+    assert (par_dict['weight'].data.asnumpy() == weight).all()
+
+    # a new full checkpoint of the same size in place of the base is not merged
+    os.chmod(base_file_name, stat.S_IWRITE)
+    save_checkpoint([{"name": "embedding", "data": Tensor(embedding + 1)},
+                     {"name": "weight", "data": Tensor(weight)}], base_file_name)
+    with pytest.raises(ValueError):
+        load_checkpoint(delta_file_name)
+    for file_name in [base_file_name, delta_file_name]:
+        os.chmod(file_name, stat.S_IWRITE)
+        os.remove(file_name)
+
+
 def test_checkpoint_manager():
     """ test_checkpoint_manager """
     ckp_mgr = _CheckpointManager()